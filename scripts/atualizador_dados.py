@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Atualizador em segundo plano de IPCA, TR e bancos.csv (ver infrastructure.data.atualizador).
+
+    python scripts/atualizador_dados.py                 # laço (Ctrl+C / SIGTERM para sair)
+    python scripts/atualizador_dados.py --uma-vez       # um ciclo com as fontes vencidas
+    python scripts/atualizador_dados.py --uma-vez --forcar --fontes ipca tr
+    python scripts/atualizador_dados.py --status        # última atualização e duração por fonte
+"""
+
+import sys
+import signal
+import logging
+import argparse
+import threading
+from pathlib import Path
+
+# --- bootstrap PYTHONPATH -> src ---
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+# -----------------------------------
+
+from infrastructure.data.atualizador import ARQUIVO_ESTADO, FONTES, AtualizadorDados, ler_estado
+from infrastructure.data.snapshots import RepositorioSnapshots
+
+
+def _imprimir_estado(estado):
+    if not estado:
+        print("[ATUALIZADOR] nenhuma atualização registrada.")
+        return
+    for fonte in FONTES:
+        e = estado.get(fonte)
+        if not e:
+            print(f"  - {fonte}: nunca atualizado")
+            continue
+        situacao = "ok" if e.get("ok") else f"FALHOU ({e.get('erro')})"
+        print(f"  - {fonte}: última atualização {e.get('ultima_atualizacao') or '—'} | "
+              f"última tentativa {e.get('ultima_tentativa')} em {e.get('duracao_s')}s | "
+              f"{e.get('linhas', '—')} linha(s) | {situacao}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Mantém IPCA, TR e bancos.csv locais atualizados a partir do BACEN.")
+    ap.add_argument("--ipca", default="dados/txjuros/IPCA_BACEN.csv")
+    ap.add_argument("--tr", default="dados/txjuros/TR_mensal_compat.csv")
+    ap.add_argument("--bancos", default="dados/bancos.csv")
+    ap.add_argument("--dir-series", default="dados/series", dest="dir_series")
+    ap.add_argument("--snapshots", default="dados/snapshots", help="diretório dos snapshots ('' desliga)")
+    ap.add_argument("--estado", default=ARQUIVO_ESTADO)
+    ap.add_argument("--fontes", nargs="+", choices=FONTES, default=list(FONTES))
+    ap.add_argument("--uma-vez", action="store_true", dest="uma_vez", help="roda um ciclo e sai")
+    ap.add_argument("--forcar", action="store_true", help="atualiza mesmo as fontes não vencidas")
+    ap.add_argument("--verificar-a-cada", type=float, default=60.0, dest="verificar_a_cada")
+    ap.add_argument("--status", action="store_true", help="mostra o estado gravado e sai")
+    args = ap.parse_args()
+
+    caminho = lambda p: str(ROOT / p)  # caminhos relativos ao ROOT
+    if args.status:
+        _imprimir_estado(ler_estado(caminho(args.estado)))
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    atualizador = AtualizadorDados(
+        caminho_ipca=caminho(args.ipca),
+        caminho_tr=caminho(args.tr),
+        caminho_bancos=caminho(args.bancos),
+        dir_series=caminho(args.dir_series),
+        arquivo_estado=caminho(args.estado),
+        snapshots=RepositorioSnapshots(caminho(args.snapshots)) if args.snapshots else None,
+    )
+    if args.uma_vez:
+        atualizador.executar_ciclo(args.fontes, forcar=args.forcar)
+    else:
+        parar = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: parar.set())
+        if args.forcar:
+            atualizador.executar_ciclo(args.fontes, forcar=True)
+        atualizador.executar(parar, args.fontes, verificar_a_cada=args.verificar_a_cada)
+    _imprimir_estado(atualizador.estado())
+    return 0 if all(atualizador.estado().get(f, {}).get("ok") for f in args.fontes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Ranking em lote de um arquivo grande de pedidos (valor_total, entrada, prazo_anos[, cliente])
+contra todas as ofertas de bancos.csv (ver application.lote_clientes).
+
+    python scripts/lote_clientes.py --entrada dados/clientes.csv --saida resultados/lote.csv --top 5
+    python scripts/lote_clientes.py --entrada clientes.parquet --saida resultados/lote.csv   # requer pyarrow
+
+Interrompido (Ctrl+C / kill), o mesmo comando retoma do último bloco concluído; --recomecar descarta
+a saída e o checkpoint (<saida>.checkpoint.json). Pedidos inválidos não interrompem o lote: vão,
+com o motivo, para <saida>.rejeitados.csv.
+"""
+
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+# --- bootstrap PYTHONPATH -> src ---
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+# -----------------------------------
+
+from application.controlador import ControladorApp
+from application.lote_clientes import (INTERVALO_PROGRESSO_S, LINHAS_POR_BLOCO, caminho_rejeitados,
+                                        processar_arquivo)
+
+
+def _imprimir_progresso(p):
+    print(f"[LOTE] {p['linhas']} linha(s) ({p['rejeitadas']} rejeitada(s)) | {p['blocos']} bloco(s) "
+          f"| {p['linhas_por_s']:.0f} linhas/s | {p['decorrido_s']:.1f}s", flush=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Ranking em lote (clientes × ofertas), em blocos e retomável.")
+    ap.add_argument("--entrada", required=True, help="CSV ou Parquet com valor_total, entrada, prazo_anos")
+    ap.add_argument("--saida", default="resultados/lote_clientes.csv")
+    ap.add_argument("--bancos", default="dados/bancos.csv")
+    ap.add_argument("--ipca", default="dados/txjuros/IPCA_BACEN.csv")
+    ap.add_argument("--tr",   default="dados/txjuros/TR_mensal_compat.csv")
+    ap.add_argument("--top", type=int, default=None, help="melhores ofertas por cliente (padrão: todas)")
+    ap.add_argument("--linhas-por-bloco", type=int, default=LINHAS_POR_BLOCO, dest="linhas_por_bloco")
+    ap.add_argument("--progresso-a-cada", type=float, default=INTERVALO_PROGRESSO_S, dest="progresso_a_cada",
+                    help="segundos entre relatórios de vazão")
+    ap.add_argument("--recomecar", action="store_true", help="descarta saída e checkpoint e começa do início")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    caminho = lambda p: str(ROOT / p)  # caminhos relativos ao ROOT
+
+    lote = ControladorApp().preparar_lote(
+        caminho(args.bancos),
+        fonte_ipca={"caminho_ipca": caminho(args.ipca)},
+        fonte_tr={"fixture_csv_path": caminho(args.tr)},
+    )
+    estado = processar_arquivo(
+        lote, caminho(args.entrada), caminho(args.saida),
+        linhas_por_bloco=args.linhas_por_bloco, top=args.top, recomecar=args.recomecar,
+        ao_progresso=_imprimir_progresso, intervalo_progresso=args.progresso_a_cada,
+    )
+    print(f"[LOTE] OK | {estado['linhas']} cliente(s) × {len(lote.rotulos)} oferta(s) -> {caminho(args.saida)}")
+    if estado["rejeitadas"]:
+        print(f"[LOTE] {estado['rejeitadas']} linha(s) rejeitada(s) -> {caminho_rejeitados(caminho(args.saida))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,14 +2,22 @@ from __future__ import annotations
 
 import os
 import sys
+import math
+import bisect
+import functools
 import logging                               # ALTERAÇÃO: usar logging em vez de print
-from typing import Any, Optional             # ALTERAÇÃO: tipagens úteis
-from typing import Dict, List, Tuple, Optional
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple  # ALTERAÇÃO: tipagens úteis
+
+import numpy as np
+import pandas as pd
 
 
 from domain.financiamento import Financiamento
 from domain.simulador_sac import SimuladorSAC
 from domain.simulador_sac_ipca import SimuladorSAC_IPCA
+from domain.simulador_vetorizado import totais_sac
 from domain.comparador import ComparadorModalidades
 from infrastructure.data.tabela_ipca import TabelaIPCA
 from infrastructure.data.tabela_tr import TabelaTR
@@ -20,10 +28,205 @@ from infrastructure.data.coletor_bacen import obter_ipca_df, df_para_tabela_ipca
 from application.comparador import comparar_varios, recomendar # novo
 from domain.recomendador import RecomendadorModalidade
 from infrastructure.data.exportador_csv import exportar_cronograma_csv
+from infrastructure.data.snapshots import RepositorioSnapshots
+from infrastructure.data.repositorio_series import RepositorioSeries
 from domain.simulacao_resultado import SimulacaoResultado   # ALTERAÇÃO: tipagem de retorno
 
 logger = logging.getLogger(__name__)         # ALTERAÇÃO: logger do módulo
 
+# executores de simular_multiplos_bancos(workers=..., executor=...)
+EXECUTORES = ("threads", "processos")
+# tarefas por worker: cada uma simula um lote contíguo de bancos (amortiza o envio a processos)
+LOTES_POR_WORKER = 4
+
+# sufixo do rótulo ("<banco> – <sufixo>") de cada sistema de bancos.csv
+ROTULOS_SISTEMA = {"SAC": "SAC", "SAC_IPCA": "SAC IPCA+", "SAC_TR": "SAC TR"}
+# colunas da tabela de simular_lote_clientes
+COLUNAS_LOTE = ["cliente", "posicao", "oferta", "total_pago", "total_juros", "primeira_parcela", "ultima_parcela"]
+# elementos (clientes × ofertas) por bloco do kernel vetorizado: cabe no cache e limita a memória
+ELEMENTOS_POR_BLOCO = 1 << 16
+
+# tabelas compartilhadas (somente leitura) de cada processo do pool, enviadas uma vez no initializer
+_TABELAS_PROCESSO: tuple = ()
+
+
+@dataclass(frozen=True)
+class ProgressoSimulacao:
+    """
+    Um banco concluído em iterar_simulacoes_bancos.
+
+    ranking: ranking parcial (rótulo, total_pago) dos bancos concluídos até aqui, na ordem
+      de comparar_varios. mensagem/resultados: recomendação e resultados finais (os mesmos de
+      simular_multiplos_bancos); só vêm preenchidos no último item.
+    """
+    rotulo: str
+    resultado: Any
+    ranking: List[Tuple[str, float]]
+    concluidos: int
+    total: int
+    mensagem: Optional[str] = None
+    resultados: Optional[Dict[str, Any]] = None
+
+
+def _simular_banco(b: dict, dados_financiamento: dict, tabela_ipca, tr_series, resumo: bool = False):
+    """
+    Simula uma linha de bancos.csv com IPCA/TR já carregados; retorna (rótulo, resultado).
+    Com `resumo`, o resultado é um ResumoSimulacao (totais, sem o cronograma).
+    """
+    nome = b["nome"].strip()
+    sistema = b["sistema"].upper().strip()
+    taxa_csv = float(b["taxa_anual"])
+
+    fin = ControladorApp._montar_financiamento(dados_financiamento, sistema, taxa_csv)
+
+    # log de transparência:
+    taxa_user = dados_financiamento.get("taxa_juros_anual")
+    if taxa_user is not None and abs(taxa_user - taxa_csv) > 1e-9:
+        logger.info("Ignorando taxa_juros_anual de dados_financiamento (%.4f); usando taxa do CSV para %s: %.4f", 
+                     taxa_user, nome, taxa_csv)
+
+    if sistema == "SAC":
+        simulador = SimuladorSAC(fin, taxa_csv)
+        return f"{nome} – {ROTULOS_SISTEMA[sistema]}", simulador.resumir() if resumo else simulador.simular()
+
+    if sistema == "SAC_IPCA":
+        if tabela_ipca is None:
+            raise RuntimeError("IPCA não carregado.")
+        simulador = SimuladorSAC_IPCA(fin, tabela_ipca)
+        return f"{nome} – {ROTULOS_SISTEMA[sistema]}", simulador.resumir() if resumo else simulador.simular()
+
+    if sistema == "SAC_TR":
+        # garante que tr_series existe e tem conteúdo
+        if tr_series is None or len(tr_series) == 0:
+            raise RuntimeError("TR não carregada (tr_series vazio).")
+        simulador = SimuladorSAC(fin, taxa_csv)
+        simular = simulador.resumir if resumo else simulador.simular
+        return f"{nome} – {ROTULOS_SISTEMA[sistema]}", simular(usar_tr=True, tr_series=tr_series)
+
+    raise ValueError(f"Sistema inválido: {sistema!r}")
+
+
+def _simular_lote(lote: list, dados_financiamento: dict, tabela_ipca, tr_series, resumo: bool = False) -> list:
+    """[(índice, banco)] -> [(índice, rótulo, resultado, erro)]; o erro de um banco não interrompe o lote."""
+    saida = []
+    for i, b in lote:
+        try:
+            saida.append((i, *_simular_banco(b, dados_financiamento, tabela_ipca, tr_series, resumo), None))
+        except Exception as e:
+            saida.append((i, None, None, e))
+    return saida
+
+
+def _iniciar_processo(dados_financiamento: dict, tabela_ipca, tr_series) -> None:
+    global _TABELAS_PROCESSO
+    _TABELAS_PROCESSO = (dados_financiamento, tabela_ipca, tr_series)
+
+
+def _simular_lote_processo(lote: list, resumo: bool = False) -> list:
+    return _simular_lote(lote, *_TABELAS_PROCESSO, resumo)
+
+
+def _validar_top(nome: str, top: Optional[int]) -> None:
+    """Regra única de `top`/`top_k`: None (todas as ofertas) ou inteiro >= 0 (0: nenhuma)."""
+    if top is not None and top < 0:
+        raise ValueError(f"{nome} inválido: {top!r}")
+
+
+class LoteOfertas:
+    """
+    Ofertas de bancos.csv com IPCA/TR já carregados (ver ControladorApp.preparar_lote),
+    para ranquear vários lotes de clientes sem reler as entradas.
+    """
+
+    def __init__(self, ofertas: Dict[str, Tuple[str, float]], tabela_ipca, tabela_tr,
+                 fonte_ipca: dict|None = None, fonte_tr: dict|None = None):
+        """ofertas: {rótulo: (sistema, taxa_anual)}, na ordem de bancos.csv."""
+        self.rotulos = list(ofertas)
+        self.sistemas = [sistema for sistema, _ in ofertas.values()]
+        self.taxa_mensal = np.array([(1.0 + taxa) ** (1.0 / 12.0) - 1.0 for _, taxa in ofertas.values()])
+        self.tabela_ipca, self.tabela_tr = tabela_ipca, tabela_tr
+        self.fonte_ipca, self.fonte_tr = fonte_ipca, fonte_tr
+        self._corrigida = np.array([s != "SAC_IPCA" for s in self.sistemas])
+        # posição de cada rótulo em ordem alfabética (desempate do ranking, como em comparar_varios)
+        self._desempate = np.argsort(np.argsort(np.array(self.rotulos, dtype=object)))
+
+    def _indice(self, meses: int):
+        """(ofertas, meses) com a correção mensal do saldo de cada oferta (0 no SAC puro)."""
+        series = {"SAC": np.zeros(meses)}
+        if self.tabela_ipca is not None:
+            ipca = ControladorApp._estender_indice(self.tabela_ipca, meses, self.fonte_ipca)
+            series["SAC_IPCA"] = ipca.fatia_ipca(1, meses)
+        if self.tabela_tr is not None:
+            tr = ControladorApp._estender_indice(self.tabela_tr, meses, self.fonte_tr)
+            series["SAC_TR"] = np.asarray(tr[:meses], dtype=float)
+        return np.stack([series[s] for s in self.sistemas])
+
+    @staticmethod
+    def _validar_cliente(c: dict) -> Tuple[float, int]:
+        """(valor financiado, prazo em meses) de um pedido; ValueError com o motivo se for inválido."""
+        numeros = {}
+        for campo in ("valor_total", "entrada", "prazo_anos"):
+            if campo not in c:
+                raise ValueError(f"{campo} ausente")
+            try:
+                numeros[campo] = float(c[campo])
+            except (TypeError, ValueError):
+                raise ValueError(f"{campo} não numérico: {c[campo]!r}") from None
+            if not math.isfinite(numeros[campo]):
+                raise ValueError(f"{campo} sem valor ou não finito: {c[campo]!r}")
+        fin = ControladorApp._montar_financiamento(numeros, "SAC", 0.0)  # valida prazo_anos (múltiplo de 1/12)
+        if fin.prazo_meses <= 0:
+            raise ValueError(f"prazo_meses inválido: {fin.prazo_meses}")
+        valor = float(fin.valor_financiado())
+        if valor <= 0:
+            raise ValueError(f"valor financiado não positivo: {valor}")
+        return valor, fin.prazo_meses
+
+    def ranquear(self, clientes, top: Optional[int] = None, rejeitados: Optional[list] = None):
+        """
+        DataFrame (COLUNAS_LOTE) com as `top` melhores ofertas de cada cliente; ver simular_lote_clientes.
+
+        Um pedido inválido levanta ValueError (com o cliente e o motivo). Com a lista `rejeitados`,
+        ele é pulado e `(posição em clientes, motivo)` é acrescentado a ela: os demais são ranqueados.
+        """
+        _validar_top("top", top)
+        if isinstance(clientes, pd.DataFrame):
+            clientes = clientes.to_dict("records")
+
+        ids_clientes, valores, prazos = [], [], []
+        for i, c in enumerate(clientes):
+            try:
+                valor, prazo = self._validar_cliente(c)
+            except ValueError as e:
+                if rejeitados is None:
+                    raise ValueError(f"cliente {c.get('cliente', i)!r}: {e}") from e
+                rejeitados.append((i, str(e)))
+                continue
+            ids_clientes.append(c.get("cliente", i))
+            valores.append(valor)
+            prazos.append(prazo)
+        if not ids_clientes:
+            return pd.DataFrame(columns=COLUNAS_LOTE)
+
+        # IPCA/TR estendidos até o maior prazo do lote
+        indice = self._indice(max(prazos))
+        valores, prazos = np.array(valores), np.array(prazos)
+        k = len(self.rotulos) if top is None else min(top, len(self.rotulos))
+        por_bloco = max(1, ELEMENTOS_POR_BLOCO // len(self.rotulos))
+        partes = []
+        for inicio in range(0, len(valores), por_bloco):
+            fatia = slice(inicio, inicio + por_bloco)
+            totais = totais_sac(valores[fatia], prazos[fatia], self.taxa_mensal, indice, self._corrigida)
+            pago = totais["total_pago"]
+            ordem = np.lexsort((np.broadcast_to(self._desempate, pago.shape), pago), axis=-1)[:, :k]
+            partes.append(pd.DataFrame({
+                "cliente": np.repeat(np.array(ids_clientes[fatia], dtype=object), k),
+                "posicao": np.tile(np.arange(1, k + 1), len(pago)),
+                "oferta": np.array(self.rotulos, dtype=object)[ordem].ravel(),
+                **{coluna: np.take_along_axis(totais[coluna], ordem, axis=1).ravel() for coluna in COLUNAS_LOTE[3:]},
+            }))
+        return pd.concat(partes, ignore_index=True)
+
 
 class ControladorApp:
     """
@@ -31,11 +234,18 @@ class ControladorApp:
     comparações e exportações com base nos dados fornecidos pelo usuário.
     """
 
-    def __init__(self):
+    def __init__(self, snapshots: Optional[RepositorioSnapshots] = None):
         """
         Inicializa o controlador com os componentes necessários.
+
+        Parâmetros:
+          snapshots: repositório opcional de snapshots das entradas. Quando informado,
+            simular_multiplos_bancos reaproveita entradas já normalizadas, registra os ids
+            usados em cada execução e devolve resultados em cache para (ids, parâmetros) iguais.
         """
         self.comparador: Optional[ComparadorModalidades] = None  # ALTERAÇÃO: anotação de tipo
+        self.snapshots = snapshots
+        self.ultima_execucao: Optional[str] = None  # chave da última execução registrada
 
     # ------------------------ Helpers privados ------------------------ #
     def _validar_campos_comuns(self, dados: dict) -> tuple[str, float]:
@@ -60,7 +270,8 @@ class ControladorApp:
             raise FileNotFoundError(f"Arquivo do IPCA não encontrado: {caminho_ipca}")  # ALTERAÇÃO
         return caminho_ipca
 
-    def _montar_financiamento(self, dados: dict, sistema: str, taxa_anual: float) -> Financiamento:
+    @staticmethod
+    def _montar_financiamento(dados: dict, sistema: str, taxa_anual: float) -> Financiamento:
         """Cria o objeto Financiamento com valores validados."""
         return Financiamento(
             valor_total=dados["valor_total"],
@@ -141,17 +352,33 @@ class ControladorApp:
         dados = {"mensagem_comparacao": mensagem_comparacao}
         return recomendador.recomendar(dados)
 
-    def _carregar_tabela_tr(self, fonte_tr: dict|None, exige_tr: bool) -> TabelaTR|None:
+    def _carregar_tabela_tr(self, fonte_tr: dict|None, exige_tr: bool, ids: dict|None = None) -> TabelaTR|None:
         if not exige_tr: return None
         if not fonte_tr: raise KeyError("Fonte da TR não informada.")
+        if self.snapshots is not None and fonte_tr.get("fixture_csv_path"):
+            # snapshot do arquivo inteiro normalizado; o recorte de período é aplicado depois
+            ids["tr"] = self.snapshots.snapshot_arquivo(
+                "tr", fonte_tr["fixture_csv_path"],
+                lambda p: ColetorTR(fixture_csv_path=p, online=False).coletar(),
+            )
+            df_tr = self.snapshots.carregar(ids["tr"])
+            if fonte_tr.get("inicio"):
+                df_tr = df_tr[df_tr["data"] >= fonte_tr["inicio"]]
+            if fonte_tr.get("fim"):
+                df_tr = df_tr[df_tr["data"] <= fonte_tr["fim"]]
+            return TabelaTR(df_tr.reset_index(drop=True), _cache={})
         if fonte_tr.get("fixture_csv_path"):
             coletor = ColetorTR(fixture_csv_path=fonte_tr["fixture_csv_path"], online=False)
         elif fonte_tr.get("online"):
-            coletor = ColetorTR(fixture_csv_path=None, online=True, serie=fonte_tr.get("serie"))
+            repo = RepositorioSeries(fonte_tr["dir_series"]) if fonte_tr.get("dir_series") else None
+            coletor = ColetorTR(fixture_csv_path=None, online=True, serie=fonte_tr.get("serie"), repositorio=repo)
         else:
             raise ValueError("Fonte da TR inválida. Informe 'fixture_csv_path' ou 'online'.")
         df_tr = coletor.coletar(inicio=fonte_tr.get("inicio"), fim=fonte_tr.get("fim"))
-        return TabelaTR.from_dataframe(df_tr)
+        tabela = TabelaTR.from_dataframe(df_tr)
+        if self.snapshots is not None:
+            ids["tr"] = self.snapshots.registrar("tr", tabela.df)
+        return tabela
 
     def exportar_resultado(self, simulacao_resultado: Any, nome_base: str) -> str:
         """
@@ -170,20 +397,173 @@ class ControladorApp:
         return caminho
     
 
-    def _carregar_tabela_ipca(self, fonte_ipca: dict|None, exige_ipca: bool) -> TabelaIPCA|None:
+    def _carregar_tabela_ipca(self, fonte_ipca: dict|None, exige_ipca: bool, ids: dict|None = None) -> TabelaIPCA|None:
         if not exige_ipca: return None
         if not fonte_ipca: raise KeyError("Fonte do IPCA não informada.")
         if fonte_ipca.get("usar_bacen"):
             meses = int(fonte_ipca.get("meses", 24))
-            df_ipca = obter_ipca_df(meses=meses)
-            return TabelaIPCA.from_dataframe(df_ipca)
+            repo = RepositorioSeries(fonte_ipca["dir_series"]) if fonte_ipca.get("dir_series") else None
+            df_ipca = obter_ipca_df(meses=meses, repositorio=repo)
+            tabela = TabelaIPCA.from_dataframe(df_ipca)
+            if self.snapshots is not None:
+                ids["ipca"] = self.snapshots.registrar("ipca", tabela.tabela)
+            return tabela
         if "caminho_ipca" in fonte_ipca:
+            if self.snapshots is not None:
+                ids["ipca"] = self.snapshots.snapshot_arquivo(
+                    "ipca", fonte_ipca["caminho_ipca"], lambda p: TabelaIPCA(p).tabela)
+                return TabelaIPCA.from_tabela_normalizada(self.snapshots.carregar(ids["ipca"]))
             return TabelaIPCA(fonte_ipca["caminho_ipca"])
         raise ValueError("Fonte do IPCA inválida.")
 
+    def _carregar_bancos(self, caminho_bancos_csv: str, ids: dict) -> list:
+        """Lê bancos.csv (ou o snapshot normalizado, se o arquivo não mudou)."""
+        if self.snapshots is None:
+            return carregar_bancos_csv(caminho_bancos_csv)
+        ids["bancos"] = self.snapshots.snapshot_arquivo(
+            "bancos", caminho_bancos_csv, lambda p: pd.DataFrame(carregar_bancos_csv(p)))
+        return self.snapshots.carregar(ids["bancos"]).to_dict("records")
+
+    @staticmethod
+    def _parametros_execucao(dados_financiamento: dict, fonte_ipca: dict|None, fonte_tr: dict|None,
+                             top_k: Optional[int] = None) -> dict:
+        """Parâmetros que, junto com os ids dos snapshots, definem uma execução (caminhos ficam de fora)."""
+        caminhos = {"caminho_ipca", "fixture_csv_path", "diretorio_cache"}
+        parametros = {
+            "financiamento": dict(dados_financiamento),
+            "ipca": {k: v for k, v in (fonte_ipca or {}).items() if k not in caminhos},
+            "tr": {k: v for k, v in (fonte_tr or {}).items() if k not in caminhos},
+        }
+        if top_k is not None:  # resultados resumidos não podem servir de cache para a execução completa
+            parametros["top_k"] = top_k
+        return parametros
+
+
+    @staticmethod
+    def _estender_indice(tabela, prazo_meses: int, fonte: dict|None):
+        """
+        Estende IPCA/TR até o prazo: com fonte["projecao"] (modelo ou dict de ConfigProjecao),
+        usa o caminho projetado (cacheado); senão, a política fonte["extensao"] (padrão "ultimo").
+        """
+        fonte = fonte or {}
+        if fonte.get("projecao"):
+            return tabela.projetar(prazo_meses, fonte["projecao"], fonte.get("diretorio_cache"))
+        return tabela.estender(prazo_meses, fonte.get("extensao", "ultimo"))
+
+
+    def simular_multiplos_bancos(self, caminho_bancos_csv, dados_financiamento, fonte_ipca=None, fonte_tr=None,
+                                 workers: Optional[int] = None, executor: str = "threads",
+                                 top_k: Optional[int] = None):
+        """
+        Simula todos os bancos de bancos.csv; retorna (resultados, ranking, mensagem).
 
-    def simular_multiplos_bancos(self, caminho_bancos_csv, dados_financiamento, fonte_ipca=None, fonte_tr=None):
-        bancos = carregar_bancos_csv(caminho_bancos_csv)
+        Com `workers` > 1, os bancos são simulados em lotes em paralelo (`executor` "threads" ou
+        "processos"; processos recebem IPCA/TR uma vez por worker). A ordem dos resultados é a
+        do CSV e um banco inválido levanta o mesmo erro da execução serial (o primeiro na ordem).
+
+        Com `top_k`, todas as ofertas são ranqueadas pelos totais (sem montar cronogramas) e só
+        as k melhores do ranking ficam com o SimulacaoResultado completo; as demais ficam com um
+        ResumoSimulacao. Ranking e mensagem são os mesmos da simulação completa.
+        """
+        _validar_top("top_k", top_k)
+        bancos, tabela_ipca, tr_series, chave, em_cache = self._preparar_execucao(
+            caminho_bancos_csv, dados_financiamento, fonte_ipca, fonte_tr, top_k)
+        if em_cache is not None:
+            return em_cache
+
+        saida = self._simular_bancos(bancos, dados_financiamento, tabela_ipca, tr_series, workers, executor, top_k)
+        if chave is not None:
+            self.snapshots.guardar_resultado(chave, saida)
+        return saida
+
+    def iterar_simulacoes_bancos(self, caminho_bancos_csv, dados_financiamento, fonte_ipca=None, fonte_tr=None,
+                                 workers: Optional[int] = None, executor: str = "threads",
+                                 top_k: Optional[int] = None) -> Iterator[ProgressoSimulacao]:
+        """
+        Variante progressiva de simular_multiplos_bancos: gera um ProgressoSimulacao por banco,
+        assim que ele termina, com o ranking parcial. O último item traz a mensagem de recomendação.
+
+        Os dados (bancos, IPCA, TR) são carregados uma vez antes do primeiro item; cada banco é
+        uma tarefa própria (com `workers` > 1, na ordem de conclusão), então o primeiro resultado
+        não espera pelos demais. Um banco inválido levanta o erro assim que é encontrado; os já
+        gerados continuam válidos. O ranking/mensagem/resultados finais e o cache de snapshots são
+        os mesmos de simular_multiplos_bancos (inclusive com `top_k`, em que os itens trazem resumos).
+        """
+        _validar_top("top_k", top_k)
+        bancos, tabela_ipca, tr_series, chave, em_cache = self._preparar_execucao(
+            caminho_bancos_csv, dados_financiamento, fonte_ipca, fonte_tr, top_k)
+        if em_cache is not None:
+            resultados, _, mensagem = em_cache
+            ranking: List[Tuple[str, float]] = []
+            for n, (rotulo, resultado) in enumerate(resultados.items(), 1):
+                bisect.insort(ranking, *comparar_varios({rotulo: resultado}), key=lambda t: (t[1], t[0]))
+                final = n == len(resultados)
+                yield ProgressoSimulacao(rotulo, resultado, list(ranking), n, len(resultados),
+                                         mensagem if final else None, resultados if final else None)
+            return
+
+        resumo = top_k is not None
+        if workers is not None and workers > 1 and len(bancos) > 1:
+            simulados = self._simular_em_fluxo(bancos, dados_financiamento, tabela_ipca, tr_series,
+                                               min(workers, len(bancos)), executor, resumo)
+        else:
+            simulados = ((i, *_simular_banco(b, dados_financiamento, tabela_ipca, tr_series, resumo))
+                         for i, b in enumerate(bancos))
+
+        concluidos: Dict[int, Tuple[str, Any]] = {}
+        indice_do_rotulo: Dict[str, int] = {}  # rótulo repetido: vale o último banco no CSV (como no dict)
+        ranking = []
+        for i, rotulo, resultado in simulados:
+            concluidos[i] = (rotulo, resultado)
+            if indice_do_rotulo.get(rotulo, -1) < i:
+                if rotulo in indice_do_rotulo:
+                    ranking = [t for t in ranking if t[0] != rotulo]
+                indice_do_rotulo[rotulo] = i
+                bisect.insort(ranking, *comparar_varios({rotulo: resultado}), key=lambda t: (t[1], t[0]))
+            resultados = mensagem = None
+            if len(concluidos) == len(bancos):
+                resultados = dict(concluidos[j] for j in range(len(bancos)))
+                if resumo:
+                    banco_do_rotulo = {concluidos[j][0]: bancos[j] for j in range(len(bancos))}
+                    self._materializar_melhores(resultados, banco_do_rotulo, top_k,
+                                                dados_financiamento, tabela_ipca, tr_series)
+                saida = self._consolidar(resultados)
+                if chave is not None:
+                    self.snapshots.guardar_resultado(chave, saida)
+                mensagem = saida[2]
+            yield ProgressoSimulacao(rotulo, resultado, list(ranking), len(concluidos), len(bancos),
+                                     mensagem, resultados)
+
+    def _preparar_execucao(self, caminho_bancos_csv, dados_financiamento, fonte_ipca, fonte_tr, top_k=None):
+        """
+        Carrega bancos, IPCA e TR (uma vez cada) e registra a execução nos snapshots.
+        Retorna (bancos, tabela_ipca, tr_series, chave, resultado_em_cache).
+        """
+        ids: Dict[str, str] = {}  # ids dos snapshots usados (quando self.snapshots existe)
+        bancos, tabela_ipca, tabela_tr = self._carregar_entradas(caminho_bancos_csv, fonte_ipca, fonte_tr, ids)
+
+        # estende IPCA/TR virtualmente até o prazo (sem copiar nem alterar as tabelas carregadas)
+        prazo_meses = int(round(dados_financiamento["prazo_anos"] * 12))
+        if tabela_ipca is not None:
+            tabela_ipca = self._estender_indice(tabela_ipca, prazo_meses, fonte_ipca)
+        tr_series = None
+        if tabela_tr is not None:
+            tr_series = self._estender_indice(tabela_tr, prazo_meses, fonte_tr)
+
+        # --- snapshots: registra a execução e reaproveita resultado de (ids, parâmetros) iguais ---
+        chave = em_cache = None
+        if self.snapshots is not None:
+            chave = self.snapshots.registrar_execucao(
+                ids, self._parametros_execucao(dados_financiamento, fonte_ipca, fonte_tr, top_k))
+            self.ultima_execucao = chave
+            em_cache = self.snapshots.obter_resultado(chave)
+            if em_cache is not None:
+                logger.info("Execução %s já simulada com os mesmos snapshots/parâmetros; usando cache.", chave)
+        return bancos, tabela_ipca, tr_series, chave, em_cache
+
+    def _carregar_entradas(self, caminho_bancos_csv, fonte_ipca, fonte_tr, ids: dict):
+        """Bancos, IPCA e TR (uma vez cada); IPCA/TR ainda sem extensão até o prazo."""
+        bancos = self._carregar_bancos(caminho_bancos_csv, ids)
         if not bancos:
             raise ValueError("Nenhum banco encontrado em bancos.csv.")
 
@@ -191,67 +571,158 @@ class ControladorApp:
         exige_tr   = any(b["sistema"].upper()=="SAC_TR"   for b in bancos)
 
         # --- IPCA (uma vez) ---
-        tabela_ipca = self._carregar_tabela_ipca(fonte_ipca, exige_ipca)
-
-        # acolchoa IPCA se necessário
-        if tabela_ipca is not None:
-            prazo_meses = int(round(dados_financiamento["prazo_anos"] * 12))
-            tam = len(tabela_ipca.tabela)
-            if tam < prazo_meses:
-                ultimo = float(tabela_ipca.tabela.loc[tam-1, "ipca"])
-                faltam = prazo_meses - tam
-                import pandas as pd
-                pad = pd.DataFrame({"ipca": [ultimo]*faltam})
-                tabela_ipca.tabela = pd.concat([tabela_ipca.tabela, pad], ignore_index=True)
+        tabela_ipca = self._carregar_tabela_ipca(fonte_ipca, exige_ipca, ids)
 
         # --- TR (uma vez) ---
-        tr_series = None  
-        tabela_tr = self._carregar_tabela_tr(fonte_tr, exige_tr)
-        if tabela_tr is not None and getattr(tabela_tr, "df", None) is not None and "tr" in tabela_tr.df.columns:
-            tr_series = tabela_tr.df["tr"].tolist()
+        tabela_tr = self._carregar_tabela_tr(fonte_tr, exige_tr, ids)
+        return bancos, tabela_ipca, tabela_tr
 
-        resultados = {}
+    def preparar_lote(self, caminho_bancos_csv, fonte_ipca=None, fonte_tr=None) -> "LoteOfertas":
+        """
+        Carrega bancos, IPCA e TR uma vez e devolve um LoteOfertas, que ranqueia quantos lotes
+        de clientes forem preciso (ver simular_lote_clientes) sem reler as entradas.
+        """
+        bancos, tabela_ipca, tabela_tr = self._carregar_entradas(caminho_bancos_csv, fonte_ipca, fonte_tr, {})
+
+        # ofertas: rótulo repetido vale o último banco (como no dict de simular_multiplos_bancos)
+        ofertas: Dict[str, Tuple[str, float]] = {}
         for b in bancos:
-            nome = b["nome"].strip()
             sistema = b["sistema"].upper().strip()
-            taxa_csv = float(b["taxa_anual"])
-
-            fin = self._montar_financiamento(dados_financiamento, sistema, taxa_csv)
-
-            # log de transparência:
-            taxa_user = dados_financiamento.get("taxa_juros_anual")
-            if taxa_user is not None and abs(taxa_user - taxa_csv) > 1e-9:
-                logger.info("Ignorando taxa_juros_anual de dados_financiamento (%.4f); usando taxa do CSV para %s: %.4f", 
-                             taxa_user, nome, taxa_csv)
-
-            if sistema == "SAC":
-                resultado = SimuladorSAC(fin, taxa_csv).simular()
-                rotulo = f"{nome} – SAC"
-
-            elif sistema == "SAC_IPCA":
-                if tabela_ipca is None:
-                    raise RuntimeError("IPCA não carregado.")
-                resultado = SimuladorSAC_IPCA(fin, tabela_ipca).simular()
-                rotulo = f"{nome} – SAC IPCA+"
-
-            elif sistema == "SAC_TR":
-                # garante que tr_series existe e tem conteúdo
-                if tr_series is None or len(tr_series) == 0:
-                    raise RuntimeError("TR não carregada (tr_series vazio).")
-                resultado = SimuladorSAC(fin, taxa_csv).simular(usar_tr=True, tr_series=tr_series)
-                rotulo = f"{nome} – SAC TR"
-
-            else:
+            if sistema not in ROTULOS_SISTEMA:
                 raise ValueError(f"Sistema inválido: {sistema!r}")
+            if sistema == "SAC_IPCA" and tabela_ipca is None:
+                raise RuntimeError("IPCA não carregado.")
+            if sistema == "SAC_TR" and (tabela_tr is None or len(tabela_tr.df) == 0):
+                raise RuntimeError("TR não carregada (tr_series vazio).")
+            ofertas[f"{b['nome'].strip()} – {ROTULOS_SISTEMA[sistema]}"] = (sistema, float(b["taxa_anual"]))
+        return LoteOfertas(ofertas, tabela_ipca, tabela_tr, fonte_ipca, fonte_tr)
+
+    def simular_lote_clientes(self, caminho_bancos_csv, clientes, fonte_ipca=None, fonte_tr=None,
+                              top: Optional[int] = None):
+        """
+        Ranqueia as ofertas de bancos.csv para muitos clientes de uma vez; retorna um DataFrame
+        longo (COLUNAS_LOTE) com as `top` melhores ofertas de cada cliente (todas, se None).
+
+        `clientes`: lista de dicts ou DataFrame com valor_total, entrada, prazo_anos e, opcionalmente,
+        "cliente" (identificador; padrão: a posição). Bancos, IPCA e TR são carregados uma vez
+        (IPCA/TR estendidos até o maior prazo) e a matriz clientes × ofertas é avaliada pelo kernel
+        vetorizado (domain.simulador_vetorizado), em blocos de ELEMENTOS_POR_BLOCO. Os totais e a
+        ordem (total_pago, oferta) são os mesmos de simular_multiplos_bancos para cada cliente;
+        a taxa de cada oferta é a do CSV (taxa_juros_anual do cliente é ignorada).
+        """
+        return self.preparar_lote(caminho_bancos_csv, fonte_ipca, fonte_tr).ranquear(clientes, top)
 
-            resultados[rotulo] = resultado
-
+    def reproduzir_execucao(self, chave: str, workers: Optional[int] = None, executor: str = "threads"):
+        """
+        Refaz uma execução registrada a partir dos snapshots e parâmetros gravados,
+        sem reler os arquivos de origem (que podem ter mudado desde então).
+        """
+        if self.snapshots is None:
+            raise RuntimeError("reproduzir_execucao requer um RepositorioSnapshots.")
+        registro = self.snapshots.execucao(chave)
+        ids, params = registro["snapshots"], registro["parametros"]
+        dados_financiamento = params["financiamento"]
+        prazo_meses = int(round(dados_financiamento["prazo_anos"] * 12))
+
+        bancos = self.snapshots.carregar(ids["bancos"]).to_dict("records")
+        tabela_ipca = tr_series = None
+        if "ipca" in ids:
+            tabela_ipca = TabelaIPCA.from_tabela_normalizada(self.snapshots.carregar(ids["ipca"]))
+            tabela_ipca = self._estender_indice(tabela_ipca, prazo_meses, params["ipca"])
+        if "tr" in ids:
+            df_tr = self.snapshots.carregar(ids["tr"])
+            if params["tr"].get("inicio"):
+                df_tr = df_tr[df_tr["data"] >= params["tr"]["inicio"]]
+            if params["tr"].get("fim"):
+                df_tr = df_tr[df_tr["data"] <= params["tr"]["fim"]]
+            tabela_tr = TabelaTR(df_tr.reset_index(drop=True), _cache={})
+            tr_series = self._estender_indice(tabela_tr, prazo_meses, params["tr"])
+        return self._simular_bancos(bancos, dados_financiamento, tabela_ipca, tr_series, workers, executor,
+                                    params.get("top_k"))
+
+    @staticmethod
+    def _simular_em_paralelo(bancos: list, dados_financiamento: dict, tabela_ipca, tr_series,
+                             workers: int, executor: str, resumo: bool = False) -> list:
+        """[(rótulo, resultado)] na ordem de `bancos`, simulados em lotes num pool de `workers`."""
+        if executor not in EXECUTORES:
+            raise ValueError(f"executor inválido: {executor!r} (esperado: {', '.join(EXECUTORES)})")
+        indexados = list(enumerate(bancos))
+        tamanho = max(1, math.ceil(len(indexados) / (workers * LOTES_POR_WORKER)))
+        lotes = [indexados[i:i + tamanho] for i in range(0, len(indexados), tamanho)]
+        if executor == "threads":
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simulacao") as pool:
+                partes = list(pool.map(
+                    lambda lote: _simular_lote(lote, dados_financiamento, tabela_ipca, tr_series, resumo), lotes))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_processo,
+                                     initargs=(dados_financiamento, tabela_ipca, tr_series)) as pool:
+                partes = list(pool.map(functools.partial(_simular_lote_processo, resumo=resumo), lotes))
+        saida = sorted((item for parte in partes for item in parte), key=lambda item: item[0])
+        erro = next((e for _, _, _, e in saida if e is not None), None)
+        if erro is not None:
+            raise erro  # o mesmo erro (primeiro banco inválido na ordem do CSV) da execução serial
+        return [(rotulo, resultado) for _, rotulo, resultado, _ in saida]
+
+    @staticmethod
+    def _simular_em_fluxo(bancos: list, dados_financiamento: dict, tabela_ipca, tr_series,
+                          workers: int, executor: str, resumo: bool = False) -> Iterator[Tuple[int, str, Any]]:
+        """(índice, rótulo, resultado) na ordem de conclusão; uma tarefa por banco num pool de `workers`."""
+        if executor not in EXECUTORES:
+            raise ValueError(f"executor inválido: {executor!r} (esperado: {', '.join(EXECUTORES)})")
+        if executor == "threads":
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simulacao")
+            simular = lambda lote: _simular_lote(lote, dados_financiamento, tabela_ipca, tr_series, resumo)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_processo,
+                                       initargs=(dados_financiamento, tabela_ipca, tr_series))
+            simular = functools.partial(_simular_lote_processo, resumo=resumo)
+        try:
+            pendentes = {pool.submit(simular, [(i, b)]) for i, b in enumerate(bancos)}
+            while pendentes:
+                prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    for i, rotulo, resultado, erro in futuro.result():
+                        if erro is not None:
+                            raise erro
+                        yield i, rotulo, resultado
+        finally:
+            # erro ou consumidor que parou de iterar: descarta o que ainda não começou
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _consolidar(resultados: dict):
+        """(resultados, ranking, mensagem) a partir dos resultados na ordem do CSV."""
         from application.comparador import mapear_modalidades, comparar_varios, recomendar
         ranking = comparar_varios(resultados)
         mensagem = recomendar(ranking, modalidades=mapear_modalidades(list(resultados.keys())))
         return resultados, ranking, mensagem
 
-
-
-
-
+    def _simular_bancos(self, bancos: list, dados_financiamento: dict, tabela_ipca, tr_series,
+                        workers: Optional[int] = None, executor: str = "threads", top_k: Optional[int] = None):
+        """
+        Simula cada linha de bancos.csv com IPCA/TR já carregados; retorna (resultados, ranking, mensagem).
+        Com `top_k`, ranqueia pelos resumos e refaz com cronograma completo só as k melhores ofertas.
+        """
+        resumo = top_k is not None
+        if workers is not None and workers > 1 and len(bancos) > 1:
+            simulados = self._simular_em_paralelo(bancos, dados_financiamento, tabela_ipca, tr_series,
+                                                  min(workers, len(bancos)), executor, resumo)
+        else:
+            simulados = (_simular_banco(b, dados_financiamento, tabela_ipca, tr_series, resumo) for b in bancos)
+        resultados = {}
+        banco_do_rotulo = {}  # rótulo repetido: vale o último banco, como no dict de resultados
+        for b, (rotulo, resultado) in zip(bancos, simulados):
+            resultados[rotulo] = resultado
+            banco_do_rotulo[rotulo] = b
+        if resumo:
+            self._materializar_melhores(resultados, banco_do_rotulo, top_k,
+                                        dados_financiamento, tabela_ipca, tr_series)
+        return self._consolidar(resultados)
+
+    @staticmethod
+    def _materializar_melhores(resultados: dict, banco_do_rotulo: dict, top_k: int,
+                               dados_financiamento: dict, tabela_ipca, tr_series) -> None:
+        """Troca, em `resultados`, os resumos das `top_k` melhores ofertas pelo cronograma completo."""
+        for rotulo, _ in comparar_varios(resultados)[:top_k]:
+            resultados[rotulo] = _simular_banco(banco_do_rotulo[rotulo], dados_financiamento,
+                                                tabela_ipca, tr_series)[1]
@@ -0,0 +1,162 @@
+"""
+Processamento em lote, retomável, de um arquivo grande de pedidos de financiamento contra
+todas as ofertas de bancos.csv (ver ControladorApp.preparar_lote e LoteOfertas.ranquear).
+
+- a entrada (CSV/Parquet) é lida em blocos: a memória depende do tamanho do bloco, não do arquivo;
+- o ranking de cada bloco é acrescentado ao CSV de saída (fsync) e só então o checkpoint
+  (`<saida>.checkpoint.json`) registra as linhas processadas e o tamanho da saída;
+- na retomada, a saída é truncada no tamanho do último checkpoint (descarta um bloco escrito
+  pela metade) e as linhas já processadas são puladas na leitura;
+- o checkpoint guarda tamanho e mtime da entrada: retomar contra um arquivo modificado é recusado;
+- um pedido inválido não derruba o lote: a linha vai, com o motivo, para `<saida>.rejeitados.csv`
+  (truncado e retomado junto com a saída) e é contada em "rejeitadas".
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from typing import Callable, Optional
+
+from infrastructure.data.escrita_atomica import gravar_atomico
+from infrastructure.data.leitor_clientes import ler_em_blocos
+
+logger = logging.getLogger(__name__)
+
+# tamanho padrão do bloco de entrada (linhas)
+LINHAS_POR_BLOCO = 50_000
+# intervalo padrão entre relatórios de progresso (s)
+INTERVALO_PROGRESSO_S = 10.0
+
+
+def caminho_checkpoint(saida: str) -> str:
+    return f"{saida}.checkpoint.json"
+
+
+def caminho_rejeitados(saida: str) -> str:
+    """CSV com as linhas recusadas (colunas linha, motivo e as da entrada)."""
+    return f"{saida}.rejeitados.csv"
+
+
+def ler_checkpoint(saida: str) -> Optional[dict]:
+    """Checkpoint do lote que grava em `saida`, ou None se não houver."""
+    try:
+        with open(caminho_checkpoint(saida), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _gravar_checkpoint(saida: str, estado: dict) -> None:
+    gravar_atomico(caminho_checkpoint(saida), json.dumps(estado, ensure_ascii=False, indent=2, sort_keys=True))
+
+
+def _assinatura_entrada(entrada: str) -> dict:
+    """Tamanho e mtime da entrada: as linhas puladas na retomada só valem para o mesmo arquivo."""
+    st = os.stat(entrada)
+    return {"entrada_bytes": st.st_size, "entrada_mtime_ns": st.st_mtime_ns}
+
+
+def _estado_inicial(entrada: str, saida: str, top: Optional[int], recomecar: bool) -> dict:
+    estado = None if recomecar else ler_checkpoint(saida)
+    assinatura = _assinatura_entrada(entrada)
+    if estado is None:
+        for caminho in (saida, caminho_rejeitados(saida)):
+            if os.path.exists(caminho):
+                os.remove(caminho)
+        return {"entrada": os.path.abspath(entrada), "top": top, "linhas": 0, "blocos": 0,
+                "bytes_saida": 0, "rejeitadas": 0, "bytes_rejeitados": 0, "concluido": False, **assinatura}
+    if estado["entrada"] != os.path.abspath(entrada) or estado["top"] != top:
+        raise ValueError(f"{caminho_checkpoint(saida)} é de outro lote (entrada {estado['entrada']}, "
+                         f"top {estado['top']}); use recomecar para descartá-lo.")
+    if {k: estado.get(k) for k in assinatura} != assinatura:
+        raise ValueError(f"{entrada} mudou desde o checkpoint {caminho_checkpoint(saida)} (tamanho ou data "
+                         "de modificação); use recomecar.")
+    tamanho = os.path.getsize(saida) if os.path.exists(saida) else 0
+    if tamanho < estado["bytes_saida"]:
+        raise ValueError(f"{saida} tem {tamanho} bytes, menos que os {estado['bytes_saida']} do checkpoint; "
+                         "use recomecar.")
+    return estado
+
+
+def _anexar_rejeitados(caminho: str, bloco, rejeitados: list, estado: dict) -> int:
+    """Acrescenta as linhas recusadas do bloco (com linha e motivo) a `caminho`; retorna o novo tamanho."""
+    posicoes = [i for i, _ in rejeitados]
+    linhas = bloco.iloc[posicoes].copy()
+    linhas.insert(0, "motivo", [motivo for _, motivo in rejeitados])
+    linhas.insert(0, "linha", [estado["linhas"] + i for i in posicoes])
+    with open(caminho, "ab") as f:
+        f.write(linhas.to_csv(index=False, header=estado["bytes_rejeitados"] == 0).encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def processar_arquivo(
+    lote,
+    entrada: str,
+    saida: str,
+    linhas_por_bloco: int = LINHAS_POR_BLOCO,
+    top: Optional[int] = None,
+    recomecar: bool = False,
+    ao_progresso: Optional[Callable[[dict], None]] = None,
+    intervalo_progresso: float = INTERVALO_PROGRESSO_S,
+) -> dict:
+    """
+    Ranqueia todos os pedidos de `entrada` com `lote` (LoteOfertas) e grava em `saida` (CSV com
+    COLUNAS_LOTE), retomando do último bloco concluído se houver checkpoint.
+
+    Sem a coluna "cliente", o identificador é o número da linha de dados (estável entre retomadas).
+    Pedidos inválidos são pulados e gravados em `caminho_rejeitados(saida)` com o motivo.
+    `ao_progresso(dict)` é chamado a cada `intervalo_progresso` segundos e no fim, com linhas,
+    rejeitadas, blocos, linhas_por_s (desta execução) e decorrido_s. Retorna o estado final do checkpoint.
+    """
+    estado = _estado_inicial(entrada, saida, top, recomecar)
+    if estado["concluido"]:
+        logger.info("Lote %s já concluído (%d linhas).", saida, estado["linhas"])
+        return estado
+    if estado["linhas"]:
+        logger.info("Retomando %s a partir da linha %d (bloco %d).", saida, estado["linhas"], estado["blocos"])
+
+    inicio = ultimo_relato = time.monotonic()
+    linhas_execucao = 0
+
+    def _relatar():
+        decorrido = time.monotonic() - inicio
+        ao_progresso({"linhas": estado["linhas"], "rejeitadas": estado["rejeitadas"], "blocos": estado["blocos"],
+                      "decorrido_s": round(decorrido, 3),
+                      "linhas_por_s": linhas_execucao / decorrido if decorrido > 0 else 0.0})
+
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    rejeitados_csv = caminho_rejeitados(saida)
+    if os.path.exists(rejeitados_csv):
+        with open(rejeitados_csv, "r+b") as f:
+            f.truncate(estado["bytes_rejeitados"])
+    with open(saida, "ab") as f:
+        f.truncate(estado["bytes_saida"])  # descarta o que passou do último checkpoint
+        f.seek(estado["bytes_saida"])
+        for bloco in ler_em_blocos(entrada, linhas_por_bloco, pular=estado["linhas"]):
+            if "cliente" not in bloco.columns:
+                bloco = bloco.assign(cliente=range(estado["linhas"], estado["linhas"] + len(bloco)))
+            rejeitados = []
+            tabela = lote.ranquear(bloco, top, rejeitados)
+            if rejeitados:
+                estado["bytes_rejeitados"] = _anexar_rejeitados(rejeitados_csv, bloco, rejeitados, estado)
+                estado["rejeitadas"] += len(rejeitados)
+            f.write(tabela.to_csv(index=False, header=estado["bytes_saida"] == 0).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+            estado.update(linhas=estado["linhas"] + len(bloco), blocos=estado["blocos"] + 1, bytes_saida=f.tell())
+            _gravar_checkpoint(saida, estado)
+            linhas_execucao += len(bloco)
+            if ao_progresso is not None and time.monotonic() - ultimo_relato >= intervalo_progresso:
+                ultimo_relato = time.monotonic()
+                _relatar()
+
+    estado["concluido"] = True
+    _gravar_checkpoint(saida, estado)
+    if ao_progresso is not None:
+        _relatar()
+    return estado
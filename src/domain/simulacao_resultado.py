@@ -128,3 +128,56 @@ class SimulacaoResultado:
             "total_juros": float(self.total_juros),
             "total_pago": float(self.total_pago),
         }
+
+
+class ResumoSimulacao:
+    """
+    Resumo de uma simulação sem o cronograma (ver `resumir()` dos simuladores).
+
+    Tem total_pago/total_juros iguais aos do SimulacaoResultado correspondente, o número
+    de parcelas e o valor da primeira e da última parcela; serve para ranquear ofertas
+    sem materializar a lista de parcelas.
+    """
+
+    def __init__(self, n_parcelas: int, total_pago: float, total_juros: float,
+                 primeira_parcela: float, ultima_parcela: float):
+        self.n_parcelas = n_parcelas
+        self.total_pago = total_pago
+        self.total_juros = total_juros
+        self.primeira_parcela = primeira_parcela
+        self.ultima_parcela = ultima_parcela
+
+    @classmethod
+    def de_fluxo(cls, valores) -> "ResumoSimulacao":
+        """Acumula pares (valor_parcela, juros) na ordem das parcelas (mesma soma de SimulacaoResultado)."""
+        n, total_pago, total_juros = 0, 0, 0
+        primeira = ultima = 0.0
+        for valor, juros in valores:
+            if n == 0:
+                primeira = valor
+            n += 1
+            total_pago += valor
+            total_juros += juros
+            ultima = valor
+        return cls(n, total_pago, total_juros, primeira, ultima)
+
+    def __repr__(self):
+        """
+        Representação resumida, no formato de SimulacaoResultado.
+        """
+        return (
+            f"ResumoSimulacao("
+            f"parcelas={self.n_parcelas}, "
+            f"total_pago={self.total_pago:.2f}, "
+            f"total_juros={self.total_juros:.2f})"
+        )
+
+    def to_dict_resumo(self):
+        """
+        Retorna um dicionário com o resumo numérico da simulação (mesmas chaves de SimulacaoResultado).
+        """
+        return {
+            "parcelas": self.n_parcelas,
+            "total_pago": self.total_pago,
+            "total_juros": self.total_juros
+        }
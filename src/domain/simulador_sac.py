@@ -1,7 +1,7 @@
 from domain.parcela import Parcela
-from domain.simulacao_resultado import SimulacaoResultado
+from domain.simulacao_resultado import ResumoSimulacao, SimulacaoResultado
 import logging
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +64,55 @@ class SimuladorSAC:
             tr_series: série de TR (fração) aplicada mês a mês; se faltar valores, replica o último.
                        Tem precedência sobre `tr_mensal` se fornecida.
         """
+        lista_parcelas: List[Parcela] = []
+        for k, saldo_anterior, tr_mes, saldo_corrigido, amortizacao_mes, juros_mes, valor_parcela, saldo_devedor \
+                in self._fluxo(usar_tr, tr_mensal, tr_series):
+            # 9) Cria parcela
+            parcela = Parcela(
+                numero=k,
+                amortizacao=amortizacao_mes,
+                juros=juros_mes,
+                valor_total=valor_parcela,
+                saldo_devedor=saldo_devedor,
+            )
+
+            # 10) Atributos de transparência (não quebram compatibilidade)
+            try:
+                parcela.saldo_anterior = saldo_anterior
+                parcela.correcao_tr_mes = tr_mes
+                parcela.saldo_corrigido = saldo_corrigido
+            except Exception:
+                pass  # ambientes restritos: ignore atributos dinâmicos
+
+            lista_parcelas.append(parcela)
+
+        return SimulacaoResultado(lista_parcelas)
+
+    def resumir(
+        self,
+        usar_tr: bool = False,
+        tr_mensal: Optional[float] = None,
+        tr_series: Optional[List[float]] = None,
+    ) -> ResumoSimulacao:
+        """
+        Mesma simulação de `simular` (mesmos parâmetros), sem montar o cronograma: retorna só os
+        totais e a primeira/última parcela, com total_pago/total_juros idênticos aos de `simular`.
+        """
+        return ResumoSimulacao.de_fluxo(
+            (valor_parcela, juros_mes)
+            for _, _, _, _, _, juros_mes, valor_parcela, _ in self._fluxo(usar_tr, tr_mensal, tr_series)
+        )
+
+    def _fluxo(
+        self,
+        usar_tr: bool,
+        tr_mensal: Optional[float],
+        tr_series: Optional[List[float]],
+    ) -> Iterator[Tuple[int, float, float, float, float, float, float, float]]:
+        """
+        Gera, mês a mês, (k, saldo_anterior, tr_mes, saldo_corrigido, amortizacao, juros,
+        valor_parcela, saldo_devedor) conforme as regras da classe.
+        """
         valor_financiado = float(self.financiamento.valor_financiado())
         prazo_meses = self._prazo_meses()
         taxa_mensal = self._taxa_mensal()
@@ -80,7 +129,6 @@ class SimuladorSAC:
         # Estado
         saldo_devedor = valor_financiado
         fator_acumulado = 1.0
-        lista_parcelas: List[Parcela] = []
 
         for k in range(1, prazo_meses + 1):
             # 1) Saldo antes de correções/juros (transparência)
@@ -125,23 +173,4 @@ class SimuladorSAC:
             if abs(saldo_devedor) < self._MARGEM_TOLERANCIA:
                 saldo_devedor = 0.0
 
-            # 9) Cria parcela
-            parcela = Parcela(
-                numero=k,
-                amortizacao=amortizacao_mes,
-                juros=juros_mes,
-                valor_total=valor_parcela,
-                saldo_devedor=saldo_devedor,
-            )
-
-            # 10) Atributos de transparência (não quebram compatibilidade)
-            try:
-                parcela.saldo_anterior = saldo_anterior
-                parcela.correcao_tr_mes = tr_mes
-                parcela.saldo_corrigido = saldo_corrigido
-            except Exception:
-                pass  # ambientes restritos: ignore atributos dinâmicos
-
-            lista_parcelas.append(parcela)
-
-        return SimulacaoResultado(lista_parcelas)
+            yield k, saldo_anterior, tr_mes, saldo_corrigido, amortizacao_mes, juros_mes, valor_parcela, saldo_devedor
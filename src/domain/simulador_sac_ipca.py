@@ -1,5 +1,5 @@
 from domain.parcela import Parcela
-from domain.simulacao_resultado import SimulacaoResultado
+from domain.simulacao_resultado import ResumoSimulacao, SimulacaoResultado
 
 
 class SimuladorSAC_IPCA:
@@ -38,8 +38,20 @@ class SimuladorSAC_IPCA:
         Retorno:
         SimulacaoResultado: Contendo lista de parcelas, total pago e total de juros.
         """
-        lista_parcelas = []
+        # 7. Armazena os dados de cada parcela
+        return SimulacaoResultado([Parcela(*parcela) for parcela in self._fluxo()])
 
+    def resumir(self):
+        """
+        Mesma simulação de `simular`, sem montar o cronograma.
+
+        Retorno:
+        ResumoSimulacao: total pago, total de juros e primeira/última parcela (mesmos totais de `simular`).
+        """
+        return ResumoSimulacao.de_fluxo((valor, juros) for _, _, juros, valor, _ in self._fluxo())
+
+    def _fluxo(self):
+        """Gera (numero_parcela, amortizacao, juros, valor_parcela, saldo_devedor) mês a mês."""
         valor_financiado = self.financiamento.valor_financiado()
         prazo_meses = self.financiamento.prazo_meses
         taxa_juros_base_mensal = self.financiamento.taxa_base_mensal()
@@ -71,16 +83,5 @@ class SimuladorSAC_IPCA:
             if abs(saldo_devedor) < self._MARGEM_TOLERANCIA:
                 saldo_devedor = 0.0
 
-            # 7. Armazena os dados da parcela
-            lista_parcelas.append(
-                Parcela(
-                    numero_parcela,
-                    amortizacao_mes,
-                    juros_mes,
-                    valor_parcela,
-                    saldo_devedor
-                )
-            )
-
-        return SimulacaoResultado(lista_parcelas)
+            yield numero_parcela, amortizacao_mes, juros_mes, valor_parcela, saldo_devedor
 
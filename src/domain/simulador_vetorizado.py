@@ -0,0 +1,91 @@
+"""
+Kernel vetorizado (NumPy) das regras de SimuladorSAC (com e sem TR) e SimuladorSAC_IPCA,
+para avaliar de uma vez uma matriz de financiamentos × ofertas.
+
+Calcula só os totais (como `resumir()` dos simuladores): o laço é mês a mês e cada passo
+opera sobre a matriz inteira, com as mesmas operações de ponto flutuante, na mesma ordem,
+dos simuladores escalares — os totais coincidem com os de `simular()`.
+"""
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+
+# mesma tolerância dos simuladores para zerar resíduos do saldo
+_MARGEM_TOLERANCIA = 1e-6
+
+
+def totais_sac(
+    valor_financiado: np.ndarray,
+    prazo_meses: np.ndarray,
+    taxa_mensal: np.ndarray,
+    indice: np.ndarray,
+    amortizacao_corrigida: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Totais de C financiamentos × O ofertas.
+
+    Parâmetros:
+      valor_financiado, prazo_meses: (C,) por financiamento.
+      taxa_mensal: (O,) taxa efetiva mensal por oferta.
+      indice: (O, T) correção mensal do saldo em fração (0 no SAC puro), T >= max(prazo_meses).
+      amortizacao_corrigida: (O,) True para a regra do SimuladorSAC (amortização corrigida pelo
+        fator acumulado do índice e limitada ao saldo); False para a do SimuladorSAC_IPCA
+        (amortização constante).
+
+    Retorna dict de arrays (C, O): total_pago, total_juros, primeira_parcela, ultima_parcela.
+    """
+    n = np.asarray(prazo_meses, dtype=np.int64)
+    indice = np.asarray(indice, dtype=float)
+    if len(n) and indice.shape[1] < n.max():
+        raise ValueError(f"índice com {indice.shape[1]} meses; o maior prazo tem {int(n.max())}")
+
+    # prazos decrescentes: no mês k, os financiamentos ativos são o prefixo [:ativos[k]] e os que
+    # terminam em k são [ativos[k + 1]:ativos[k]] — só o prefixo é calculado a cada mês
+    ordem = np.argsort(-n, kind="stable")
+    n = n[ordem]
+    meses = int(n.max(initial=0))
+    ativos = np.searchsorted(-n, -np.arange(meses + 2), side="right")
+
+    taxa = np.asarray(taxa_mensal, dtype=float)[None, :]
+    corrigida = np.asarray(amortizacao_corrigida, dtype=bool)[None, :]
+    amort_const = (np.asarray(valor_financiado, dtype=float)[ordem] / n)[:, None]
+    forma = (len(n), taxa.shape[1])
+    saldo = np.broadcast_to(np.asarray(valor_financiado, dtype=float)[ordem][:, None], forma).copy()
+    fator = np.ones(taxa.shape[1])
+    total_pago = np.zeros(forma)
+    total_juros = np.zeros(forma)
+    primeira = np.zeros(forma)
+    ultima = np.zeros(forma)
+
+    for k in range(1, meses + 1):
+        m, fim = ativos[k], ativos[k + 1]  # ativos: [:m]; último mês: [fim:m]
+        correcao = 1.0 + indice[:, k - 1]
+        fator = fator * correcao
+
+        saldo_corrigido = saldo[:m]
+        saldo_corrigido *= correcao
+        # SAC/SAC+TR: amortização corrigida pelo fator, limitada ao saldo; SAC+IPCA: constante
+        amortizacao = amort_const[:m] * np.where(corrigida, fator, 1.0)
+        np.minimum(amortizacao, saldo_corrigido, out=amortizacao, where=corrigida)
+        amortizacao[fim:m] = saldo_corrigido[fim:m]  # último mês quita o saldo corrigido
+        juros = saldo_corrigido * taxa
+        valor = amortizacao + juros
+
+        total_pago[:m] += valor
+        total_juros[:m] += juros
+        if k == 1:
+            primeira[:m] = valor
+        ultima[fim:m] = valor[fim:m]
+        saldo_corrigido -= amortizacao
+        saldo_corrigido[np.abs(saldo_corrigido) < _MARGEM_TOLERANCIA] = 0.0
+
+    desfazer = np.empty_like(ordem)
+    desfazer[ordem] = np.arange(len(ordem))
+    return {
+        "total_pago": total_pago[desfazer],
+        "total_juros": total_juros[desfazer],
+        "primeira_parcela": primeira[desfazer],
+        "ultima_parcela": ultima[desfazer],
+    }
@@ -0,0 +1,233 @@
+"""
+Atualizador em segundo plano das entradas locais (IPCA, TR e bancos.csv).
+
+A UI e o ControladorApp leem sempre arquivos locais; quem vai ao BACEN é este atualizador,
+fora do caminho interativo. Cada fonte é atualizada no seu intervalo:
+
+  - IPCA (SGS 433) e TR (SGS 226): incrementais via RepositorioSeries (só meses novos) e
+    gravados nos formatos que a UI já lê (CSV do Bacen para o IPCA, "data,tr" para a TR);
+  - bancos.csv: `gerar_bancos_csv_real` (consulta combinada no Olinda).
+
+O arquivo novo é escrito num temporário do mesmo diretório e trocado com `os.replace`: um
+leitor vê o arquivo antigo ou o novo, nunca um pela metade. Coleta que falha, estoura o prazo
+ou só consegue dado guardado (desatualizado) não troca nada. Com um RepositorioSnapshots, o
+arquivo trocado já é normalizado e guardado (pickle) para o ControladorApp reaproveitar.
+
+O estado (última atualização, duração, erro, linhas, id do snapshot) fica num JSON
+(`ARQUIVO_ESTADO`), lido por `ler_estado` sem depender do processo do atualizador.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+from infrastructure.data.cliente_sgs import ClienteSGS
+from infrastructure.data.coletor_bacen import obter_ipca_df
+from infrastructure.data.coletor_tr import ColetorTR
+from infrastructure.data.coletor_txjuros import ColetorTxJuros
+from infrastructure.data.escrita_atomica import trocar_atomico
+from infrastructure.data.gerador_bancos import _last_closed_month_yyyy_mm, gerar_bancos_csv_real
+from infrastructure.data.leitor_bancos import carregar_bancos_csv
+from infrastructure.data.prazo import orcamento, prazo_atual
+from infrastructure.data.repositorio_series import RepositorioSeries
+from infrastructure.data.snapshots import RepositorioSnapshots
+from infrastructure.data.tabela_ipca import TabelaIPCA
+
+logger = logging.getLogger(__name__)
+
+FONTES = ("ipca", "tr", "bancos")
+ARQUIVO_ESTADO = os.path.join("dados", "atualizacao.json")
+# intervalo (s) entre atualizações bem-sucedidas, por fonte, e espera após uma falha
+INTERVALOS_PADRAO = {"ipca": 6 * 3600, "tr": 6 * 3600, "bancos": 24 * 3600}
+INTERVALO_FALHA_S = 15 * 60
+# orçamento (s) de cada atualização (ver prazo.orcamento)
+PRAZO_ATUALIZACAO_S = 300.0
+# início das séries gravadas (mesmo dos CSVs de dados/txjuros)
+INICIO_SERIES = "1994-08"
+CABECALHO_IPCA = "Data;433 - Índice nacional de preços ao consumidor-amplo (IPCA) - Var. % mensal"
+
+# normalização de cada arquivo para o snapshot (a mesma do ControladorApp)
+CARREGADORES_SNAPSHOT: Dict[str, Callable[[str], pd.DataFrame]] = {
+    "ipca": lambda p: TabelaIPCA(p).tabela,
+    "tr": lambda p: ColetorTR(fixture_csv_path=p, online=False).coletar(),
+    "bancos": lambda p: pd.DataFrame(carregar_bancos_csv(p)),
+}
+
+
+class AtualizacaoRecusada(RuntimeError):
+    """A coleta terminou, mas o resultado não deve substituir o arquivo atual."""
+
+
+def _verificar_atual(fonte: str, df: Optional[pd.DataFrame] = None) -> None:
+    """Recusa a troca se algo da coleta em andamento veio de dado guardado (prazo esgotado)."""
+    prazo = prazo_atual()
+    if df is not None and df.attrs.get("desatualizado"):
+        raise AtualizacaoRecusada(f"{fonte}: SGS sem resposta no prazo; só havia o histórico local")
+    if prazo is not None and prazo.desatualizados:
+        raise AtualizacaoRecusada(f"{fonte}: dados desatualizados ({', '.join(prazo.desatualizados)})")
+
+
+def _gravar_json(caminho: str, obj) -> None:
+    def _escrever(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    trocar_atomico(caminho, _escrever)
+
+
+def ler_estado(arquivo: str = ARQUIVO_ESTADO) -> Dict[str, dict]:
+    """Estado gravado pelo atualizador ({fonte: {...}}); vazio se ele nunca rodou."""
+    try:
+        with open(arquivo, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Estado do atualizador ilegível (%s): %s", arquivo, e)
+        return {}
+
+
+class AtualizadorDados:
+    """
+    Mantém IPCA, TR e bancos.csv locais atualizados a partir do BACEN.
+
+    Uso:
+        at = AtualizadorDados(snapshots=RepositorioSnapshots("dados/snapshots"))
+        at.executar_ciclo()          # atualiza as fontes vencidas
+        at.executar(parar)           # laço até `parar` (threading.Event) ser sinalizado
+        at.estado()["ipca"]          # {"ultima_atualizacao", "duracao_s", "ok", "erro", ...}
+    """
+
+    def __init__(self, caminho_ipca: str = os.path.join("dados", "txjuros", "IPCA_BACEN.csv"),
+                 caminho_tr: str = os.path.join("dados", "txjuros", "TR_mensal_compat.csv"),
+                 caminho_bancos: str = os.path.join("dados", "bancos.csv"),
+                 dir_series: str = os.path.join("dados", "series"),
+                 arquivo_estado: str = ARQUIVO_ESTADO,
+                 snapshots: Optional[RepositorioSnapshots] = None,
+                 cliente: Optional[ClienteSGS] = None,
+                 coletor_txjuros: Optional[ColetorTxJuros] = None,
+                 intervalos: Optional[Dict[str, float]] = None,
+                 prazo_s: Optional[float] = PRAZO_ATUALIZACAO_S,
+                 mes_bancos: Optional[str] = None):
+        self.caminhos = {"ipca": caminho_ipca, "tr": caminho_tr, "bancos": caminho_bancos}
+        self.repositorio = RepositorioSeries(dir_series)
+        self.arquivo_estado = arquivo_estado
+        self.snapshots = snapshots
+        self.cliente = cliente
+        self.coletor_txjuros = coletor_txjuros
+        self.intervalos = {**INTERVALOS_PADRAO, **(intervalos or {})}
+        self.prazo_s = prazo_s
+        self.mes_bancos = mes_bancos
+        self._lock = threading.Lock()
+        self._estado: Dict[str, dict] = ler_estado(arquivo_estado)
+
+    # ------------------------------ coleta ------------------------------ #
+    def _gravar_ipca(self, destino: str) -> int:
+        fim = _last_closed_month_yyyy_mm()
+        df = obter_ipca_df(data_inicial=f"01/{INICIO_SERIES[5:7]}/{INICIO_SERIES[:4]}",
+                           data_final=f"28/{fim[5:7]}/{fim[:4]}",
+                           cliente=self.cliente or ClienteSGS(), repositorio=self.repositorio)
+        _verificar_atual("ipca", df)
+        linhas = [CABECALHO_IPCA] + [f"{d[5:7]}/{d[:4]};{v:.2f}".replace(".", ",")
+                                     for d, v in zip(df["data"], df["ipca"])]
+
+        def _escrever(tmp):
+            with open(tmp, "w", encoding="latin-1", newline="") as f:
+                f.write("\n".join(linhas) + "\n")
+
+        trocar_atomico(destino, _escrever)
+        return len(df)
+
+    def _gravar_tr(self, destino: str) -> int:
+        coletor = ColetorTR(online=True, cliente=self.cliente, repositorio=self.repositorio)
+        df = coletor.coletar(INICIO_SERIES, _last_closed_month_yyyy_mm())
+        _verificar_atual("tr", df)
+        trocar_atomico(destino, lambda tmp: df[["data", "tr"]].to_csv(tmp, index=False, encoding="utf-8"))
+        return len(df)
+
+    def _gravar_bancos(self, destino: str) -> int:
+        linhas = {}
+
+        def _escrever(tmp):
+            gerar_bancos_csv_real(tmp, mes=self.mes_bancos, on_error="raise", verbose=False,
+                                  prazo_s=self.prazo_s, coletor=self.coletor_txjuros)
+            linhas["n"] = len(carregar_bancos_csv(tmp))  # valida antes da troca
+            _verificar_atual("bancos")
+
+        trocar_atomico(destino, _escrever)
+        return linhas["n"]
+
+    # ---------------------------- atualização ---------------------------- #
+    def atualizar(self, fonte: str) -> dict:
+        """Atualiza uma fonte agora (vencida ou não); retorna e grava o novo estado dela."""
+        if fonte not in FONTES:
+            raise ValueError(f"Fonte desconhecida: {fonte!r} (esperado: {', '.join(FONTES)})")
+        destino = self.caminhos[fonte]
+        gravar = {"ipca": self._gravar_ipca, "tr": self._gravar_tr, "bancos": self._gravar_bancos}[fonte]
+        inicio = datetime.now()
+        t0 = time.perf_counter()
+        with self._lock:
+            estado = dict(self._estado.get(fonte, {}))
+        estado["ultima_tentativa"] = inicio.isoformat(timespec="seconds")
+        try:
+            with orcamento(self.prazo_s):
+                linhas = gravar(destino)
+        except Exception as e:
+            estado.update(ok=False, erro=f"{type(e).__name__}: {e}", duracao_s=round(time.perf_counter() - t0, 3))
+            logger.warning("Atualização de %s falhou: %s", fonte, e)
+        else:
+            estado.update(ok=True, erro=None, linhas=linhas, ultima_atualizacao=estado["ultima_tentativa"],
+                          duracao_s=round(time.perf_counter() - t0, 3))
+            if self.snapshots is not None:
+                estado["snapshot"] = self.snapshots.snapshot_arquivo(fonte, destino, CARREGADORES_SNAPSHOT[fonte])
+            logger.info("%s atualizado: %d linha(s) em %.2fs", fonte, linhas, estado["duracao_s"])
+        with self._lock:
+            self._estado[fonte] = estado
+            _gravar_json(self.arquivo_estado, self._estado)
+        return estado
+
+    def estado(self) -> Dict[str, dict]:
+        """Cópia do estado por fonte (última atualização, duração, ok/erro, linhas, snapshot)."""
+        with self._lock:
+            return {f: dict(e) for f, e in self._estado.items()}
+
+    def proxima(self, fonte: str, agora: Optional[datetime] = None) -> datetime:
+        """Quando `fonte` vence: intervalo após o último sucesso, ou INTERVALO_FALHA_S após uma falha."""
+        e = self._estado.get(fonte)
+        if not e or not e.get("ultima_tentativa"):
+            return agora or datetime.now()
+        espera = self.intervalos[fonte] if e.get("ok") else INTERVALO_FALHA_S
+        return datetime.fromisoformat(e["ultima_tentativa"]) + timedelta(seconds=espera)
+
+    def pendentes(self, fontes: Iterable[str] = FONTES, agora: Optional[datetime] = None) -> list:
+        agora = agora or datetime.now()
+        return [f for f in fontes if self.proxima(f, agora) <= agora]
+
+    def executar_ciclo(self, fontes: Iterable[str] = FONTES, forcar: bool = False) -> Dict[str, dict]:
+        """Atualiza em paralelo as fontes vencidas (todas, com `forcar`); retorna {fonte: estado}."""
+        alvo = list(fontes) if forcar else self.pendentes(fontes)
+        if not alvo:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(alvo), thread_name_prefix="atualizador") as pool:
+            futuros = {f: pool.submit(self.atualizar, f) for f in alvo}
+            return {f: fut.result() for f, fut in futuros.items()}
+
+    def executar(self, parar: Optional[threading.Event] = None, fontes: Iterable[str] = FONTES,
+                 verificar_a_cada: float = 60.0) -> None:
+        """Laço do atualizador: um ciclo, espera até a próxima fonte vencer (no máximo `verificar_a_cada`)."""
+        parar = parar or threading.Event()
+        fontes = list(fontes)
+        while True:
+            self.executar_ciclo(fontes)
+            agora = datetime.now()
+            espera = min((self.proxima(f, agora) - agora).total_seconds() for f in fontes)
+            if parar.wait(min(max(espera, 1.0), verificar_a_cada)):
+                return
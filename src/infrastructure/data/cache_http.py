@@ -0,0 +1,296 @@
+"""
+Cache persistente de respostas HTTP (SGS e Olinda) com revalidação condicional.
+
+Respostas GET 200 são guardadas em disco por URL completa (parâmetros normalizados em
+ordem), com o corpo comprimido (gzip). Dentro do TTL do recurso a resposta sai do disco sem
+tocar a rede; depois dele, a requisição vai com If-None-Match / If-Modified-Since e um 304
+apenas renova a entrada. Séries mensais mudam no máximo uma vez por mês, então os TTLs
+padrão são de horas.
+
+O cache é plugado no pool compartilhado (`sessao_http.ativar_cache`), de modo que todos os
+coletores passam por ele sem mudança de código. O corpo nunca é montado inteiro em memória
+pelo cache: da rede, os blocos vão para o chamador e, comprimidos, para um temporário que só
+vira entrada quando a leitura chega ao fim; do disco, a resposta é servida com `raw`
+apontando para o arquivo gzip (`stream=True` continua lendo em blocos).
+
+Layout em disco:
+    <diretorio>/<aa>/<chave>.json    url, status, cabeçalhos, validadores, armazenado_em
+    <diretorio>/<aa>/<chave>.gz      corpo da resposta
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from infrastructure.data.escrita_atomica import GravacaoAtomica, gravar_atomico
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_CACHE = "dados/cache_http"
+TTL_PADRAO = 6 * 3600
+# trecho da URL -> TTL (segundos); o primeiro que aparecer na URL vale
+TTLS_PADRAO: Dict[str, float] = {
+    "bcdata.sgs": 12 * 3600,
+    "TaxasJurosMensalPorMes": 24 * 3600,
+    "TaxasJurosDiariaPorInicioPeriodo": 6 * 3600,
+}
+# cabeçalhos guardados junto com o corpo
+_CABECALHOS_GUARDADOS = ("content-type", "etag", "last-modified")
+# bloco lido do gzip quando o chamador não pede tamanho
+_BLOCO_LEITURA = 64 * 1024
+# resto de corpo que ainda é lido ao fechar uma resposta incompleta para completar a entrada
+# (leitores de JSON em streaming param no ']' e deixam só o '}' final para trás)
+_RESTO_MAXIMO = 64 * 1024
+
+
+def url_canonica(url: str) -> str:
+    """URL com os parâmetros em ordem (mesma consulta -> mesma chave)."""
+    p = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(p.query, keep_blank_values=True)))
+    return urlunsplit((p.scheme, p.netloc.lower(), p.path, query, ""))
+
+
+class _CorpoGuardado:
+    """`raw` de uma resposta servida do cache: lê o corpo do gzip em disco em blocos."""
+
+    def __init__(self, caminho: str):
+        self._arquivo = gzip.open(caminho, "rb")
+
+    def read(self, n: Optional[int] = None, **_) -> bytes:
+        if self._arquivo.closed:
+            return b""
+        dados = self._arquivo.read(_BLOCO_LEITURA if n is None or n < 0 else n)
+        if not dados:
+            self.close()
+        return dados
+
+    def close(self) -> None:
+        self._arquivo.close()
+
+
+class _CopiaParaCache:
+    """
+    `raw` de uma resposta 200 vinda da rede: repassa os blocos ao chamador e grava cada um,
+    comprimido, num temporário da entrada. Só quando o corpo chega ao fim o temporário vira a
+    entrada (corpo e depois metadados); leitura interrompida ou com erro é descartada.
+    """
+
+    def __init__(self, raw, cache: "CacheHTTP", url: str, headers):
+        self._raw = raw
+        self._cache, self._url, self._headers = cache, url, headers
+        self._gravacao: Optional[GravacaoAtomica] = GravacaoAtomica(cache._caminhos(url)[1])
+        self._gz = gzip.GzipFile(fileobj=self._gravacao.arquivo, mode="wb", compresslevel=6)
+
+    def __getattr__(self, nome):
+        return getattr(self._raw, nome)
+
+    def stream(self, n: int, decode_content: bool = True) -> Iterator[bytes]:
+        try:
+            for bloco in self._raw.stream(n, decode_content=decode_content):
+                if self._gravacao is not None:
+                    self._gz.write(bloco)
+                yield bloco
+        except GeneratorExit:  # o chamador parou de ler: completa se só faltava o fim
+            self._completar()
+            raise
+        except BaseException:
+            self._descartar()
+            raise
+        self._concluir()
+
+    def _completar(self) -> None:
+        """Lê o que ainda falta do corpo (até _RESTO_MAXIMO) e conclui a entrada; senão a descarta."""
+        try:
+            lidos = 0
+            while self._gravacao is not None and lidos <= _RESTO_MAXIMO:
+                bloco = self._raw.read(_BLOCO_LEITURA, decode_content=True)
+                if not bloco:
+                    self._concluir()
+                    break
+                self._gz.write(bloco)
+                lidos += len(bloco)
+        except Exception as e:  # corpo que não dá para completar só não vira entrada
+            logger.debug("Resposta de %s não guardada: %s", self._url, e)
+        finally:
+            self._descartar()
+
+    def _concluir(self) -> None:
+        if self._gravacao is None:
+            return
+        gravacao, self._gravacao = self._gravacao, None
+        try:
+            self._gz.close()
+        except BaseException:
+            gravacao.descartar()
+            raise
+        gravacao.concluir()
+        self._cache.gravar_metadados(self._url, self._headers)
+
+    def _descartar(self) -> None:
+        if self._gravacao is not None:
+            gravacao, self._gravacao = self._gravacao, None
+            gravacao.descartar()
+
+    def close(self) -> None:
+        try:
+            self._completar()
+        finally:
+            self._raw.close()
+
+
+class CacheHTTP:
+    """
+    Cache em disco de respostas GET, com TTL por recurso e contadores de uso.
+
+    Parâmetros:
+      diretorio: raiz do cache.
+      ttl_padrao: TTL (s) de URLs que não casam com nenhum trecho de `ttls`.
+      ttls: {trecho da URL: TTL em segundos} (padrão: TTLS_PADRAO).
+    """
+
+    def __init__(self, diretorio: str = DIRETORIO_CACHE, ttl_padrao: float = TTL_PADRAO,
+                 ttls: Optional[Dict[str, float]] = None):
+        self.diretorio = os.path.abspath(diretorio)
+        os.makedirs(self.diretorio, exist_ok=True)
+        self.ttl_padrao = ttl_padrao
+        self.ttls = dict(TTLS_PADRAO if ttls is None else ttls)
+        self._lock = threading.Lock()
+        self._contadores = {"acertos": 0, "falhas": 0, "revalidadas": 0, "gravadas": 0, "desatualizadas": 0}
+
+    # ----------------------------- contadores ---------------------------- #
+    def _contar(self, nome: str) -> None:
+        with self._lock:
+            self._contadores[nome] += 1
+
+    def estatisticas(self) -> Dict[str, int]:
+        """acertos (sem rede), revalidadas (304), falhas (foi à rede), gravadas e desatualizadas
+        (vencidas usadas porque o prazo da coleta acabou)."""
+        with self._lock:
+            return dict(self._contadores)
+
+    # ------------------------------- disco ------------------------------- #
+    def ttl(self, url: str) -> float:
+        for trecho, segundos in self.ttls.items():
+            if trecho in url:
+                return segundos
+        return self.ttl_padrao
+
+    def _caminhos(self, url: str) -> Tuple[str, str]:
+        chave = hashlib.sha256(url_canonica(url).encode("utf-8")).hexdigest()
+        base = os.path.join(self.diretorio, chave[:2], chave)
+        return base + ".json", base + ".gz"
+
+    def ler(self, url: str) -> Optional[Tuple[dict, _CorpoGuardado]]:
+        """(metadados, corpo aberto para leitura em blocos) da entrada de `url`, ou None se ausente/ilegível."""
+        p_meta, p_corpo = self._caminhos(url)
+        try:
+            with open(p_meta, encoding="utf-8") as f:
+                meta = json.load(f)
+            return meta, _CorpoGuardado(p_corpo)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Entrada de cache ilegível (%s): %s", p_meta, e)
+            return None
+
+    def gravar_metadados(self, url: str, headers) -> None:
+        """Grava os metadados (cabeçalhos relevantes) de uma entrada cujo corpo gzip já está em disco."""
+        meta = {
+            "url": url_canonica(url),
+            "headers": {k: headers[k] for k in _CABECALHOS_GUARDADOS if k in headers},
+            "armazenado_em": time.time(),
+        }
+        gravar_atomico(self._caminhos(url)[0], json.dumps(meta, sort_keys=True).encode("utf-8"))
+        self._contar("gravadas")
+
+    def renovar(self, url: str, meta: dict) -> None:
+        """Reinicia o TTL de uma entrada revalidada (304)."""
+        p_meta, _ = self._caminhos(url)
+        meta = {**meta, "armazenado_em": time.time()}
+        gravar_atomico(p_meta, json.dumps(meta, sort_keys=True).encode("utf-8"))
+
+    def fresca(self, url: str, meta: dict) -> bool:
+        return time.time() - float(meta.get("armazenado_em", 0)) < self.ttl(url)
+
+    def limpar(self) -> None:
+        """Apaga todas as entradas (os contadores continuam)."""
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    # ------------------------------ transporte --------------------------- #
+    @staticmethod
+    def _resposta(request: PreparedRequest, meta: dict, corpo: _CorpoGuardado) -> Response:
+        r = Response()
+        r.status_code = 200
+        r.reason = "OK"
+        r.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        r.encoding = get_encoding_from_headers(r.headers)
+        r.raw = corpo
+        r.url = request.url
+        r.request = request
+        r.from_cache = True
+        return r
+
+    def guardada(self, request: PreparedRequest) -> Optional[Response]:
+        """
+        Resposta guardada para `request` qualquer que seja a idade (prazo da coleta esgotado);
+        `desatualizada` indica se o TTL já venceu. None se a URL nunca foi guardada.
+        """
+        entrada = self.ler(request.url)
+        if entrada is None:
+            return None
+        vencida = not self.fresca(request.url, entrada[0])
+        self._contar("desatualizadas" if vencida else "acertos")
+        r = self._resposta(request, *entrada)
+        r.desatualizada = vencida
+        return r
+
+    def enviar(self, request: PreparedRequest, enviar: Callable[[PreparedRequest], Response]) -> Response:
+        """
+        Atende `request` (GET) pelo cache: fresca -> disco; vencida -> requisição condicional
+        via `enviar` (304 renova, 200 regrava); ausente -> `enviar` e grava se 200.
+        """
+        url = request.url
+        entrada = self.ler(url)
+        if entrada is not None:
+            meta, corpo = entrada
+            if self.fresca(url, meta):
+                self._contar("acertos")
+                return self._resposta(request, meta, corpo)
+            validadores = meta.get("headers", {})
+            if "etag" in validadores:
+                request.headers["If-None-Match"] = validadores["etag"]
+            if "last-modified" in validadores:
+                request.headers["If-Modified-Since"] = validadores["last-modified"]
+
+        try:
+            resp = enviar(request)
+        except BaseException:
+            if entrada is not None:
+                entrada[1].close()
+            raise
+        if resp.status_code == 304 and entrada is not None:
+            resp.close()
+            self.renovar(url, entrada[0])
+            self._contar("revalidadas")
+            return self._resposta(request, *entrada)
+
+        if entrada is not None:
+            entrada[1].close()
+        self._contar("falhas")
+        if resp.status_code == 200:
+            # o corpo é gravado à medida que o chamador o lê (stream=True continua em blocos)
+            resp.raw = _CopiaParaCache(resp.raw, self, url, resp.headers)
+        return resp
@@ -3,6 +3,8 @@ from typing import Optional
 import re
 import pandas as pd
 
+from infrastructure.data.normalizacao import para_ano_mes, para_numero
+
 def carregar_ipca_bacen_csv(path_csv: Optional[str | Path]) -> pd.DataFrame:
     """
     Lê um CSV exportado do Bacen para IPCA e retorna DataFrame com colunas:
@@ -72,43 +74,12 @@ def carregar_ipca_bacen_csv(path_csv: Optional[str | Path]) -> pd.DataFrame:
     # 7) extrair e normalizar
     out = df[[date_col, value_col]].rename(columns={date_col: "data", value_col: "ipca"}).copy()
 
-    # 7a) normaliza data: aceita "MM/YYYY", "DD/MM/YYYY", "YYYY-MM"
-    out["data"] = out["data"].astype(str).str.strip()
-    def _to_yyyy_mm(s: str) -> Optional[str]:
-        s = (s or "").strip()
-        if re.match(r"^\d{2}/\d{4}$", s):   # MM/YYYY
-            mm, yyyy = s.split("/")
-            return f"{int(yyyy):04d}-{int(mm):02d}"
-        if re.match(r"^\d{1,2}/\d{1,2}/\d{4}$", s):  # DD/MM/YYYY
-            parts = s.split("/")
-            d, m, y = parts
-            return f"{int(y):04d}-{int(m):02d}"
-        if re.match(r"^\d{4}-\d{2}$", s):  # YYYY-MM
-            return s[:7]
-        if re.match(r"^\d{4}/\d{2}$", s):  # YYYY/MM
-            yyyy, mm = s.split("/")
-            return f"{int(yyyy):04d}-{int(mm):02d}"
-        # fallback: try parse with pandas
-        try:
-            dt = pd.to_datetime(s, dayfirst=True, errors="coerce")
-            if pd.isna(dt):
-                return None
-            return f"{dt.year:04d}-{dt.month:02d}"
-        except Exception:
-            return None
-
-    out["data"] = out["data"].map(_to_yyyy_mm)
+    # 7a) normaliza data: aceita "MM/YYYY", "DD/MM/YYYY", "YYYY-MM", "YYYY/MM" (detecção vetorizada)
+    out["data"] = para_ano_mes(out["data"])
     out = out.dropna(subset=["data"])
 
     # 7b) normaliza ipca numérico (',' -> '.', remove '%' e pontos de milhar)
-    out["ipca"] = (
-        out["ipca"].astype(str)
-                  .str.replace(".", "", regex=False)
-                  .str.replace(",", ".", regex=False)
-                  .str.replace("%", "", regex=False)
-                  .str.strip()
-    )
-    out["ipca"] = pd.to_numeric(out["ipca"], errors="coerce")
+    out["ipca"] = para_numero(out["ipca"], remover_milhar=True)
     out = out.dropna(subset=["ipca"]).reset_index(drop=True)
 
     # 8) Se IPCA veio em porcentagem (ex.: 1.86), converte p/ fração (0.0186)
@@ -1,7 +1,46 @@
+from io import StringIO
 from pathlib import Path
 from typing import Optional, Union
+import numpy as np
 import pandas as pd
 
+from infrastructure.data.normalizacao import componentes_data, para_numero, rotulos_ano_mes
+
+
+def _ler_csv_bacen(path: Path) -> pd.DataFrame:
+    """
+    Lê o CSV do Bacen (latin1, ';') com o engine C.
+
+    O rodapé "Fonte; ...", quando presente, é descartado antes do parse para que a coluna
+    de valores seja lida direto como float (decimal ',' e milhar '.').
+    """
+    txt = path.read_bytes().decode("latin1")
+    corpo, _, rodape = txt.rstrip().rpartition("\n")
+    if corpo and rodape.strip().lower().startswith("fonte"):
+        txt = corpo
+    return pd.read_csv(StringIO(txt), sep=";", decimal=",", thousands=".")
+
+
+def _ultimo_valor_por_mes(chave_mes: np.ndarray, dia: np.ndarray, valores: np.ndarray) -> pd.DataFrame:
+    """
+    Reduz a série diária ao ÚLTIMO valor de cada mês sem sort+groupby.
+
+    `chave_mes` = ano*12 + (mês-1). Se as datas não estiverem em ordem, aplica um único
+    argsort estável; o último elemento de cada mês é a posição em que a chave muda.
+    """
+    if len(chave_mes) == 0:
+        return pd.DataFrame({"data": pd.Series(dtype=str), "tr": pd.Series(dtype=float)})
+
+    ordem_dia = chave_mes * 32 + dia
+    if (np.diff(ordem_dia) < 0).any():
+        ordem = np.argsort(ordem_dia, kind="stable")
+        chave_mes = chave_mes[ordem]
+        valores = valores[ordem]
+
+    ultimos = np.flatnonzero(np.append(chave_mes[1:] != chave_mes[:-1], True))
+    return pd.DataFrame({"data": rotulos_ano_mes(chave_mes[ultimos]), "tr": valores[ultimos]})
+
+
 def carregar_tr_mensal(
     path_csv: Union[str, Path],
     data_col: Optional[str] = None,
@@ -14,11 +53,13 @@ def carregar_tr_mensal(
     """
     Lê TR diária exportada do Bacen e retorna uma tabela mensal (colunas: data [YYYY-MM], tr [float]).
     Estratégia:
-      - lê com encoding latin1 e separador ';' (formato padrão dos CSVs do Bacen);
+      - lê com encoding latin1 e separador ';' (formato padrão dos CSVs do Bacen), via engine C;
       - detecta automaticamente colunas de data e valor se não informadas;
-      - converte data para datetime (dayfirst=True), normaliza valores (','->'.', remove '%');
+      - converte data (dayfirst=True); o layout fixo "DD/MM/YYYY" do Bacen é reconhecido por
+        amostra e convertido numa única passada vetorizada; normaliza valores (','->'.', remove '%');
       - converte para FRAÇÃO se os valores vierem em porcentagem;
-      - agrupa por mês e usa o ÚLTIMO valor disponível no mês (prática adequada para TR mensal);
+      - usa o ÚLTIMO valor disponível no mês (prática adequada para TR mensal) por redução
+        baseada em índice (sem sort+groupby) — séries diárias de décadas saem em milissegundos;
       - opcionalmente reindexa para intervalo start..end e preenche (ffill) se fill_missing=True.
 
     Retorna DataFrame com colunas ['data','tr'] (data no formato "YYYY-MM").
@@ -28,7 +69,7 @@ def carregar_tr_mensal(
         raise FileNotFoundError(f"Arquivo não encontrado: {path}")
 
     # 1) leitura robusta
-    df = pd.read_csv(path, encoding="latin1", sep=";")
+    df = _ler_csv_bacen(path)
 
     # 2) detectar colunas
     cols = list(df.columns)
@@ -44,33 +85,23 @@ def carregar_tr_mensal(
             valor_col = cols[1] if len(cols) > 1 else cols[0]
 
     # 3) normalização básica
-    df = df[[data_col, valor_col]].rename(columns={data_col: "data_raw", valor_col: "tr_raw"}).copy()
-    # a data costuma vir em "DD/MM/YYYY" ou "MM/YYYY" — tentamos parse com dayfirst
-    df["data_dt"] = pd.to_datetime(df["data_raw"].astype(str).str.strip(), dayfirst=dayfirst, errors="coerce")
-    df = df.dropna(subset=["data_dt"]).reset_index(drop=True)
+    # a data costuma vir em "DD/MM/YYYY" ou "MM/YYYY" — caminho rápido para o layout do Bacen
+    ano, mes, dia, valido = componentes_data(df[data_col], dayfirst=dayfirst)
 
     # normaliza valores: "0,017" -> 0.017 ; "0,17%" -> 0.0017 (mais abaixo convertemos %->frac)
-    df["tr_clean"] = (
-        df["tr_raw"]
-        .astype(str)
-        .str.replace(".", "", regex=False)   # remove pontos de milhar (por precaução)
-        .str.replace(",", ".", regex=False)
-        .str.replace("%", "", regex=False)
-        .str.strip()
-    )
-    df["tr"] = pd.to_numeric(df["tr_clean"], errors="coerce")
-    df = df.dropna(subset=["tr"]).reset_index(drop=True)
+    valores = para_numero(df[valor_col], remover_milhar=True).to_numpy(dtype=float)
+    valido &= ~np.isnan(valores)
+    chave_mes = (ano * 12 + mes - 1)[valido]
+    dia = dia[valido]
+    valores = valores[valido]
 
     # 4) Se estiver em porcentagem (mediana > 1), converte para fração
-    med = df["tr"].abs().median()
+    med = np.median(np.abs(valores)) if len(valores) else np.nan
     if pd.notna(med) and med > 0.02:
-        df["tr"] = df["tr"] / 100.0
+        valores = valores / 100.0
 
-    # 5) agrega por mês: usar o ÚLTIMO valor do mês (DataTime -> Period M)
-    df["ano_mes"] = df["data_dt"].dt.to_period("M").astype(str)  # "YYYY-MM"
-    # ordenar por data e pegar último do mês
-    df = df.sort_values(["ano_mes", "data_dt"])
-    mensal = df.groupby("ano_mes", as_index=False).agg({"tr": "last"}).rename(columns={"ano_mes": "data"})
+    # 5) agrega por mês: usar o ÚLTIMO valor do mês (índice de troca de mês)
+    mensal = _ultimo_valor_por_mes(chave_mes, dia, valores)
 
     # 6) opcional: reindexar para um intervalo contínuo start..end e preencher
     if start is not None or end is not None:
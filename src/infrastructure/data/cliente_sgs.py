@@ -0,0 +1,353 @@
+"""
+Cliente concorrente para séries mensais do SGS/BACEN (IPCA 433, TR 226, ...).
+
+Cada série é buscada por várias estratégias (intervalo e /ultimos/N; JSON e CSV) disparadas
+em paralelo num pool de threads, com um pequeno escalonamento entre elas (requisições
+"hedged"): a primeira resposta que cobre todo o período (até o último mês já publicável)
+vence e as demais tentativas são canceladas — as que ainda não começaram não chegam a sair,
+e as que estão baixando o corpo param no próximo bloco. O dump completo da série, caro, é
+reserva: só sai se nenhuma das estratégias baratas trouxer dados. Se nenhuma cobrir o
+período inteiro, vale a de maior prioridade que trouxe dados.
+
+Várias séries podem ser buscadas ao mesmo tempo (`buscar_series`); o resultado é sempre um
+DataFrame normalizado com `data` ("YYYY-MM") e `valor` (float, unidade publicada pelo SGS).
+
+Com um RepositorioSeries local, `buscar_incremental` pede ao SGS só os meses posteriores ao
+último já guardado (e nem faz a requisição se nenhum mês novo pode ter sido publicado).
+
+Dentro de um `prazo.orcamento(...)`, a corrida termina no prazo; dado vindo do cache vencido
+ou do repositório (por falta de tempo ou falha do SGS) sai com `df.attrs["desatualizado"] = True`.
+"""
+from __future__ import annotations
+
+import calendar
+import io
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from infrastructure.data.leitura_json import ler_dataframe
+from infrastructure.data.normalizacao import para_ano_mes, para_numero
+from infrastructure.data.prazo import PrazoEsgotado, marcar_desatualizado, prazo_atual, submeter
+from infrastructure.data.sessao_http import obter_sessao
+
+logger = logging.getLogger(__name__)
+
+URL_BASE_SGS = "https://api.bcb.gov.br"
+SGS_IPCA = 433
+SGS_TR = 226
+# Publicação: o dado do mês M sai em M + defasagem, a partir do dia indicado
+# (IPCA de M no início de M+1, por volta do dia 10; TR mensal já no início de M)
+PUBLICACAO: Dict[int, Tuple[int, int]] = {SGS_IPCA: (1, 12), SGS_TR: (0, 1)}
+# Intervalo entre o disparo de uma estratégia e a seguinte (0 = todas de uma vez)
+ATRASO_HEDGE = 0.25
+# Tamanho dos blocos lidos do corpo da resposta (checa cancelamento entre blocos)
+_BLOCO = 64 * 1024
+# Folga além do prazo para as tentativas em voo devolverem (com timeouts já limitados a ele)
+_FOLGA_PRAZO = 0.5
+
+
+class ErroSGS(RuntimeError):
+    """Nenhuma estratégia de coleta do SGS retornou dados."""
+
+
+class _Cancelada(Exception):
+    """Tentativa interrompida porque outra já venceu."""
+
+
+@dataclass(frozen=True)
+class Tentativa:
+    """
+    Uma estratégia de coleta: caminho relativo à série, parâmetros e formato da resposta.
+    Estratégias de `reserva` só são disparadas depois que as demais falharam.
+    """
+    nome: str
+    caminho: str
+    params: Dict[str, str] = field(default_factory=dict)
+    formato: str = "json"
+    reserva: bool = False
+
+
+def _meses(inicio: str, fim: str) -> int:
+    ai, mi = int(inicio[:4]), int(inicio[5:7])
+    af, mf = int(fim[:4]), int(fim[5:7])
+    return (af - ai) * 12 + (mf - mi) + 1
+
+
+def _somar_meses(ano_mes: str, k: int) -> str:
+    n = int(ano_mes[:4]) * 12 + int(ano_mes[5:7]) - 1 + k
+    return f"{n // 12:04d}-{n % 12 + 1:02d}"
+
+
+def ultimo_mes_publicado(serie: int, hoje: Optional[date] = None) -> Optional[str]:
+    """Último mês ("YYYY-MM") que já pode ter sido publicado para `serie`; None se desconhecido."""
+    if int(serie) not in PUBLICACAO:
+        return None
+    defasagem, dia = PUBLICACAO[int(serie)]
+    hoje = hoje or date.today()
+    return _somar_meses(f"{hoje.year:04d}-{hoje.month:02d}", -defasagem - (1 if hoje.day < dia else 0))
+
+
+def tentativas_padrao(inicio: str, fim: str) -> List[Tentativa]:
+    """
+    Estratégias em ordem de prioridade (mesma sequência de fallbacks do ColetorTR original):
+    intervalo, /ultimos/N e dump completo (reserva), cada uma em JSON e CSV.
+    """
+    ultimo_dia = calendar.monthrange(int(fim[:4]), int(fim[5:7]))[1]
+    intervalo = {
+        "dataInicial": f"01/{inicio[5:7]}/{inicio[:4]}",
+        "dataFinal": f"{ultimo_dia:02d}/{fim[5:7]}/{fim[:4]}",  # último dia real do mês (31/09 é inválido)
+    }
+    n = _meses(inicio, fim)
+    out = []
+    for nome, caminho, params, reserva in (
+        ("intervalo", "dados", intervalo, False),
+        ("ultimos", f"dados/ultimos/{n}", {}, False),
+        ("completo", "dados", {}, True),
+    ):
+        for formato in ("json", "csv"):
+            out.append(Tentativa(f"{nome}_{formato}", caminho, {**params, "formato": formato}, formato, reserva))
+    return out
+
+
+def normalizar_sgs(raw: pd.DataFrame) -> pd.DataFrame:
+    """Payload SGS (data 'DD/MM/YYYY' ou 'MM/YYYY', valor '0,45') -> data 'YYYY-MM', valor float."""
+    if raw is None or raw.empty or not {"data", "valor"}.issubset(raw.columns):
+        return pd.DataFrame({"data": pd.Series(dtype=str), "valor": pd.Series(dtype=float)})
+    out = pd.DataFrame({"data": para_ano_mes(raw["data"]), "valor": para_numero(raw["valor"])})
+    return out.dropna().drop_duplicates(subset="data", keep="last").sort_values("data").reset_index(drop=True)
+
+
+class ClienteSGS:
+    """
+    Busca séries do SGS com estratégias concorrentes.
+
+    Parâmetros:
+      url_base: raiz da API (troque por um servidor local nos testes).
+      session: sessão `requests` (padrão: a sessão compartilhada de sessao_http, sem retry de
+               transporte — os fallbacks concorrentes já fazem esse papel).
+      max_workers: threads do pool (compartilhado entre séries e estratégias).
+      timeout: (connect, read) por requisição.
+      atraso_hedge: segundos entre o disparo de estratégias consecutivas da mesma série.
+    """
+
+    def __init__(self, url_base: str = URL_BASE_SGS, session=None, max_workers: int = 8,
+                 timeout: Tuple[float, float] = (5, 10), atraso_hedge: float = ATRASO_HEDGE):
+        self.url_base = url_base.rstrip("/")
+        self.max_workers = max_workers
+        self.session = session or obter_sessao(retentar=False)
+        self.timeout = timeout
+        self.atraso_hedge = atraso_hedge
+
+    def _url(self, serie: int, caminho: str) -> str:
+        return f"{self.url_base}/dados/serie/bcdata.sgs.{int(serie)}/{caminho}"
+
+    def _executar(self, serie: int, t: Tentativa, atraso: float, cancelado: threading.Event) -> pd.DataFrame:
+        """Executa uma tentativa; aborta se `cancelado` for sinalizado antes ou durante o download."""
+        if cancelado.wait(atraso):
+            raise _Cancelada()
+        with self.session.get(self._url(serie, t.caminho), params=t.params,
+                              timeout=self.timeout, stream=True) as r:
+            r.raise_for_status()
+            blocos = self._blocos(r, cancelado)
+            if t.formato == "csv":
+                raw = pd.read_csv(io.BytesIO(b"".join(blocos)), sep=";", dtype=str)
+                raw.columns = [c.strip().strip('"').lower() for c in raw.columns]
+            else:
+                # array JSON decodificado em streaming direto para colunas
+                raw = ler_dataframe(blocos)
+            desatualizado = getattr(r, "desatualizada", False)
+        df = normalizar_sgs(raw)
+        df.attrs["desatualizado"] = desatualizado
+        return df
+
+    @staticmethod
+    def _blocos(r, cancelado: threading.Event):
+        for bloco in r.iter_content(_BLOCO):
+            if cancelado.is_set():
+                raise _Cancelada()
+            yield bloco
+
+    def _corrida(self, pool: ThreadPoolExecutor, serie: int, inicio: str, fim: str,
+                 tentativas: List[Tentativa]) -> pd.DataFrame:
+        cancelado = threading.Event()
+        futuros: Dict[Future, int] = {}
+
+        def _disparar(indices: List[int]) -> set:
+            novos = {
+                submeter(pool, self._executar, serie, tentativas[i], k * self.atraso_hedge, cancelado): i
+                for k, i in enumerate(indices)
+            }
+            futuros.update(novos)
+            return set(novos)
+
+        reservas = [i for i, t in enumerate(tentativas) if t.reserva]
+        baratas = [i for i, t in enumerate(tentativas) if not t.reserva]
+        if not baratas:
+            baratas, reservas = reservas, []
+        pendentes = _disparar(baratas)
+
+        prazo = prazo_atual()
+        # meses ainda não publicados não contam: a janela termina no último publicável
+        publicado = ultimo_mes_publicado(serie)
+        esperado = _meses(inicio, min(fim, publicado) if publicado and publicado >= inicio else fim)
+        parciais: Dict[int, pd.DataFrame] = {}
+        erros: List[str] = []
+        sem_tempo = False
+        try:
+            while pendentes:
+                espera = None if prazo is None else prazo.restante() + _FOLGA_PRAZO
+                prontos, pendentes = wait(pendentes, timeout=espera, return_when=FIRST_COMPLETED)
+                if not prontos:
+                    erros.append(f"prazo de {prazo.segundos:.1f}s esgotado")
+                    sem_tempo = True
+                    break
+                for fut in prontos:
+                    i = futuros[fut]
+                    try:
+                        df = fut.result()
+                    except _Cancelada:
+                        continue
+                    except PrazoEsgotado as e:
+                        erros.append(f"{tentativas[i].nome}: {e}")
+                        sem_tempo = True
+                        continue
+                    except Exception as e:  # falha de rede/HTTP/parse: tenta as demais
+                        erros.append(f"{tentativas[i].nome}: {e}")
+                        continue
+                    desatualizado = df.attrs.get("desatualizado", False)
+                    df = df[(df["data"] >= inicio) & (df["data"] <= fim)].reset_index(drop=True)
+                    df.attrs["desatualizado"] = desatualizado
+                    if len(df) >= esperado:
+                        logger.debug("SGS %s: '%s' venceu (%d meses)", serie, tentativas[i].nome, len(df))
+                        return df
+                    if not df.empty:
+                        parciais[i] = df
+                if not pendentes and reservas and not parciais and not sem_tempo:
+                    logger.debug("SGS %s: estratégias baratas falharam; disparando o dump completo", serie)
+                    pendentes = _disparar(reservas)
+                    reservas = []
+        finally:
+            cancelado.set()
+            for fut in futuros:
+                fut.cancel()
+        if parciais:
+            melhor = min(parciais)
+            logger.debug("SGS %s: período incompleto; usando '%s'", serie, tentativas[melhor].nome)
+            return parciais[melhor]
+        if sem_tempo or (prazo is not None and prazo.esgotado()):
+            raise PrazoEsgotado(f"SGS {serie}: prazo esgotado sem dado guardado ({'; '.join(erros)})")
+        raise ErroSGS(f"Falha ao obter série SGS {serie}: todas as estratégias falharam ({'; '.join(erros)})")
+
+    def buscar_serie(self, serie: int, inicio: str, fim: str,
+                     tentativas: Optional[List[Tentativa]] = None) -> pd.DataFrame:
+        """Série `serie` entre `inicio` e `fim` ("YYYY-MM"), colunas data/valor."""
+        return self.buscar_series({str(serie): serie}, inicio, fim, tentativas)[str(serie)]
+
+    def buscar_series(self, series: Dict[str, int], inicio: str, fim: str,
+                      tentativas: Optional[List[Tentativa]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Busca várias séries ao mesmo tempo ({nome: código SGS}); retorna {nome: DataFrame}.
+        Levanta ErroSGS se alguma série não puder ser obtida.
+        """
+        inicio, fim = str(inicio)[:7], str(fim)[:7]
+        if inicio > fim:
+            raise ValueError("Intervalo inválido: inicio > fim.")
+        tentativas = tentativas or tentativas_padrao(inicio, fim)
+        # uma thread coordena cada série e as demais executam as tentativas (sem risco de
+        # deadlock: sempre há thread livre para todas as tentativas de todas as séries)
+        n_threads = max(self.max_workers, len(series) * (len(tentativas) + 1))
+        pool = ThreadPoolExecutor(max_workers=n_threads, thread_name_prefix="sgs")
+        try:
+            corridas = {
+                nome: submeter(pool, self._corrida, pool, serie, inicio, fim, tentativas)
+                for nome, serie in series.items()
+            }
+            return {nome: fut.result() for nome, fut in corridas.items()}
+        finally:
+            # não espera perdedoras presas aguardando cabeçalhos: terminam em segundo plano
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def buscar_incremental(self, serie: int, inicio: str, fim: str, repositorio, nome: str,
+                           hoje: Optional[date] = None) -> pd.DataFrame:
+        """
+        Como `buscar_serie`, mas usando o RepositorioSeries `repositorio` (série `nome`, na
+        unidade do SGS) como base: só os meses após o último guardado são pedidos ao SGS
+        (`dataInicial` = último + 1), anexados ao repositório e combinados com o histórico.
+        Se o repositório já cobre o período até o último mês publicável, não há requisição;
+        se o prazo da coleta acabar ou o SGS não trouxer os meses esperados, o histórico guardado
+        é usado (marcado como desatualizado).
+        """
+        inicio, fim = str(inicio)[:7], str(fim)[:7]
+        if inicio > fim:
+            raise ValueError("Intervalo inválido: inicio > fim.")
+        ultimo = repositorio.ultimo_mes(nome)
+        primeiro = repositorio.primeiro_mes(nome)
+        if ultimo is None:
+            df = self.buscar_serie(serie, inicio, fim)
+            repositorio.anexar(nome, df)
+            return df
+        if primeiro > inicio:
+            # histórico não alcança o início: busca do início até o fim do guardado (ou de `fim`)
+            # e reescreve a série, para a próxima chamada já sair do repositório
+            df = self.buscar_serie(serie, inicio, max(fim, ultimo))
+            if not df.empty and df["data"].iloc[0] < primeiro and df["data"].iloc[-1] >= ultimo:
+                repositorio.substituir(nome, df)
+            else:  # resposta parcial: não encolhe o histórico, só acrescenta o que é novo
+                repositorio.anexar(nome, df)
+            desatualizado = df.attrs.get("desatualizado", False)
+            df = df[df["data"] <= fim].reset_index(drop=True)
+            df.attrs["desatualizado"] = desatualizado
+            return df
+
+        publicado = ultimo_mes_publicado(serie, hoje)
+        alvo = min(fim, publicado) if publicado else fim
+        desatualizado = False
+        if ultimo < alvo:
+            desde = _somar_meses(ultimo, 1)
+            try:
+                novos = self.buscar_serie(serie, desde, alvo)
+            except PrazoEsgotado as e:  # sem tempo: o histórico guardado é o dado mais recente
+                logger.warning("%s; usando o repositório até %s", e, ultimo)
+                marcar_desatualizado(f"SGS {serie} (repositório até {ultimo})")
+                desatualizado = True
+            except ErroSGS as e:  # mês publicável ainda não divulgado (ou SGS fora): segue com o histórico
+                logger.warning("SGS %s: nada novo desde %s (%s)", serie, ultimo, e)
+                marcar_desatualizado(f"SGS {serie} (repositório até {ultimo})")
+                desatualizado = True
+            else:
+                repositorio.anexar(nome, novos)
+                desatualizado = novos.attrs.get("desatualizado", False)
+        else:
+            logger.debug("SGS %s: repositório em dia até %s; sem requisição", serie, ultimo)
+        df = repositorio.ler(nome, desde=inicio)
+        df = df[df["data"] <= fim].reset_index(drop=True)
+        df.attrs["desatualizado"] = desatualizado
+        return df
+
+
+def tr_para_fracao(df: pd.DataFrame) -> pd.DataFrame:
+    """data/valor da TR (SGS publica em % a.m.) -> data/tr em fração (regra da mediana do projeto)."""
+    out = df.rename(columns={"valor": "tr"})[["data", "tr"]].copy()
+    med = out["tr"].abs().median()
+    if pd.notna(med) and med > 1.0:
+        out["tr"] = out["tr"] / 100.0
+    return out
+
+
+def coletar_ipca_tr(inicio: str, fim: str, cliente: Optional[ClienteSGS] = None) -> Dict[str, pd.DataFrame]:
+    """
+    IPCA (433, em %) e TR (226, no formato do ColetorTR) em paralelo.
+    Retorna {"ipca": DataFrame(data, ipca), "tr": DataFrame(data, tr)}.
+    """
+    cliente = cliente or ClienteSGS()
+    dfs = cliente.buscar_series({"ipca": SGS_IPCA, "tr": SGS_TR}, inicio, fim)
+    return {
+        "ipca": dfs["ipca"].rename(columns={"valor": "ipca"}),
+        "tr": tr_para_fracao(dfs["tr"]),
+    }
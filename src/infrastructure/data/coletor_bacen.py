@@ -1,6 +1,7 @@
 """
 Coletor de dados do IPCA (SGS/BACEN), série 433.
-- Tenta `bcdata`; fallback via `requests`.
+- Tenta `bcdata`; fallback via ClienteSGS (estratégias concorrentes, ver cliente_sgs).
+- Com `repositorio` (RepositorioSeries), busca só os meses após o último guardado em "ipca".
 - Retorna DataFrame com colunas: `data` (YYYY-MM) e `ipca` (percentual mensal, ex.: 0.45 para 0,45%).
 Observação: a convenção do projeto é armazenar `%` e converter para fração apenas no consumo (TabelaIPCA.get_ipca).
 """
@@ -10,6 +11,10 @@ from datetime import date, timedelta
 from typing import Optional
 import pandas as pd
 
+from infrastructure.data.cliente_sgs import ClienteSGS
+from infrastructure.data.normalizacao import para_ano_mes, para_numero
+from infrastructure.data.repositorio_series import RepositorioSeries
+
 SGS_IPCA_SERIE = 433
 MESES_HISTORICO = 24
 
@@ -23,7 +28,9 @@ def _periodo_padrao(meses: int = MESES_HISTORICO) -> tuple[str, str]:
 def obter_ipca_df(meses: int = MESES_HISTORICO,
                   data_inicial: Optional[str] = None,
                   data_final: Optional[str] = None,
-                   fixture_csv_path: Optional[str] = None) -> pd.DataFrame:
+                   fixture_csv_path: Optional[str] = None,
+                  cliente: Optional[ClienteSGS] = None,
+                  repositorio: Optional[RepositorioSeries] = None) -> pd.DataFrame:
     # 0) se forneceu fixture offline, lê e normaliza
     if fixture_csv_path is not None:
         df = pd.read_csv(fixture_csv_path)
@@ -34,7 +41,9 @@ def obter_ipca_df(meses: int = MESES_HISTORICO,
     if di is None or df is None:
         di, df = _periodo_padrao(meses)
 
-    # 2) Tenta bcdata
+    # 2) Tenta bcdata (a menos que um cliente SGS explícito ou um repositório tenha sido passado)
+    if cliente is not None or repositorio is not None:
+        return _obter_ipca_via_requests(SGS_IPCA_SERIE, di, df, cliente, repositorio)
     try:
         from bcdata import sgs as _sgs  # type: ignore
         raw = _sgs.get({str(SGS_IPCA_SERIE): SGS_IPCA_SERIE}, start=di, end=df)
@@ -52,30 +61,28 @@ def obter_ipca_df(meses: int = MESES_HISTORICO,
     # 3) Fallback requests
     return _obter_ipca_via_requests(SGS_IPCA_SERIE, di, df)
 
-def _obter_ipca_via_requests(serie: int, data_inicial: str, data_final: str) -> pd.DataFrame:
-    import requests
-    url = f"https://api.bcb.gov.br/dados/serie/bcdata.sgs.{serie}/dados"
-    params = {"formato": "json", "dataInicial": data_inicial, "dataFinal": data_final}
-    r = requests.get(url, params=params, timeout=30)
-    r.raise_for_status()
-    dados = r.json()  # [{'data':'MM/YYYY','valor':'0,45'}, ...]
-    df = pd.DataFrame(dados).rename(columns={"valor":"ipca"})
-    return _normalizar_df(df)
+def _obter_ipca_via_requests(serie: int, data_inicial: str, data_final: str,
+                             cliente: Optional[ClienteSGS] = None,
+                             repositorio: Optional[RepositorioSeries] = None) -> pd.DataFrame:
+    # datas 'DD/MM/YYYY' -> período 'YYYY-MM'; fallbacks do SGS correm em paralelo no cliente
+    inicio = f"{data_inicial[6:10]}-{data_inicial[3:5]}"
+    fim = f"{data_final[6:10]}-{data_final[3:5]}"
+    cliente = cliente or ClienteSGS()
+    if repositorio is not None:
+        dados = cliente.buscar_incremental(serie, inicio, fim, repositorio, "ipca")
+    else:
+        dados = cliente.buscar_serie(serie, inicio, fim)
+    out = _normalizar_df(dados.rename(columns={"valor": "ipca"}))
+    # dado do cache/repositório por prazo esgotado (ver prazo.orcamento)
+    out.attrs["desatualizado"] = dados.attrs.get("desatualizado", False)
+    return out
 
 def _normalizar_df(df: pd.DataFrame) -> pd.DataFrame:
     out = df.copy()
-    def norm_data(x: str) -> str:
-        x = str(x).strip()
-        if "/" in x and len(x) == 7:  # 'MM/YYYY'
-            m, y = x.split("/")
-            return f"{y}-{int(m):02d}"
-        if "-" in x:
-            return x[:7]
-        return x
-    def to_float(v) -> float:
-        return float(str(v).replace(",", ".").strip())
-    out["data"] = out["data"].map(norm_data)
-    out["ipca"] = out["ipca"].map(to_float)
+    # 'MM/YYYY' (SGS) ou 'YYYY-MM[-DD]' -> 'YYYY-MM'; valores fora dos layouts são mantidos como vieram
+    data = out["data"].astype(str).str.strip()
+    out["data"] = para_ano_mes(data).fillna(data)
+    out["ipca"] = para_numero(out["ipca"], remover=())
     out = out.dropna(subset=["ipca"]).sort_values("data").reset_index(drop=True)
     return out[["data","ipca"]]
 
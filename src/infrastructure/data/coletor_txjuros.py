@@ -15,8 +15,13 @@ Saídas (DataFrame harmonizado):
 
 Heurísticas:
 - Autodetecta nomes de campos usando padrões (case-insensitive) p/ funcionar mesmo com pequenas variações.
-- Tenta JSON, se falhar tenta CSV. Requisições com retries + backoff.
-- Se não conseguir aplicar $filter, traz página(s) e filtra do lado do cliente.
+- Tenta JSON, se falhar tenta CSV. Requisições pela sessão compartilhada (sessao_http): conexões
+  keep-alive reaproveitadas e retries + backoff unificados.
+- Se não conseguir aplicar $filter, traz página(s) em paralelo ($count ou sondagem) e filtra do lado do cliente.
+- $select só com os campos usados (instituição, modalidade, segmento, período e taxa), quando o
+  recurso aceita; várias modalidades numa consulta só ($filter com `or`), separadas no cliente.
+- Dentro de um `prazo.orcamento(...)`, PrazoEsgotado não é tratado como "tente o próximo dialeto":
+  sobe direto; resposta vinda do cache vencido sai com `meta["desatualizado"] = True`.
 
 Obs:
 - Os códigos de modalidade mencionados no projeto (ex.: 903101, 905101, 903201, 905201, 903203, 905203)
@@ -27,48 +32,67 @@ Obs:
 from __future__ import annotations
 
 import io
+import json
+import logging
 import math
-import time
-import random
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import pandas as pd
 
+try:
+    from .escrita_atomica import gravar_atomico
+    from .leitura_json import ler_dataframe
+    from .prazo import PrazoEsgotado, submeter
+    from .sessao_http import cache_ativo, esperar_backoff, obter_sessao
+except ImportError:  # executado direto (PYTHONPATH=src)
+    from infrastructure.data.escrita_atomica import gravar_atomico  # type: ignore
+    from infrastructure.data.leitura_json import ler_dataframe  # type: ignore
+    from infrastructure.data.prazo import PrazoEsgotado, submeter  # type: ignore
+    from infrastructure.data.sessao_http import cache_ativo, esperar_backoff, obter_sessao  # type: ignore
+
 
 # ---------------------------- Configuração base ---------------------------- #
 
 OLINDA_BASE = "https://olinda.bcb.gov.br/olinda/servico/taxaJuros/versao/v2/odata"
 RECURSO_MENSAL = "TaxasJurosMensalPorMes"
 RECURSO_DIARIO = "TaxasJurosDiariaPorInicioPeriodo"
+# páginas ($top/$skip) buscadas ao mesmo tempo em _paged_collect
+MAX_PAGINAS_PARALELAS = 4
+# blocos lidos por vez do corpo JSON (streaming)
+_BLOCO_JSON = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+# Dialetos de $filter por recurso, na ordem padrão de tentativa ({mes} = "YYYY-MM")
+DIALETOS_MENSAL = [
+    "Mes eq '{mes}'",
+    "MesReferencia eq '{mes}'",  # alguns datasets usam MesReferencia
+    "Mes eq '{mes}-01'",
+    "MesReferencia eq '{mes}-01'",
+]
+DIALETOS_DIARIO = [
+    "InicioPeriodo eq '{inicio}'",
+    "Data eq '{inicio}'",
+]
+# "dialeto" da paginação com filtro no cliente (último recurso)
+PAGINAR = "$paginar"
+ARQUIVO_DIALETOS = "dialetos_odata.json"
+ARQUIVO_PROJECOES = "projecoes_odata.json"
+
+# Modalidades PF de financiamento imobiliário (pré, pós TR, pós IPCA × mercado/reguladas)
+MODALIDADES_IMOBILIARIO = (903101, 905101, 903201, 905201, 903203, 905203)
+# Campos projetados via $select (+ o campo de período do dialeto em uso)
+CAMPOS_SELECT = ("InstituicaoFinanceira", "CodigoModalidade", "CodigoSegmento", "TaxaJurosAoAno")
 
 
 # ------------------------------ HTTP / Retries ----------------------------- #
 
-def _make_session():
-    import requests
-    from urllib3.util.retry import Retry
-    from requests.adapters import HTTPAdapter
-
-    s = requests.Session()
-    retries = Retry(
-        total=5, connect=5, read=5,
-        backoff_factor=0.6,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=("GET",),
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retries)
-    s.mount("https://", adapter)
-    s.headers.update({
-        "Accept": "application/json",
-        "User-Agent": "SAD-FI/1.0 (coletor_txjuros)",
-    })
-    return s
-
-
 def _sleep_backoff(attempt: int, base: float = 0.7):
-    time.sleep(base * (2 ** (attempt - 1)) * (1 + random.random() * 0.4))
+    esperar_backoff(attempt, base)
 
 
 # ------------------------------ Utilidades --------------------------------- #
@@ -99,6 +123,148 @@ def _coerce_percent_to_fraction(x: pd.Series) -> pd.Series:
     return s
 
 
+class _MemoriaOData:
+    """
+    Memória por chave (URL base + recurso) do que já se descobriu sobre o servidor OData.
+
+    Cada subclasse tem a sua memória (compartilhada no processo) e, com `diretorio`, o seu
+    arquivo `<diretorio>/<ARQUIVO>`, para que execuções seguintes já comecem pela consulta
+    que funciona.
+    """
+
+    ARQUIVO = ""
+    _memoria: Dict[str, object] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, diretorio: Optional[str] = None):
+        self.caminho = os.path.join(diretorio, self.ARQUIVO) if diretorio else None
+        if self.caminho and os.path.exists(self.caminho):
+            try:
+                with open(self.caminho, encoding="utf-8") as f:
+                    salvos = json.load(f)
+                with self._lock:
+                    for chave, valor in salvos.items():
+                        self._memoria.setdefault(chave, valor)
+            except (OSError, ValueError) as e:
+                logger.warning("Memória OData ilegível (%s): %s", self.caminho, e)
+
+    def obter(self, chave: str):
+        with self._lock:
+            return self._memoria.get(chave)
+
+    def registrar(self, chave: str, valor) -> None:
+        with self._lock:
+            if self._memoria.get(chave) == valor:
+                return
+            self._memoria[chave] = valor
+            conteudo = json.dumps(self._memoria, indent=2, sort_keys=True)
+        logger.info("OData %s: %r", chave, valor)
+        self._persistir(conteudo)
+
+    def _persistir(self, conteudo: str) -> None:
+        if self.caminho:
+            try:
+                gravar_atomico(self.caminho, conteudo)
+            except OSError as e:  # só uma otimização: não derruba a coleta que já deu certo
+                logger.warning("Não foi possível gravar a memória OData (%s): %s", self.caminho, e)
+
+    @classmethod
+    def esquecer(cls) -> None:
+        """Limpa a memória do processo (o arquivo persistido não é tocado)."""
+        with cls._lock:
+            cls._memoria.clear()
+
+
+class DialetosOData(_MemoriaOData):
+    """Dialeto de $filter que funcionou por último em cada recurso."""
+
+    ARQUIVO = ARQUIVO_DIALETOS
+    _memoria: Dict[str, str] = {}
+    _lock = threading.Lock()
+
+    def ordenar(self, chave: str, dialetos: List[str]) -> List[str]:
+        """`dialetos` com o último que funcionou (se houver) na frente."""
+        conhecido = self.obter(chave)
+        if conhecido in dialetos:
+            return [conhecido] + [d for d in dialetos if d != conhecido]
+        return list(dialetos)
+
+
+class ProjecoesOData(_MemoriaOData):
+    """
+    Se o recurso aceita a projeção `$select` dada: chave `<URL base>/<recurso>`, depois o
+    `$select`, valor True/False. Separado dos dialetos, que guardam só expressões de $filter.
+    """
+
+    ARQUIVO = ARQUIVO_PROJECOES
+    _memoria: Dict[str, Dict[str, bool]] = {}
+    _lock = threading.Lock()
+
+    def aceita(self, recurso: str, select: str) -> Optional[bool]:
+        """True/False se já se sabe se `recurso` aceita `select`; None se nunca foi sondado."""
+        return (self.obter(recurso) or {}).get(select)
+
+    def registrar_aceite(self, recurso: str, select: str, aceita: bool) -> None:
+        with self._lock:
+            conhecidas = self._memoria.setdefault(recurso, {})
+            if conhecidas.get(select) == aceita:
+                return
+            conhecidas[select] = aceita
+            conteudo = json.dumps(self._memoria, indent=2, sort_keys=True)
+        logger.info("OData %s: $select=%s %s", recurso, select, "aceito" if aceita else "recusado")
+        self._persistir(conteudo)
+
+
+def _campo_periodo(dialeto: str) -> str:
+    """Campo de período de um dialeto de $filter ("Mes eq '{mes}'" -> "Mes")."""
+    return dialeto.split(" ", 1)[0]
+
+
+def _filtro_modalidades(codigos: Iterable[int], codigo_segmento: int) -> str:
+    """Trecho fixo do $filter: uma ou várias modalidades (com `or`) e o segmento."""
+    termos = [f"CodigoModalidade eq {int(c)}" for c in codigos]
+    mods = termos[0] if len(termos) == 1 else "(" + " or ".join(termos) + ")"
+    return f"{mods} and CodigoSegmento eq {int(codigo_segmento)}"
+
+
+def _inteiro(valor) -> Optional[int]:
+    try:
+        return int(float(str(valor).replace(",", ".")))
+    except (TypeError, ValueError):
+        return None
+
+
+class FiltroTaxas:
+    """
+    Filtro de linhas (modalidade(s), segmento e período) aplicado durante a leitura da resposta,
+    com as mesmas regras do filtro no cliente de `coletar_mensal`/`coletar_diaria_por_inicio`.
+    As colunas são detectadas na primeira linha; critério sem coluna correspondente não filtra.
+    """
+
+    def __init__(self, codigo_modalidade: Union[int, Iterable[int]], codigo_segmento: int,
+                 periodo: str, is_mensal: bool):
+        codigos = [codigo_modalidade] if isinstance(codigo_modalidade, int) else codigo_modalidade
+        self.codigos = {int(c) for c in codigos}
+        self.codigo_segmento = int(codigo_segmento)
+        self.periodo = periodo[:7] if is_mensal else periodo[:10]
+        self.is_mensal = is_mensal
+        self._cols: Optional[Dict[str, str]] = None
+
+    def __call__(self, linha: dict) -> bool:
+        if self._cols is None:
+            self._cols = ColetorTxJuros._detect_columns(pd.DataFrame(columns=list(linha)), self.is_mensal)
+        c = self._cols
+        if c["cod_modalidade"] and _inteiro(linha.get(c["cod_modalidade"])) not in self.codigos:
+            return False
+        if c["cod_segmento"] and _inteiro(linha.get(c["cod_segmento"])) != self.codigo_segmento:
+            return False
+        if c["periodo"]:
+            per = str(linha.get(c["periodo"]) or "").strip().replace("/", "-")
+            if per[:len(self.periodo)] != self.periodo:
+                return False
+        return True
+
+
 @dataclass
 class ResultadoColeta:
     df: pd.DataFrame
@@ -112,24 +278,39 @@ class ColetorTxJuros:
     Coleta taxas de juros por instituição financeira via Olinda/BCB (OData).
     """
 
-    def __init__(self, base_url: str = OLINDA_BASE):
+    def __init__(self, base_url: str = OLINDA_BASE, session=None,
+                 max_paginas_paralelas: int = MAX_PAGINAS_PARALELAS,
+                 diretorio_cache: Optional[str] = None):
         self.base_url = base_url
-        self.sess = _make_session()
+        self.max_paginas_paralelas = max_paginas_paralelas
+        # dialetos e projeções persistem no diretório informado ou no do cache HTTP ativo (se houver)
+        cache = cache_ativo()
+        diretorio = diretorio_cache or (cache.diretorio if cache is not None else None)
+        self.dialetos = DialetosOData(diretorio)
+        self.projecoes = ProjecoesOData(diretorio)
+        # sessão compartilhada (pool keep-alive + retry unificado, ver sessao_http)
+        self.sess = session or obter_sessao()
 
     # -------------------------- Núcleo OData genérico -------------------------- #
 
-    def _odata_get(self, recurso: str, params: Dict[str, str], timeout=(5, 45)) -> pd.DataFrame:
-        """Tenta JSON; se falhar, tenta CSV; retorna DataFrame bruto."""
+    def _odata_get(self, recurso: str, params: Dict[str, str], timeout=(5, 45),
+                   filtro: Optional[Callable[[dict], bool]] = None) -> pd.DataFrame:
+        """
+        Tenta JSON; se falhar, tenta CSV; retorna DataFrame bruto. O JSON é lido em streaming
+        (leitura_json): com `filtro`, só as linhas aceitas são materializadas, e
+        `attrs["linhas_lidas"]` guarda o total de linhas da resposta e `attrs["desatualizado"]`
+        se ela veio do cache vencido por prazo esgotado.
+        """
         import requests
 
         url = f"{self.base_url}/{recurso}"
         # 1) JSON
         try:
-            r = self.sess.get(url, params={**params, "$format": "json"}, timeout=timeout)
-            if r.status_code == 200 and r.content:
-                data = r.json()
-                values = data.get("value", []) if isinstance(data, dict) else []
-                return pd.DataFrame(values)
+            with self.sess.get(url, params={**params, "$format": "json"}, timeout=timeout, stream=True) as r:
+                if r.status_code == 200:
+                    raw = ler_dataframe(r.iter_content(_BLOCO_JSON), chave="value", filtro=filtro)
+                    raw.attrs["desatualizado"] = getattr(r, "desatualizada", False)
+                    return raw
         except (requests.RequestException, ValueError):
             pass
 
@@ -144,6 +325,11 @@ class ColetorTxJuros:
                 except Exception:
                     buf.seek(0)
                     raw = pd.read_csv(buf)  # tenta padrão
+                lidas = len(raw)
+                if filtro is not None and lidas:
+                    raw = raw[[filtro(linha) for linha in raw.to_dict("records")]].reset_index(drop=True)
+                raw.attrs["linhas_lidas"] = lidas
+                raw.attrs["desatualizado"] = getattr(r2, "desatualizada", False)
                 return raw
             # Se ainda assim falhar, levanta o erro HTTP original (se houver)
             if 'r' in locals():
@@ -155,6 +341,38 @@ class ColetorTxJuros:
         # Se nada deu certo, retorna vazio
         return pd.DataFrame()
 
+    def _contar(self, recurso: str, base_params: Dict[str, str]) -> Optional[int]:
+        """Total de registros via `$count=true` (@odata.count); None se o servidor não informar."""
+        url = f"{self.base_url}/{recurso}"
+        params = {k: v for k, v in base_params.items() if k not in ("$top", "$skip")}
+        try:
+            r = self.sess.get(url, params={**params, "$count": "true", "$top": "1", "$format": "json"},
+                              timeout=(5, 30))
+            if r.status_code == 200:
+                total = r.json().get("@odata.count")
+                return int(total) if total is not None else None
+        except PrazoEsgotado:
+            raise
+        except Exception:
+            pass
+        return None
+
+    def _pagina(self, recurso: str, base_params: Dict[str, str], indice: int, page_size: int,
+                retries_per_page: int, filtro: Optional[Callable[[dict], bool]] = None) -> pd.DataFrame:
+        """Uma página ($top/$skip) com retentativas próprias; levanta a última falha."""
+        params = {**base_params, "$top": str(page_size), "$skip": str(indice * page_size)}
+        for attempt in range(1, retries_per_page + 1):
+            try:
+                raw = self._odata_get(recurso, params=params, filtro=filtro)
+                return raw if raw is not None else pd.DataFrame()
+            except PrazoEsgotado:
+                raise
+            except Exception:
+                if attempt == retries_per_page:
+                    raise
+                _sleep_backoff(attempt)
+        return pd.DataFrame()
+
     def _paged_collect(
         self,
         recurso: str,
@@ -162,31 +380,129 @@ class ColetorTxJuros:
         page_size: int = 1000,
         max_pages: int = 50,
         retries_per_page: int = 3,
+        filtro: Optional[Callable[[dict], bool]] = None,
     ) -> pd.DataFrame:
-        """Coleta paginado via $top/$skip; concatena e retorna."""
-        frames: List[pd.DataFrame] = []
-        for i in range(max_pages):
-            skip = i * page_size
-            last_err = None
-            for attempt in range(1, retries_per_page + 1):
+        """
+        Coleta paginado via $top/$skip com até `max_paginas_paralelas` páginas em voo.
+        Com `filtro`, cada página só materializa as linhas aceitas (memória de pico constante).
+
+        O total vem de `$count` quando o servidor informa; senão as páginas são sondadas em
+        janela deslizante até a primeira vazia (ou incompleta). Cada página tem suas próprias
+        retentativas, e uma página lenta não segura as demais. O resultado é remontado na ordem
+        das páginas, até a primeira que falhou de vez (como antes: encerra com o que tem); se a
+        falha foi o prazo da coleta, levanta PrazoEsgotado em vez de devolver um resultado parcial.
+        """
+        total = self._contar(recurso, base_params)
+        fim = min(max_pages, math.ceil(total / page_size)) if total is not None else max_pages
+        if fim <= 0:
+            return pd.DataFrame()
+
+        paginas: Dict[int, pd.DataFrame] = {}
+        falhas: Dict[int, Exception] = {}
+        limite = max(1, min(self.max_paginas_paralelas, fim))
+        with ThreadPoolExecutor(max_workers=limite, thread_name_prefix="olinda") as pool:
+            em_voo = {}
+            proxima = 0
+
+            def _submeter():
+                nonlocal proxima
+                while len(em_voo) < limite and proxima < fim:
+                    fut = submeter(pool, self._pagina, recurso, base_params, proxima, page_size,
+                                      retries_per_page, filtro)
+                    em_voo[fut] = proxima
+                    proxima += 1
+
+            _submeter()
+            while em_voo:
+                prontos, _ = wait(em_voo, return_when=FIRST_COMPLETED)
+                for fut in prontos:
+                    i = em_voo.pop(fut)
+                    try:
+                        raw = fut.result()
+                    except Exception as e:
+                        falhas[i] = e
+                        fim = min(fim, i)
+                        continue
+                    # vazia/incompleta pelo total da página, não pelas linhas que passaram no filtro
+                    lidas = raw.attrs.get("linhas_lidas", len(raw))
+                    if lidas == 0:
+                        fim = min(fim, i)
+                        continue
+                    if not raw.empty:
+                        paginas[i] = raw
+                    if lidas < page_size:  # página incompleta: é a última
+                        fim = min(fim, i + 1)
+                _submeter()
+
+        sem_tempo = next((e for e in falhas.values() if isinstance(e, PrazoEsgotado)), None)
+        if sem_tempo is not None:
+            raise sem_tempo
+        if falhas:
+            i = min(falhas)
+            logger.warning("%s: página %d falhou após %d tentativas (%s); usando %d página(s)",
+                           recurso, i, retries_per_page, falhas[i], i)
+        frames = [paginas[i] for i in range(fim) if i in paginas]
+        if not frames:
+            return pd.DataFrame()
+        raw = pd.concat(frames, ignore_index=True)
+        raw.attrs["desatualizado"] = any(f.attrs.get("desatualizado", False) for f in frames)
+        return raw
+
+    def _projecao(self, recurso: str, campo_periodo: str) -> Dict[str, str]:
+        """
+        `{"$select": ...}` com CAMPOS_SELECT + `campo_periodo` se o recurso aceitar a projeção;
+        `{}` se não. Descoberto uma vez (consulta com $top=1) e lembrado em ProjecoesOData.
+        """
+        select = ",".join(CAMPOS_SELECT + (campo_periodo,))
+        chave = f"{self.base_url}/{recurso}"
+        aceita = self.projecoes.aceita(chave, select)
+        if aceita is None:
+            try:
+                r = self.sess.get(f"{self.base_url}/{recurso}",
+                                  params={"$select": select, "$top": "1", "$format": "json"}, timeout=(5, 30))
+            except PrazoEsgotado:
+                raise
+            except Exception:
+                return {}  # falha de rede: não conclui nada, tenta de novo na próxima
+            if r.status_code == 200:
+                aceita = True
+            elif r.status_code in (400, 501):  # recusa definitiva da projeção
+                aceita = False
+            else:  # 429, 5xx...: falha transitória, não conclui nada
+                return {}
+            self.projecoes.registrar_aceite(chave, select, aceita)
+        return {"$select": select} if aceita else {}
+
+    def _buscar_com_dialetos(self, recurso: str, dialetos: List[str], valores: Dict[str, str],
+                             filtro_fixo: str, page_size: int, max_pages: int,
+                             filtro: Optional[Callable[[dict], bool]] = None) -> pd.DataFrame:
+        """
+        Tenta os dialetos de $filter começando pelo que funcionou por último neste recurso (o
+        primeiro que traz linhas é lembrado para as próximas coletas) e, por fim, a paginação —
+        sempre o último recurso, nunca lembrada: o filtro pode voltar a funcionar.
+        Cada consulta projeta só os campos usados ($select) quando o recurso aceita.
+        """
+        chave = f"{self.base_url}/{recurso}"
+        for dialeto in self.dialetos.ordenar(chave, dialetos) + [PAGINAR]:
+            raw = None
+            # na paginação o campo de período é desconhecido: usa o do dialeto padrão
+            projecao = self._projecao(recurso, _campo_periodo(dialetos[0] if dialeto == PAGINAR else dialeto))
+            if dialeto == PAGINAR:
+                raw = self._paged_collect(recurso, {"$top": str(page_size), **projecao}, page_size=page_size,
+                                          max_pages=max_pages, filtro=filtro)
+            else:
+                fexpr = f"{dialeto.format(**valores)} and {filtro_fixo}"
                 try:
-                    raw = self._odata_get(
-                        recurso,
-                        params={**base_params, "$top": str(page_size), "$skip": str(skip)},
-                    )
-                    if raw is not None and not raw.empty:
-                        frames.append(raw)
-                        break
-                    else:
-                        # página vazia → acabou
-                        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
-                except Exception as e:
-                    last_err = e
-                _sleep_backoff(attempt)
-            if last_err:
-                # se a página falhou após N tentativas, encerra com o que tem
-                break
-        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+                    raw = self._odata_get(recurso, params={"$filter": fexpr, "$top": str(page_size), **projecao})
+                except PrazoEsgotado:
+                    raise
+                except Exception:
+                    pass
+            if raw is not None and not raw.empty:
+                if dialeto != PAGINAR:
+                    self.dialetos.registrar(chave, dialeto)
+                return raw
+        return pd.DataFrame()
 
     # ------------------------ Autodetecção de colunas ------------------------- #
 
@@ -238,147 +554,155 @@ class ColetorTxJuros:
             s = s.str.replace("/", "-", regex=False)
         return s
 
+    def _separar_por_modalidade(self, raw: pd.DataFrame, is_mensal: bool, alvo: str,
+                                codigos: List[int], codigo_segmento: int) -> Dict[int, pd.DataFrame]:
+        """
+        Harmoniza a resposta bruta e a separa por código de modalidade (filtro no cliente forte:
+        período `alvo`, modalidade e segmento). Sem coluna de modalidade, as linhas só podem ser
+        atribuídas quando há um único código pedido.
+        """
+        cols = self._detect_columns(raw, is_mensal=is_mensal)
+
+        def _ci_get(col: str, default=None):
+            return raw[col] if col in raw.columns else pd.Series([default] * len(raw))
+
+        per = self._normalize_period(_ci_get(cols["periodo"], ""), is_mensal=is_mensal)
+        mod = pd.to_numeric(_ci_get(cols["cod_modalidade"], pd.NA), errors="coerce").astype("Int64")
+        seg = pd.to_numeric(_ci_get(cols["cod_segmento"],  pd.NA), errors="coerce").astype("Int64")
+        taxa = _coerce_percent_to_fraction(_ci_get(cols["taxa"], pd.NA))
+        inst = _ci_get(cols["instituicao"], "").astype(str).str.strip()
+
+        base = pd.Series([True] * len(raw))
+        if per.notna().any(): base &= (per.str[:len(alvo)] == alvo)
+        if seg.notna().any(): base &= (seg == int(codigo_segmento))
+        tem_mod = mod.notna().any()
+        if not tem_mod and len(codigos) > 1:
+            logger.warning("Resposta sem coluna de modalidade; não dá para separar %s", codigos)
+
+        saida: Dict[int, pd.DataFrame] = {}
+        for codigo in codigos:
+            if tem_mod:
+                sel = base & (mod == int(codigo)).fillna(False)
+            else:
+                sel = base & (len(codigos) == 1)
+            saida[codigo] = pd.DataFrame({
+                "instituicao": inst[sel].reset_index(drop=True),
+                "codigo_modalidade": int(codigo),
+                "codigo_segmento": int(codigo_segmento),
+                "periodo": per[sel].reset_index(drop=True).fillna(alvo),
+                "taxa_anual": taxa[sel].reset_index(drop=True),
+            }).dropna(subset=["taxa_anual"]).reset_index(drop=True)
+        return saida
+
     # -------------------------- API de alto nível ---------------------------- #
 
-    def coletar_mensal(
+    def coletar_mensal_modalidades(
         self,
-        mes: str,                         # "YYYY-MM" ou "YYYY-MM-01"
-        codigo_modalidade: int,           # 903101, 905101, 903201, 905201, 903203, 905203
-        codigo_segmento: int = 1,         # 1 = PF
-        page_size: int = 5000,            # ↑ maior para varrer mais rápido
-        max_pages: int = 100,             # ↑
-    ) -> ResultadoColeta:
+        mes: str,                                           # "YYYY-MM" ou "YYYY-MM-01"
+        codigos_modalidade: Iterable[int] = MODALIDADES_IMOBILIARIO,
+        codigo_segmento: int = 1,                           # 1 = PF
+        page_size: int = 5000,
+        max_pages: int = 100,
+    ) -> Dict[int, ResultadoColeta]:
         """
-        Coleta MENSAL por instituição. Tenta várias formas:
+        Coleta MENSAL por instituição de várias modalidades numa consulta só
+        ($filter com `CodigoModalidade eq A or CodigoModalidade eq B ...`), separada no cliente
+        em {código: ResultadoColeta}. Tenta várias formas:
           1) $filter com Mes == 'YYYY-MM'
           2) $filter com Mes == 'YYYY-MM-01'
           3) $filter com MesReferencia (alguns recursos mudam cabeçalho)
           4) Baixa páginas e filtra no cliente
+        A forma que funcionou por último para o recurso é tentada primeiro (ver DialetosOData).
         """
-        base_params = {}
         base = RECURSO_MENSAL
+        codigos = [int(c) for c in dict.fromkeys(codigos_modalidade)]
 
         # normalizações de mês aceitas
         mes = str(mes).strip()
         cand_mes = {mes[:7], mes[:10]}
         cand_mes = {m if len(m) == 7 else (m[:7]) for m in cand_mes} | {f"{m[:7]}-01" for m in cand_mes}
 
-        tries = []
-        for m in sorted(cand_mes):
-            tries.append(f"Mes eq '{m}' and CodigoModalidade eq {int(codigo_modalidade)} and CodigoSegmento eq {int(codigo_segmento)}")
-            # alguns datasets usam MesReferencia
-            tries.append(f"MesReferencia eq '{m}' and CodigoModalidade eq {int(codigo_modalidade)} and CodigoSegmento eq {int(codigo_segmento)}")
-
-        raw = pd.DataFrame()
-        # 1) tenta filtros no servidor
-        for fexpr in tries:
-            try:
-                raw = self._odata_get(base, params={"$filter": fexpr, "$top": str(page_size)})
-                if raw is not None and not raw.empty:
-                    break
-            except Exception:
-                pass
-
-        # 2) se ainda vazio, pagina e filtra no cliente
-        if raw is None or raw.empty:
-            raw = self._paged_collect(base, {"$top": str(page_size)}, page_size=page_size, max_pages=max_pages)
+        raw = self._buscar_com_dialetos(
+            base, DIALETOS_MENSAL, {"mes": mes[:7]},
+            _filtro_modalidades(codigos, codigo_segmento),
+            page_size, max_pages,
+            filtro=FiltroTaxas(codigos, codigo_segmento, mes[:7], is_mensal=True),
+        )
 
         if raw is None or raw.empty:
-            return ResultadoColeta(pd.DataFrame(), meta={"recurso": base, "mes": list(cand_mes), "etapa": "sem_dados"})
-
-        cols = self._detect_columns(raw, is_mensal=True)
-
-        def _ci_get(col: str, default=None):
-            return raw[col] if col in raw.columns else pd.Series([default] * len(raw))
-
-        per = self._normalize_period(_ci_get(cols["periodo"], ""), is_mensal=True)
-        mod = pd.to_numeric(_ci_get(cols["cod_modalidade"], pd.NA), errors="coerce").astype("Int64")
-        seg = pd.to_numeric(_ci_get(cols["cod_segmento"],  pd.NA), errors="coerce").astype("Int64")
-        taxa = _coerce_percent_to_fraction(_ci_get(cols["taxa"], pd.NA))
-        inst = _ci_get(cols["instituicao"], "").astype(str).str.strip()
+            return {c: ResultadoColeta(pd.DataFrame(), meta={"recurso": base, "mes": list(cand_mes), "etapa": "sem_dados"})
+                    for c in codigos}
 
-        # filtra no cliente (forte)
         alvo_mes7 = next(iter(sorted({m[:7] for m in cand_mes})))  # escolhe o alvo YYYY-MM
-        sel = pd.Series([True] * len(raw))
-        if per.notna().any(): sel &= (per.str[:7] == alvo_mes7)
-        if mod.notna().any(): sel &= (mod == int(codigo_modalidade))
-        if seg.notna().any(): sel &= (seg == int(codigo_segmento))
+        dfs = self._separar_por_modalidade(raw, True, alvo_mes7, codigos, codigo_segmento)
+        meta = {"recurso": base, "mes": alvo_mes7}
+        if raw.attrs.get("desatualizado"):
+            meta["desatualizado"] = True
+        return {c: ResultadoColeta(df, meta=dict(meta)) for c, df in dfs.items()}
 
-        out = pd.DataFrame({
-            "instituicao": inst[sel].reset_index(drop=True),
-            "codigo_modalidade": int(codigo_modalidade),
-            "codigo_segmento": int(codigo_segmento),
-            "periodo": per[sel].reset_index(drop=True).fillna(alvo_mes7),
-            "taxa_anual": taxa[sel].reset_index(drop=True),
-        }).dropna(subset=["taxa_anual"]).reset_index(drop=True)
-
-        return ResultadoColeta(out, meta={"recurso": base, "mes": alvo_mes7})
+    def coletar_mensal(
+        self,
+        mes: str,                         # "YYYY-MM" ou "YYYY-MM-01"
+        codigo_modalidade: int,           # 903101, 905101, 903201, 905201, 903203, 905203
+        codigo_segmento: int = 1,         # 1 = PF
+        page_size: int = 5000,            # ↑ maior para varrer mais rápido
+        max_pages: int = 100,             # ↑
+    ) -> ResultadoColeta:
+        """Coleta MENSAL por instituição de uma modalidade (ver `coletar_mensal_modalidades`)."""
+        return self.coletar_mensal_modalidades(mes, [codigo_modalidade], codigo_segmento,
+                                               page_size, max_pages)[int(codigo_modalidade)]
 
-    def coletar_diaria_por_inicio(
+    def coletar_diaria_modalidades(
         self,
-        inicio_periodo: str,              # "YYYY-MM-DD" (aceita "YYYY-MM")
-        codigo_modalidade: int,
+        inicio_periodo: str,                                # "YYYY-MM-DD" (aceita "YYYY-MM")
+        codigos_modalidade: Iterable[int] = MODALIDADES_IMOBILIARIO,
         codigo_segmento: int = 1,
         page_size: int = 5000,
         max_pages: int = 50,
-    ) -> ResultadoColeta:
+    ) -> Dict[int, ResultadoColeta]:
         """
-        Coleta DIÁRIA (média de 5 dias úteis a partir de 'inicio_periodo').
+        Coleta DIÁRIA (média de 5 dias úteis a partir de 'inicio_periodo') de várias modalidades
+        numa consulta só, separada no cliente em {código: ResultadoColeta}.
         Tenta:
           1) $filter com InicioPeriodo == 'YYYY-MM-DD'
           2) $filter com Data == 'YYYY-MM-DD' (alterna cabeçalho)
           3) pagina e filtra no cliente
+        A forma que funcionou por último para o recurso é tentada primeiro.
         """
         base = RECURSO_DIARIO
+        codigos = [int(c) for c in dict.fromkeys(codigos_modalidade)]
 
         ini = str(inicio_periodo).strip()
         if len(ini) == 7:
             ini = f"{ini}-01"
-        tries = [
-            f"InicioPeriodo eq '{ini}' and CodigoModalidade eq {int(codigo_modalidade)} and CodigoSegmento eq {int(codigo_segmento)}",
-            f"Data eq '{ini}' and CodigoModalidade eq {int(codigo_modalidade)} and CodigoSegmento eq {int(codigo_segmento)}",
-        ]
-
-        raw = pd.DataFrame()
-        for fexpr in tries:
-            try:
-                raw = self._odata_get(base, params={"$filter": fexpr, "$top": str(page_size)})
-                if raw is not None and not raw.empty:
-                    break
-            except Exception:
-                pass
+        raw = self._buscar_com_dialetos(
+            base, DIALETOS_DIARIO, {"inicio": ini},
+            _filtro_modalidades(codigos, codigo_segmento),
+            page_size, max_pages,
+            filtro=FiltroTaxas(codigos, codigo_segmento, ini, is_mensal=False),
+        )
 
         if raw is None or raw.empty:
-            raw = self._paged_collect(base, {"$top": str(page_size)}, page_size=page_size, max_pages=max_pages)
-
-        if raw is None or raw.empty:
-            return ResultadoColeta(pd.DataFrame(), meta={"recurso": base, "inicio": ini, "etapa": "sem_dados"})
-
-        cols = self._detect_columns(raw, is_mensal=False)
-
-        def _ci_get(col: str, default=None):
-            return raw[col] if col in raw.columns else pd.Series([default] * len(raw))
-
-        per = self._normalize_period(_ci_get(cols["periodo"], ""), is_mensal=False)
-        mod = pd.to_numeric(_ci_get(cols["cod_modalidade"], pd.NA), errors="coerce").astype("Int64")
-        seg = pd.to_numeric(_ci_get(cols["cod_segmento"],  pd.NA), errors="coerce").astype("Int64")
-        taxa = _coerce_percent_to_fraction(_ci_get(cols["taxa"], pd.NA))
-        inst = _ci_get(cols["instituicao"], "").astype(str).str.strip()
-
-        sel = pd.Series([True] * len(raw))
-        if per.notna().any(): sel &= (per.str[:10] == ini)
-        if mod.notna().any(): sel &= (mod == int(codigo_modalidade))
-        if seg.notna().any(): sel &= (seg == int(codigo_segmento))
+            return {c: ResultadoColeta(pd.DataFrame(), meta={"recurso": base, "inicio": ini, "etapa": "sem_dados"})
+                    for c in codigos}
 
-        out = pd.DataFrame({
-            "instituicao": inst[sel].reset_index(drop=True),
-            "codigo_modalidade": int(codigo_modalidade),
-            "codigo_segmento": int(codigo_segmento),
-            "periodo": per[sel].reset_index(drop=True).fillna(ini),
-            "taxa_anual": taxa[sel].reset_index(drop=True),
-        }).dropna(subset=["taxa_anual"]).reset_index(drop=True)
+        dfs = self._separar_por_modalidade(raw, False, ini, codigos, codigo_segmento)
+        meta = {"recurso": base, "inicio": ini}
+        if raw.attrs.get("desatualizado"):
+            meta["desatualizado"] = True
+        return {c: ResultadoColeta(df, meta=dict(meta)) for c, df in dfs.items()}
 
-        return ResultadoColeta(out, meta={"recurso": base, "inicio": ini})
+    def coletar_diaria_por_inicio(
+        self,
+        inicio_periodo: str,              # "YYYY-MM-DD" (aceita "YYYY-MM")
+        codigo_modalidade: int,
+        codigo_segmento: int = 1,
+        page_size: int = 5000,
+        max_pages: int = 50,
+    ) -> ResultadoColeta:
+        """Coleta DIÁRIA de uma modalidade (ver `coletar_diaria_modalidades`)."""
+        return self.coletar_diaria_modalidades(inicio_periodo, [codigo_modalidade], codigo_segmento,
+                                               page_size, max_pages)[int(codigo_modalidade)]
 
 
 
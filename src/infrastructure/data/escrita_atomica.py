@@ -0,0 +1,77 @@
+"""
+Escrita atômica de arquivos: o conteúdo vai para um temporário no mesmo diretório do destino
+(nome único via `tempfile.mkstemp`, sem colisão entre threads ou processos) e só então
+substitui o destino com `os.replace`. Um leitor vê o arquivo antigo ou o novo, nunca um
+pela metade; se a escrita falhar, o temporário é removido e o destino fica intacto.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Callable, Tuple, Union
+
+
+def _temporario(destino: str) -> Tuple[int, str]:
+    """(descritor, caminho) de um temporário novo no diretório de `destino`, com a mesma extensão."""
+    pasta = os.path.dirname(os.path.abspath(destino))
+    os.makedirs(pasta, exist_ok=True)
+    return tempfile.mkstemp(dir=pasta, prefix=".tmp_", suffix=os.path.splitext(destino)[1])
+
+
+def trocar_atomico(destino: str, escrever: Callable[[str], None], sincronizar: bool = False) -> None:
+    """
+    Chama `escrever(caminho_temporario)` e troca o temporário com `destino`.
+
+    O temporário tem a mesma extensão do destino (np.save/np.savez não acrescentam outra).
+    Com `sincronizar`, o conteúdo é levado ao disco (fsync) antes da troca.
+    """
+    fd, tmp = _temporario(destino)
+    os.close(fd)
+    try:
+        escrever(tmp)
+        if sincronizar:
+            with open(tmp, "rb+") as f:
+                os.fsync(f.fileno())
+        os.replace(tmp, destino)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def gravar_atomico(destino: str, dados: Union[bytes, str], sincronizar: bool = False) -> None:
+    """Grava `dados` (bytes, ou texto em UTF-8) em `destino` de forma atômica."""
+    if isinstance(dados, str):
+        dados = dados.encode("utf-8")
+
+    def _escrever(tmp: str) -> None:
+        with open(tmp, "wb") as f:
+            f.write(dados)
+
+    trocar_atomico(destino, _escrever, sincronizar)
+
+
+class GravacaoAtomica:
+    """
+    Escrita incremental com a mesma garantia, para conteúdo que chega aos poucos (ex.: corpo
+    HTTP lido em blocos): `arquivo` é o temporário aberto em modo binário; `concluir()` troca
+    com o destino e `descartar()` apaga o temporário.
+    """
+
+    def __init__(self, destino: str):
+        self.destino = destino
+        fd, self._tmp = _temporario(destino)
+        self.arquivo = os.fdopen(fd, "wb")
+
+    def concluir(self) -> None:
+        try:
+            self.arquivo.close()
+            os.replace(self._tmp, self.destino)
+        except BaseException:
+            self.descartar()
+            raise
+
+    def descartar(self) -> None:
+        self.arquivo.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
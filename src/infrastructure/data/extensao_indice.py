@@ -0,0 +1,135 @@
+"""
+Extensão virtual de séries de índices (IPCA, TR) além do último mês disponível.
+
+Em vez de copiar a tabela e concatenar linhas de preenchimento (`pd.concat`) ou gravar um
+CSV acolchoado em disco, a série é "vista" com um tamanho maior: os meses reais vêm da
+tabela original (sem cópia) e os meses virtuais são calculados sob demanda pela política:
+
+  - "ultimo":    repete o último valor observado;
+  - "media":     média histórica de toda a série;
+  - "media_12m": média dos últimos 12 meses (ou da série inteira, se for menor).
+
+O valor de extensão é calculado uma única vez, no primeiro acesso a um mês virtual.
+Alternativamente, os meses virtuais podem vir de um caminho projetado já pronto
+(`futuro`, ver `projecao_indice.projetar`).
+"""
+from __future__ import annotations
+
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+POLITICAS_EXTENSAO = ("ultimo", "media", "media_12m")
+# Janela da política "media_12m"
+JANELA_MEDIA_MOVEL = 12
+
+
+def valor_extensao(valores: np.ndarray, politica: str = "ultimo") -> float:
+    """Valor usado nos meses além da série, segundo a política."""
+    if politica not in POLITICAS_EXTENSAO:
+        raise ValueError(f"Política de extensão inválida: {politica!r} (use {', '.join(POLITICAS_EXTENSAO)})")
+    if len(valores) == 0:
+        raise ValueError("Série vazia: não há valor para estender")
+    if politica == "ultimo":
+        return float(valores[-1])
+    if politica == "media":
+        return float(np.mean(valores))
+    return float(np.mean(valores[-JANELA_MEDIA_MOVEL:]))
+
+
+def _somente_leitura(valores: np.ndarray) -> np.ndarray:
+    """Visão float somente-leitura (sem cópia quando já é float64)."""
+    arr = np.asarray(valores, dtype=float)
+    if arr.flags.writeable:
+        arr = arr.view()
+        arr.flags.writeable = False  # garante que a visão não altera a tabela compartilhada
+    return arr
+
+
+class SerieEstendida:
+    """
+    Visão somente-leitura de uma série com `tamanho` meses, dos quais só os primeiros
+    `len(valores)` são reais. Indexação e fatias são avaliadas sob demanda; a série
+    base nunca é copiada nem alterada.
+
+    Com `futuro`, o mês virtual j (0 = primeiro após a série) vale `futuro[j]`; além do fim
+    do caminho, repete o último valor projetado. Sem dados reais nem `futuro` não há o que
+    estender: a visão fica vazia (len 0).
+    """
+
+    def __init__(self, valores: np.ndarray, tamanho: int, politica: str = "ultimo",
+                 futuro: Optional[np.ndarray] = None):
+        if futuro is None and politica not in POLITICAS_EXTENSAO:
+            raise ValueError(f"Política de extensão inválida: {politica!r} (use {', '.join(POLITICAS_EXTENSAO)})")
+        self._base = _somente_leitura(valores)
+        self._futuro = None if futuro is None else _somente_leitura(futuro)
+        if self._futuro is not None and len(self._futuro) == 0:
+            raise ValueError("Caminho projetado vazio")
+        vazia = len(self._base) == 0 and self._futuro is None
+        self._tamanho = 0 if vazia else max(int(tamanho), len(self._base))
+        self.politica = "projecao" if futuro is not None else politica
+        self._extra: float | None = None
+
+    @property
+    def n_reais(self) -> int:
+        """Quantidade de meses com dado observado."""
+        return len(self._base)
+
+    @property
+    def valor_extensao(self) -> float:
+        """Valor dos meses virtuais (calculado no primeiro uso); com projeção, o último projetado."""
+        if self._futuro is not None:
+            return float(self._futuro[-1])
+        if self._extra is None:
+            self._extra = valor_extensao(self._base, self.politica)
+        return self._extra
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __getitem__(self, chave: Union[int, slice]) -> Union[float, np.ndarray]:
+        if isinstance(chave, slice):
+            inicio, fim, passo = chave.indices(self._tamanho)
+            if passo == 1:
+                return self.fatia(inicio, fim)
+            return np.array([self[i] for i in range(inicio, fim, passo)], dtype=float)
+        i = int(chave)
+        if i < 0:
+            i += self._tamanho
+        if i < 0 or i >= self._tamanho:
+            raise IndexError(f"Índice {chave} fora do intervalo (0 a {self._tamanho - 1})")
+        n = len(self._base)
+        if i < n:
+            return float(self._base[i])
+        if self._futuro is not None:
+            return float(self._futuro[min(i - n, len(self._futuro) - 1)])
+        return self.valor_extensao
+
+    def fatia(self, inicio: int, fim: int) -> np.ndarray:
+        """
+        Valores do intervalo [inicio, fim) como array. Se o intervalo estiver todo dentro
+        da série real, devolve uma visão (sem cópia); só os meses virtuais são materializados.
+        """
+        inicio, fim = max(0, inicio), min(fim, self._tamanho)
+        if fim <= inicio:
+            return np.empty(0, dtype=float)
+        if fim <= len(self._base):
+            return self._base[inicio:fim]
+        n = len(self._base)
+        j0, j1 = max(inicio, n) - n, fim - n  # intervalo virtual, relativo ao fim da série
+        if self._futuro is not None:
+            if j1 <= len(self._futuro) and inicio >= n:
+                return self._futuro[j0:j1]
+            virtuais = self._futuro[np.minimum(np.arange(j0, j1), len(self._futuro) - 1)]
+        else:
+            virtuais = np.full(j1 - j0, self.valor_extensao)
+        if inicio >= n:
+            return virtuais
+        return np.concatenate([self._base[inicio:n], virtuais])
+
+    def __iter__(self) -> Iterator[float]:
+        for i in range(self._tamanho):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"SerieEstendida(reais={len(self._base)}, tamanho={self._tamanho}, politica={self.politica!r})"
@@ -15,6 +15,8 @@ Obs:
   * Se a modalidade escolhida não retornar dados (ex.: mercado), o gerador tenta
     automaticamente a alternativa (reguladas) para aquela modalidade.
   * Se nada vier da API, cai num fallback “realista” de nomes + taxas padrão.
+  * Todas as modalidades vão numa consulta combinada só (mais uma diária, se preciso),
+    com prazo global (`prazo_s`).
 """
 
 from __future__ import annotations
@@ -23,6 +25,9 @@ from dataclasses import dataclass
 import os
 import sys
 import math
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 import unicodedata
 import re
 from pathlib import Path
@@ -40,13 +45,20 @@ except ImportError:  # sem pacote (executado direto)
 # coletor oficial de taxas
 try:
     from .coletor_txjuros import ColetorTxJuros
+    from .prazo import PrazoEsgotado, orcamento, submeter
 except ImportError:
     # idem compat
     from infrastructure.data.coletor_txjuros import ColetorTxJuros  # type: ignore
+    from infrastructure.data.prazo import PrazoEsgotado, orcamento, submeter  # type: ignore
 
 
 # -------------------------- Fallbacks e defaults -------------------------- #
 
+# prazo global (s) das coletas online de gerar_bancos_csv_real
+PRAZO_COLETA_S = 120.0
+
+logger = logging.getLogger(__name__)
+
 DEFAULT_BANCOS_FAKE = [
     {"nome": "Banco Alfa", "sistema": "SAC",      "taxa_anual": 0.115},
     {"nome": "Banco Beta", "sistema": "SAC_IPCA", "taxa_anual": 0.085},
@@ -152,58 +164,101 @@ MAPA = MapeamentoModalidade(
     },
 )
 
-def _coletar_taxas_por_sistema(
+def _harmonizar_taxas(df) -> pd.DataFrame:
+    """(instituicao, taxa_anual) sem nulos e com a menor taxa do período por instituição."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["instituicao", "taxa_anual"])
+    out = df[["instituicao", "taxa_anual"]].copy()
+    out = out.dropna(subset=["instituicao", "taxa_anual"])
+    # colapsa duplicatas por instituição: usa a menor taxa do período
+    out["_k"] = out["instituicao"].map(_normalize_name)
+    out = (out.groupby("_k", as_index=False)
+              .agg(taxa_anual=("taxa_anual", "min"),
+                   instituicao=("instituicao", "first")))
+    return out[["instituicao", "taxa_anual"]].reset_index(drop=True)
+
+def _unir_por_instituicao(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatena coletas (instituicao, taxa_anual) e fica com a menor taxa por instituição."""
+    dfs = [d for d in dfs if d is not None and not d.empty]
+    if not dfs:
+        return pd.DataFrame(columns=["instituicao", "taxa_anual"])
+    if len(dfs) == 1:
+        return dfs[0]
+    df = pd.concat(dfs, ignore_index=True)
+    df["_k"] = df["instituicao"].map(_normalize_name)
+    df = (df.groupby("_k", as_index=False)
+            .agg(taxa_anual=("taxa_anual", "min"),
+                 instituicao=("instituicao", "first")))
+    return df.drop(columns=["_k"])
+
+
+def _codigo(sistema: str, pref: str) -> int:
+    return (MAPA.codigos_mercado if pref == "mercado" else MAPA.codigos_reguladas)[sistema]
+
+
+def _coletar_modalidades_agrupadas(
     coletor: ColetorTxJuros,
-    sistema: str,
-    prefer: str,         # "mercado" | "reguladas"
-    tipo: str,           # "mensal" | "diario"
-    mes: Optional[str],  # YYYY-MM (mensal)
-    inicio: Optional[str], # YYYY-MM-DD (diario)
-    segmento: int = 1,   # 1 = PF
-) -> pd.DataFrame:
+    sistemas: List[str],
+    prefs: Tuple[str, ...],
+    tipo: str,
+    mes: Optional[str],
+    inicio: Optional[str],
+    prazo_s: Optional[float] = PRAZO_COLETA_S,
+) -> Dict[Tuple[str, str, str], pd.DataFrame]:
     """
-    Tenta coletar taxas para um sistema (SAC, SAC_TR, SAC_IPCA) usando o código preferido;
-    se vier vazio, tenta a alternativa. Retorna DF com colunas ['instituicao','taxa_anual'].
+    Coleta todas as modalidades (mercado e reguladas) dos `sistemas` numa consulta combinada
+    e separa em {(sistema, preferência, tipo): DataFrame}. Com uma única preferência, a
+    alternativa (que já veio na mesma resposta) cobre a preferida vazia. Se todas as
+    preferências mensais de algum sistema vierem vazias, uma consulta diária combinada busca
+    só esses sistemas.
+
+    `prazo_s` é um prazo global (`prazo.orcamento`): timeouts e backoffs das requisições são
+    limitados a ele; ao estourar, a consulta pendente é abandonada (fica fora do resultado) e
+    o que já chegou é usado.
     """
-    assert tipo in ("mensal", "diario")
-    cod_pref = (MAPA.codigos_mercado if prefer == "mercado" else MAPA.codigos_reguladas)[sistema]
-    cod_alt  = (MAPA.codigos_reguladas if prefer == "mercado" else MAPA.codigos_mercado)[sistema]
-
-    def _harmonizar(df) -> pd.DataFrame:
-        if df is None or df.empty:
-            return pd.DataFrame(columns=["instituicao", "taxa_anual"])
-        out = df[["instituicao", "taxa_anual"]].copy()
-        out = out.dropna(subset=["instituicao", "taxa_anual"])
-        # colapsa duplicatas por instituição: usa a menor taxa do período
-        out["_k"] = out["instituicao"].map(_normalize_name)
-        out = (out.groupby("_k", as_index=False)
-                  .agg(taxa_anual=("taxa_anual", "min"),
-                       instituicao=("instituicao", "first")))
-        return out[["instituicao", "taxa_anual"]].reset_index(drop=True)
-
-    # 1) preferido
-    if tipo == "mensal":
-        mes = mes or _last_closed_month_yyyy_mm()
-        r = coletor.coletar_mensal(mes=mes, codigo_modalidade=cod_pref, codigo_segmento=segmento)
-        df = _harmonizar(r.df)
-    else:
-        if not inicio:
-            # padrão: primeiro dia do mês fechado
-            m = _last_closed_month_yyyy_mm()
-            inicio = f"{m}-01"
-        r = coletor.coletar_diaria_por_inicio(inicio_periodo=inicio, codigo_modalidade=cod_pref, codigo_segmento=segmento)
-        df = _harmonizar(r.df)
-
-    if df.empty:
-        # 2) alternativa
-        if tipo == "mensal":
-            r2 = coletor.coletar_mensal(mes=mes or _last_closed_month_yyyy_mm(), codigo_modalidade=cod_alt, codigo_segmento=segmento)
-            df = _harmonizar(r2.df)
-        else:
-            r2 = coletor.coletar_diaria_por_inicio(inicio_periodo=inicio, codigo_modalidade=cod_alt, codigo_segmento=segmento)
-            df = _harmonizar(r2.df)
-
-    return df
+    resultados: Dict[Tuple[str, str, str], pd.DataFrame] = {}
+    inicio_diario = inicio or f"{(mes or _last_closed_month_yyyy_mm())[:7]}-01"
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="txjuros")
+    try:
+        with orcamento(prazo_s) as prazo:
+            limite = None if prazo is None else prazo.fim
+
+            def _consultar(tipo_local: str, alvo: List[str]) -> bool:
+                codigos = [_codigo(sis, p) for sis in alvo for p in ("mercado", "reguladas")]
+                if tipo_local == "mensal":
+                    fut = submeter(pool, coletor.coletar_mensal_modalidades,
+                                   mes or _last_closed_month_yyyy_mm(), codigos)
+                else:
+                    fut = submeter(pool, coletor.coletar_diaria_modalidades,
+                                   inicio if tipo_local == tipo else inicio_diario, codigos)
+                restante = None if limite is None else max(0.0, limite - time.monotonic())
+                try:
+                    por_codigo = fut.result(timeout=restante)
+                except (FuturesTimeout, PrazoEsgotado):
+                    logger.warning("Prazo de %.1fs esgotado; coleta %s abandonada: %s", prazo.segundos, tipo_local, alvo)
+                    return False
+                except Exception as e:
+                    logger.warning("Coleta %s %s falhou: %s", tipo_local, alvo, e)
+                    por_codigo = {}
+                for sis in alvo:
+                    for pref in prefs:
+                        r = por_codigo.get(_codigo(sis, pref))
+                        df = _harmonizar_taxas(r.df if r is not None else None)
+                        if df.empty and len(prefs) == 1:
+                            alt = por_codigo.get(_codigo(sis, "reguladas" if pref == "mercado" else "mercado"))
+                            df = _harmonizar_taxas(alt.df if alt is not None else None)
+                        resultados[(sis, pref, tipo_local)] = df
+                return True
+
+            if _consultar(tipo, sistemas) and tipo == "mensal":
+                # fallback: diário do mesmo mês para os sistemas sem dados mensais
+                vazios = [sis for sis in sistemas if all(resultados[(sis, p, "mensal")].empty for p in prefs)]
+                if vazios:
+                    _consultar("diario", vazios)
+    finally:
+        # não espera coleta presa: termina em segundo plano
+        pool.shutdown(wait=False, cancel_futures=True)
+    return resultados
 
 # ---------------------------- Geração REAL -------------------------------- #
 
@@ -219,6 +274,8 @@ def gerar_bancos_csv_real(
     on_error: str = "fallback",       # "fallback" | "raise"
     verbose: bool = True,
     offline_csv: dict | None = None,
+    prazo_s: Optional[float] = PRAZO_COLETA_S,
+    coletor: Optional[ColetorTxJuros] = None,
 ) -> str:
     """
     Gera `bancos.csv` com **taxas reais por banco** (fração a.a.) vindas do BCB.
@@ -226,8 +283,10 @@ def gerar_bancos_csv_real(
     Estratégia:
       - Se `offline_csv` for informado, carrega CSVs exportados do ReportTxJuros
         (chaves: {"pre": ..., "tr": ..., "ipca": ...}) e gera o arquivo.
-      - Caso contrário, coleta na Olinda (taxaJuros v2) para cada modalidade.
+      - Caso contrário, coleta na Olinda (taxaJuros v2) todas as modalidades numa consulta só.
         `prefer` pode ser "mercado", "reguladas" ou "ambos" (une as duas e usa a **menor** taxa por banco).
+      - As consultas têm prazo global `prazo_s`; ao estourar, segue com o que já chegou
+        (sistemas sem dados ficam de fora).
       - Remove duplicatas por instituição (normalizando nome) e ordena alfabeticamente.
     """
     try:
@@ -274,27 +333,7 @@ def gerar_bancos_csv_real(
                 return destino_csv
 
         # ---- (B) ONLINE (Olinda) ---------------------------------
-        coletor = ColetorTxJuros()
-
-        def _coleta(sistema: str, tipo_local: str) -> pd.DataFrame:
-            if prefer == "ambos":
-                df_merc = _coletar_taxas_por_sistema(coletor, sistema, "mercado",  tipo_local, mes, inicio, 1)
-                df_reg  = _coletar_taxas_por_sistema(coletor, sistema, "reguladas",tipo_local, mes, inicio, 1)
-                df = pd.concat([df_merc, df_reg], ignore_index=True)
-                if not df.empty:
-                    df["_k"] = df["instituicao"].map(_normalize_name)
-                    df = (df.groupby("_k", as_index=False)
-                            .agg(taxa_anual=("taxa_anual","min"),
-                                 instituicao=("instituicao","first")))
-                    df = df.drop(columns=["_k"])
-                stats.setdefault(sistema, {})[f"{tipo_local}_mercado"]   = len(df_merc)
-                stats.setdefault(sistema, {})[f"{tipo_local}_reguladas"] = len(df_reg)
-                stats.setdefault(sistema, {})[f"{tipo_local}_unidos"]    = len(df)
-                return df
-            else:
-                df1 = _coletar_taxas_por_sistema(coletor, sistema, prefer, tipo_local, mes, inicio, 1)
-                stats.setdefault(sistema, {})[f"{tipo_local}_{prefer}"] = len(df1)
-                return df1
+        coletor = coletor or ColetorTxJuros()
 
         # alvo padrão de mês/início
         if tipo == "mensal" and not mes:
@@ -303,14 +342,26 @@ def gerar_bancos_csv_real(
             m = mes or _last_closed_month_yyyy_mm()
             inicio = f"{m}-01"
 
-        for sistema in modalidades:
-            sis = sistema.upper()
+        sistemas = [s.upper() for s in modalidades]
+        for sis in sistemas:
             if sis not in MAPA.sistemas:
-                raise ValueError(f"Sistema '{sistema}' não suportado.")
-            df = _coleta(sis, tipo)
-            if df.empty and tipo == "mensal":
-                # fallback: diário do mesmo mês
-                df = _coleta(sis, "diario")
+                raise ValueError(f"Sistema '{sis}' não suportado.")
+        prefs = ("mercado", "reguladas") if prefer == "ambos" else (prefer,)
+
+        coletas = _coletar_modalidades_agrupadas(coletor, sistemas, prefs, tipo, mes, inicio, prazo_s=prazo_s)
+
+        for sis in sistemas:
+            # usa o tipo pedido; o diário só entra se o mensal veio vazio
+            for tipo_local in (tipo, "diario"):
+                dfs = {p: coletas.get((sis, p, tipo_local)) for p in prefs}
+                dfs = {p: d for p, d in dfs.items() if d is not None}
+                for p, d in dfs.items():
+                    stats.setdefault(sis, {})[f"{tipo_local}_{p}"] = len(d)
+                df = _unir_por_instituicao(list(dfs.values()))
+                if prefer == "ambos" and dfs:
+                    stats.setdefault(sis, {})[f"{tipo_local}_unidos"] = len(df)
+                if not df.empty or tipo_local == "diario":
+                    break
             if df.empty:
                 continue
             df = df.sort_values("instituicao")
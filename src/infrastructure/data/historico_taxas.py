@@ -0,0 +1,295 @@
+"""
+Histórico local de taxas por instituição (Olinda `TaxasJurosMensalPorMes`), em colunas.
+
+`gerar_bancos_csv_real` olha um mês só; aqui `preencher_historico` baixa N meses das seis
+modalidades imobiliárias (uma consulta combinada por mês, vários meses em paralelo) e guarda
+cada mês numa partição própria, coluna a coluna, para consultas de tendência por banco sem
+voltar à API.
+
+Layout em disco:
+    <diretorio>/_instituicoes.json            nomes internados: id = posição na lista
+    <diretorio>/_indice.json                  {mês: linhas} das partições gravadas
+    <diretorio>/mes=<AAAA-MM>/instituicao.npy int32 (id do nome)
+    <diretorio>/mes=<AAAA-MM>/modalidade.npy  int32 (código da modalidade)
+    <diretorio>/mes=<AAAA-MM>/taxa_anual.npy  float64 (fração a.a.)
+
+- As colunas são lidas com `np.load(mmap_mode="r")` e filtradas por id/código antes de
+  qualquer DataFrame: a série de um banco custa O(meses), sem ler nomes nem outras colunas.
+- Nomes são internados uma vez (a tabela só cresce); ids de partições antigas nunca mudam.
+- Toda escrita é atômica: os JSON via temporário + `os.replace`, e cada partição é montada
+  num diretório temporário e só então renomeada para `mes=<AAAA-MM>`. O índice é gravado por
+  último, então uma partição interrompida simplesmente não aparece e é coletada de novo; ao
+  refazer um mês, ele sai do índice antes da troca, e nenhum leitor vê colunas misturadas.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .coletor_txjuros import MODALIDADES_IMOBILIARIO, ColetorTxJuros, ResultadoColeta
+    from .escrita_atomica import gravar_atomico
+    from .gerador_bancos import _last_closed_month_yyyy_mm
+    from .prazo import PrazoEsgotado, orcamento, submeter
+except ImportError:  # executado direto (PYTHONPATH=src)
+    from infrastructure.data.coletor_txjuros import MODALIDADES_IMOBILIARIO, ColetorTxJuros, ResultadoColeta  # type: ignore
+    from infrastructure.data.escrita_atomica import gravar_atomico  # type: ignore
+    from infrastructure.data.gerador_bancos import _last_closed_month_yyyy_mm  # type: ignore
+    from infrastructure.data.prazo import PrazoEsgotado, orcamento, submeter  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_HISTORICO = os.path.join("dados", "historico_taxas")
+ARQUIVO_INSTITUICOES = "_instituicoes.json"
+ARQUIVO_INDICE = "_indice.json"
+# meses coletados ao mesmo tempo em preencher_historico
+MAX_MESES_PARALELOS = 4
+# coluna -> dtype gravado em cada partição
+COLUNAS = {"instituicao": np.int32, "modalidade": np.int32, "taxa_anual": np.float64}
+
+
+def _gravar_json(caminho: str, obj) -> None:
+    gravar_atomico(caminho, json.dumps(obj, ensure_ascii=False, sort_keys=True))
+
+
+def meses_ate(fim: str, n: int) -> List[str]:
+    """Os `n` meses ("YYYY-MM") que terminam em `fim`, do mais antigo ao mais recente."""
+    ano, mes = int(fim[:4]), int(fim[5:7])
+    chave = ano * 12 + mes - 1
+    return [f"{k // 12:04d}-{k % 12 + 1:02d}" for k in range(chave - n + 1, chave + 1)]
+
+
+class HistoricoTaxas:
+    """
+    Armazém local de taxas mensais por instituição e modalidade, particionado por mês.
+
+    Uso:
+        hist = HistoricoTaxas("dados/historico_taxas")
+        preencher_historico(hist, 24)                      # últimos 24 meses fechados
+        hist.serie("CAIXA ECONOMICA FEDERAL", 903101)      # mes/taxa_anual
+        hist.ler(desde="2024-01", modalidades=[903201])    # tabela longa
+    """
+
+    def __init__(self, diretorio: str = DIRETORIO_HISTORICO):
+        self.diretorio = os.path.abspath(diretorio)
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._lock = threading.Lock()
+        self._nomes: List[str] = self._carregar(ARQUIVO_INSTITUICOES, [])
+        self._ids: Dict[str, int] = {nome: i for i, nome in enumerate(self._nomes)}
+        self._indice: Dict[str, int] = self._carregar(ARQUIVO_INDICE, {})
+
+    def _carregar(self, arquivo: str, padrao):
+        caminho = os.path.join(self.diretorio, arquivo)
+        if not os.path.exists(caminho):
+            return padrao
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _particao(self, mes: str) -> str:
+        return os.path.join(self.diretorio, f"mes={mes}")
+
+    # ------------------------------ nomes ------------------------------ #
+    @property
+    def instituicoes(self) -> List[str]:
+        """Nomes internados (o id de cada um é a sua posição)."""
+        return list(self._nomes)
+
+    def id_instituicao(self, nome: str) -> Optional[int]:
+        return self._ids.get(str(nome).strip())
+
+    def _internar(self, nomes: Iterable[str]) -> np.ndarray:
+        """Ids dos `nomes`, acrescentando à tabela os que ainda não existem (chamar com o lock)."""
+        ids = []
+        for nome in nomes:
+            nome = str(nome).strip()
+            i = self._ids.get(nome)
+            if i is None:
+                i = self._ids[nome] = len(self._nomes)
+                self._nomes.append(nome)
+            ids.append(i)
+        return np.asarray(ids, dtype=COLUNAS["instituicao"])
+
+    # ----------------------------- escrita ----------------------------- #
+    def meses(self) -> List[str]:
+        """Meses gravados, em ordem."""
+        return sorted(self._indice)
+
+    def gravar_mes(self, mes: str, df: pd.DataFrame) -> int:
+        """
+        Grava (ou substitui) a partição de `mes` a partir de um DataFrame com colunas
+        instituicao, codigo_modalidade e taxa_anual (como os do ColetorTxJuros). Retorna o
+        número de linhas gravadas; DataFrame vazio não grava nada.
+        """
+        mes = str(mes)[:7]
+        df = df.dropna(subset=["taxa_anual"])
+        if df.empty:
+            return 0
+        with self._lock:
+            n_nomes = len(self._nomes)
+            colunas = {
+                "instituicao": self._internar(df["instituicao"]),
+                "modalidade": df["codigo_modalidade"].to_numpy(dtype=COLUNAS["modalidade"]),
+                "taxa_anual": df["taxa_anual"].to_numpy(dtype=COLUNAS["taxa_anual"]),
+            }
+            if len(self._nomes) > n_nomes:  # nomes antes da partição que os usa
+                _gravar_json(os.path.join(self.diretorio, ARQUIVO_INSTITUICOES), self._nomes)
+            self._trocar_particao(mes, colunas)
+            self._indice[mes] = len(df)
+            _gravar_json(os.path.join(self.diretorio, ARQUIVO_INDICE), self._indice)
+        return len(df)
+
+    def _trocar_particao(self, mes: str, colunas: Dict[str, np.ndarray]) -> None:
+        """Monta a partição num diretório temporário e a troca com a atual (chamar com o lock)."""
+        particao = self._particao(mes)
+        nova = tempfile.mkdtemp(dir=self.diretorio, prefix=f".tmp_mes={mes}_")
+        try:
+            for nome, valores in colunas.items():
+                np.save(os.path.join(nova, f"{nome}.npy"), valores)
+            if mes in self._indice:  # refazer: o mês some do índice enquanto as colunas trocam
+                del self._indice[mes]
+                _gravar_json(os.path.join(self.diretorio, ARQUIVO_INDICE), self._indice)
+            antiga = f"{nova}_antiga"
+            if os.path.exists(particao):
+                os.rename(particao, antiga)
+            os.rename(nova, particao)
+        except BaseException:
+            shutil.rmtree(nova, ignore_errors=True)
+            raise
+        shutil.rmtree(antiga, ignore_errors=True)
+
+    def gravar_resultados(self, mes: str, resultados: Dict[int, ResultadoColeta]) -> int:
+        """Grava o retorno de `coletar_mensal_modalidades` ({código: ResultadoColeta}) como a partição de `mes`."""
+        frames = [r.df for r in resultados.values() if r is not None and not r.df.empty]
+        return self.gravar_mes(mes, pd.concat(frames, ignore_index=True)) if frames else 0
+
+    # ----------------------------- leitura ----------------------------- #
+    def _coluna(self, mes: str, nome: str) -> np.ndarray:
+        return np.load(os.path.join(self._particao(mes), f"{nome}.npy"), mmap_mode="r")
+
+    def _selecionar(self, desde: Optional[str], ate: Optional[str]) -> List[str]:
+        return [m for m in self.meses() if (desde is None or m >= desde[:7]) and (ate is None or m <= ate[:7])]
+
+    def serie(self, instituicao: str, codigo_modalidade: int,
+              desde: Optional[str] = None, ate: Optional[str] = None) -> pd.DataFrame:
+        """Taxa mês a mês de uma instituição numa modalidade: colunas mes, taxa_anual."""
+        i = self.id_instituicao(instituicao)
+        meses: List[str] = []
+        taxas: List[float] = []
+        if i is not None:
+            for mes in self._selecionar(desde, ate):
+                sel = (self._coluna(mes, "instituicao") == i) & (self._coluna(mes, "modalidade") == int(codigo_modalidade))
+                if sel.any():
+                    meses.append(mes)
+                    taxas.append(float(self._coluna(mes, "taxa_anual")[sel][0]))
+        return pd.DataFrame({"mes": meses, "taxa_anual": pd.Series(taxas, dtype="float64")})
+
+    def ler(self, desde: Optional[str] = None, ate: Optional[str] = None,
+            modalidades: Optional[Iterable[int]] = None,
+            instituicoes: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Tabela longa (mes, instituicao, codigo_modalidade, taxa_anual) dos meses entre `desde` e
+        `ate`, opcionalmente só de algumas modalidades/instituições (filtradas nas colunas).
+        """
+        cods = None if modalidades is None else np.asarray([int(c) for c in modalidades], dtype=COLUNAS["modalidade"])
+        ids = None
+        if instituicoes is not None:
+            ids = np.asarray([i for i in map(self.id_instituicao, instituicoes) if i is not None],
+                             dtype=COLUNAS["instituicao"])
+        partes = []
+        for mes in self._selecionar(desde, ate):
+            inst, mod = self._coluna(mes, "instituicao"), self._coluna(mes, "modalidade")
+            sel = np.ones(len(inst), dtype=bool)
+            if cods is not None:
+                sel &= np.isin(mod, cods)
+            if ids is not None:
+                sel &= np.isin(inst, ids)
+            partes.append((mes, inst[sel], mod[sel], self._coluna(mes, "taxa_anual")[sel]))
+        nomes = np.asarray(self._nomes, dtype=object)
+        if not partes:
+            return pd.DataFrame({"mes": [], "instituicao": [], "codigo_modalidade": pd.Series(dtype="int32"),
+                                 "taxa_anual": pd.Series(dtype="float64")})
+        return pd.DataFrame({
+            "mes": np.concatenate([np.full(len(p[1]), p[0], dtype=object) for p in partes]),
+            "instituicao": nomes[np.concatenate([p[1] for p in partes])],
+            "codigo_modalidade": np.concatenate([p[2] for p in partes]),
+            "taxa_anual": np.concatenate([p[3] for p in partes]),
+        })
+
+
+# ------------------------------ coleta ------------------------------ #
+
+def preencher_historico(
+    historico: HistoricoTaxas,
+    meses: Iterable[str] | int,
+    *,
+    coletor: Optional[ColetorTxJuros] = None,
+    codigos_modalidade: Iterable[int] = MODALIDADES_IMOBILIARIO,
+    codigo_segmento: int = 1,
+    max_workers: int = MAX_MESES_PARALELOS,
+    refazer: bool = False,
+    prazo_s: Optional[float] = None,
+) -> Dict[str, int]:
+    """
+    Coleta os `meses` (lista "YYYY-MM" ou N = últimos N meses fechados) com até `max_workers`
+    meses em voo, uma consulta combinada das modalidades por mês, e grava cada mês assim que
+    chega. Meses já gravados são pulados (a menos que `refazer`); meses sem dados ou com falha
+    ficam de fora e são tentados de novo na próxima execução.
+
+    Retorna {mês: linhas gravadas} (0 = sem dados/falha; meses pulados não aparecem).
+    """
+    if isinstance(meses, int):
+        meses = meses_ate(_last_closed_month_yyyy_mm(), meses)
+    existentes = set(historico.meses())
+    pendentes = [m[:7] for m in meses if refazer or m[:7] not in existentes]
+    if not pendentes:
+        return {}
+    coletor = coletor or ColetorTxJuros()
+    codigos = list(codigos_modalidade)
+    gravadas: Dict[str, int] = {}
+    with orcamento(prazo_s), ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pendentes))),
+                                                thread_name_prefix="historico") as pool:
+        futuros = {submeter(pool, coletor.coletar_mensal_modalidades, mes, codigos, codigo_segmento): mes
+                   for mes in pendentes}
+        for fut in as_completed(futuros):
+            mes = futuros[fut]
+            try:
+                gravadas[mes] = historico.gravar_resultados(mes, fut.result())
+            except PrazoEsgotado as e:
+                logger.warning("Histórico %s: %s", mes, e)
+                gravadas[mes] = 0
+            except Exception as e:  # falha de um mês não derruba os demais
+                logger.warning("Histórico %s: coleta falhou (%s)", mes, e)
+                gravadas[mes] = 0
+            else:
+                if not gravadas[mes]:
+                    logger.info("Histórico %s: sem dados publicados", mes)
+    return dict(sorted(gravadas.items()))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Preenche o histórico local de taxas (Olinda) por mês.")
+    parser.add_argument("--meses", type=int, default=24, help="últimos N meses fechados")
+    parser.add_argument("--fim", default=None, help="último mês (YYYY-MM); padrão: último mês fechado")
+    parser.add_argument("--dir", default=DIRETORIO_HISTORICO)
+    parser.add_argument("--paralelo", type=int, default=MAX_MESES_PARALELOS)
+    parser.add_argument("--refazer", action="store_true", help="coleta de novo meses já gravados")
+    args = parser.parse_args()
+
+    hist = HistoricoTaxas(args.dir)
+    alvo = meses_ate(args.fim or _last_closed_month_yyyy_mm(), args.meses)
+    resumo = preencher_historico(hist, alvo, max_workers=args.paralelo, refazer=args.refazer)
+    for mes, n in resumo.items():
+        print(f"{mes}: {n} linha(s)")
+    print(f"meses gravados: {len(hist.meses())} | instituições: {len(hist.instituicoes)}")
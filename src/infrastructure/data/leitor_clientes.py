@@ -0,0 +1,59 @@
+"""
+Leitura em blocos de arquivos de pedidos de financiamento (CSV ou Parquet), para lotes grandes.
+
+Cada bloco é um DataFrame com no máximo `linhas_por_bloco` linhas; o arquivo nunca é
+carregado inteiro. `pular` descarta as primeiras linhas de dados (retomada de um lote).
+
+Colunas esperadas: valor_total, entrada, prazo_anos e, opcionalmente, cliente.
+Parquet requer `pyarrow` (dependência opcional, importada só quando usada).
+"""
+from __future__ import annotations
+
+import os
+from typing import Iterator
+
+import pandas as pd
+
+COLUNAS_CLIENTES = ("valor_total", "entrada", "prazo_anos")
+
+
+def _validar_colunas(df: pd.DataFrame, caminho: str) -> pd.DataFrame:
+    faltando = [c for c in COLUNAS_CLIENTES if c not in df.columns]
+    if faltando:
+        raise ValueError(f"{caminho}: colunas ausentes: {', '.join(faltando)}")
+    return df
+
+
+def ler_em_blocos(caminho: str, linhas_por_bloco: int = 50_000, pular: int = 0) -> Iterator[pd.DataFrame]:
+    """Gera blocos (DataFrame) de `caminho` (.csv ou .parquet), a partir da linha de dados `pular`."""
+    if linhas_por_bloco < 1:
+        raise ValueError(f"linhas_por_bloco inválido: {linhas_por_bloco!r}")
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(f"Arquivo de clientes não encontrado: {caminho}")
+
+    if caminho.lower().endswith(".parquet"):
+        yield from _ler_parquet(caminho, linhas_por_bloco, pular)
+        return
+
+    # predicado, não range: o pandas converte um range em set (memória proporcional a `pular`)
+    pular_linha = (lambda i: 0 < i <= pular) if pular else None
+    leitor = pd.read_csv(caminho, chunksize=linhas_por_bloco, skiprows=pular_linha, encoding="utf-8-sig")
+    with leitor:
+        for bloco in leitor:
+            yield _validar_colunas(bloco, caminho)
+
+
+def _ler_parquet(caminho: str, linhas_por_bloco: int, pular: int) -> Iterator[pd.DataFrame]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Leitura de Parquet requer o pacote 'pyarrow' (pip install pyarrow).") from e
+
+    arquivo = pq.ParquetFile(caminho)
+    for lote in arquivo.iter_batches(batch_size=linhas_por_bloco):
+        if pular >= lote.num_rows:
+            pular -= lote.num_rows
+            continue
+        bloco = lote.slice(pular).to_pandas()
+        pular = 0
+        yield _validar_colunas(bloco, caminho)
@@ -1,18 +1,85 @@
+import logging
+import os
+from functools import lru_cache
+from typing import Tuple
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+# Bytes lidos do início do arquivo para detectar encoding e separador
+_TAMANHO_AMOSTRA = 4096
+# Separadores aceitos, em ordem de preferência (';' é o padrão do Bacen)
+_SEPARADORES = (";", ",", "\t", "|")
+
+
+def _detectar_encoding(amostra: bytes) -> str:
+    """UTF-8 (com ou sem BOM) se a amostra decodificar; caso contrário, ISO-8859-1 (padrão do Bacen)."""
+    try:
+        amostra.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # a amostra pode ter cortado um caractere multibyte no final
+        if e.start < len(amostra) - 3:
+            return "ISO-8859-1"
+    return "utf-8-sig" if amostra.startswith(b"\xef\xbb\xbf") else "utf-8"
+
+
+def _detectar_separador(texto: str, completo: bool) -> str:
+    """
+    Escolhe o separador que aparece o mesmo número de vezes (> 0) em todas as linhas da amostra,
+    incluindo o cabeçalho. Em empate, vale a ordem de `_SEPARADORES`.
+    """
+    linhas = [ln for ln in texto.splitlines() if ln.strip()]
+    if not completo and len(linhas) > 1:
+        linhas = linhas[:-1]  # última linha pode estar truncada
+    if not linhas:
+        return ","
+    for sep in _SEPARADORES:
+        contagens = {ln.count(sep) for ln in linhas}
+        if len(contagens) == 1 and contagens.pop() > 0:
+            return sep
+    # sem separador consistente: o mais frequente
+    return max(_SEPARADORES, key=texto.count) if any(s in texto for s in _SEPARADORES) else ","
+
+
+@lru_cache(maxsize=64)
+def _dialeto_cache(caminho: str, tamanho: int, mtime_ns: int) -> Tuple[str, str]:
+    """Detecta (encoding, separador) uma única vez por impressão digital do arquivo (caminho, tamanho, mtime)."""
+    with open(caminho, "rb") as f:
+        amostra = f.read(_TAMANHO_AMOSTRA)
+    encoding = _detectar_encoding(amostra)
+    texto = amostra.decode("ISO-8859-1" if encoding == "ISO-8859-1" else "utf-8", errors="ignore")
+    sep = _detectar_separador(texto, completo=len(amostra) < _TAMANHO_AMOSTRA)
+    logger.debug("Dialeto detectado para %s: encoding=%s sep=%r", caminho, encoding, sep)
+    return encoding, sep
+
+
+def detectar_dialeto(caminho: str) -> Tuple[str, str]:
+    """Retorna (encoding, separador) do CSV, reaproveitando a detecção enquanto o arquivo não mudar."""
+    caminho = os.path.abspath(caminho)
+    st = os.stat(caminho)
+    return _dialeto_cache(caminho, st.st_size, st.st_mtime_ns)
+
+
 def ler_csv(caminho: str) -> pd.DataFrame:
     """
     Lê e trata o CSV do IPCA proveniente do BACEN.
 
     Etapas:
+    - Detecta encoding e separador a partir dos primeiros KB (cacheado por arquivo)
+    - Lê com o engine C, apenas as duas primeiras colunas, como texto
     - Renomeia colunas para 'data' e 'ipca'
     - Remove linha final com a fonte (se existir)
     - Converte vírgula decimal para ponto
     - Remove entradas inválidas ou vazias
     - Converte IPCA para float
     """
-    df = pd.read_csv(caminho, encoding="ISO-8859-1", sep=None, engine="python")
-    print(df.head())  # verificar se veio algo
+    encoding, sep = detectar_dialeto(caminho)
+    df = pd.read_csv(
+        caminho, encoding=encoding, sep=sep, engine="c",
+        usecols=[0, 1], dtype=str, keep_default_na=False,
+    )
+    logger.debug("ler_csv(%s): %d linhas brutas", caminho, len(df))
     # Renomeia colunas para nomes tratáveis
     df = df.rename(columns={
         df.columns[0]: "data",
@@ -20,10 +87,10 @@ def ler_csv(caminho: str) -> pd.DataFrame:
     })
 
     # Remove linha com a fonte (se presente)
-    df = df[~df["data"].astype(str).str.contains("Fonte", case=False, na=False)]
+    df = df[~df["data"].str.contains("Fonte", case=False, na=False)]
 
     # Substitui vírgula por ponto, remove espaços e converte
-    df["ipca"] = df["ipca"].astype(str).str.replace(",", ".").str.strip()
+    df["ipca"] = df["ipca"].str.replace(",", ".", regex=False).str.strip()
 
     # Remove linhas em branco ou vazias
     df = df[df["ipca"] != ""]
@@ -0,0 +1,119 @@
+"""
+Leitura incremental de respostas JSON grandes (Olinda `{"value": [...]}`, SGS `[...]`).
+
+`r.json()` + `pd.DataFrame(valores)` mantém a resposta várias vezes em memória (bytes, texto,
+lista de dicts e o DataFrame). Aqui os objetos do array são decodificados um a um conforme os
+blocos chegam (`JSONDecoder.raw_decode` sobre um buffer que só guarda o trecho ainda não
+consumido) e vão direto para buffers por coluna. Um filtro opcional descarta as linhas
+indesejadas antes de qualquer cópia, então o pico de memória fica em ~1 bloco + as linhas
+aceitas, qualquer que seja o tamanho da resposta.
+
+Os elementos do array devem ser objetos (como nas APIs do BACEN).
+"""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+_DECODER = json.JSONDecoder()
+_SEPARADORES = re.compile(r"[\s,]*")
+_INICIO_ARRAY = re.compile(r"\s*\[")
+# Bytes preservados do fim do buffer enquanto a chave do array não aparece
+_FOLGA_CHAVE = 64
+
+
+def iterar_objetos(blocos: Iterable[bytes], chave: Optional[str] = None) -> Iterator[Any]:
+    """
+    Objetos do array JSON lidos de `blocos` (bytes UTF-8, em qualquer fragmentação).
+
+    Com `chave`, o array é o valor de `"chave": [...]` (ex.: "value" do OData); sem ela, o
+    documento inteiro deve ser um array. Levanta ValueError se o array não for encontrado ou
+    o documento terminar no meio de um elemento.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    fonte = iter(blocos)
+    buf, pos, acabou = "", 0, False
+
+    def _ler_mais() -> None:
+        nonlocal buf, pos, acabou
+        bloco = next(fonte, None)
+        if bloco is None:
+            acabou = True
+            buf = buf[pos:] + decodificador.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + decodificador.decode(bloco)
+        pos = 0
+
+    padrao = re.compile(r'"%s"\s*:\s*\[' % re.escape(chave)) if chave else _INICIO_ARRAY
+    while True:
+        m = padrao.search(buf, pos) if chave else padrao.match(buf, pos)
+        if m:
+            pos = m.end()
+            break
+        if acabou:
+            raise ValueError(f"Array JSON {'de ' + repr(chave) + ' ' if chave else ''}não encontrado")
+        if chave:
+            pos = max(pos, len(buf) - len(chave) - _FOLGA_CHAVE)
+        elif buf[pos:].strip():
+            raise ValueError("Documento JSON não é um array")
+        _ler_mais()
+
+    while True:
+        pos = _SEPARADORES.match(buf, pos).end()
+        if pos >= len(buf):
+            if acabou:
+                raise ValueError("JSON truncado: array sem ']'")
+            _ler_mais()
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            obj, fim = _DECODER.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if acabou:
+                raise
+            _ler_mais()  # elemento incompleto: junta o próximo bloco e tenta de novo
+            continue
+        pos = fim
+        yield obj
+
+
+def ler_colunas(blocos: Iterable[bytes], chave: Optional[str] = None,
+                filtro: Optional[Callable[[dict], bool]] = None) -> Tuple[Dict[str, List[Any]], int]:
+    """
+    Lê o array em buffers por coluna ({coluna: valores}), aplicando `filtro` a cada objeto.
+    Retorna (colunas, linhas lidas antes do filtro). Chaves ausentes viram None.
+    """
+    colunas: Dict[str, List[Any]] = {}
+    aceitas = lidas = 0
+    for obj in iterar_objetos(blocos, chave):
+        lidas += 1
+        if not isinstance(obj, dict) or (filtro is not None and not filtro(obj)):
+            continue
+        for k, v in obj.items():
+            col = colunas.get(k)
+            if col is None:
+                col = colunas[k] = [None] * aceitas
+            col.append(v)
+        aceitas += 1
+        if len(obj) != len(colunas):
+            for col in colunas.values():
+                if len(col) < aceitas:
+                    col.append(None)
+    return colunas, lidas
+
+
+def ler_dataframe(blocos: Iterable[bytes], chave: Optional[str] = None,
+                  filtro: Optional[Callable[[dict], bool]] = None) -> pd.DataFrame:
+    """
+    DataFrame das linhas aceitas por `filtro`; `df.attrs["linhas_lidas"]` guarda quantas
+    linhas a resposta tinha (para paginação: página vazia != página sem linhas aceitas).
+    """
+    colunas, lidas = ler_colunas(blocos, chave, filtro)
+    df = pd.DataFrame(colunas)
+    df.attrs["linhas_lidas"] = lidas
+    return df
@@ -0,0 +1,276 @@
+"""
+Normalização vetorizada de datas e números para todos os carregadores (IPCA, TR, taxas).
+
+Em vez de callbacks por elemento (`.map` com regex/split), o formato da coluna é detectado
+a partir de uma amostra e a coluna inteira é convertida de uma vez:
+  - datas em layout fixo ("DD/MM/YYYY", "MM/YYYY", "YYYY-MM", "YYYY-MM-DD", "YYYY/MM") são
+    decodificadas direto dos bytes com NumPy; apenas as sobras fora do layout (ex.: rodapé
+    "Fonte", meses sem zero à esquerda) passam por um único `pd.to_datetime`;
+  - números em texto ("0,45", "1.234,5", "12,3% a.a.") são limpos direto nos bytes e
+    convertidos com `ndarray.astype(float)`; só linhas inválidas vão para `pd.to_numeric`.
+
+Convenção de saída das datas mensais: "YYYY-MM" (str); inválidas viram NaN.
+"""
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Tamanho da amostra usada para detectar o formato dominante da coluna
+AMOSTRA_FORMATO = 50
+
+
+@dataclass(frozen=True)
+class _Layout:
+    """Layout de data de largura fixa: posições (início, fim) de cada campo e separadores."""
+    formato: str
+    largura: int
+    ano: Tuple[int, int]
+    mes: Tuple[int, int]
+    dia: Optional[Tuple[int, int]]
+    separadores: Tuple[Tuple[int, str], ...]
+
+
+LAYOUTS: Tuple[_Layout, ...] = (
+    _Layout("%d/%m/%Y", 10, (6, 10), (3, 5), (0, 2), ((2, "/"), (5, "/"))),
+    _Layout("%Y-%m-%d", 10, (0, 4), (5, 7), (8, 10), ((4, "-"), (7, "-"))),
+    _Layout("%m/%Y", 7, (3, 7), (0, 2), None, ((2, "/"),)),
+    _Layout("%Y-%m", 7, (0, 4), (5, 7), None, ((4, "-"),)),
+    _Layout("%Y/%m", 7, (0, 4), (5, 7), None, ((4, "/"),)),
+)
+_POR_FORMATO = {lay.formato: lay for lay in LAYOUTS}
+
+
+# ------------------------------- Datas ------------------------------------ #
+
+def _como_bytes(serie: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte a coluna para um array de bytes (largura do maior valor, sem espaços) e seus comprimentos."""
+    s = serie.astype(str)
+    try:
+        b = np.asarray(s.to_numpy(dtype=object, na_value=""), dtype="S")
+    except UnicodeEncodeError:
+        # caracteres não-ASCII nunca formam data válida: viram '?' e caem nas sobras
+        b = np.asarray(s.str.encode("ascii", errors="replace").fillna(b"").to_numpy(dtype=object),
+                       dtype="S")
+    b = np.char.strip(b)
+    return b, np.char.str_len(b)
+
+
+def _decodificar(b: np.ndarray, tamanhos: np.ndarray, lay: _Layout) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Lê (ano, mes, dia, valido) dos bytes segundo o layout, numa única operação NumPy."""
+    m = b.astype(f"S{lay.largura}").view(np.uint8).reshape(len(b), lay.largura).astype(np.int16)
+    dig = m - ord("0")
+
+    def _campo(ini_fim: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        ini, fim = ini_fim
+        bloco = dig[:, ini:fim]
+        ok = ((bloco >= 0) & (bloco <= 9)).all(axis=1)
+        pesos = 10 ** np.arange(fim - ini - 1, -1, -1)
+        return (bloco * pesos).sum(axis=1), ok
+
+    ano, ok_a = _campo(lay.ano)
+    mes, ok_m = _campo(lay.mes)
+    if lay.dia is not None:
+        dia, ok_d = _campo(lay.dia)
+    else:
+        dia, ok_d = np.ones(len(b), dtype=np.int64), True
+    valido = (tamanhos == lay.largura) & ok_a & ok_m & ok_d
+    for pos, ch in lay.separadores:
+        valido &= m[:, pos] == ord(ch)
+    valido &= (mes >= 1) & (mes <= 12) & (dia >= 1) & (dia <= 31)
+    return ano.astype(np.int64), mes.astype(np.int64), dia.astype(np.int64), valido
+
+
+def detectar_formato_data(serie: pd.Series, amostra: int = AMOSTRA_FORMATO) -> Optional[str]:
+    """
+    Detecta o formato dominante das datas a partir das primeiras `amostra` linhas.
+    Retorna o código strftime (ex.: "%m/%Y") ou None se nenhum layout conhecido casar.
+    """
+    head = serie.head(amostra)
+    if head.empty:
+        return None
+    b, tam = _como_bytes(head)
+    melhor, acertos = None, 0
+    for lay in LAYOUTS:
+        n = int(_decodificar(b, tam, lay)[3].sum())
+        if n > acertos:
+            melhor, acertos = lay.formato, n
+    return melhor
+
+
+def componentes_data(serie: pd.Series, dayfirst: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Retorna (ano, mes, dia, valido) como arrays NumPy para a coluna inteira.
+
+    Ordem: formato detectado na amostra -> demais layouts só para as sobras -> um único
+    `pd.to_datetime(dayfirst=...)` para o que restar.
+    """
+    n = len(serie)
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        valido = serie.notna().to_numpy()
+        return (serie.dt.year.fillna(0).to_numpy(dtype=np.int64),
+                serie.dt.month.fillna(1).to_numpy(dtype=np.int64),
+                serie.dt.day.fillna(1).to_numpy(dtype=np.int64),
+                valido)
+
+    ano = np.zeros(n, dtype=np.int64)
+    mes = np.ones(n, dtype=np.int64)
+    dia = np.ones(n, dtype=np.int64)
+    valido = np.zeros(n, dtype=bool)
+    if n == 0:
+        return ano, mes, dia, valido
+
+    b, tam = _como_bytes(serie)
+    # "DD/MM/YYYY" só faz sentido com dayfirst; sem ele, fica para o parser genérico
+    layouts = [lay for lay in LAYOUTS if dayfirst or lay.formato != "%d/%m/%Y"]
+    detectado = detectar_formato_data(serie)
+    ordem = [_POR_FORMATO[detectado]] if detectado and _POR_FORMATO[detectado] in layouts else []
+    ordem += [lay for lay in layouts if lay not in ordem]
+    for lay in ordem:
+        pend = ~valido & (tam > 0)
+        if not pend.any():
+            break
+        a, m, d, ok = _decodificar(b, tam, lay)
+        novo = pend & ok
+        ano[novo], mes[novo], dia[novo] = a[novo], m[novo], d[novo]
+        valido |= novo
+
+    pend = ~valido & (tam > 0)
+    if pend.any():
+        resto = pd.Series(b[pend]).str.decode("ascii")
+        with warnings.catch_warnings():
+            # sobras são heterogêneas por definição: o aviso de "formato não inferido" é esperado
+            warnings.simplefilter("ignore", UserWarning)
+            dt = pd.to_datetime(resto, dayfirst=dayfirst, errors="coerce")
+        ok = dt.notna().to_numpy()
+        idx = np.flatnonzero(pend)[ok]
+        ano[idx] = dt.dt.year.to_numpy()[ok]
+        mes[idx] = dt.dt.month.to_numpy()[ok]
+        dia[idx] = dt.dt.day.to_numpy()[ok]
+        valido[idx] = True
+    return ano, mes, dia, valido
+
+
+def rotulos_ano_mes(chave_mes: np.ndarray) -> pd.Series:
+    """Converte chaves inteiras de mês (ano*12 + mês-1) em rótulos "YYYY-MM" montados byte a byte."""
+    chave_mes = np.asarray(chave_mes, dtype=np.int64)
+    ano, mes = chave_mes // 12, chave_mes % 12 + 1
+    m = np.empty((len(chave_mes), 7), dtype=np.uint8)
+    for i, peso in enumerate((1000, 100, 10, 1)):
+        m[:, i] = ano // peso % 10 + ord("0")
+    m[:, 4] = ord("-")
+    m[:, 5] = mes // 10 + ord("0")
+    m[:, 6] = mes % 10 + ord("0")
+    return pd.Series(m.view("S7").ravel().astype("U7").astype(object), dtype=str)
+
+
+def para_ano_mes(serie: pd.Series, dayfirst: bool = True) -> pd.Series:
+    """Normaliza a coluna de datas para "YYYY-MM" (NaN onde não for possível interpretar)."""
+    ano, mes, _, valido = componentes_data(serie, dayfirst=dayfirst)
+    out = rotulos_ano_mes(ano * 12 + mes - 1)
+    out.index = serie.index
+    return out.where(valido)
+
+
+def para_datetime(serie: pd.Series, dayfirst: bool = True) -> pd.Series:
+    """Normaliza a coluna de datas para datetime64 (NaT onde não for possível interpretar)."""
+    ano, mes, dia, valido = componentes_data(serie, dayfirst=dayfirst)
+    partes = pd.DataFrame({"year": ano, "month": mes, "day": dia}, index=serie.index)
+    dt = pd.to_datetime(partes, errors="coerce")
+    return dt.where(valido)
+
+
+# ------------------------------ Números ----------------------------------- #
+
+# Sufixos comuns em taxas digitadas à mão ("12,5% a.a.")
+SUFIXOS_TAXA = ("%", "a.a.", "a.a", "aa")
+
+
+def _tabela_bytes(caracteres: bytes) -> np.ndarray:
+    """Tabela de consulta byte -> bool (mais barata que `np.isin` por elemento)."""
+    tab = np.zeros(256, dtype=bool)
+    tab[np.frombuffer(caracteres, dtype=np.uint8)] = True
+    return tab
+
+
+# Bytes aceitos por `ndarray.astype(float)` depois da limpeza (NUL = fim da string)
+_BYTES_NUMERICOS = _tabela_bytes(b"0123456789.-+eE\x00")
+_BYTES_ESPACO = _tabela_bytes(b" \t")
+
+
+def _limpar_bytes_numericos(b: np.ndarray, remover: Tuple[str, ...], remover_milhar: bool) -> np.ndarray:
+    """
+    Limpa números em texto direto nos bytes: remove tokens/espaços/milhar e troca ',' por '.'.
+    Caracteres removidos viram NUL e são compactados para o fim de cada linha.
+    """
+    for tok in remover:
+        if len(tok) > 1:
+            b = np.char.replace(b, tok.encode("ascii"), b"")
+    largura = max(int(np.char.str_len(b).max(initial=0)), 1)
+    v = b.astype(f"S{largura}").view(np.uint8).reshape(len(b), largura)
+    apagar = _BYTES_ESPACO[v]
+    for tok in remover:
+        if len(tok) == 1:
+            apagar |= v == ord(tok)
+    if remover_milhar:
+        apagar |= v == ord(".")
+    v[apagar] = 0
+    v[v == ord(",")] = ord(".")
+    if apagar.any():
+        # compacta: NULs vão para o fim (ordenação estável por linha)
+        ordem = np.argsort(v == 0, axis=1, kind="stable")
+        v = np.take_along_axis(v, ordem, axis=1)
+    return v.view(f"S{largura}").ravel()
+
+
+def para_numero(serie: pd.Series, remover_milhar: bool = False, remover: Tuple[str, ...] = ("%",)) -> pd.Series:
+    """
+    Converte a coluna para float de forma vetorizada.
+
+    - Colunas já numéricas passam direto.
+    - Texto: remove os tokens de `remover` e espaços, opcionalmente o '.' de milhar, troca ','
+      por '.' e converte com `ndarray.astype(float)`. Só as linhas que não formam número
+      (ex.: rodapé "Fonte") passam por `pd.to_numeric(errors="coerce")` e viram NaN.
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float)
+    s = serie.astype(str)
+    try:
+        b = np.asarray(s.to_numpy(dtype=object, na_value=""), dtype="S")
+    except UnicodeEncodeError:
+        b = None
+    if b is None:
+        # não-ASCII: caminho pandas (raro em séries do Bacen)
+        t = s
+        for tok in remover:
+            t = t.str.replace(tok, "", regex=False)
+        if remover_milhar:
+            t = t.str.replace(".", "", regex=False)
+        t = t.str.replace(",", ".", regex=False).str.replace(r"\s", "", regex=True)
+        return pd.to_numeric(t, errors="coerce").astype(float)
+
+    b = _limpar_bytes_numericos(b, tuple(remover), remover_milhar)
+    v = b.view(np.uint8).reshape(len(b), b.dtype.itemsize)
+    ok = _BYTES_NUMERICOS[v].all(axis=1) & (v[:, 0] != 0)
+    out = np.full(len(b), np.nan)
+    try:
+        out[ok] = b[ok].astype(float)
+    except ValueError:
+        ok[:] = False  # ex.: "1.2.3" — deixa o pandas decidir linha a linha
+    if not ok.all():
+        resto = pd.Series(b[~ok]).str.decode("ascii")
+        out[~ok] = pd.to_numeric(resto, errors="coerce").to_numpy(dtype=float)
+    return pd.Series(out, index=serie.index)
+
+
+def taxa_para_fracao(serie: pd.Series, limiar_percentual: float = 1.5) -> pd.Series:
+    """
+    Converte taxas digitadas livremente ("12,5%", "0,11", "9.5 a.a.") para fração.
+    Valores >= `limiar_percentual` são interpretados como percentual e divididos por 100.
+    """
+    x = para_numero(serie, remover=SUFIXOS_TAXA)
+    return x.where(x < limiar_percentual, x / 100.0)
@@ -0,0 +1,141 @@
+"""
+Orçamento de tempo global para uma coleta online (SGS, Olinda).
+
+Sem prazo, as cadeias de fallback somam timeouts e backoffs por tentativa (ColetorTR: até seis
+tentativas de (5, 10)s; ColetorTxJuros: retry do transporte + backoff da aplicação) e um
+clique na UI pode ficar minutos parado. Com `orcamento(segundos)`, tudo o que roda dentro do
+bloco tira do mesmo saldo:
+
+  - timeouts de conexão/leitura são limitados ao tempo restante (sessao_http);
+  - backoffs (do transporte e da aplicação) não dormem além do prazo;
+  - esperas por estratégias concorrentes (ClienteSGS) terminam no prazo.
+
+Esgotado o prazo, a coleta usa o dado guardado mais recente (cache HTTP em disco, mesmo
+vencido, ou o RepositorioSeries) e o marca como desatualizado (`Prazo.desatualizados`,
+`df.attrs["desatualizado"]`); sem nada guardado, levanta `PrazoEsgotado`.
+
+O prazo vale para a thread atual via `contextvars`; threads de pools recebem o contexto com
+`submeter(pool, fn, ...)`.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# orçamento padrão de uma coleta disparada pela interface (segundos)
+PRAZO_PADRAO_S = 30.0
+
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+class PrazoEsgotado(RuntimeError):
+    """
+    O orçamento de tempo da coleta acabou e não há dado guardado para usar no lugar.
+    (Não deriva de TimeoutError/OSError: o requests embrulharia a exceção em ConnectionError.)
+    """
+
+
+class Prazo:
+    """Instante-limite (relógio monotônico) de uma coleta e registro dos dados desatualizados usados."""
+
+    def __init__(self, segundos: float):
+        self.segundos = float(segundos)
+        self.fim = time.monotonic() + self.segundos
+        self.desatualizados: List[str] = []
+        self._lock = threading.Lock()
+
+    def restante(self) -> float:
+        return max(0.0, self.fim - time.monotonic())
+
+    def esgotado(self) -> bool:
+        return time.monotonic() >= self.fim
+
+    def verificar(self, contexto: str = "") -> None:
+        """Levanta PrazoEsgotado se o prazo acabou."""
+        if self.esgotado():
+            raise PrazoEsgotado(f"Prazo de {self.segundos:.1f}s esgotado{': ' + contexto if contexto else ''}")
+
+    def limitar(self, timeout: Timeout, contexto: str = "") -> Timeout:
+        """
+        `timeout` do requests ((connect, read) ou único) limitado ao tempo restante; levanta
+        PrazoEsgotado se não resta tempo (o requests recusa timeout 0 com ValueError).
+        """
+        resto = self.restante()
+        if resto <= 0:
+            raise PrazoEsgotado(f"Prazo de {self.segundos:.1f}s esgotado{': ' + contexto if contexto else ''}")
+        if isinstance(timeout, tuple):
+            return tuple(resto if t is None else min(t, resto) for t in timeout)
+        return resto if timeout is None else min(timeout, resto)
+
+    def dormir(self, segundos: float, contexto: str = "") -> None:
+        """Dorme `segundos` se couber no prazo; senão levanta PrazoEsgotado sem esperar."""
+        if segundos >= self.restante():
+            raise PrazoEsgotado(f"Prazo de {self.segundos:.1f}s esgotado antes do backoff"
+                                f"{': ' + contexto if contexto else ''}")
+        time.sleep(segundos)
+
+    def marcar_desatualizado(self, fonte: str) -> None:
+        with self._lock:
+            if fonte not in self.desatualizados:
+                self.desatualizados.append(fonte)
+        logger.warning("Prazo esgotado: usando dado guardado (desatualizado) de %s", fonte)
+
+
+_PRAZO: contextvars.ContextVar[Optional[Prazo]] = contextvars.ContextVar("prazo_coleta", default=None)
+
+
+def prazo_atual() -> Optional[Prazo]:
+    """Prazo em vigor na thread/contexto atual, ou None."""
+    return _PRAZO.get()
+
+
+@contextmanager
+def orcamento(segundos: Optional[float]) -> Iterator[Optional[Prazo]]:
+    """
+    Define o orçamento da coleta para o bloco. Dentro de outro orçamento, o mais curto vale
+    (o externo continua recebendo as marcações de desatualizado). `None` não impõe limite.
+    """
+    externo = _PRAZO.get()
+    if segundos is None:
+        yield externo
+        return
+    prazo = Prazo(segundos)
+    if externo is not None and externo.fim <= prazo.fim:
+        yield externo
+        return
+    if externo is not None:
+        prazo.desatualizados = externo.desatualizados  # mesmo registro
+        prazo._lock = externo._lock
+    token = _PRAZO.set(prazo)
+    try:
+        yield prazo
+    finally:
+        _PRAZO.reset(token)
+
+
+def marcar_desatualizado(fonte: str) -> None:
+    """Registra no prazo atual (se houver) que `fonte` veio de dado guardado."""
+    prazo = _PRAZO.get()
+    if prazo is not None:
+        prazo.marcar_desatualizado(fonte)
+
+
+def dormir(segundos: float, contexto: str = "") -> None:
+    """`time.sleep` que respeita o prazo atual (levanta PrazoEsgotado em vez de dormir além dele)."""
+    prazo = _PRAZO.get()
+    if prazo is None:
+        time.sleep(segundos)
+    else:
+        prazo.dormir(segundos, contexto)
+
+
+def submeter(pool: Executor, fn, *args, **kwargs) -> Future:
+    """`pool.submit` levando o contexto atual (e com ele o prazo) para a thread do pool."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
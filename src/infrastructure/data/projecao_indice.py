@@ -0,0 +1,186 @@
+"""
+Modelos de projeção para caminhos futuros de índices (IPCA, TR) além do histórico.
+
+Modelos (`ConfigProjecao.modelo`):
+  - "constante":   valor fixo (`valor`; se omitido, o último observado);
+  - "media_movel": média dos últimos `janela` meses;
+  - "ar1":         AR(1) com reversão à média, x_t = c + phi * x_{t-1}, ajustado por mínimos
+                   quadrados; o caminho decai de x_último para mu = c / (1 - phi).
+
+O caminho tem `horizonte` meses (padrão 420 = 35 anos) e é calculado uma única vez por
+(configuração, hash do conteúdo da série): as chamadas seguintes recebem o mesmo array
+somente-leitura, sem reajustar. Opcionalmente o resultado também é persistido em disco
+(`diretorio_cache`), em um .npz por chave.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+
+from infrastructure.data.escrita_atomica import trocar_atomico
+
+logger = logging.getLogger(__name__)
+
+MODELOS_PROJECAO = ("constante", "media_movel", "ar1")
+# 35 anos: cobre o maior prazo habitacional
+HORIZONTE_PADRAO = 420
+# |phi| máximo aceito no AR(1); acima disso a série é tratada como passeio aleatório amortecido
+PHI_MAXIMO = 0.99
+# Projeções mantidas em memória (LRU)
+_MAX_CACHE = 32
+
+
+@dataclass(frozen=True)
+class ConfigProjecao:
+    """Configuração de um modelo de projeção (imutável e usada como parte da chave de cache)."""
+    modelo: str = "ar1"
+    horizonte: int = HORIZONTE_PADRAO
+    janela: int = 12                    # "media_movel"
+    valor: Optional[float] = None       # "constante" (None = último observado)
+    janela_ajuste: Optional[int] = None  # "ar1": últimos N meses usados no ajuste (None = todos)
+
+    def __post_init__(self):
+        if self.modelo not in MODELOS_PROJECAO:
+            raise ValueError(f"Modelo de projeção inválido: {self.modelo!r} (use {', '.join(MODELOS_PROJECAO)})")
+        if self.horizonte < 1:
+            raise ValueError("horizonte deve ser >= 1")
+        if self.janela < 1:
+            raise ValueError("janela deve ser >= 1")
+
+    @classmethod
+    def de(cls, spec) -> "ConfigProjecao":
+        """Aceita ConfigProjecao, nome do modelo (str) ou dict com os campos."""
+        if isinstance(spec, cls):
+            return spec
+        if isinstance(spec, str):
+            return cls(modelo=spec)
+        if isinstance(spec, dict):
+            return cls(**spec)
+        raise TypeError(f"Configuração de projeção inválida: {spec!r}")
+
+
+@dataclass(frozen=True)
+class Projecao:
+    """Resultado de uma projeção: parâmetros ajustados e caminho futuro (somente-leitura)."""
+    config: ConfigProjecao
+    parametros: Dict[str, float]
+    caminho: np.ndarray = field(repr=False)
+    chave: str = ""
+
+
+def hash_serie(valores: np.ndarray) -> str:
+    """Hash SHA-256 do conteúdo da série (float64), independente de arquivo/mtime."""
+    arr = np.ascontiguousarray(np.asarray(valores, dtype=np.float64))
+    return hashlib.sha256(arr.tobytes()).hexdigest()
+
+
+def chave_projecao(valores: np.ndarray, config: ConfigProjecao) -> str:
+    """Chave de cache: configuração do modelo + hash dos dados de origem."""
+    cfg = json.dumps(asdict(config), sort_keys=True)
+    return hashlib.sha256(f"{cfg}|{hash_serie(valores)}".encode("utf-8")).hexdigest()[:32]
+
+
+def ajustar_ar1(valores: np.ndarray) -> Dict[str, float]:
+    """
+    Ajusta x_t = c + phi * x_{t-1} por mínimos quadrados.
+    Retorna {"c", "phi", "mu"}; com phi fora de (-PHI_MAXIMO, PHI_MAXIMO), limita phi e usa a
+    média amostral como nível de longo prazo.
+    """
+    x = np.asarray(valores, dtype=float)
+    if len(x) < 3:
+        mu = float(np.mean(x))
+        return {"c": mu, "phi": 0.0, "mu": mu}
+    A = np.column_stack([np.ones(len(x) - 1), x[:-1]])
+    (c, phi), *_ = np.linalg.lstsq(A, x[1:], rcond=None)
+    if abs(phi) < PHI_MAXIMO:
+        mu = c / (1.0 - phi)
+    else:
+        phi = float(np.clip(phi, -PHI_MAXIMO, PHI_MAXIMO))
+        mu = float(np.mean(x))
+        c = mu * (1.0 - phi)
+    return {"c": float(c), "phi": float(phi), "mu": float(mu)}
+
+
+def _ajustar(valores: np.ndarray, config: ConfigProjecao) -> Dict[str, float]:
+    if config.modelo == "constante":
+        return {"valor": float(valores[-1] if config.valor is None else config.valor)}
+    if config.modelo == "media_movel":
+        return {"valor": float(np.mean(valores[-config.janela:]))}
+    x = valores if config.janela_ajuste is None else valores[-config.janela_ajuste:]
+    return {**ajustar_ar1(x), "ultimo": float(valores[-1])}
+
+
+def _gerar_caminho(parametros: Dict[str, float], config: ConfigProjecao) -> np.ndarray:
+    if config.modelo != "ar1":
+        return np.full(config.horizonte, parametros["valor"])
+    mu, phi = parametros["mu"], parametros["phi"]
+    h = np.arange(1, config.horizonte + 1)
+    return mu + phi ** h * (parametros["ultimo"] - mu)
+
+
+_CACHE: "OrderedDict[str, Projecao]" = OrderedDict()
+
+
+def _ler_disco(arquivo: str, config: ConfigProjecao, chave: str) -> Optional[Projecao]:
+    try:
+        with np.load(arquivo) as npz:
+            caminho = npz["caminho"]
+            parametros = json.loads(str(npz["parametros"]))
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning("Cache de projeção ilegível (%s): %s", arquivo, e)
+        return None
+    caminho.flags.writeable = False
+    return Projecao(config, parametros, caminho, chave)
+
+
+def _gravar_disco(arquivo: str, proj: Projecao) -> None:
+    trocar_atomico(arquivo, lambda tmp: np.savez(tmp, caminho=proj.caminho, parametros=json.dumps(proj.parametros)))
+
+
+def projetar(valores: np.ndarray, config=None, diretorio_cache: Optional[str] = None) -> Projecao:
+    """
+    Ajusta o modelo e gera o caminho futuro de `config.horizonte` meses para a série `valores`
+    (mesma unidade da série: % para IPCA, fração para TR).
+
+    Resultado cacheado por (config, hash da série) em memória e, se `diretorio_cache` for
+    informado, em disco.
+    """
+    config = ConfigProjecao.de(config or ConfigProjecao())
+    x = np.asarray(valores, dtype=float)
+    if len(x) == 0:
+        raise ValueError("Série vazia: não há dados para projetar")
+    chave = chave_projecao(x, config)
+
+    proj = _CACHE.get(chave)
+    if proj is not None:
+        _CACHE.move_to_end(chave)
+        return proj
+
+    arquivo = os.path.join(diretorio_cache, f"projecao_{chave}.npz") if diretorio_cache else None
+    if arquivo and os.path.exists(arquivo):
+        proj = _ler_disco(arquivo, config, chave)
+    if proj is None:
+        parametros = _ajustar(x, config)
+        caminho = _gerar_caminho(parametros, config)
+        caminho.flags.writeable = False
+        proj = Projecao(config, parametros, caminho, chave)
+        logger.debug("Projeção %s ajustada: %s", config.modelo, parametros)
+        if arquivo:
+            _gravar_disco(arquivo, proj)
+
+    _CACHE[chave] = proj
+    if len(_CACHE) > _MAX_CACHE:
+        _CACHE.popitem(last=False)
+    return proj
+
+
+def limpar_cache() -> None:
+    """Esvazia o cache em memória (o cache em disco, se houver, é mantido)."""
+    _CACHE.clear()
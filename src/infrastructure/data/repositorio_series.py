@@ -0,0 +1,288 @@
+"""
+Repositório local de séries mensais (IPCA, TR, ...) somente-anexação.
+
+Cada série fica em `<diretorio>/<nome>.csv` ("data;valor", data em "YYYY-MM", ponto decimal)
+e um índice pequeno (`_indice.json`) guarda, por série, o último mês, o número de linhas e
+o tamanho confirmado do arquivo em bytes.
+
+- `anexar` grava apenas os meses posteriores ao último já armazenado, com uma única escrita
+  em modo append: uma atualização mensal custa O(meses novos), não O(histórico).
+- `substituir` reescreve a série inteira (arquivo temporário + `os.replace`), para quando o
+  histórico guardado não alcança o início pedido.
+- O índice é reescrito de forma atômica (arquivo temporário + `os.replace`). Se um append for
+  interrompido, o arquivo fica maior que o tamanho confirmado e é truncado na próxima abertura.
+- Escritas são serializadas por um lock da instância (threads) e por um lock de arquivo
+  (`_indice.lock`, fcntl/msvcrt) entre processos. Com os dois locks, o índice é relido do
+  disco antes de cada `anexar`/`substituir`: instâncias em processos diferentes não perdem
+  entradas umas das outras, e appends interrompidos só são truncados por quem tem o lock.
+- Leituras param no tamanho confirmado no índice: bytes de um append em andamento em outro
+  processo nunca aparecem.
+- `ler_cauda(n)` lê só as últimas `n` linhas (busca a partir do fim do arquivo), e
+  `ler(desde=...)` usa a cauda quando o índice mostra que basta.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from io import StringIO
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from infrastructure.data.escrita_atomica import gravar_atomico
+from infrastructure.data.normalizacao import componentes_data, para_ano_mes, para_numero
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_INDICE = "_indice.json"
+ARQUIVO_TRAVA = "_indice.lock"
+CABECALHO = "data;valor\n"
+# Bloco lido por vez ao buscar linhas a partir do fim do arquivo
+_BLOCO_CAUDA = 8192
+
+
+def _chave_mes(ano_mes: str) -> int:
+    """'YYYY-MM' -> ano*12 + mês-1 (para contar meses entre datas)."""
+    ano, mes, _, valido = componentes_data(pd.Series([ano_mes]))
+    if not valido[0]:
+        raise ValueError(f"Mês inválido: {ano_mes!r} (esperado YYYY-MM)")
+    return int(ano[0]) * 12 + int(mes[0]) - 1
+
+
+@contextmanager
+def _trava_arquivo(caminho: str):
+    """Lock exclusivo entre processos sobre `caminho` (criado se preciso); espera até obtê-lo."""
+    with open(caminho, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK desiste após ~10 s: continua esperando
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _ultimas_linhas(caminho: str, n: int, inicio_dados: int, fim: int) -> str:
+    """Retorna o texto das últimas `n` linhas antes do byte `fim`, lendo em blocos a partir dele."""
+    with open(caminho, "rb") as f:
+        pos = fim
+        partes, quebras = [], 0
+        while pos > inicio_dados and quebras <= n:
+            tam = min(_BLOCO_CAUDA, pos - inicio_dados)
+            pos -= tam
+            f.seek(pos)
+            bloco = f.read(tam)
+            partes.append(bloco)
+            quebras += bloco.count(b"\n")
+    dados = b"".join(reversed(partes))
+    linhas = dados.splitlines(keepends=True)
+    return b"".join(linhas[-n:]).decode("utf-8") if n > 0 else ""
+
+
+class RepositorioSeries:
+    """
+    Armazena séries mensais em CSVs somente-anexação, com índice do último mês por série.
+
+    Uso:
+        repo = RepositorioSeries("dados/series")
+        repo.anexar("ipca", df)             # df com colunas data/valor (ou data/ipca, data/tr)
+        repo.ultimo_mes("ipca")             # "2025-07"
+        repo.ler_cauda("ipca", 12)          # últimos 12 meses sem ler o histórico
+    """
+
+    def __init__(self, diretorio: str):
+        self.diretorio = os.path.abspath(diretorio)
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._caminho_indice = os.path.join(self.diretorio, ARQUIVO_INDICE)
+        self._caminho_trava = os.path.join(self.diretorio, ARQUIVO_TRAVA)
+        # escritas de séries diferentes (ex.: IPCA e TR atualizados em paralelo) compartilham o índice
+        self._lock = threading.Lock()
+        self._indice: Dict[str, dict] = {}
+        with self._travado():
+            pass
+
+    # ------------------------------ índice ------------------------------ #
+    @contextmanager
+    def _travado(self):
+        """
+        Locks da instância e do arquivo de trava, com o índice relido do disco: o que for
+        escrito dentro do bloco parte do estado deixado por qualquer outro processo.
+        """
+        with self._lock, _trava_arquivo(self._caminho_trava):
+            self._indice = self._carregar_indice()
+            yield
+
+    def _carregar_indice(self) -> Dict[str, dict]:
+        """Lê o índice e trunca appends interrompidos (chamar com os locks)."""
+        if not os.path.exists(self._caminho_indice):
+            return {}
+        with open(self._caminho_indice, encoding="utf-8") as f:
+            indice = json.load(f)
+        # recupera appends interrompidos: descarta bytes além do tamanho confirmado
+        for nome, meta in indice.items():
+            caminho = self.caminho(nome)
+            if os.path.exists(caminho) and os.path.getsize(caminho) > meta["bytes"]:
+                logger.warning("Série %s com append incompleto: truncando para %d bytes", nome, meta["bytes"])
+                with open(caminho, "r+b") as f:
+                    f.truncate(meta["bytes"])
+        return indice
+
+    def _salvar_indice(self) -> None:
+        """Grava o índice (chamar com os locks)."""
+        gravar_atomico(self._caminho_indice, json.dumps(self._indice, indent=2, sort_keys=True), sincronizar=True)
+
+    def caminho(self, nome: str) -> str:
+        """Caminho do CSV da série."""
+        return os.path.join(self.diretorio, f"{nome}.csv")
+
+    def series(self) -> list:
+        """Nomes das séries armazenadas."""
+        return sorted(self._indice)
+
+    def ultimo_mes(self, nome: str) -> Optional[str]:
+        """Último mês armazenado ("YYYY-MM"), lido do índice; None se a série não existir."""
+        meta = self._indice.get(nome)
+        return meta["ultimo_mes"] if meta else None
+
+    def primeiro_mes(self, nome: str) -> Optional[str]:
+        """Primeiro mês armazenado (lê só a primeira linha de dados); None se a série não existir."""
+        if nome not in self._indice:
+            return None
+        with open(self.caminho(nome), encoding="utf-8") as f:
+            f.readline()  # cabeçalho
+            return f.readline().split(";", 1)[0] or None
+
+    def tamanho(self, nome: str) -> int:
+        """Número de meses armazenados."""
+        meta = self._indice.get(nome)
+        return meta["linhas"] if meta else 0
+
+    # ------------------------------ escrita ----------------------------- #
+    @staticmethod
+    def _normalizar(df: pd.DataFrame) -> pd.DataFrame:
+        if "data" not in df.columns:
+            raise ValueError("DataFrame precisa da coluna 'data'")
+        col_valor = "valor" if "valor" in df.columns else next(c for c in df.columns if c != "data")
+        datas = para_ano_mes(df["data"])
+        valores = para_numero(df[col_valor])
+        novos = pd.DataFrame({"data": datas, "valor": valores}).dropna()
+        # último valor vence para meses repetidos no lote
+        return novos.drop_duplicates(subset="data", keep="last").sort_values("data")
+
+    @staticmethod
+    def _linhas(df: pd.DataFrame) -> str:
+        return "".join(f"{d};{v!r}\n" for d, v in zip(df["data"].tolist(), df["valor"].astype(float).tolist()))
+
+    def anexar(self, nome: str, df: pd.DataFrame) -> int:
+        """
+        Anexa à série `nome` apenas os meses de `df` posteriores ao último armazenado.
+
+        `df` deve ter a coluna 'data' e uma coluna de valor ('valor' ou a segunda coluna).
+        Datas em qualquer layout aceito por `para_ano_mes`; valores numéricos ou texto pt-BR.
+        Retorna o número de meses gravados.
+        """
+        novos = self._normalizar(df)
+        with self._travado():
+            ultimo = self.ultimo_mes(nome)
+            if ultimo is not None:
+                novos = novos[novos["data"] > ultimo]
+            if novos.empty:
+                return 0
+
+            texto = self._linhas(novos)
+            meta = self._indice.get(nome)
+            if meta is None:
+                texto = CABECALHO + texto
+            # série nova (ou órfã, sem índice) começa do zero; existente recebe só o append
+            with open(self.caminho(nome), "ab" if meta else "wb") as f:
+                f.write(texto.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+                tamanho = f.tell()
+
+            self._indice[nome] = {
+                "ultimo_mes": novos["data"].iloc[-1],
+                "linhas": (meta["linhas"] if meta else 0) + len(novos),
+                "bytes": tamanho,
+            }
+            self._salvar_indice()
+        logger.info("Série %s: %d mês(es) anexado(s) até %s", nome, len(novos), novos["data"].iloc[-1])
+        return len(novos)
+
+    def substituir(self, nome: str, df: pd.DataFrame) -> int:
+        """
+        Reescreve a série `nome` inteira com os meses de `df` (mesmo formato de `anexar`), de
+        forma atômica. Retorna o número de meses gravados.
+        """
+        novos = self._normalizar(df)
+        if novos.empty:
+            raise ValueError(f"Série {nome!r}: nada para gravar")
+        texto = (CABECALHO + self._linhas(novos)).encode("utf-8")
+        with self._travado():
+            gravar_atomico(self.caminho(nome), texto, sincronizar=True)
+            self._indice[nome] = {"ultimo_mes": novos["data"].iloc[-1], "linhas": len(novos), "bytes": len(texto)}
+            self._salvar_indice()
+        logger.info("Série %s reescrita: %d mês(es) de %s a %s", nome, len(novos),
+                    novos["data"].iloc[0], novos["data"].iloc[-1])
+        return len(novos)
+
+    # ------------------------------ leitura ----------------------------- #
+    def _para_df(self, texto: str) -> pd.DataFrame:
+        df = pd.read_csv(StringIO(texto), sep=";", names=["data", "valor"], dtype={"data": str},
+                         engine="c")
+        df["valor"] = df["valor"].astype(float)
+        return df
+
+    def ler(self, nome: str, desde: Optional[str] = None) -> pd.DataFrame:
+        """
+        Lê a série (colunas data, valor). Com `desde` ("YYYY-MM"), retorna só os meses >= desde,
+        lendo apenas a cauda do arquivo: como as datas são estritamente crescentes, as últimas
+        k linhas (k = meses de `desde` até o último) cobrem todo o intervalo.
+        """
+        meta = self._indice.get(nome)
+        if meta is None:
+            raise KeyError(f"Série não encontrada no repositório: {nome!r}")
+        if desde is None:
+            with open(self.caminho(nome), "rb") as f:
+                f.seek(len(CABECALHO))
+                return self._para_df(f.read(meta["bytes"] - len(CABECALHO)).decode("utf-8"))
+        k = _chave_mes(meta["ultimo_mes"]) - _chave_mes(desde) + 1
+        if k <= 0:
+            return pd.DataFrame({"data": pd.Series(dtype=str), "valor": pd.Series(dtype=float)})
+        df = self.ler_cauda(nome, min(k, meta["linhas"]))
+        return df[df["data"] >= desde].reset_index(drop=True)
+
+    def ler_cauda(self, nome: str, n: int) -> pd.DataFrame:
+        """Lê apenas os últimos `n` meses da série, sem percorrer o histórico."""
+        meta = self._indice.get(nome)
+        if meta is None:
+            raise KeyError(f"Série não encontrada no repositório: {nome!r}")
+        n = min(int(n), meta["linhas"])
+        if n <= 0:
+            return pd.DataFrame({"data": pd.Series(dtype=str), "valor": pd.Series(dtype=float)})
+        return self._para_df(_ultimas_linhas(self.caminho(nome), n, len(CABECALHO), meta["bytes"]))
+
+    def valores(self, nome: str) -> np.ndarray:
+        """Valores da série inteira como array (ordem cronológica)."""
+        return self.ler(nome)["valor"].to_numpy(dtype=float)
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from infrastructure.data.repositorio_series import RepositorioSeries
+
 def salvar_csv_tratado(entrada: str, saida: str = "dados/ipca_tratado.csv") -> None:
     """
     Lê o CSV original do IPCA no padrão BACEN, trata os dados e salva como novo CSV.
@@ -30,6 +32,22 @@ def salvar_csv_tratado(entrada: str, saida: str = "dados/ipca_tratado.csv") -> N
     df.to_csv(saida, sep=";", index=False, encoding="utf-8")
     print(f"✅ Arquivo tratado salvo em: {saida}")
 
+def anexar_ipca_tratado(entrada: str, diretorio_series: str = "dados/series", nome: str = "ipca") -> int:
+    """
+    Variante incremental de `salvar_csv_tratado`: em vez de reescrever o CSV inteiro,
+    anexa ao repositório de séries apenas os meses do arquivo BACEN posteriores ao último
+    já armazenado.
+
+    Retorno:
+    int: quantidade de meses novos gravados.
+    """
+    from infrastructure.data.leitor_csv import ler_csv
+
+    df = ler_csv(entrada)
+    novos = RepositorioSeries(diretorio_series).anexar(nome, df.rename(columns={"ipca": "valor"}))
+    print(f"✅ {novos} mês(es) novo(s) anexado(s) à série '{nome}' em: {diretorio_series}")
+    return novos
+
 # Execução direta (opcional)
 if __name__ == "__main__":
     salvar_csv_tratado("dados/ipca.csv")
\ No newline at end of file
@@ -0,0 +1,219 @@
+"""
+Pool de conexões HTTP compartilhado por todos os coletores (SGS, Olinda/taxaJuros).
+
+Um único `PoolManager` (urllib3) por processo mantém as conexões keep-alive abertas por
+host, de modo que uma atualização completa reaproveita as conexões TLS com
+api.bcb.gov.br e olinda.bcb.gov.br em vez de reconectar a cada chamada.
+
+Dois perfis de sessão usam o mesmo pool:
+  - `obter_sessao()`            -> com retry/backoff unificado (429/5xx, erros de conexão)
+  - `obter_sessao(retentar=False)` -> sem retry no transporte, para quem já faz os próprios
+    fallbacks (ClienteSGS dispara estratégias concorrentes e não deve repetir uma que falhou)
+
+Com `ativar_cache()`, todas as requisições GET das sessões compartilhadas passam pelo cache
+em disco (ver cache_http), inclusive as de sessões obtidas antes da ativação.
+
+Dentro de um `prazo.orcamento(...)`, timeouts e backoffs (do transporte e da aplicação) tiram do
+mesmo saldo; esgotado o prazo, a resposta guardada no cache (mesmo vencida) é usada e marcada
+como desatualizada, e sem ela a requisição falha na hora com `PrazoEsgotado`.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from infrastructure.data.cache_http import DIRETORIO_CACHE, CacheHTTP
+from infrastructure.data.prazo import PrazoEsgotado, dormir, marcar_desatualizado, prazo_atual
+
+logger = logging.getLogger(__name__)
+
+# hosts distintos mantidos no pool / conexões simultâneas por host
+POOL_HOSTS = 8
+POOL_CONEXOES = 32
+# política de retry única (transporte) e base do backoff das retentativas da aplicação
+RETENTATIVAS = 4
+BACKOFF_FATOR = 0.6
+STATUS_RETENTAVEIS = (429, 500, 502, 503, 504)
+
+CABECALHOS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) SAD-FI/1.0",
+    "Accept": "*/*",
+    "Connection": "keep-alive",
+}
+
+
+class _RetryComPrazo(Retry):
+    """Retry cujas esperas (backoff ou Retry-After) respeitam o prazo da coleta em andamento."""
+
+    def sleep(self, response=None) -> None:
+        prazo = prazo_atual()
+        if prazo is None:
+            return super().sleep(response)
+        espera = self.get_retry_after(response) if response is not None and self.respect_retry_after_header else None
+        prazo.dormir(self.get_backoff_time() if espera is None else espera, "retry do transporte")
+
+
+def politica_retry(total: int = RETENTATIVAS) -> Retry:
+    """Retry do transporte: erros de conexão/leitura e 429/5xx em GET, respeitando Retry-After."""
+    return _RetryComPrazo(
+        total=total, connect=total, read=total, status=total,
+        backoff_factor=BACKOFF_FATOR,
+        status_forcelist=STATUS_RETENTAVEIS,
+        allowed_methods=("GET",),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def esperar_backoff(tentativa: int, base: float = BACKOFF_FATOR) -> None:
+    """
+    Backoff exponencial com jitter para retentativas feitas pela aplicação (tentativa >= 1).
+    Dentro de um orçamento, levanta PrazoEsgotado em vez de dormir além dele.
+    """
+    dormir(base * (2 ** (tentativa - 1)) * (1 + random.random() * 0.4), "backoff")
+
+
+class _Adaptador(HTTPAdapter):
+    """
+    HTTPAdapter que consulta o cache do gerenciador (se ativo) antes de ir à rede e limita o
+    timeout ao prazo da coleta em andamento (se houver).
+    """
+
+    def __init__(self, gerenciador: "GerenciadorHTTP", **kwargs):
+        super().__init__(**kwargs)
+        self._gerenciador = gerenciador
+
+    def _guardada(self, request):
+        """Resposta do cache (mesmo vencida) para o prazo esgotado; None se não houver."""
+        cache = self._gerenciador.cache
+        r = cache.guardada(request) if cache is not None and request.method == "GET" else None
+        if r is not None and r.desatualizada:
+            p = urlsplit(request.url)
+            marcar_desatualizado(p.netloc + p.path)
+        return r
+
+    def _enviar(self, request, **kwargs):
+        cache = self._gerenciador.cache
+        if cache is None or request.method != "GET":
+            return super().send(request, **kwargs)
+        return cache.enviar(request, lambda req: super(_Adaptador, self).send(req, **kwargs))
+
+    def send(self, request, **kwargs):
+        prazo = prazo_atual()
+        if prazo is None:
+            return self._enviar(request, **kwargs)
+        if prazo.esgotado():
+            r = self._guardada(request)
+            if r is not None:
+                return r
+            prazo.verificar(request.url)
+        try:
+            kwargs["timeout"] = prazo.limitar(kwargs.get("timeout"), request.url)
+            return self._enviar(request, **kwargs)
+        except (requests.RequestException, PrazoEsgotado):
+            # timeout cortado pelo prazo ou backoff que não cabia: o guardado vale mais que o erro
+            r = self._guardada(request)
+            if r is None:
+                raise
+            return r
+
+
+class GerenciadorHTTP:
+    """
+    Dono do pool de conexões e das sessões que o usam.
+
+    As sessões são criadas uma vez por perfil e reaproveitadas; os adaptadores dos dois
+    perfis compartilham o mesmo PoolManager, então uma conexão aberta por um coletor serve
+    aos demais.
+    """
+
+    def __init__(self, pool_hosts: int = POOL_HOSTS, pool_conexoes: int = POOL_CONEXOES,
+                 retry: Optional[Retry] = None):
+        self.pool_hosts = pool_hosts
+        self.pool_conexoes = pool_conexoes
+        self.retry = retry or politica_retry()
+        self.cache: Optional[CacheHTTP] = None
+        self._lock = threading.Lock()
+        self._adaptador: Optional[HTTPAdapter] = None
+        self._sessoes: Dict[bool, requests.Session] = {}
+
+    def _adaptador_base(self) -> HTTPAdapter:
+        """Adaptador dono do PoolManager (nunca montado; os demais reutilizam seu pool)."""
+        if self._adaptador is None:
+            self._adaptador = HTTPAdapter(pool_connections=self.pool_hosts,
+                                          pool_maxsize=self.pool_conexoes)
+        return self._adaptador
+
+    def _criar_sessao(self, retentar: bool) -> requests.Session:
+        adaptador = _Adaptador(self, pool_connections=self.pool_hosts, pool_maxsize=self.pool_conexoes,
+                               max_retries=self.retry if retentar else 0)
+        adaptador.poolmanager.clear()
+        adaptador.poolmanager = self._adaptador_base().poolmanager
+        s = requests.Session()
+        s.mount("https://", adaptador)
+        s.mount("http://", adaptador)
+        s.headers.update(CABECALHOS)
+        return s
+
+    def sessao(self, retentar: bool = True) -> requests.Session:
+        """Sessão do perfil pedido (criada na primeira chamada; thread-safe)."""
+        with self._lock:
+            s = self._sessoes.get(retentar)
+            if s is None:
+                s = self._sessoes[retentar] = self._criar_sessao(retentar)
+            return s
+
+    def fechar(self) -> None:
+        """Fecha todas as conexões do pool; novas sessões serão criadas sob demanda."""
+        with self._lock:
+            if self._adaptador is not None:
+                self._adaptador.poolmanager.clear()
+            self._adaptador = None
+            self._sessoes.clear()
+
+
+_GERENCIADOR = GerenciadorHTTP()
+
+
+def obter_sessao(retentar: bool = True) -> requests.Session:
+    """Sessão compartilhada do processo (keep-alive, pool dimensionado, retry unificado)."""
+    return _GERENCIADOR.sessao(retentar)
+
+
+def ativar_cache(cache: Optional[CacheHTTP] = None, diretorio: str = DIRETORIO_CACHE) -> CacheHTTP:
+    """
+    Liga o cache em disco para as sessões compartilhadas; retorna o cache em uso. Chamar de
+    novo com o mesmo diretório mantém o cache atual (e seus contadores).
+    """
+    atual = _GERENCIADOR.cache
+    if cache is None and atual is not None and atual.diretorio == os.path.abspath(diretorio):
+        return atual
+    _GERENCIADOR.cache = cache or CacheHTTP(diretorio)
+    return _GERENCIADOR.cache
+
+
+def desativar_cache() -> None:
+    _GERENCIADOR.cache = None
+
+
+def cache_ativo() -> Optional[CacheHTTP]:
+    """Cache em disco ligado nas sessões compartilhadas, ou None."""
+    return _GERENCIADOR.cache
+
+
+def estatisticas_cache() -> Dict[str, int]:
+    """Contadores do cache ativo (vazio se desativado)."""
+    return _GERENCIADOR.cache.estatisticas() if _GERENCIADOR.cache is not None else {}
+
+
+def fechar_sessoes() -> None:
+    """Fecha as conexões do pool compartilhado (ex.: ao fim de uma atualização longa)."""
+    _GERENCIADOR.fechar()
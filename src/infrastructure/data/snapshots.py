@@ -0,0 +1,146 @@
+"""
+Snapshots endereçados por conteúdo dos dados de entrada (bancos.csv, IPCA, TR).
+
+Cada entrada é normalizada uma vez (pelo carregador de sempre) e o DataFrame resultante é
+guardado com id = tipo + SHA-256 do conteúdo. Versões idênticas compartilham o mesmo id
+(deduplicação), e arquivos que não mudaram (mesmo caminho, tamanho e mtime) são resolvidos
+pelo índice `_arquivos.json`, sem reler nem revalidar.
+
+Cada execução registra os ids usados (`registrar_execucao`); resultados podem ser guardados
+e recuperados por (ids dos snapshots, parâmetros), permitindo replay e cache de simulações.
+
+Layout em disco:
+    <diretorio>/objetos/<aa>/<hash>.pkl      DataFrame normalizado
+    <diretorio>/_arquivos.json               caminho -> (tamanho, mtime_ns, id)
+    <diretorio>/execucoes/<chave>.json       ids + parâmetros de cada execução
+    <diretorio>/resultados/<chave>.pkl       resultado da execução (opcional)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+from infrastructure.data.escrita_atomica import gravar_atomico
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_INDICE = "_arquivos.json"
+
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """SHA-256 do conteúdo (colunas, dtypes e valores; o índice é ignorado)."""
+    h = hashlib.sha256()
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def chave_execucao(snapshot_ids: Dict[str, str], parametros: Dict[str, Any]) -> str:
+    """Chave determinística de uma execução: ids dos snapshots + parâmetros."""
+    texto = json.dumps({"snapshots": snapshot_ids, "parametros": parametros}, sort_keys=True, default=str)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:32]
+
+
+class RepositorioSnapshots:
+    """Armazena DataFrames normalizados por conteúdo e o registro das execuções que os usaram."""
+
+    def __init__(self, diretorio: str = "dados/snapshots"):
+        self.diretorio = os.path.abspath(diretorio)
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._caminho_indice = os.path.join(self.diretorio, ARQUIVO_INDICE)
+        self._arquivos: Dict[str, dict] = {}
+        if os.path.exists(self._caminho_indice):
+            with open(self._caminho_indice, encoding="utf-8") as f:
+                self._arquivos = json.load(f)
+        self._memoria: Dict[str, pd.DataFrame] = {}
+
+    # ----------------------------- snapshots ----------------------------- #
+    def _caminho_objeto(self, snapshot_id: str) -> str:
+        digest = snapshot_id.split("-", 1)[1]
+        return os.path.join(self.diretorio, "objetos", digest[:2], f"{digest}.pkl")
+
+    def registrar(self, tipo: str, df: pd.DataFrame) -> str:
+        """Guarda o DataFrame normalizado (se ainda não existir) e retorna seu id "<tipo>-<sha256>"."""
+        snapshot_id = f"{tipo}-{hash_dataframe(df)}"
+        caminho = self._caminho_objeto(snapshot_id)
+        if not os.path.exists(caminho):
+            gravar_atomico(caminho, pickle.dumps(df.reset_index(drop=True), protocol=pickle.HIGHEST_PROTOCOL))
+            logger.info("Snapshot novo: %s", snapshot_id)
+        self._memoria[snapshot_id] = df
+        return snapshot_id
+
+    def carregar(self, snapshot_id: str) -> pd.DataFrame:
+        """DataFrame normalizado do snapshot (sem reprocessar a origem)."""
+        df = self._memoria.get(snapshot_id)
+        if df is None:
+            caminho = self._caminho_objeto(snapshot_id)
+            if not os.path.exists(caminho):
+                raise KeyError(f"Snapshot não encontrado: {snapshot_id}")
+            with open(caminho, "rb") as f:
+                df = pickle.load(f)
+            self._memoria[snapshot_id] = df
+        return df
+
+    def snapshot_arquivo(self, tipo: str, caminho: str, carregador: Callable[[str], pd.DataFrame]) -> str:
+        """
+        Id do snapshot do arquivo `caminho`. Se o arquivo não mudou (tamanho e mtime) desde o
+        último registro, reaproveita o id sem chamar `carregador`; caso contrário, normaliza com
+        `carregador(caminho)` e registra (conteúdo igual a uma versão anterior -> mesmo id).
+        """
+        caminho = os.path.abspath(caminho)
+        st = os.stat(caminho)
+        chave = f"{tipo}:{caminho}"
+        meta = self._arquivos.get(chave)
+        if (meta and meta["tamanho"] == st.st_size and meta["mtime_ns"] == st.st_mtime_ns
+                and os.path.exists(self._caminho_objeto(meta["id"]))):
+            return meta["id"]
+        snapshot_id = self.registrar(tipo, carregador(caminho))
+        self._arquivos[chave] = {"tamanho": st.st_size, "mtime_ns": st.st_mtime_ns, "id": snapshot_id}
+        gravar_atomico(self._caminho_indice, json.dumps(self._arquivos, indent=2, sort_keys=True).encode("utf-8"))
+        return snapshot_id
+
+    # ----------------------------- execuções ----------------------------- #
+    def registrar_execucao(self, snapshot_ids: Dict[str, str], parametros: Dict[str, Any]) -> str:
+        """Grava os ids dos snapshots e os parâmetros usados; retorna a chave da execução."""
+        chave = chave_execucao(snapshot_ids, parametros)
+        registro = {
+            "chave": chave,
+            "snapshots": snapshot_ids,
+            "parametros": parametros,
+            "registrado_em": datetime.now().isoformat(timespec="seconds"),
+        }
+        caminho = os.path.join(self.diretorio, "execucoes", f"{chave}.json")
+        gravar_atomico(caminho, json.dumps(registro, indent=2, sort_keys=True, default=str).encode("utf-8"))
+        return chave
+
+    def execucao(self, chave: str) -> dict:
+        """Registro de uma execução (ids dos snapshots e parâmetros), para replay."""
+        caminho = os.path.join(self.diretorio, "execucoes", f"{chave}.json")
+        if not os.path.exists(caminho):
+            raise KeyError(f"Execução não encontrada: {chave}")
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+
+    def guardar_resultado(self, chave: str, resultado: Any) -> None:
+        """Guarda o resultado de uma execução (pickle) sob a chave da execução."""
+        caminho = os.path.join(self.diretorio, "resultados", f"{chave}.pkl")
+        gravar_atomico(caminho, pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def obter_resultado(self, chave: str) -> Optional[Any]:
+        """Resultado guardado para a chave, ou None."""
+        caminho = os.path.join(self.diretorio, "resultados", f"{chave}.pkl")
+        if not os.path.exists(caminho):
+            return None
+        try:
+            with open(caminho, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning("Resultado em cache ilegível (%s): %s", caminho, e)
+            return None
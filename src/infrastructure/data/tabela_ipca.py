@@ -1,4 +1,7 @@
+from infrastructure.data.extensao_indice import SerieEstendida
 from infrastructure.data.leitor_csv import ler_csv
+from infrastructure.data.normalizacao import para_datetime
+from infrastructure.data.projecao_indice import projetar
 
 class TabelaIPCA:
     """
@@ -33,7 +36,36 @@ class TabelaIPCA:
         if mes < 1 or mes > len(self.tabela):
             raise IndexError(f"Mês {mes} fora do intervalo disponível (1 a {len(self.tabela)})")
         return self.tabela.loc[mes - 1, "ipca"] / 100  # converte de % para decimal
+
+    def estender(self, meses: int, politica: str = "ultimo") -> "TabelaIPCAEstendida":
+        """
+        Retorna uma visão da tabela com pelo menos `meses` meses, preenchendo os meses
+        além do último dado segundo `politica` ("ultimo", "media" ou "media_12m").
+
+        A tabela original não é copiada nem alterada; os meses virtuais são calculados
+        apenas quando consultados.
+        """
+        return TabelaIPCAEstendida(self, meses, politica)
+
+    def projetar(self, meses: int, config=None, diretorio_cache=None) -> "TabelaIPCAEstendida":
+        """
+        Como `estender`, mas os meses além do último dado vêm de um modelo de projeção
+        ("constante", "media_movel" ou "ar1"; ver `projecao_indice.ConfigProjecao`).
+        O caminho projetado é cacheado por configuração e conteúdo da tabela.
+        """
+        proj = projetar(self.tabela["ipca"].to_numpy(dtype=float), config, diretorio_cache)
+        return TabelaIPCAEstendida(self, meses, futuro=proj.caminho)
     
+    @classmethod
+    def from_tabela_normalizada(cls, df):
+        """
+        Constrói a tabela a partir de um DataFrame já normalizado (coluna 'ipca' em %),
+        como o guardado em um snapshot, sem revalidar nem reordenar.
+        """
+        inst = object.__new__(cls)
+        inst.tabela = df
+        return inst
+
     @classmethod
     def from_dataframe(cls, df):
         """
@@ -87,20 +119,10 @@ class TabelaIPCA:
         # ordenar por data se houver coluna 'data' (tenta parse)
         if "data" in [c.lower() for c in df2.columns]:
             
-            # parsing robusto de data: tenta formatos comuns antes de recorrer ao parser genérico
+            # parsing robusto de data: formato detectado por amostra e convertido de uma vez
             real_data_col = next(c for c in df2.columns if c.lower() == "data")
-            formats = ["%Y-%m-%d", "%Y-%m", "%m/%Y", "%d/%m/%Y"]
-            parsed = None
-            for fmt in formats:
-                parsed_try = pd.to_datetime(df2[real_data_col], format=fmt, errors="coerce", dayfirst=True)
-                if parsed_try.notna().any():
-                    parsed = parsed_try
-                    break
-            if parsed is None:
-                # fallback: permite dateutil (poderá emitir warning)
-                parsed = pd.to_datetime(df2[real_data_col], dayfirst=True, errors="coerce")
-            
-            
+            parsed = para_datetime(df2[real_data_col])
+
             if parsed.isna().all():
                 # se falhar no parse, não ordena, apenas mantém ordem original
                 pass
@@ -115,3 +137,27 @@ class TabelaIPCA:
         inst = object.__new__(cls)
         inst.tabela = df2  # armazena DataFrame com coluna 'ipca' em %
         return inst
+
+
+class TabelaIPCAEstendida:
+    """
+    Visão de uma TabelaIPCA estendida virtualmente (ver `TabelaIPCA.estender`).
+    Mesma interface de consumo (`get_ipca(mes)` em fração) usada pelos simuladores.
+    """
+
+    def __init__(self, base: TabelaIPCA, meses: int, politica: str = "ultimo", futuro=None):
+        self.base = base
+        self.serie = SerieEstendida(base.tabela["ipca"].to_numpy(dtype=float), meses, politica, futuro)
+
+    def __len__(self) -> int:
+        return len(self.serie)
+
+    def get_ipca(self, mes: int) -> float:
+        """IPCA do mês (1..len) em fração; meses virtuais seguem a política de extensão."""
+        if mes < 1 or mes > len(self.serie):
+            raise IndexError(f"Mês {mes} fora do intervalo disponível (1 a {len(self.serie)})")
+        return self.serie[mes - 1] / 100  # converte de % para decimal
+
+    def fatia_ipca(self, inicio: int, fim: int):
+        """IPCA em fração dos meses `inicio`..`fim` (inclusive, base 1) como array NumPy."""
+        return self.serie.fatia(inicio - 1, fim) / 100
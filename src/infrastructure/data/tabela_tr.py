@@ -11,6 +11,10 @@ import pandas as pd
 from dataclasses import dataclass
 from typing import Optional, Tuple, Dict
 
+from infrastructure.data.extensao_indice import SerieEstendida
+from infrastructure.data.normalizacao import para_ano_mes, para_numero
+from infrastructure.data.projecao_indice import projetar
+
 # ==========================
 #  TabelaTR (parse e lookup)
 # ==========================
@@ -34,17 +38,14 @@ class TabelaTR:
         if "data" not in df2.columns:
             raise ValueError("Coluna 'data' não encontrada")
 
-        # Normaliza datas para YYYY-MM
-        d1 = pd.to_datetime(df2["data"].astype(str), format="%Y-%m", errors="coerce")
-        d2 = pd.to_datetime(df2["data"].astype(str), format="%m/%Y", errors="coerce")
-        d = d1.fillna(d2)
-        d = d.fillna(pd.to_datetime(df2["data"].astype(str), errors="coerce"))
+        # Normaliza datas para YYYY-MM (formato detectado por amostra, conversão vetorizada)
+        d = para_ano_mes(df2["data"], dayfirst=False)
         if d.isna().any():
             raise ValueError("Há datas inválidas na TR")
-        df2["data"] = d.dt.strftime("%Y-%m")
+        df2["data"] = d
 
         # Normaliza TR para fração
-        tr = pd.to_numeric(df2["tr"], errors="coerce")
+        tr = para_numero(df2["tr"])
         if tr.isna().any():
             raise ValueError("Valores de TR inválidos")
         if tr.abs().median() > 1.0:
@@ -70,6 +71,20 @@ class TabelaTR:
         self._cache[ano_mes] = valor
         return valor
 
+    def estender(self, meses: int, politica: str = "ultimo") -> SerieEstendida:
+        """
+        Série mensal da TR (fração) com pelo menos `meses` meses; os meses além do último
+        dado seguem `politica` ("ultimo", "media" ou "media_12m"), calculados sob demanda.
+        Não copia nem altera a tabela.
+        """
+        return SerieEstendida(self._df["tr"].to_numpy(dtype=float), meses, politica)
+
+    def projetar(self, meses: int, config=None, diretorio_cache: Optional[str] = None) -> SerieEstendida:
+        """Como `estender`, com os meses futuros vindos de um modelo de projeção (cacheado)."""
+        valores = self._df["tr"].to_numpy(dtype=float)
+        proj = projetar(valores, config, diretorio_cache)
+        return SerieEstendida(valores, meses, futuro=proj.caminho)
+
     @property
     def df(self) -> pd.DataFrame:
         return self._df.copy()
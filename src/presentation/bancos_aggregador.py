@@ -3,6 +3,7 @@ from io import StringIO
 import pandas as pd
 import unicodedata
 from presentation.logging_setup import logger
+from infrastructure.data.normalizacao import taxa_para_fracao
 
 def _norm_cols(df):
     def _nc(c: str) -> str:
@@ -27,20 +28,6 @@ def _norm_sistema(x: str) -> str | None:
     if "SAC" in s: return "SAC"
     return None
 
-def _parse_taxa(v) -> float | None:
-    if v is None: return None
-    if isinstance(v, (int, float)):
-        return float(v)/100.0 if float(v) >= 1.5 else float(v)
-    s = str(v).strip()
-    if not s: return None
-    s = s.replace("%", "").replace("a.a.", "").replace("a.a", "").replace("aa", "").replace(",", ".")
-    s = "".join(s.split())
-    try:
-        x = float(s)
-        return x/100.0 if x >= 1.5 else x
-    except Exception:
-        return None
-
 def agregar_bancos_csv(dest: str, fontes_dir: str = "dados/fontes_bancos", taxa_default: float = 0.11):
     src_dir = Path(fontes_dir)
     dest_p = Path(dest); dest_p.parent.mkdir(parents=True, exist_ok=True)
@@ -87,16 +74,15 @@ def agregar_bancos_csv(dest: str, fontes_dir: str = "dados/fontes_bancos", taxa_
         if tipo is None: tipo = pd.Series([f.stem] * len(df))
 
         taxa_cols = [c for c in df.columns if any(k in c for k in ["taxa_anual","taxa_aa","taxa","juros","nominal","base"])]
-        taxa = pd.Series([None]*len(df))
+        taxa = pd.Series(float("nan"), index=df.index)
         for c in taxa_cols:
-            parsed = df[c].map(_parse_taxa)
-            taxa = taxa.where(taxa.notna(), parsed)
+            taxa = taxa.fillna(taxa_para_fracao(df[c]))
 
         sist = tipo.map(_norm_sistema)
 
         for n, s, t in zip(nome, sist, taxa):
             if s is None: continue
-            if t is None: t = float(taxa_default); com_default += 1
+            if pd.isna(t): t = float(taxa_default); com_default += 1
             linhas.append({"nome": _fix_text(str(n).split(" — ")[0].split(" - ")[0]),
                            "sistema": s, "taxa_anual": float(t)})
 
@@ -3,6 +3,7 @@ import pandas as pd
 import unicodedata
 from pathlib import Path
 from presentation.logging_setup import logger
+from infrastructure.data.normalizacao import taxa_para_fracao
 
 _missing_cols_re = re.compile(r"faltam colunas obrigat[oó]rias:\s*\[(.*?)\]", re.IGNORECASE)
 
@@ -28,20 +29,6 @@ def _norm_modalidade(s: str | None) -> str | None:
     if "SAC" in s: return "SAC"
     return None
 
-def _parse_taxa(v) -> float | None:
-    if v is None: return None
-    if isinstance(v, (int, float)): return float(v)/100.0 if float(v) >= 1.5 else float(v)
-    s = str(v).strip()
-    if not s: return None
-    s = (s.replace("%","").replace("a.a.","").replace("a.a","")
-           .replace("aa","").replace(",", "."))
-    s = "".join(s.split())
-    try:
-        x = float(s)
-        return x/100.0 if x >= 1.5 else x
-    except Exception:
-        return None
-
 def ensure_bancos_schema(bancos_path: str, required_cols: list[str], taxa_default: float) -> None:
     p = Path(bancos_path)
     # tenta detectar separador rápido
@@ -76,13 +63,13 @@ def ensure_bancos_schema(bancos_path: str, required_cols: list[str], taxa_defaul
     if "taxa_anual" not in df.columns:
         for cand in ("taxa_anual","taxa_aa","taxa","juros","nominal","base","taxa_juros_anual"):
             if cand in df.columns:
-                df["taxa_anual"] = df[cand].map(_parse_taxa); break
+                df["taxa_anual"] = taxa_para_fracao(df[cand]); break
         if "taxa_anual" not in df.columns:
             df["taxa_anual"] = None
 
     df["sistema"] = df["sistema"].map(_norm_modalidade)
     df["nome"] = df["nome"].fillna("Banco").astype(str)
-    df["taxa_anual"] = df["taxa_anual"].map(lambda x: taxa_default if (x is None or (isinstance(x,float) and x!=x)) else x)
+    df["taxa_anual"] = df["taxa_anual"].where(df["taxa_anual"].notna(), taxa_default)
 
     df_ok = df[df["sistema"].isin(["SAC","SAC_TR","SAC_IPCA"])].copy()
     if df_ok.empty:
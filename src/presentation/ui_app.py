@@ -10,6 +10,9 @@ import streamlit as st
 import pandas as pd
 import requests
 from application.controlador import ControladorApp
+from infrastructure.data.atualizador import ler_estado as estado_atualizador
+from infrastructure.data.prazo import PRAZO_PADRAO_S, PrazoEsgotado, orcamento
+from infrastructure.data.sessao_http import ativar_cache, estatisticas_cache
 from presentation.ui_state import FinanciamentoInput, FontesInput
 from presentation.formatters import brl
 from matplotlib.ticker import FuncFormatter
@@ -22,6 +25,8 @@ from presentation.bancos_schema_fix import parse_missing_from_error, ensure_banc
 from presentation.plots import plot_ranking, plot_top3, save_fig_png
 
 st.set_page_config(page_title="SAD-FI — Comparador", layout="wide")
+# cache em disco das respostas do BACEN (SGS/Olinda): reexecuções não vão à rede
+ativar_cache(diretorio="dados/cache_http")
 st.title("SAD-FI — Comparador de Financiamentos (SAC, SAC-TR, SAC+IPCA)")
 
 # ----- Inputs ----------------------------------------------------------------
@@ -68,6 +73,13 @@ with col2:
         st.success(f"bancos.csv atualizado em: {caminho}")
 
 st.caption(f"Usando bancos: {fontes.caminho_bancos} | IPCA: {fontes.caminho_ipca} | TR: {fontes.caminho_tr_compat}")
+# dados locais mantidos pelo atualizador em segundo plano (scripts/atualizador_dados.py), se estiver rodando
+atualizacoes = estado_atualizador()
+if atualizacoes:
+    st.caption("Última atualização automática: " + " | ".join(
+        f"{fonte}: {e.get('ultima_atualizacao') or 'nunca'} ({e.get('duracao_s', '—')}s)"
+        + ("" if e.get("ok") else " ⚠️ última tentativa falhou")
+        for fonte, e in sorted(atualizacoes.items())))
 logger.info("Fontes | bancos=%s | IPCA=%s | TR=%s",
             file_stat(fontes.caminho_bancos), file_stat(fontes.caminho_ipca), file_stat(fontes.caminho_tr_compat))
 
@@ -82,7 +94,11 @@ if run:
 
     # Função utilitária para chamar a simulação (evita duplicar código)
     def _call_simulation():
-        return controlador.simular_multiplos_bancos(
+        # progressivo: barra de progresso e ranking parcial a cada oferta concluída
+        barra = st.progress(0.0, text="Carregando bancos, IPCA e TR…")
+        parcial = st.empty()
+        resultados, ranking, msg = None, [], None
+        for passo in controlador.iterar_simulacoes_bancos(
             caminho_bancos_csv=fontes.caminho_bancos,
             dados_financiamento={
                 "valor_total": fin.valor_total,
@@ -92,12 +108,32 @@ if run:
             },
             fonte_ipca={"caminho_ipca": fontes.caminho_ipca},
             fonte_tr={"fixture_csv_path": fontes.caminho_tr_compat},
-        )
+            top_k=3,  # cronograma completo só para o Top 3 do gráfico; o resto é ranqueado pelos totais
+        ):
+            resultados, ranking, msg = passo.resultados, passo.ranking, passo.mensagem
+            barra.progress(passo.concluidos / passo.total,
+                           text=f"{passo.concluidos}/{passo.total} ofertas simuladas")
+            # redesenhar a tabela a cada oferta fica caro com milhares delas
+            if passo.concluidos % max(1, passo.total // 50) == 0:
+                parcial.dataframe(pd.DataFrame(ranking[:10], columns=["Oferta (parcial)", "Total Pago"])
+                                  .style.format({"Total Pago": brl}), use_container_width=True)
+        barra.empty()
+        parcial.empty()
+        return resultados, ranking, msg
 
     try:
-        # Exibe spinner durante a simulação
-        with st.spinner("Simulação em andamento… isso pode levar alguns minutos."):
+        # a coleta online tem prazo global (PRAZO_PADRAO_S)
+        with orcamento(PRAZO_PADRAO_S) as prazo:
             resultados, ranking, msg = _call_simulation()
+        if prazo.desatualizados:
+            st.warning("A fonte online não respondeu a tempo; usando dados guardados (podem estar "
+                       "desatualizados): " + ", ".join(prazo.desatualizados))
+
+    except PrazoEsgotado:
+        st.error(f"A fonte online (BACEN) não respondeu em {PRAZO_PADRAO_S:.0f}s e não há dados guardados. "
+                 "Tente novamente mais tarde ou carregue um CSV local de IPCA/TR.")
+        logger.exception("Prazo da coleta online esgotado.")
+        resultados = ranking = msg = None
 
     except requests.RequestException:
         # Falha de rede ao acessar BACEN / fonte online
@@ -117,8 +153,7 @@ if run:
             st.info("Detectado problema no schema de bancos. Tentando aplicar correção automática e reexecutar...")
             try:
                 ensure_bancos_schema(fontes.caminho_bancos, missing, fin.taxa_juros_anual)
-                with st.spinner("Aplicando correção e reexecutando a simulação..."):
-                    resultados, ranking, msg = _call_simulation()
+                resultados, ranking, msg = _call_simulation()
             except Exception as e2:
                 st.error(f"Falha ao aplicar correção automática ou reexecutar a simulação: {e2}")
                 logger.exception("Erro durante autofix e reexecucao")
@@ -157,6 +192,8 @@ if run:
         logger.info("Salvo: %s", (out_dir/"ranking.csv").resolve())
 
         st.info(msg)
+        if estatisticas_cache():
+            st.caption("Cache HTTP: " + ", ".join(f"{k}={v}" for k, v in estatisticas_cache().items()))
 
         # Gráfico Ranking (salvar antes de exibir)
         st.subheader("Ranking — Total Pago")
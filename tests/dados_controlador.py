@@ -0,0 +1,26 @@
+"""
+tests/dados_controlador.py
+
+Entradas comuns dos testes do ControladorApp com vários bancos (sem rede):
+CSV de bancos, IPCA e TR locais e um financiamento de referência.
+Importar este módulo também coloca src no path.
+"""
+
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+BANCOS_CSV = os.path.join(ROOT, "dados", "bancos.csv")
+IPCA_CSV = os.path.join(ROOT, "dados", "ipca.csv")
+TR_CSV = os.path.join(ROOT, "tests", "fixtures", "tr_fixture.csv")
+FONTES = dict(fonte_ipca={"caminho_ipca": IPCA_CSV}, fonte_tr={"fixture_csv_path": TR_CSV})
+DADOS = {"valor_total": 300000.0, "entrada": 60000.0, "prazo_anos": 10}
+
+
+def parcelas(resultado):
+    """(valor_total, juros, saldo_devedor) de cada parcela, para comparar cronogramas."""
+    return [(p.valor_total, p.juros, p.saldo_devedor) for p in resultado.parcelas]
@@ -0,0 +1,129 @@
+"""
+tests/test_atualizador.py
+
+Atualizador em segundo plano (atualizador) contra o servidor local do SGS/Olinda:
+- um ciclo grava IPCA, TR e bancos.csv nos formatos que a UI/ControladorApp já leem
+- estado com última atualização e duração; fontes em dia não são recoletadas
+- falha do BACEN não troca o arquivo atual e fica registrada no estado
+- snapshots dos arquivos trocados já ficam prontos para o ControladorApp
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+
+# garante src e tools no path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for _p in (os.path.join(ROOT, "src"), os.path.join(ROOT, "tools")):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+from application.controlador import ControladorApp
+from infrastructure.data.atualizador import INTERVALO_FALHA_S, AtualizadorDados, ler_estado
+from infrastructure.data.cliente_sgs import ClienteSGS
+from infrastructure.data.coletor_txjuros import ColetorTxJuros, DialetosOData
+from infrastructure.data.snapshots import RepositorioSnapshots
+from infrastructure.data.tabela_ipca import TabelaIPCA
+from servidor_bacen_local import ServidorBacenLocal
+
+
+def _atualizador(srv, tmp, **kw):
+    return AtualizadorDados(
+        caminho_ipca=os.path.join(tmp, "IPCA_BACEN.csv"),
+        caminho_tr=os.path.join(tmp, "TR_mensal_compat.csv"),
+        caminho_bancos=os.path.join(tmp, "bancos.csv"),
+        dir_series=os.path.join(tmp, "series"),
+        arquivo_estado=os.path.join(tmp, "atualizacao.json"),
+        cliente=ClienteSGS(url_base=srv.url, atraso_hedge=0.05),
+        coletor_txjuros=ColetorTxJuros(base_url=srv.url_olinda),
+        mes_bancos="2025-07",
+        prazo_s=20,
+        **kw,
+    )
+
+
+def testar_ciclo_grava_arquivos_e_estado():
+    print("\n🔧 testar_ciclo_grava_arquivos_e_estado")
+    DialetosOData.esquecer()
+    with tempfile.TemporaryDirectory() as tmp, ServidorBacenLocal() as srv:
+        snaps = RepositorioSnapshots(os.path.join(tmp, "snapshots"))
+        at = _atualizador(srv, tmp, snapshots=snaps)
+        estado = at.executar_ciclo()
+        print({f: (e["ok"], e.get("linhas"), e["duracao_s"], e["erro"]) for f, e in estado.items()})
+        assert all(e["ok"] for e in estado.values()), estado
+
+        ipca = TabelaIPCA(at.caminhos["ipca"]).tabela
+        assert len(ipca) == estado["ipca"]["linhas"] and ipca["data"].iloc[0] == "08/1994"
+        assert estado["tr"]["linhas"] > 300 and estado["bancos"]["linhas"] == 23
+        # estado persistido (a UI lê sem o processo do atualizador)
+        gravado = ler_estado(at.arquivo_estado)
+        assert set(gravado) == {"ipca", "tr", "bancos"}
+        assert all(e["ultima_atualizacao"] and e["duracao_s"] >= 0 for e in gravado.values())
+
+        # em dia: nada vence, nenhuma requisição
+        srv.limpar()
+        assert at.pendentes() == [] and at.executar_ciclo() == {} and srv.relatorio() == {}
+
+        # ControladorApp lê os arquivos trocados; os snapshots já estão prontos
+        ctrl = ControladorApp(snapshots=RepositorioSnapshots(os.path.join(tmp, "snapshots")))
+        resultados, ranking, _ = ctrl.simular_multiplos_bancos(
+            caminho_bancos_csv=at.caminhos["bancos"],
+            dados_financiamento={"valor_total": 300_000.0, "entrada": 60_000.0, "prazo_anos": 10,
+                                 "taxa_juros_anual": 0.11},
+            fonte_ipca={"caminho_ipca": at.caminhos["ipca"]},
+            fonte_tr={"fixture_csv_path": at.caminhos["tr"]},
+        )
+        assert ranking
+        uso = ctrl.snapshots.execucao(ctrl.ultima_execucao)["snapshots"]
+        assert uso == {f: estado[f]["snapshot"] for f in ("ipca", "tr", "bancos")}
+    DialetosOData.esquecer()
+
+
+def testar_falha_nao_troca_arquivo():
+    print("\n🔧 testar_falha_nao_troca_arquivo")
+    DialetosOData.esquecer()
+    with tempfile.TemporaryDirectory() as tmp, ServidorBacenLocal() as srv:
+        at = _atualizador(srv, tmp)
+        assert at.atualizar("bancos")["ok"]
+        with open(at.caminhos["bancos"], "rb") as f:
+            antes = f.read()
+        anterior = at.estado()["bancos"]["ultima_atualizacao"]
+
+        srv.injetar(500, 1000)  # Olinda fora do ar
+        at.prazo_s = 2
+        estado = at.atualizar("bancos")
+        print(estado)
+        assert not estado["ok"] and "RuntimeError" in estado["erro"]
+        assert estado["ultima_atualizacao"] == anterior
+        with open(at.caminhos["bancos"], "rb") as f:
+            assert f.read() == antes
+        assert not [n for n in os.listdir(tmp) if n.startswith(".tmp_")]
+        # após uma falha, a fonte vence de novo em INTERVALO_FALHA_S (não no intervalo normal)
+        espera = at.proxima("bancos") - datetime.fromisoformat(estado["ultima_tentativa"])
+        assert espera.total_seconds() == INTERVALO_FALHA_S
+    DialetosOData.esquecer()
+
+
+def testar_laco_para_no_sinal():
+    print("\n🔧 testar_laco_para_no_sinal")
+    DialetosOData.esquecer()
+    with tempfile.TemporaryDirectory() as tmp, ServidorBacenLocal() as srv:
+        at = _atualizador(srv, tmp)
+        parar = threading.Event()
+        t = threading.Thread(target=at.executar, args=(parar, ["ipca", "tr"]), kwargs={"verificar_a_cada": 0.1})
+        t.start()
+        while set(at.estado()) != {"ipca", "tr"} and t.is_alive():
+            t.join(0.05)
+        parar.set()
+        t.join(5)
+        assert not t.is_alive() and all(e["ok"] for e in at.estado().values())
+    DialetosOData.esquecer()
+
+
+if __name__ == "__main__":
+    testar_ciclo_grava_arquivos_e_estado()
+    testar_falha_nao_troca_arquivo()
+    testar_laco_para_no_sinal()
+    print("\n🎯 Testes do atualizador passaram.")
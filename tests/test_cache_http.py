@@ -0,0 +1,199 @@
+"""
+tests/test_cache_http.py
+
+Cache HTTP em disco contra um servidor local com ETag/Last-Modified:
+- segunda execução dentro do TTL não toca a rede (acertos)
+- TTL vencido -> requisição condicional; 304 reaproveita o corpo, conteúdo novo regrava
+- ClienteSGS e ColetorTxJuros passam pelo cache ativado em sessao_http
+- stream=True: o corpo é gravado enquanto o chamador lê e servido do disco em blocos;
+  leitura abandonada no meio não vira entrada nem deixa temporários
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data import sessao_http
+from infrastructure.data.cache_http import CacheHTTP, url_canonica
+from infrastructure.data.cliente_sgs import ClienteSGS
+from infrastructure.data.coletor_txjuros import ColetorTxJuros
+
+
+class _Servidor:
+    """Serve um JSON versionado; responde 304 quando If-None-Match bate com a versão atual."""
+
+    def __init__(self):
+        self.versao = 1
+        self.chamadas = []  # (caminho, condicional?, status)
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *a):
+                pass
+
+            def do_GET(self):
+                etag = f'"v{servidor.versao}"'
+                caminho = urlparse(self.path).path
+                condicional = self.headers.get("If-None-Match")
+                if condicional == etag:
+                    servidor.chamadas.append((caminho, True, 304))
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                servidor.chamadas.append((caminho, bool(condicional), 200))
+                if "grande" in caminho:
+                    dados = [{"i": i, "v": f"{servidor.versao}" * 50} for i in range(20_000)]
+                elif "bcdata.sgs" in caminho:
+                    dados = [{"data": f"01/{m:02d}/2024", "valor": f"0,{servidor.versao}0"} for m in range(1, 4)]
+                else:
+                    dados = {"value": [{"InstituicaoFinanceira": "Banco A", "Mes": "2024-03",
+                                        "CodigoModalidade": 903101, "CodigoSegmento": 1,
+                                        "TaxaJurosAoAno": 10.0 + servidor.versao}]}
+                corpo = json.dumps(dados).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", "Mon, 01 Apr 2024 00:00:00 GMT")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def fechar(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _vencer(cache, url):
+    """Envelhece a entrada de `url` além de qualquer TTL."""
+    p_meta, _ = cache._caminhos(url)
+    with open(p_meta, encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["armazenado_em"] -= 10 ** 7
+    with open(p_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def testar_url_canonica():
+    print("\n🔧 testar_url_canonica")
+    assert url_canonica("http://H/x?b=2&a=1") == url_canonica("http://h/x?a=1&b=2")
+
+
+def testar_acerto_revalidacao_e_conteudo_novo():
+    print("\n🔧 testar_acerto_revalidacao_e_conteudo_novo")
+    srv = _Servidor()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = sessao_http.ativar_cache(CacheHTTP(os.path.join(tmp, "cache")))
+        try:
+            s = sessao_http.obter_sessao()
+            url = f"{srv.url}/odata/TaxasJurosMensalPorMes"
+            r1 = s.get(url, params={"$top": "5", "$format": "json"}, timeout=5)
+            r2 = s.get(url, params={"$format": "json", "$top": "5"}, timeout=5)
+            assert r1.json() == r2.json() and getattr(r2, "from_cache", False)
+            assert len(srv.chamadas) == 1
+
+            # corpo guardado comprimido
+            _, p_corpo = cache._caminhos(r1.url)
+            with gzip.open(p_corpo, "rb") as f:
+                assert json.loads(f.read()) == r1.json()
+
+            _vencer(cache, r1.url)
+            r3 = s.get(url, params={"$top": "5", "$format": "json"}, timeout=5)
+            assert srv.chamadas[-1] == ("/odata/TaxasJurosMensalPorMes", True, 304)
+            assert r3.json() == r1.json()
+
+            srv.versao = 2
+            _vencer(cache, r1.url)
+            r4 = s.get(url, params={"$top": "5", "$format": "json"}, timeout=5)
+            assert r4.json()["value"][0]["TaxaJurosAoAno"] == 12.0
+            r5 = s.get(url, params={"$top": "5", "$format": "json"}, timeout=5)
+            assert r5.json() == r4.json() and len(srv.chamadas) == 3
+            print(cache.estatisticas())
+            assert cache.estatisticas() == {"acertos": 2, "falhas": 2, "revalidadas": 1, "gravadas": 2,
+                                           "desatualizadas": 0}
+        finally:
+            sessao_http.desativar_cache()
+            srv.fechar()
+
+
+def testar_coletores_usam_cache():
+    print("\n🔧 testar_coletores_usam_cache")
+    srv = _Servidor()
+    with tempfile.TemporaryDirectory() as tmp:
+        sessao_http.ativar_cache(diretorio=os.path.join(tmp, "cache"))
+        try:
+            for _ in range(2):
+                df = ClienteSGS(url_base=srv.url, atraso_hedge=1.0).buscar_serie(433, "2024-01", "2024-03")
+                res = ColetorTxJuros(base_url=srv.url).coletar_mensal("2024-03", 903101)
+            assert list(df["valor"]) == [0.1, 0.1, 0.1] and len(res.df) == 1
+            # SGS + sondagem do $select + taxas; segunda rodada inteira saiu do disco
+            assert len(srv.chamadas) == 3
+            assert sessao_http.estatisticas_cache()["acertos"] == 2
+            # mesmo diretório: mantém o cache (e os contadores)
+            assert sessao_http.ativar_cache(diretorio=os.path.join(tmp, "cache")).estatisticas()["acertos"] == 2
+        finally:
+            sessao_http.desativar_cache()
+            srv.fechar()
+
+
+def testar_stream_sem_corpo_em_memoria():
+    print("\n🔧 testar_stream_sem_corpo_em_memoria")
+    srv = _Servidor()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = sessao_http.ativar_cache(CacheHTTP(os.path.join(tmp, "cache")))
+        try:
+            s = sessao_http.obter_sessao()
+            url = f"{srv.url}/grande"
+            with s.get(url, stream=True, timeout=5) as r1:
+                blocos = list(r1.iter_content(64 * 1024))
+                assert r1._content is False  # nem o cache montou o corpo inteiro
+            corpo = b"".join(blocos)
+            assert len(blocos) > 1 and len(json.loads(corpo)) == 20_000
+            assert cache.estatisticas()["gravadas"] == 1
+
+            with s.get(url, stream=True, timeout=5) as r2:
+                assert getattr(r2, "from_cache", False) and r2._content is False
+                blocos = list(r2.iter_content(64 * 1024))
+            assert len(blocos) > 1 and b"".join(blocos) == corpo and len(srv.chamadas) == 1
+
+            # conteúdo novo lido só pela metade: a entrada antiga fica, sem temporários
+            srv.versao = 2
+            _vencer(cache, r1.url)
+            with s.get(url, stream=True, timeout=5) as r3:
+                next(r3.iter_content(64 * 1024))
+            assert srv.chamadas[-1] == ("/grande", True, 200)
+            assert cache.estatisticas()["gravadas"] == 1
+            assert not any(n.startswith(".tmp_") for _, _, arqs in os.walk(cache.diretorio) for n in arqs)
+            _, p_corpo = cache._caminhos(r1.url)
+            with gzip.open(p_corpo, "rb") as f:
+                assert f.read() == corpo
+            # não-stream continua recebendo o corpo inteiro
+            assert s.get(url, timeout=5).json()[0]["v"] == "2" * 50
+            assert cache.estatisticas()["gravadas"] == 2
+        finally:
+            sessao_http.desativar_cache()
+            srv.fechar()
+
+
+if __name__ == "__main__":
+    testar_url_canonica()
+    testar_acerto_revalidacao_e_conteudo_novo()
+    testar_coletores_usam_cache()
+    testar_stream_sem_corpo_em_memoria()
+    print("\n🎯 Testes do cache HTTP passaram.")
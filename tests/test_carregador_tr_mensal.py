@@ -0,0 +1,98 @@
+"""
+tests/test_carregador_tr_mensal.py
+
+Valida carregar_tr_mensal (TR diária do Bacen -> mensal):
+- layout "DD/MM/YYYY" com rodapé "Fonte" (caminho rápido)
+- último valor do mês mesmo com linhas fora de ordem
+- série diária longa (100k+ linhas) agregada corretamente
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data.carregador_tr_mensal_CSV import carregar_tr_mensal
+
+
+def _write_latin1(tmpdir, name, text):
+    p = os.path.join(tmpdir, name)
+    with open(p, "w", encoding="latin1") as f:
+        f.write(text)
+    return p
+
+
+def testar_tr_diaria_bacen_ultimo_do_mes():
+    print("\n🔧 testar_tr_diaria_bacen_ultimo_do_mes")
+    content = (
+        "Data;Data fim;226 - Taxa referencial (TR) - % a.m.\n"
+        "30/01/2024;29/02/2024;0,0500\n"
+        "02/01/2024;02/02/2024;0,0100\n"   # fora de ordem: não pode ser o último de jan
+        "31/01/2024;29/02/2024;0,0600\n"
+        "01/02/2024;01/03/2024;0,0700\n"
+        "29/02/2024;29/03/2024;0,0800\n"
+        "Fonte; - ;BCB-Demab\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        p = _write_latin1(tmp, "tr_diaria.csv", content)
+        df = carregar_tr_mensal(p)
+
+    print(df)
+    assert list(df.columns) == ["data", "tr"]
+    assert list(df["data"]) == ["2024-01", "2024-02"]
+    # % a.m. -> fração
+    assert abs(df.loc[0, "tr"] - 0.0006) < 1e-12
+    assert abs(df.loc[1, "tr"] - 0.0008) < 1e-12
+
+
+def testar_tr_diaria_serie_longa():
+    print("\n🔧 testar_tr_diaria_serie_longa")
+    datas = pd.date_range("1970-01-01", periods=120_000, freq="D")
+    valores = np.arange(len(datas)) % 997 / 1000.0 + 0.01
+    df_in = pd.DataFrame({
+        "Data": datas.strftime("%d/%m/%Y"),
+        "226 - TR": [f"{v:.4f}".replace(".", ",") for v in valores],
+    })
+    esperado = (
+        pd.DataFrame({"data": datas.strftime("%Y-%m"), "tr": np.round(valores, 4) / 100.0})
+        .groupby("data", as_index=False)["tr"].last()
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        p = os.path.join(tmp, "tr_longa.csv")
+        df_in.to_csv(p, sep=";", index=False, encoding="latin1")
+        df = carregar_tr_mensal(p)
+
+    print("meses:", len(df))
+    assert len(df) == len(esperado)
+    assert list(df["data"]) == list(esperado["data"])
+    assert np.allclose(df["tr"].to_numpy(), esperado["tr"].to_numpy())
+
+
+def testar_tr_intervalo_com_preenchimento():
+    print("\n🔧 testar_tr_intervalo_com_preenchimento")
+    content = (
+        "Data;Valor\n"
+        "15/01/2024;0,10\n"
+        "15/03/2024;0,30\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        p = _write_latin1(tmp, "tr_lacuna.csv", content)
+        df = carregar_tr_mensal(p, start="2024-01", end="2024-04", fill_missing=True)
+
+    print(df)
+    assert list(df["data"]) == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    assert np.allclose(df["tr"].to_numpy(), [0.001, 0.001, 0.003, 0.003])
+
+
+if __name__ == "__main__":
+    testar_tr_diaria_bacen_ultimo_do_mes()
+    testar_tr_diaria_serie_longa()
+    testar_tr_intervalo_com_preenchimento()
+    print("\n🎯 Testes carregar_tr_mensal passaram.")
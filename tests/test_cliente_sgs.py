@@ -0,0 +1,325 @@
+"""
+tests/test_cliente_sgs.py
+
+ClienteSGS contra um servidor HTTP local que imita o SGS (payloads JSON/CSV) com latência
+e falhas configuráveis por estratégia:
+- IPCA e TR buscados em paralelo (tempo ~ max, não soma)
+- estratégia lenta/quebrada perde para um fallback rápido; perdedoras são canceladas
+- dump completo só sai depois que as estratégias baratas falham
+- janela terminando em mês não publicado para na primeira resposta até o último publicável
+- todas falhando -> ErroSGS
+- dataFinal no último dia real do mês (fevereiro, meses de 30 dias)
+- ColetorTR(online=True) e obter_ipca_df usando o cliente
+- coleta incremental com RepositorioSeries: só meses novos; sem requisição se em dia
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data.cliente_sgs import ClienteSGS, ErroSGS, coletar_ipca_tr, tentativas_padrao, ultimo_mes_publicado
+from infrastructure.data.coletor_bacen import obter_ipca_df
+from infrastructure.data.coletor_tr import ColetorTR
+from infrastructure.data.repositorio_series import RepositorioSeries
+
+MESES = pd.period_range("2023-01", "2024-12", freq="M")
+PAYLOADS = {
+    433: [{"data": p.strftime("01/%m/%Y"), "valor": f"{0.1 + i / 100:.2f}"} for i, p in enumerate(MESES)],
+    226: [{"data": p.strftime("01/%m/%Y"), "valor": f"{0.05 + i / 1000:.4f}"} for i, p in enumerate(MESES)],
+}
+
+
+class _ServidorSGS:
+    """
+    Stub do SGS. `regras[(serie, estrategia)] = (latencia_s, status)`, onde estrategia é
+    "intervalo_json", "ultimos_csv", "completo_json" etc. Padrão: (latencia, 200).
+    """
+
+    def __init__(self, latencia=0.0):
+        self.latencia = latencia
+        self.regras = {}
+        self.chamadas = []
+        self.consultas = []  # parâmetros de cada chamada, na mesma ordem
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *a):
+                pass
+
+            def do_GET(self):
+                u = urlparse(self.path)
+                q = {k: v[0] for k, v in parse_qs(u.query).items()}
+                serie = int(u.path.split("bcdata.sgs.")[1].split("/")[0])
+                nome = "ultimos" if "/ultimos/" in u.path else ("intervalo" if "dataInicial" in q else "completo")
+                formato = q.get("formato", "json")
+                estrategia = f"{nome}_{formato}"
+                servidor.chamadas.append((serie, estrategia))
+                servidor.consultas.append(q)
+                latencia, status = servidor.regras.get((serie, estrategia), (servidor.latencia, 200))
+                time.sleep(latencia)
+                if status != 200:
+                    self.send_response(status)
+                    self.end_headers()
+                    return
+                dados = PAYLOADS[serie]
+                if nome == "ultimos":
+                    dados = dados[-int(u.path.rsplit("/", 1)[1]):]
+                if formato == "csv":
+                    linhas = ['"data";"valor"'] + [f'"{d["data"]}";"{d["valor"].replace(".", ",")}"' for d in dados]
+                    corpo = "\n".join(linhas).encode("utf-8")
+                else:
+                    corpo = json.dumps(dados).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def fechar(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def testar_series_em_paralelo():
+    print("\n🔧 testar_series_em_paralelo")
+    srv = _ServidorSGS(latencia=0.4)
+    try:
+        cliente = ClienteSGS(url_base=srv.url, atraso_hedge=1.0)
+        t0 = time.perf_counter()
+        dfs = coletar_ipca_tr("2024-01", "2024-12", cliente)
+        dt = time.perf_counter() - t0
+        print(f"tempo: {dt:.2f}s", srv.chamadas)
+        assert dt < 0.75  # sequencial levaria >= 0.8s
+        assert list(dfs["ipca"].columns) == ["data", "ipca"] and len(dfs["ipca"]) == 12
+        assert dfs["ipca"]["data"].iloc[0] == "2024-01" and abs(dfs["ipca"]["ipca"].iloc[0] - 0.22) < 1e-12
+        assert list(dfs["tr"].columns) == ["data", "tr"]
+        assert abs(dfs["tr"]["tr"].iloc[-1] - 0.073) < 1e-12  # mediana < 1 -> mantém
+        # primeira estratégia venceu antes do hedge: nenhuma outra foi disparada
+        assert sorted(srv.chamadas) == [(226, "intervalo_json"), (433, "intervalo_json")]
+    finally:
+        srv.fechar()
+
+
+def testar_fallback_rapido_vence():
+    print("\n🔧 testar_fallback_rapido_vence")
+    srv = _ServidorSGS()
+    srv.regras[(226, "intervalo_json")] = (2.0, 200)   # lenta
+    srv.regras[(226, "intervalo_csv")] = (0.0, 500)    # quebrada
+    try:
+        cliente = ClienteSGS(url_base=srv.url, atraso_hedge=0.05)
+        t0 = time.perf_counter()
+        df = ColetorTR(online=True, cliente=cliente).coletar("2024-07", "2024-12")
+        dt = time.perf_counter() - t0
+        print(f"tempo: {dt:.2f}s", srv.chamadas)
+        assert dt < 1.0
+        assert list(df["data"]) == [f"2024-{m:02d}" for m in range(7, 13)]
+        # /ultimos/6 cobre o período e vence; o dump completo (reserva) nem sai
+        assert not any(e.startswith("completo") for _, e in srv.chamadas)
+    finally:
+        srv.fechar()
+
+
+def testar_dump_completo_so_como_reserva():
+    print("\n🔧 testar_dump_completo_so_como_reserva")
+    srv = _ServidorSGS()
+    srv.regras[(226, "intervalo_json")] = (0.3, 500)
+    srv.regras[(226, "intervalo_csv")] = (0.0, 500)
+    try:
+        cliente = ClienteSGS(url_base=srv.url, atraso_hedge=0.05)
+        df = ColetorTR(online=True, cliente=cliente).coletar("2024-01", "2024-06")
+        print(srv.chamadas)
+        assert list(df["data"]) == [f"2024-{m:02d}" for m in range(1, 7)]
+        # /ultimos/6 traz jul-dez (fora do período): o dump só sai depois que as baratas falham
+        estrategias = [e for _, e in srv.chamadas]
+        assert estrategias.index("completo_json") > estrategias.index("intervalo_json")
+        assert "completo_csv" not in estrategias  # completo_json venceu antes do hedge
+    finally:
+        srv.fechar()
+
+
+def testar_janela_ate_ultimo_publicado():
+    print("\n🔧 testar_janela_ate_ultimo_publicado")
+    import infrastructure.data.cliente_sgs as cliente_sgs
+
+    srv = _ServidorSGS()
+    original = cliente_sgs.ultimo_mes_publicado
+    cliente_sgs.ultimo_mes_publicado = lambda serie, hoje=None: "2024-12"
+    try:
+        cliente = ClienteSGS(url_base=srv.url, atraso_hedge=1.0)
+        t0 = time.perf_counter()
+        df = cliente.buscar_serie(433, "2024-07", "2025-03")  # jan-mar/2025 ainda não publicados
+        dt = time.perf_counter() - t0
+        print(f"tempo: {dt:.2f}s", srv.chamadas)
+        assert df["data"].iloc[-1] == "2024-12" and len(df) == 6
+        # a primeira resposta já cobre até o último mês publicável: para sem esperar o hedge
+        assert srv.chamadas == [(433, "intervalo_json")] and dt < 0.75
+    finally:
+        cliente_sgs.ultimo_mes_publicado = original
+        srv.fechar()
+
+
+def testar_todas_falham():
+    print("\n🔧 testar_todas_falham")
+    srv = _ServidorSGS()
+    for nome in ("intervalo", "ultimos", "completo"):
+        for formato in ("json", "csv"):
+            srv.regras[(433, f"{nome}_{formato}")] = (0.0, 503)
+    try:
+        cliente = ClienteSGS(url_base=srv.url, atraso_hedge=0.0)
+        try:
+            cliente.buscar_serie(433, "2024-01", "2024-03")
+            assert False, "Esperava ErroSGS"
+        except ErroSGS as e:
+            print("✅", str(e)[:80])
+        assert len(srv.chamadas) == 6
+    finally:
+        srv.fechar()
+
+
+def testar_data_final_no_fim_do_mes():
+    print("\n🔧 testar_data_final_no_fim_do_mes")
+    finais = {fim: tentativas_padrao("2024-01", fim)[0].params["dataFinal"]
+              for fim in ("2024-02", "2023-02", "2026-09", "2024-12")}
+    print(finais)
+    assert finais == {"2024-02": "29/02/2024", "2023-02": "28/02/2023",
+                      "2026-09": "30/09/2026", "2024-12": "31/12/2024"}
+
+
+def testar_obter_ipca_df_com_cliente():
+    print("\n🔧 testar_obter_ipca_df_com_cliente")
+    srv = _ServidorSGS()
+    try:
+        df = obter_ipca_df(data_inicial="01/07/2024", data_final="31/12/2024",
+                           cliente=ClienteSGS(url_base=srv.url))
+        assert list(df["data"]) == [f"2024-{m:02d}" for m in range(7, 13)]
+        assert abs(df["ipca"].iloc[-1] - 0.33) < 1e-12
+    finally:
+        srv.fechar()
+
+
+def testar_ultimo_mes_publicado():
+    print("\n🔧 testar_ultimo_mes_publicado")
+    assert ultimo_mes_publicado(433, date(2024, 8, 5)) == "2024-06"   # IPCA de jul sai ~10/ago
+    assert ultimo_mes_publicado(433, date(2024, 8, 20)) == "2024-07"
+    assert ultimo_mes_publicado(226, date(2024, 1, 2)) == "2024-01"
+    assert ultimo_mes_publicado(9999, date(2024, 1, 2)) is None
+
+
+def testar_coleta_incremental_tr():
+    print("\n🔧 testar_coleta_incremental_tr")
+    srv = _ServidorSGS()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = RepositorioSeries(tmp)
+            cliente = ClienteSGS(url_base=srv.url, atraso_hedge=1.0)
+            df1 = ColetorTR(online=True, cliente=cliente, repositorio=repo).coletar("2023-01", "2024-06")
+            assert len(df1) == 18 and repo.ultimo_mes("tr") == "2024-06"
+
+            # novo mês: uma única requisição, a partir do último guardado
+            srv.chamadas.clear(); srv.consultas.clear()
+            df2 = ColetorTR(online=True, cliente=cliente, repositorio=RepositorioSeries(tmp)).coletar("2023-01", "2024-07")
+            print(srv.chamadas, srv.consultas)
+            assert srv.chamadas == [(226, "intervalo_json")]
+            assert srv.consultas[0]["dataInicial"] == "01/07/2024" and srv.consultas[0]["dataFinal"] == "31/07/2024"
+            assert len(df2) == 19 and abs(df2["tr"].iloc[-1] - (0.05 + 18 / 1000)) < 1e-12
+            assert df2.iloc[:18].reset_index(drop=True).equals(df1)
+
+            # em dia: nenhuma requisição
+            srv.chamadas.clear()
+            df3 = ColetorTR(online=True, cliente=cliente, repositorio=RepositorioSeries(tmp)).coletar("2024-01", "2024-07")
+            assert srv.chamadas == [] and len(df3) == 7
+    finally:
+        srv.fechar()
+
+
+def testar_incremental_respeita_publicacao():
+    print("\n🔧 testar_incremental_respeita_publicacao")
+    srv = _ServidorSGS()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = RepositorioSeries(tmp)
+            cliente = ClienteSGS(url_base=srv.url, atraso_hedge=1.0)
+            cliente.buscar_incremental(433, "2024-01", "2024-06", repo, "ipca", hoje=date(2024, 7, 20))
+            srv.chamadas.clear()
+            # 5 de agosto: IPCA de julho ainda não saiu -> sem requisição
+            df = cliente.buscar_incremental(433, "2024-01", "2024-07", repo, "ipca", hoje=date(2024, 8, 5))
+            assert srv.chamadas == [] and df["data"].iloc[-1] == "2024-06"
+            # obter_ipca_df com repositório usa o mesmo caminho (hoje real: julho já publicável)
+            df = obter_ipca_df(data_inicial="01/01/2024", data_final="31/07/2024",
+                               cliente=cliente, repositorio=repo)
+            assert list(df.columns) == ["data", "ipca"] and df["data"].iloc[-1] == "2024-07"
+            assert len(srv.chamadas) == 1 and srv.consultas[-1]["dataInicial"] == "01/07/2024"
+    finally:
+        srv.fechar()
+
+
+def testar_incremental_reconstroi_historico_curto():
+    print("\n🔧 testar_incremental_reconstroi_historico_curto")
+    srv = _ServidorSGS()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = RepositorioSeries(tmp)
+            cliente = ClienteSGS(url_base=srv.url, atraso_hedge=1.0)
+            cliente.buscar_incremental(433, "2024-01", "2024-06", repo, "ipca", hoje=date(2024, 7, 20))
+            # início anterior ao guardado: busca até o último guardado e reescreve a série
+            srv.chamadas.clear(); srv.consultas.clear()
+            df = cliente.buscar_incremental(433, "2023-01", "2024-03", repo, "ipca", hoje=date(2024, 7, 20))
+            assert srv.consultas[0]["dataInicial"] == "01/01/2023" and srv.consultas[0]["dataFinal"] == "30/06/2024"
+            assert len(df) == 15 and df["data"].iloc[-1] == "2024-03"
+            assert repo.primeiro_mes("ipca") == "2023-01" and repo.tamanho("ipca") == 18
+            assert RepositorioSeries(tmp).ler("ipca")["valor"].tolist() == [float(d["valor"]) for d in PAYLOADS[433][:18]]
+            # agora o repositório cobre o período: nenhuma requisição
+            srv.chamadas.clear()
+            df2 = cliente.buscar_incremental(433, "2023-01", "2024-03", repo, "ipca", hoje=date(2024, 7, 20))
+            assert srv.chamadas == [] and df2.equals(df)
+    finally:
+        srv.fechar()
+
+def testar_incremental_sgs_fora_marca_desatualizado():
+    print("\n🔧 testar_incremental_sgs_fora_marca_desatualizado")
+    srv = _ServidorSGS()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = RepositorioSeries(tmp)
+            cliente = ClienteSGS(url_base=srv.url, atraso_hedge=0.0)
+            cliente.buscar_incremental(433, "2024-01", "2024-06", repo, "ipca", hoje=date(2024, 7, 20))
+            for nome in ("intervalo", "ultimos", "completo"):
+                for formato in ("json", "csv"):
+                    srv.regras[(433, f"{nome}_{formato}")] = (0.0, 503)
+            # julho já deveria ter saído: o histórico volta, mas marcado como desatualizado
+            df = cliente.buscar_incremental(433, "2024-01", "2024-07", repo, "ipca", hoje=date(2024, 8, 20))
+            assert df["data"].iloc[-1] == "2024-06" and df.attrs["desatualizado"]
+    finally:
+        srv.fechar()
+
+
+if __name__ == "__main__":
+    testar_series_em_paralelo()
+    testar_fallback_rapido_vence()
+    testar_dump_completo_so_como_reserva()
+    testar_janela_ate_ultimo_publicado()
+    testar_todas_falham()
+    testar_data_final_no_fim_do_mes()
+    testar_obter_ipca_df_com_cliente()
+    testar_ultimo_mes_publicado()
+    testar_coleta_incremental_tr()
+    testar_incremental_respeita_publicacao()
+    testar_incremental_reconstroi_historico_curto()
+    testar_incremental_sgs_fora_marca_desatualizado()
+    print("\n🎯 Testes do ClienteSGS passaram.")
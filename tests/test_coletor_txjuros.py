@@ -0,0 +1,347 @@
+"""
+tests/test_coletor_txjuros.py
+
+Paginação concorrente do ColetorTxJuros contra um stub local do Olinda ($top/$skip/$count):
+- total via $count -> páginas em paralelo, remontadas em ordem
+- sem $count -> sondagem em janela deslizante até a página vazia/incompleta
+- página lenta não segura as demais; retentativas por página; falha definitiva corta o resultado
+- dialeto de $filter que funcionou é lembrado (e persistido) para as próximas coletas; a
+  paginação não; falha ao gravar os dialetos não derruba a coleta
+- filtro no cliente: página sem linhas aceitas não encerra a paginação
+- $select com os campos usados (quando aceito) e várias modalidades num $filter com `or`
+- só 400/501 na sondagem do $select são lembrados como recusa
+- aceite do $select persistido à parte (projecoes_odata.json), fora dos dialetos de $filter
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data import coletor_txjuros
+from infrastructure.data.coletor_txjuros import (ARQUIVO_DIALETOS, ARQUIVO_PROJECOES, ColetorTxJuros, DialetosOData,
+                                                 ProjecoesOData)
+from infrastructure.data.sessao_http import obter_sessao
+
+REGISTROS = [{"InstituicaoFinanceira": f"Banco {i:03d}", "Mes": "2024-03", "CodigoModalidade": 903101,
+              "CodigoSegmento": 1, "TaxaJurosAoAno": 10.0 + i / 100} for i in range(23)]
+
+
+class _ServidorOlinda:
+    """
+    Stub OData. `latencia[pagina]` (s), `falhas[pagina]` (quantas vezes responder 503) e
+    `com_count` (se informa @odata.count). Páginas contadas por $skip // $top.
+    `filtro_aceito`: regex do único dialeto de $filter aceito (os demais -> 400); None = nenhum.
+    O $filter aceito devolve os `registros` das modalidades citadas. `aceita_select`: projeta
+    os campos do $select (campo inexistente -> 400); se False, todo $select -> `status_select`.
+    """
+
+    def __init__(self, com_count=True):
+        self.com_count = com_count
+        self.latencia = {}
+        self.falhas = {}
+        self.paginas = []
+        self.filtro_aceito = None
+        self.filtros = []
+        self.registros = REGISTROS
+        self.aceita_select = True
+        self.status_select = 400
+        self.selects = []
+        self._lock = threading.Lock()
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *a):
+                pass
+
+            def do_GET(self):
+                q = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                top, skip = int(q.get("$top", 1000)), int(q.get("$skip", 0))
+                corpo = {}
+                campos = q["$select"].split(",") if "$select" in q else None
+                if campos is not None:
+                    servidor.selects.append(q["$select"])
+                    if not servidor.aceita_select or not set(campos) <= set(servidor.registros[0]):
+                        self.send_response(400 if servidor.aceita_select else servidor.status_select)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                if "$filter" in q:
+                    servidor.filtros.append(q["$filter"])
+                    if not (servidor.filtro_aceito and re.match(servidor.filtro_aceito, q["$filter"])):
+                        self.send_response(400)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    codigos = {int(c) for c in re.findall(r"CodigoModalidade eq (\d+)", q["$filter"])}
+                    corpo["value"] = [r for r in servidor.registros
+                                      if not codigos or r["CodigoModalidade"] in codigos][:top]
+                elif q.get("$count") == "true":
+                    if servidor.com_count:
+                        corpo["@odata.count"] = len(servidor.registros)
+                    corpo["value"] = servidor.registros[:top]
+                else:
+                    pagina = skip // top
+                    with servidor._lock:
+                        servidor.paginas.append(pagina)
+                        falhar = servidor.falhas.get(pagina, 0) > 0
+                        if falhar:
+                            servidor.falhas[pagina] -= 1
+                    time.sleep(servidor.latencia.get(pagina, 0.0))
+                    if falhar:
+                        self.send_response(503)
+                        self.end_headers()
+                        return
+                    corpo["value"] = servidor.registros[skip:skip + top]
+                if campos is not None:
+                    corpo["value"] = [{k: r[k] for k in campos} for r in corpo["value"]]
+                dados = json.dumps(corpo).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def fechar(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _coletor(srv, paralelas=4, diretorio=None):
+    # sem retry de transporte: as retentativas testadas são as do próprio coletor
+    return ColetorTxJuros(base_url=srv.url, session=obter_sessao(retentar=False),
+                          max_paginas_paralelas=paralelas, diretorio_cache=diretorio)
+
+
+def _nomes(df):
+    return list(df["InstituicaoFinanceira"])
+
+
+def testar_paginas_em_paralelo_com_count():
+    print("\n🔧 testar_paginas_em_paralelo_com_count")
+    srv = _ServidorOlinda()
+    srv.latencia = {i: 0.3 for i in range(5)}
+    try:
+        t0 = time.perf_counter()
+        df = _coletor(srv)._paged_collect("X", {}, page_size=5, max_pages=100)
+        dt = time.perf_counter() - t0
+        print(f"tempo: {dt:.2f}s páginas: {sorted(srv.paginas)}")
+        assert _nomes(df) == [r["InstituicaoFinanceira"] for r in REGISTROS]
+        assert sorted(srv.paginas) == [0, 1, 2, 3, 4]  # $count: nenhuma página além do total
+        assert dt < 1.2  # sequencial levaria >= 1.5s
+    finally:
+        srv.fechar()
+
+
+def testar_sondagem_sem_count_e_pagina_lenta():
+    print("\n🔧 testar_sondagem_sem_count_e_pagina_lenta")
+    srv = _ServidorOlinda(com_count=False)
+    srv.latencia = {1: 0.4, 3: 0.4}
+    try:
+        t0 = time.perf_counter()
+        df = _coletor(srv, paralelas=2)._paged_collect("X", {}, page_size=5, max_pages=100)
+        dt = time.perf_counter() - t0
+        print(f"tempo: {dt:.2f}s páginas: {srv.paginas}")
+        assert _nomes(df) == [r["InstituicaoFinanceira"] for r in REGISTROS]
+        # janela deslizante: enquanto a página 1 demora, a outra vaga segue com 2 e 3
+        # (em lotes fixos de 2, as páginas 1 e 3 lentas somariam >= 0.8s)
+        assert max(srv.paginas) <= 5 and dt < 0.7
+    finally:
+        srv.fechar()
+
+
+def testar_retentativas_por_pagina():
+    print("\n🔧 testar_retentativas_por_pagina")
+    espera = coletor_txjuros._sleep_backoff
+    coletor_txjuros._sleep_backoff = lambda *a, **k: None
+    srv = _ServidorOlinda()
+    try:
+        srv.falhas = {2: 2}  # JSON e CSV da 1ª tentativa falham -> 2ª tentativa passa
+        df = _coletor(srv)._paged_collect("X", {}, page_size=5, max_pages=100)
+        assert len(df) == 23
+
+        srv.falhas = {2: 100}  # falha definitiva: fica com as páginas anteriores
+        df = _coletor(srv)._paged_collect("X", {}, page_size=5, max_pages=100, retries_per_page=2)
+        assert _nomes(df) == [r["InstituicaoFinanceira"] for r in REGISTROS[:10]]
+    finally:
+        coletor_txjuros._sleep_backoff = espera
+        srv.fechar()
+
+
+def testar_filtro_no_cliente_durante_paginacao():
+    print("\n🔧 testar_filtro_no_cliente_durante_paginacao")
+    srv = _ServidorOlinda(com_count=False)
+    try:
+        df = _coletor(srv, paralelas=2)._paged_collect(
+            "X", {}, page_size=5, max_pages=100, filtro=lambda l: l["InstituicaoFinanceira"] >= "Banco 012")
+        # páginas 0 e 1 não têm linhas aceitas, mas estão cheias: a coleta continua
+        assert _nomes(df) == [r["InstituicaoFinanceira"] for r in REGISTROS[12:]]
+        assert {0, 1, 2, 3, 4} <= set(srv.paginas)
+    finally:
+        srv.fechar()
+
+
+def testar_dialeto_lembrado_e_persistido():
+    print("\n🔧 testar_dialeto_lembrado_e_persistido")
+    srv = _ServidorOlinda()
+    srv.filtro_aceito = r"MesReferencia eq '\d{4}-\d{2}-01'"
+    DialetosOData.esquecer()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            res = _coletor(srv, diretorio=tmp).coletar_mensal("2024-03", 903101)
+            assert len(res.df) == 23
+            tentados = [f.split(" and ")[0] for f in dict.fromkeys(srv.filtros)]
+            print(tentados)
+            assert tentados == ["Mes eq '2024-03'", "MesReferencia eq '2024-03'",
+                                "Mes eq '2024-03-01'", "MesReferencia eq '2024-03-01'"]
+            assert os.path.exists(os.path.join(tmp, ARQUIVO_DIALETOS))
+
+            # "novo processo": memória vazia, dialeto relido do disco -> 1 requisição
+            DialetosOData.esquecer()
+            srv.filtros.clear()
+            res = _coletor(srv, diretorio=tmp).coletar_mensal("2024-04", 903101)
+            assert srv.filtros == ["MesReferencia eq '2024-04-01' and CodigoModalidade eq 903101 and CodigoSegmento eq 1"]
+
+            # servidor que não aceita filtro: pagina, mas a paginação não é lembrada como dialeto
+            srv.filtro_aceito = None
+            srv.filtros.clear()
+            _coletor(srv, diretorio=tmp).coletar_diaria_por_inicio("2024-03-01", 903101)
+            assert len(srv.filtros) == 2 * 2  # 2 dialetos x (JSON + CSV)
+            with open(os.path.join(tmp, ARQUIVO_DIALETOS), encoding="utf-8") as f:
+                assert "$paginar" not in json.load(f).values()
+            # filtro volta a funcionar: a próxima coleta o usa em vez de paginar
+            srv.filtro_aceito = r"InicioPeriodo eq "
+            srv.filtros.clear(); srv.paginas.clear()
+            _coletor(srv, diretorio=tmp).coletar_diaria_por_inicio("2024-04-01", 903101)
+            assert len(srv.filtros) == 1 and srv.paginas == []
+    finally:
+        DialetosOData.esquecer()
+        srv.fechar()
+
+
+def testar_dialeto_sem_disco_nao_falha():
+    print("\n🔧 testar_dialeto_sem_disco_nao_falha")
+    srv = _ServidorOlinda()
+    srv.filtro_aceito = r"Mes eq '\d{4}-\d{2}' and "
+    DialetosOData.esquecer()
+    try:
+        with tempfile.NamedTemporaryFile() as arquivo:
+            # "diretório" que é um arquivo: gravar os dialetos falha com OSError
+            res = _coletor(srv, diretorio=arquivo.name).coletar_mensal("2024-03", 903101)
+            assert len(res.df) == 23
+            assert DialetosOData().obter(f"{srv.url}/TaxasJurosMensalPorMes") == "Mes eq '{mes}'"
+    finally:
+        DialetosOData.esquecer()
+        srv.fechar()
+
+
+def testar_select_e_modalidades_combinadas():
+    print("\n🔧 testar_select_e_modalidades_combinadas")
+    registros = [dict(r, CodigoModalidade=m, TaxaJurosAoMes=0.8, Posicao=i, cnpj8="00000000")
+                 for i, (r, m) in enumerate(zip(REGISTROS, [903101] * 3 + [905101] * 2 + [903201]))]
+    srv = _ServidorOlinda()
+    srv.registros = registros
+    srv.filtro_aceito = r"Mes eq '\d{4}-\d{2}' and "
+    try:
+        coletor = _coletor(srv)
+        res = coletor.coletar_mensal_modalidades("2024-03", [903101, 905101, 903203])
+        print({c: len(r.df) for c, r in res.items()}, srv.filtros, srv.selects)
+        assert {c: len(r.df) for c, r in res.items()} == {903101: 3, 905101: 2, 903203: 0}
+        assert res[905101].df["instituicao"].tolist() == ["Banco 003", "Banco 004"]
+        assert set(res[905101].df["codigo_modalidade"]) == {905101}
+        # uma consulta só, com `or`, projetada ($select sondado uma vez antes)
+        assert srv.filtros == ["Mes eq '2024-03' and (CodigoModalidade eq 903101 or CodigoModalidade eq 905101"
+                               " or CodigoModalidade eq 903203) and CodigoSegmento eq 1"]
+        sel = "InstituicaoFinanceira,CodigoModalidade,CodigoSegmento,TaxaJurosAoAno,Mes"
+        assert srv.selects == [sel, sel]
+
+        srv.filtros.clear(); srv.selects.clear()
+        r = coletor.coletar_mensal("2024-03", 903101)
+        assert len(r.df) == 3 and srv.selects == [sel]  # projeção lembrada: sem nova sondagem
+        assert srv.filtros == ["Mes eq '2024-03' and CodigoModalidade eq 903101 and CodigoSegmento eq 1"]
+    finally:
+        srv.fechar()
+
+
+def testar_select_recusado():
+    print("\n🔧 testar_select_recusado")
+    srv = _ServidorOlinda()
+    srv.aceita_select = False
+    srv.filtro_aceito = r"Mes eq"
+    try:
+        for _ in range(2):
+            res = _coletor(srv).coletar_mensal("2024-03", 903101)
+            assert len(res.df) == 23
+        assert len(srv.selects) == 1  # só a sondagem; depois consulta sem $select
+    finally:
+        srv.fechar()
+
+
+def testar_select_falha_transitoria():
+    print("\n🔧 testar_select_falha_transitoria")
+    DialetosOData.esquecer(); ProjecoesOData.esquecer()
+    srv = _ServidorOlinda()
+    srv.aceita_select = False
+    srv.status_select = 503
+    srv.filtro_aceito = r"Mes eq"
+    try:
+        for _ in range(2):
+            assert len(_coletor(srv).coletar_mensal("2024-03", 903101).df) == 23
+        assert len(srv.selects) == 2  # 503 não conclui nada: sonda de novo na próxima coleta
+    finally:
+        DialetosOData.esquecer(); ProjecoesOData.esquecer()
+        srv.fechar()
+
+
+def testar_projecao_fora_dos_dialetos():
+    print("\n🔧 testar_projecao_fora_dos_dialetos")
+    DialetosOData.esquecer(); ProjecoesOData.esquecer()
+    srv = _ServidorOlinda()
+    srv.filtro_aceito = r"Mes eq '\d{4}-\d{2}' and "
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            assert len(_coletor(srv, diretorio=tmp).coletar_mensal("2024-03", 903101).df) == 23
+            recurso = f"{srv.url}/TaxasJurosMensalPorMes"
+            sel = "InstituicaoFinanceira,CodigoModalidade,CodigoSegmento,TaxaJurosAoAno,Mes"
+            with open(os.path.join(tmp, ARQUIVO_DIALETOS), encoding="utf-8") as f:
+                assert json.load(f) == {recurso: "Mes eq '{mes}'"}
+            with open(os.path.join(tmp, ARQUIVO_PROJECOES), encoding="utf-8") as f:
+                assert json.load(f) == {recurso: {sel: True}}
+
+            # "novo processo": aceite relido do disco, sem nova sondagem
+            DialetosOData.esquecer(); ProjecoesOData.esquecer()
+            srv.selects.clear()
+            assert ProjecoesOData(tmp).aceita(recurso, sel) is True
+            assert ProjecoesOData(tmp).aceita(recurso, "Outro") is None
+            assert len(_coletor(srv, diretorio=tmp).coletar_mensal("2024-03", 903101).df) == 23
+            assert srv.selects == [sel]
+    finally:
+        DialetosOData.esquecer(); ProjecoesOData.esquecer()
+        srv.fechar()
+
+
+if __name__ == "__main__":
+    testar_paginas_em_paralelo_com_count()
+    testar_sondagem_sem_count_e_pagina_lenta()
+    testar_retentativas_por_pagina()
+    testar_filtro_no_cliente_durante_paginacao()
+    testar_dialeto_lembrado_e_persistido()
+    testar_dialeto_sem_disco_nao_falha()
+    testar_select_e_modalidades_combinadas()
+    testar_select_recusado()
+    testar_select_falha_transitoria()
+    testar_projecao_fora_dos_dialetos()
+    print("\n🎯 Testes da paginação concorrente passaram.")
@@ -0,0 +1,85 @@
+"""
+tests/test_controlador_lote.py
+
+simular_lote_clientes (clientes × ofertas, kernel vetorizado):
+- para cada cliente, mesma ordem e mesmos totais de simular_multiplos_bancos
+- prazos diferentes no mesmo lote; top limita as linhas por cliente; entrada em DataFrame
+- top segue a regra de top_k: 0 não traz linhas, negativo é recusado
+- bancos/IPCA/TR carregados uma vez para o lote inteiro; blocos não mudam o resultado
+"""
+
+import pandas as pd
+
+# entradas comuns dos testes do controlador (também põe src no path)
+from dados_controlador import BANCOS_CSV, FONTES
+
+import application.controlador as controlador
+from application.controlador import COLUNAS_LOTE, ControladorApp
+
+CLIENTES = [
+    {"cliente": "ana", "valor_total": 300000.0, "entrada": 60000.0, "prazo_anos": 10},
+    {"cliente": "bia", "valor_total": 450000.0, "entrada": 90000.0, "prazo_anos": 30},
+    {"cliente": "caio", "valor_total": 180000.0, "entrada": 20000.0, "prazo_anos": 15.5},
+    {"cliente": "davi", "valor_total": 820000.0, "entrada": 400000.0, "prazo_anos": 1},
+]
+
+
+def testar_lote_igual_ao_individual():
+    print("\n🔧 testar_lote_igual_ao_individual")
+    ctrl = ControladorApp()
+    cargas = []
+    original = ctrl._carregar_entradas
+    ctrl._carregar_entradas = lambda *a: cargas.append(1) or original(*a)
+    tabela = ctrl.simular_lote_clientes(BANCOS_CSV, CLIENTES, **FONTES)
+    assert len(cargas) == 1 and list(tabela.columns) == COLUNAS_LOTE
+    print(tabela.head(3).to_string())
+
+    for c in CLIENTES:
+        resultados, ranking, _ = ControladorApp().simular_multiplos_bancos(BANCOS_CSV, c, **FONTES)
+        linhas = tabela[tabela["cliente"] == c["cliente"]]
+        assert linhas["posicao"].tolist() == list(range(1, len(ranking) + 1))
+        assert linhas["oferta"].tolist() == [rotulo for rotulo, _ in ranking], c["cliente"]
+        for linha in linhas.itertuples():
+            res = resultados[linha.oferta]
+            assert linha.total_pago == res.total_pago and linha.total_juros == res.total_juros, linha
+            assert linha.primeira_parcela == res.parcelas[0].valor_total
+            assert linha.ultima_parcela == res.parcelas[-1].valor_total
+
+
+def testar_top_blocos_e_dataframe():
+    print("\n🔧 testar_top_blocos_e_dataframe")
+    completa = ControladorApp().simular_lote_clientes(BANCOS_CSV, CLIENTES, **FONTES)
+    top3 = ControladorApp().simular_lote_clientes(BANCOS_CSV, pd.DataFrame(CLIENTES), **FONTES, top=3)
+    assert len(top3) == 3 * len(CLIENTES)
+    assert top3.equals(completa[completa["posicao"] <= 3].reset_index(drop=True))
+
+    nenhuma = ControladorApp().simular_lote_clientes(BANCOS_CSV, CLIENTES, **FONTES, top=0)
+    assert nenhuma.empty and list(nenhuma.columns) == COLUNAS_LOTE
+    try:
+        ControladorApp().simular_lote_clientes(BANCOS_CSV, CLIENTES, **FONTES, top=-1)
+        assert False, "top negativo deveria falhar"
+    except ValueError as e:
+        assert "top inválido" in str(e)
+
+    original = controlador.ELEMENTOS_POR_BLOCO
+    controlador.ELEMENTOS_POR_BLOCO = 1  # um cliente por bloco
+    try:
+        assert ControladorApp().simular_lote_clientes(BANCOS_CSV, CLIENTES, **FONTES).equals(completa)
+    finally:
+        controlador.ELEMENTOS_POR_BLOCO = original
+
+    # sem "cliente", o identificador é a posição na lista
+    sem_id = [{k: v for k, v in c.items() if k != "cliente"} for c in CLIENTES]
+    assert ControladorApp().simular_lote_clientes(BANCOS_CSV, sem_id, **FONTES, top=1)["cliente"].tolist() == [0, 1, 2, 3]
+
+    try:
+        ControladorApp().simular_lote_clientes(BANCOS_CSV, [{**CLIENTES[0], "prazo_anos": 10.01}], **FONTES)
+        assert False, "prazo fora de múltiplo de 1/12 deveria falhar"
+    except ValueError as e:
+        assert "1/12" in str(e)
+
+
+if __name__ == "__main__":
+    testar_lote_igual_ao_individual()
+    testar_top_blocos_e_dataframe()
+    print("\n🎯 Testes de simulação em lote passaram.")
@@ -0,0 +1,61 @@
+"""
+tests/test_controlador_paralelo.py
+
+simular_multiplos_bancos com workers (threads e processos):
+- mesmos resultados, mesma ordem (a do CSV) e mesmo ranking da execução serial
+- banco inválido levanta o mesmo erro da execução serial (o primeiro na ordem dos bancos)
+"""
+
+import time
+
+# entradas comuns dos testes do controlador (também põe src no path)
+from dados_controlador import BANCOS_CSV, DADOS, FONTES, parcelas
+
+from application.controlador import ControladorApp
+
+
+def _simular(bancos_csv, **kw):
+    return ControladorApp().simular_multiplos_bancos(bancos_csv, DADOS, **FONTES, **kw)
+
+
+def testar_paralelo_igual_ao_serial():
+    print("\n🔧 testar_paralelo_igual_ao_serial")
+    inicio = time.perf_counter()
+    res_serial, ranking_serial, msg_serial = _simular(BANCOS_CSV)
+    tempos = {"serial": time.perf_counter() - inicio}
+    for executor in ("threads", "processos"):
+        inicio = time.perf_counter()
+        res, ranking, msg = _simular(BANCOS_CSV, workers=4, executor=executor)
+        tempos[executor] = time.perf_counter() - inicio
+        assert list(res) == list(res_serial), executor
+        assert all(parcelas(res[k]) == parcelas(res_serial[k]) for k in res_serial), executor
+        assert ranking == ranking_serial and msg == msg_serial, executor
+    print({k: round(v, 3) for k, v in tempos.items()})
+
+
+def testar_erro_por_banco_preservado():
+    print("\n🔧 testar_erro_por_banco_preservado")
+    # linhas já lidas (o LeitorBancos recusaria PRICE/XYZ antes de simular)
+    bancos = [{"nome": n, "sistema": s, "taxa_anual": t}
+              for n, s, t in [("A", "SAC", 0.10), ("B", "PRICE", 0.11), ("C", "SAC", 0.09), ("D", "XYZ", 0.12)]]
+    ctrl = ControladorApp()
+    erros = []
+    for kw in ({}, {"workers": 3}, {"workers": 2, "executor": "processos"}):
+        try:
+            ctrl._simular_bancos(bancos, DADOS, None, None, **kw)
+        except ValueError as e:
+            erros.append(str(e))
+    print(erros)
+    assert erros == ["Sistema inválido: 'PRICE'"] * 3
+
+    try:
+        ctrl._simular_bancos(bancos, DADOS, None, None, workers=2, executor="fibras")
+        assert False, "executor inválido deveria falhar"
+    except ValueError as e:
+        assert "executor inválido" in str(e)
+
+
+if __name__ == "__main__":
+    testar_paralelo_igual_ao_serial()
+    testar_erro_por_banco_preservado()
+    print("\n🎯 Testes de simulação paralela passaram.")
@@ -0,0 +1,79 @@
+"""
+tests/test_controlador_progressivo.py
+
+iterar_simulacoes_bancos (resultados progressivos):
+- um item por banco, ranking parcial crescente; o último traz a mensagem
+- ranking/mensagem finais iguais aos de simular_multiplos_bancos (serial e com workers)
+- o primeiro item sai depois de um único banco simulado
+- execução em cache (snapshots) é gerada sem simular; parar de iterar cancela o restante
+"""
+
+import os
+import tempfile
+
+# entradas comuns dos testes do controlador (também põe src no path)
+from dados_controlador import BANCOS_CSV, DADOS, FONTES
+
+import application.controlador as controlador
+from application.controlador import ControladorApp
+from infrastructure.data.snapshots import RepositorioSnapshots
+
+
+def _contar_simulacoes():
+    chamadas = []
+    original = controlador._simular_banco
+    controlador._simular_banco = lambda *a: chamadas.append(1) or original(*a)
+    return chamadas, lambda: setattr(controlador, "_simular_banco", original)
+
+
+def testar_itens_progressivos_e_final():
+    print("\n🔧 testar_itens_progressivos_e_final")
+    _, ranking_esperado, msg_esperada = ControladorApp().simular_multiplos_bancos(BANCOS_CSV, DADOS, **FONTES)
+
+    chamadas, restaurar = _contar_simulacoes()
+    try:
+        gerador = ControladorApp().iterar_simulacoes_bancos(BANCOS_CSV, DADOS, **FONTES)
+        primeiro = next(gerador)
+        assert len(chamadas) == 1 and primeiro.concluidos == 1 and len(primeiro.ranking) == 1
+        itens = [primeiro, *gerador]
+    finally:
+        restaurar()
+
+    assert [p.concluidos for p in itens] == list(range(1, len(itens) + 1))
+    assert all(p.total == len(itens) and len(p.ranking) == p.concluidos for p in itens)
+    assert all(p.mensagem is None for p in itens[:-1]) and itens[-1].mensagem == msg_esperada
+    assert itens[-1].ranking == ranking_esperado
+    print(itens[-1].ranking[:3])
+
+    for executor in ("threads", "processos"):
+        itens = list(ControladorApp().iterar_simulacoes_bancos(BANCOS_CSV, DADOS, **FONTES,
+                                                                workers=4, executor=executor))
+        assert len(itens) == len(ranking_esperado), executor
+        assert itens[-1].ranking == ranking_esperado and itens[-1].mensagem == msg_esperada, executor
+
+
+def testar_cache_e_parada_antecipada():
+    print("\n🔧 testar_cache_e_parada_antecipada")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSnapshots(os.path.join(tmp, "snap"))
+        final = list(ControladorApp(snapshots=repo).iterar_simulacoes_bancos(BANCOS_CSV, DADOS, **FONTES))[-1]
+        # a execução progressiva guarda o mesmo resultado que simular_multiplos_bancos usaria
+        _, ranking, msg = ControladorApp(snapshots=repo).simular_multiplos_bancos(BANCOS_CSV, DADOS, **FONTES)
+        assert ranking == final.ranking and msg == final.mensagem
+
+        chamadas, restaurar = _contar_simulacoes()
+        try:
+            itens = list(ControladorApp(snapshots=repo).iterar_simulacoes_bancos(BANCOS_CSV, DADOS, **FONTES))
+        finally:
+            restaurar()
+        assert not chamadas and itens[-1].ranking == final.ranking and itens[-1].mensagem == final.mensagem
+
+    gerador = ControladorApp().iterar_simulacoes_bancos(BANCOS_CSV, DADOS, **FONTES, workers=2)
+    assert next(gerador).concluidos == 1
+    gerador.close()  # cancela as tarefas que ainda não começaram
+
+
+if __name__ == "__main__":
+    testar_itens_progressivos_e_final()
+    testar_cache_e_parada_antecipada()
+    print("\n🎯 Testes de simulação progressiva passaram.")
@@ -0,0 +1,86 @@
+"""
+tests/test_controlador_top_k.py
+
+simular_multiplos_bancos(top_k=...):
+- ranking e mensagem idênticos aos da simulação completa
+- só as k melhores ofertas têm cronograma completo (iguais ao da simulação completa); as demais, resumo
+- resumo (resumir) com os mesmos totais de simular em SAC, SAC TR e SAC IPCA+
+- mesmo resultado com workers e em iterar_simulacoes_bancos; cache separado da execução completa
+"""
+
+import os
+import tempfile
+
+# entradas comuns dos testes do controlador (também põe src no path)
+from dados_controlador import BANCOS_CSV, DADOS, FONTES, parcelas
+
+from application.controlador import ControladorApp
+from domain.simulacao_resultado import ResumoSimulacao, SimulacaoResultado
+from infrastructure.data.snapshots import RepositorioSnapshots
+
+
+def _conferir_top_k(saida, completa, k):
+    resultados, ranking, msg = saida
+    res_completos, ranking_completo, msg_completa = completa
+    assert ranking == ranking_completo and msg == msg_completa
+    assert list(resultados) == list(res_completos)
+    melhores = {rotulo for rotulo, _ in ranking[:k]}
+    for rotulo, resultado in resultados.items():
+        if rotulo in melhores:
+            assert isinstance(resultado, SimulacaoResultado)
+            assert parcelas(resultado) == parcelas(res_completos[rotulo])
+        else:
+            assert isinstance(resultado, ResumoSimulacao), rotulo
+            assert resultado.n_parcelas == 120
+            assert resultado.ultima_parcela == res_completos[rotulo].parcelas[-1].valor_total
+
+
+def testar_top_k_igual_ao_completo():
+    print("\n🔧 testar_top_k_igual_ao_completo")
+    completa = ControladorApp().simular_multiplos_bancos(BANCOS_CSV, DADOS, **FONTES)
+
+    resumos = ControladorApp().simular_multiplos_bancos(BANCOS_CSV, DADOS, **FONTES, top_k=0)[0]
+    sistemas = {rotulo.split(" – ")[-1] for rotulo in resumos}
+    assert sistemas == {"SAC", "SAC TR", "SAC IPCA+"}, sistemas
+    for rotulo, resumo in resumos.items():
+        assert resumo.total_pago == completa[0][rotulo].total_pago, rotulo
+        assert resumo.total_juros == completa[0][rotulo].total_juros, rotulo
+        assert resumo.to_dict_resumo() == completa[0][rotulo].to_dict_resumo()
+
+    _conferir_top_k(ControladorApp().simular_multiplos_bancos(BANCOS_CSV, DADOS, **FONTES, top_k=3), completa, 3)
+    _conferir_top_k(ControladorApp().simular_multiplos_bancos(
+        BANCOS_CSV, DADOS, **FONTES, top_k=5, workers=2, executor="processos"), completa, 5)
+
+    ultimo = list(ControladorApp().iterar_simulacoes_bancos(BANCOS_CSV, DADOS, **FONTES, top_k=3, workers=3))[-1]
+    _conferir_top_k((ultimo.resultados, ultimo.ranking, ultimo.mensagem), completa, 3)
+
+    try:
+        ControladorApp().simular_multiplos_bancos(BANCOS_CSV, DADOS, **FONTES, top_k=-1)
+        assert False, "top_k negativo deveria falhar"
+    except ValueError as e:
+        assert "top_k" in str(e)
+
+
+def testar_cache_separado_da_execucao_completa():
+    print("\n🔧 testar_cache_separado_da_execucao_completa")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSnapshots(os.path.join(tmp, "snap"))
+        ctrl = ControladorApp(snapshots=repo)
+        completa = ctrl.simular_multiplos_bancos(BANCOS_CSV, DADOS, **FONTES)
+        chave_completa = ctrl.ultima_execucao
+
+        _conferir_top_k(ctrl.simular_multiplos_bancos(BANCOS_CSV, DADOS, **FONTES, top_k=3), completa, 3)
+        chave_top3 = ctrl.ultima_execucao
+        assert chave_top3 != chave_completa
+        # a execução completa continua vindo do seu próprio cache, com todos os cronogramas
+        res, _, _ = ctrl.simular_multiplos_bancos(BANCOS_CSV, DADOS, **FONTES)
+        assert ctrl.ultima_execucao == chave_completa
+        assert all(isinstance(r, SimulacaoResultado) for r in res.values())
+        # replay respeita o top_k gravado
+        _conferir_top_k(ControladorApp(snapshots=repo).reproduzir_execucao(chave_top3), completa, 3)
+
+
+if __name__ == "__main__":
+    testar_top_k_igual_ao_completo()
+    testar_cache_separado_da_execucao_completa()
+    print("\n🎯 Testes de top_k passaram.")
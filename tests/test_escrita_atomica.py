@@ -0,0 +1,93 @@
+"""
+tests/test_escrita_atomica.py
+
+Escrita atômica compartilhada (infrastructure.data.escrita_atomica):
+- bytes e texto gravados; diretório criado se preciso
+- falha durante a escrita mantém o destino antigo e não deixa temporários
+- o temporário tem a extensão do destino (np.save não acrescenta ".npy")
+- gravação incremental: destino só aparece em concluir(); descartar() não deixa rastro
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data.escrita_atomica import GravacaoAtomica, gravar_atomico, trocar_atomico
+
+
+def testar_gravar_atomico():
+    print("\n🔧 testar_gravar_atomico")
+    with tempfile.TemporaryDirectory() as tmp:
+        destino = os.path.join(tmp, "sub", "a.json")
+        gravar_atomico(destino, "{\"v\": \"ç\"}", sincronizar=True)
+        with open(destino, encoding="utf-8") as f:
+            assert f.read() == "{\"v\": \"ç\"}"
+        gravar_atomico(destino, b"novo")
+        with open(destino, "rb") as f:
+            assert f.read() == b"novo"
+        assert os.listdir(os.path.dirname(destino)) == ["a.json"]
+
+
+def testar_falha_preserva_destino():
+    print("\n🔧 testar_falha_preserva_destino")
+    with tempfile.TemporaryDirectory() as tmp:
+        destino = os.path.join(tmp, "a.csv")
+        gravar_atomico(destino, "antigo")
+
+        def _escrever(caminho):
+            with open(caminho, "w", encoding="utf-8") as f:
+                f.write("pela metade")
+            raise RuntimeError("falhou")
+
+        try:
+            trocar_atomico(destino, _escrever)
+            assert False, "Esperava RuntimeError"
+        except RuntimeError:
+            print("✅ erro propagado")
+        with open(destino, encoding="utf-8") as f:
+            assert f.read() == "antigo"
+        assert os.listdir(tmp) == ["a.csv"]
+
+
+def testar_extensao_do_temporario():
+    print("\n🔧 testar_extensao_do_temporario")
+    with tempfile.TemporaryDirectory() as tmp:
+        destino = os.path.join(tmp, "v.npy")
+        trocar_atomico(destino, lambda caminho: np.save(caminho, np.arange(3)))
+        assert np.load(destino).tolist() == [0, 1, 2]
+        assert os.listdir(tmp) == ["v.npy"]
+
+
+def testar_gravacao_incremental():
+    print("\n🔧 testar_gravacao_incremental")
+    with tempfile.TemporaryDirectory() as tmp:
+        destino = os.path.join(tmp, "corpo.gz")
+        g = GravacaoAtomica(destino)
+        for bloco in (b"ab", b"cd"):
+            g.arquivo.write(bloco)
+        assert not os.path.exists(destino)
+        g.concluir()
+        with open(destino, "rb") as f:
+            assert f.read() == b"abcd"
+
+        g = GravacaoAtomica(destino)
+        g.arquivo.write(b"pela metade")
+        g.descartar()
+        with open(destino, "rb") as f:
+            assert f.read() == b"abcd"
+        assert os.listdir(tmp) == ["corpo.gz"]
+
+
+if __name__ == "__main__":
+    testar_gravar_atomico()
+    testar_falha_preserva_destino()
+    testar_extensao_do_temporario()
+    testar_gravacao_incremental()
+    print("\n🎯 Testes de escrita atômica passaram.")
@@ -0,0 +1,121 @@
+"""
+tests/test_extensao_indice.py
+
+Extensão virtual de séries de índices:
+- políticas "ultimo", "media", "media_12m" avaliadas sob demanda
+- fatias dentro da série real são visões (sem cópia)
+- base vazia sem projeção resulta em visão vazia
+- TabelaIPCA.estender / TabelaTR.estender não alteram a tabela original
+- simular_multiplos_bancos com IPCA curto não muta a tabela compartilhada
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data.extensao_indice import SerieEstendida
+from infrastructure.data.tabela_ipca import TabelaIPCA
+from infrastructure.data.tabela_tr import TabelaTR
+
+
+def testar_politicas_extensao():
+    print("\n🔧 testar_politicas_extensao")
+    valores = np.arange(1.0, 25.0)  # 1..24
+    assert SerieEstendida(valores, 30, "ultimo")[29] == 24.0
+    assert SerieEstendida(valores, 30, "media")[29] == 12.5
+    assert SerieEstendida(valores, 30, "media_12m")[29] == np.mean(np.arange(13.0, 25.0))
+    # série menor que a janela: média da série inteira
+    assert SerieEstendida(np.array([1.0, 3.0]), 5, "media_12m")[4] == 2.0
+    try:
+        SerieEstendida(valores, 30, "zero")
+        assert False, "Esperava ValueError para política inválida"
+    except ValueError:
+        print("✅ política inválida rejeitada")
+
+
+def testar_fatias_sob_demanda():
+    print("\n🔧 testar_fatias_sob_demanda")
+    base = np.array([0.5, 0.4, 0.3])
+    s = SerieEstendida(base, 6, "ultimo")
+    assert len(s) == 6 and s.n_reais == 3
+    # dentro da série real: visão, sem cópia e sem calcular a extensão
+    f = s.fatia(0, 2)
+    assert np.shares_memory(f, base)
+    assert s._extra is None
+    assert list(s[1:5]) == [0.4, 0.3, 0.3, 0.3]
+    assert s[-1] == 0.3
+    assert list(s) == [0.5, 0.4, 0.3, 0.3, 0.3, 0.3]
+    try:
+        s[6]
+        assert False, "Esperava IndexError"
+    except IndexError:
+        print("✅ índice fora do tamanho virtual rejeitado")
+
+
+def testar_tabela_ipca_estender_sem_mutar():
+    print("\n🔧 testar_tabela_ipca_estender_sem_mutar")
+    tab = TabelaIPCA.from_dataframe(pd.DataFrame({"data": ["2024-01", "2024-02"], "ipca": [0.5, 0.3]}))
+    antes = tab.tabela.copy()
+    est = tab.estender(360, "media")
+    assert len(est) == 360
+    assert abs(est.get_ipca(1) - 0.005) < 1e-12
+    assert abs(est.get_ipca(360) - 0.004) < 1e-12
+    assert np.allclose(est.fatia_ipca(2, 4), [0.003, 0.004, 0.004])
+    pd.testing.assert_frame_equal(tab.tabela, antes)
+    assert len(tab.tabela) == 2
+
+
+def testar_tabela_tr_estender():
+    print("\n🔧 testar_tabela_tr_estender")
+    tab = TabelaTR.from_dataframe(pd.DataFrame({"data": ["2024-01", "2024-02"], "tr": [0.001, 0.002]}))
+    s = tab.estender(4)
+    assert list(s) == [0.001, 0.002, 0.002, 0.002]
+    assert len(tab.df) == 2
+
+
+def testar_base_vazia():
+    print("\n🔧 testar_base_vazia")
+    # sem dados reais não há o que estender: visão vazia, para a guarda "TR não carregada" disparar
+    s = SerieEstendida(np.empty(0), 12)
+    assert len(s) == 0 and list(s) == []
+    # com caminho projetado, os meses vêm todos de `futuro`
+    assert list(SerieEstendida(np.empty(0), 3, futuro=np.array([0.1, 0.2]))) == [0.1, 0.2, 0.2]
+
+
+def testar_controlador_nao_muta_ipca():
+    print("\n🔧 testar_controlador_nao_muta_ipca")
+    from application.controlador import ControladorApp
+
+    tab = TabelaIPCA.from_dataframe(pd.DataFrame({"data": ["2024-01", "2024-02"], "ipca": [0.5, 0.3]}))
+    ctrl = ControladorApp()
+    ctrl._carregar_tabela_ipca = lambda fonte, exige, ids=None: tab  # tabela compartilhada entre execuções
+    with tempfile.TemporaryDirectory() as tmp:
+        p = os.path.join(tmp, "bancos.csv")
+        with open(p, "w", encoding="utf-8") as f:
+            f.write("nome,sistema,taxa_anual\nBanco X,SAC_IPCA,0.06\n")
+        dados = {"valor_total": 300000.0, "entrada": 60000.0, "prazo_anos": 10}
+        r1, _, _ = ctrl.simular_multiplos_bancos(p, dados, fonte_ipca={"caminho_ipca": "-"})
+        r2, _, _ = ctrl.simular_multiplos_bancos(p, dados, fonte_ipca={"caminho_ipca": "-", "extensao": "media"})
+    assert len(tab.tabela) == 2
+    (res1,), (res2,) = r1.values(), r2.values()
+    assert len(res1.parcelas) == 120
+    # política "media" (0,4%) corrige mais que "ultimo" (0,3%)
+    assert res2.total_pago > res1.total_pago
+
+
+if __name__ == "__main__":
+    testar_politicas_extensao()
+    testar_fatias_sob_demanda()
+    testar_tabela_ipca_estender_sem_mutar()
+    testar_tabela_tr_estender()
+    testar_base_vazia()
+    testar_controlador_nao_muta_ipca()
+    print("\n🎯 Testes de extensão virtual passaram.")
@@ -0,0 +1,107 @@
+"""
+tests/test_gerador_bancos.py
+
+gerar_bancos_csv_real com consulta combinada (coletor falso com latência):
+- todas as modalidades numa consulta mensal só; prefer="ambos" usa a menor taxa por banco
+- sistemas sem mensal -> uma consulta diária combinada só para eles
+- preferência única vazia -> alternativa da mesma resposta, sem nova consulta
+- prazo global: consulta presa fica de fora, o resto é gravado
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data.coletor_txjuros import ResultadoColeta
+from infrastructure.data.gerador_bancos import gerar_bancos_csv_real
+
+LATENCIA = 0.3
+MENSAL = {
+    903101: [("Banco A", 0.12), ("Banco B", 0.11)],   # SAC mercado
+    905101: [("BANCO A", 0.10)],                      # SAC reguladas (mesmo banco, menor taxa)
+    905203: [("Banco C", 0.06)],                      # SAC_IPCA só tem reguladas
+}
+DIARIO = {903201: [("Banco T", 0.09)]}                # SAC_TR só tem diário
+
+
+class _ColetorFalso:
+    def __init__(self, preso=None):
+        self.preso = preso  # "mensal" | "diario" | None
+        self.liberar = threading.Event()
+        self.chamadas = []
+
+    def _responder(self, tipo, tabela, codigos):
+        self.chamadas.append((tipo, sorted(codigos)))
+        if tipo == self.preso:
+            self.liberar.wait(10)
+        time.sleep(LATENCIA)
+        return {c: ResultadoColeta(pd.DataFrame(tabela.get(c, []), columns=["instituicao", "taxa_anual"]), meta={})
+                for c in codigos}
+
+    def coletar_mensal_modalidades(self, mes, codigos_modalidade, codigo_segmento=1):
+        return self._responder("mensal", MENSAL, codigos_modalidade)
+
+    def coletar_diaria_modalidades(self, inicio_periodo, codigos_modalidade, codigo_segmento=1):
+        return self._responder("diario", DIARIO, codigos_modalidade)
+
+
+def _gerar(coletor, **kw):
+    with tempfile.TemporaryDirectory() as tmp:
+        destino = os.path.join(tmp, "bancos.csv")
+        t0 = time.perf_counter()
+        gerar_bancos_csv_real(destino, mes="2024-03", on_error="raise", verbose=False, coletor=coletor, **kw)
+        dt = time.perf_counter() - t0
+        return pd.read_csv(destino), dt
+
+
+def testar_consulta_combinada():
+    print("\n🔧 testar_consulta_combinada")
+    coletor = _ColetorFalso()
+    df, dt = _gerar(coletor, prefer="ambos")
+    print(f"tempo: {dt:.2f}s chamadas: {coletor.chamadas}")
+    # antes: 6 mensais + 2 diárias; agora 1 mensal combinada + 1 diária só do SAC_TR
+    assert coletor.chamadas == [("mensal", [903101, 903201, 903203, 905101, 905201, 905203]),
+                                ("diario", [903201, 905201])]
+    sac = df[df["sistema"] == "SAC"].set_index("nome")["taxa_anual"].to_dict()
+    assert sac == {"Banco A": 0.10, "Banco B": 0.11}
+    assert df[df["sistema"] == "SAC_TR"]["nome"].tolist() == ["Banco T"]
+    assert df[df["sistema"] == "SAC_IPCA"]["nome"].tolist() == ["Banco C"]
+    assert list(df["sistema"].drop_duplicates()) == ["SAC", "SAC_TR", "SAC_IPCA"]
+
+
+def testar_alternativa_sem_nova_consulta():
+    print("\n🔧 testar_alternativa_sem_nova_consulta")
+    coletor = _ColetorFalso()
+    df, _ = _gerar(coletor, prefer="mercado", modalidades=("SAC", "SAC_IPCA"))
+    assert len(coletor.chamadas) == 1
+    # SAC_IPCA mercado vazio -> reguladas da mesma resposta
+    assert df[df["sistema"] == "SAC_IPCA"]["nome"].tolist() == ["Banco C"]
+    assert df[df["sistema"] == "SAC"].set_index("nome")["taxa_anual"].to_dict() == {"Banco A": 0.12, "Banco B": 0.11}
+
+
+def testar_prazo_global():
+    print("\n🔧 testar_prazo_global")
+    coletor = _ColetorFalso(preso="diario")
+    try:
+        df, dt = _gerar(coletor, prefer="ambos", prazo_s=1.2)
+        print(f"tempo: {dt:.2f}s")
+        assert dt < 2.0
+        assert set(df["sistema"]) == {"SAC", "SAC_IPCA"}  # diário do SAC_TR abandonado no prazo
+    finally:
+        coletor.liberar.set()
+
+
+if __name__ == "__main__":
+    testar_consulta_combinada()
+    testar_alternativa_sem_nova_consulta()
+    testar_prazo_global()
+    print("\n🎯 Testes do gerador de bancos passaram.")
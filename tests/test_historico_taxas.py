@@ -0,0 +1,118 @@
+"""
+tests/test_historico_taxas.py
+
+Histórico local de taxas por mês (historico_taxas):
+- backfill paralelo de vários meses contra o servidor local (uma coleta combinada por mês)
+- nomes internados em ids estáveis; série de um banco e tabela longa filtrada
+- meses já gravados são pulados; meses sem dados ficam de fora e são tentados de novo
+- partições reabertas do disco dão o mesmo resultado
+- refazer um mês troca a partição inteira (sem colunas misturadas nem sobras no disco)
+"""
+
+import csv
+import glob
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# garante src e tools no path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for _p in (os.path.join(ROOT, "src"), os.path.join(ROOT, "tools")):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+from infrastructure.data.coletor_txjuros import ColetorTxJuros, DialetosOData
+from infrastructure.data.historico_taxas import HistoricoTaxas, meses_ate, preencher_historico
+from servidor_bacen_local import ServidorBacenLocal
+
+MESES = ["2025-05", "2025-06", "2025-07"]
+CAIXA = "CAIXA ECONOMICA FEDERAL"
+
+
+def _dados_varios_meses(destino):
+    """Copia os relatórios de 2025-07 para 2025-05/06 com a taxa anual somada de (mês - 7)."""
+    for caminho in glob.glob(os.path.join(ROOT, "dados", "txjuros", "2025-07P_*.csv")):
+        with open(caminho, encoding="utf-8-sig") as f:
+            linhas = list(csv.DictReader(f, delimiter=";"))
+        for mes in MESES:
+            delta = int(mes[5:]) - 7
+            nome = os.path.basename(caminho).replace("2025-07", mes)
+            with open(os.path.join(destino, nome), "w", encoding="utf-8", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=list(linhas[0]), delimiter=";")
+                w.writeheader()
+                for linha in linhas:
+                    taxa = float(linha["TaxaJurosAoAno"].replace(",", ".")) + delta
+                    w.writerow({**linha, "TaxaJurosAoAno": f"{taxa:.2f}".replace(".", ",")})
+
+
+def testar_meses_ate():
+    print("\n🔧 testar_meses_ate")
+    assert meses_ate("2025-02", 3) == ["2024-12", "2025-01", "2025-02"]
+    assert meses_ate("2025-07", 1) == ["2025-07"]
+
+
+def testar_backfill_paralelo_e_consultas():
+    print("\n🔧 testar_backfill_paralelo_e_consultas")
+    DialetosOData.esquecer()
+    with tempfile.TemporaryDirectory() as dados, tempfile.TemporaryDirectory() as tmp:
+        _dados_varios_meses(dados)
+        with ServidorBacenLocal(dir_dados=dados) as srv:
+            hist = HistoricoTaxas(tmp)
+            coletor = ColetorTxJuros(base_url=srv.url_olinda)
+            pedidos = []
+            original = coletor.coletar_mensal_modalidades
+
+            def _contar(mes, codigos, *a):
+                pedidos.append((mes, len(codigos)))
+                return original(mes, codigos, *a)
+
+            coletor.coletar_mensal_modalidades = _contar
+            resumo = preencher_historico(hist, ["2025-04"] + MESES, coletor=coletor, max_workers=4)
+            print(resumo, srv.relatorio())
+            assert resumo == {"2025-04": 0, "2025-05": 23, "2025-06": 23, "2025-07": 23}
+            assert hist.meses() == MESES
+            # uma coleta combinada (seis modalidades) por mês
+            assert sorted(pedidos) == [(m, 6) for m in ["2025-04"] + MESES]
+
+            # meses gravados são pulados; o mês sem dados é tentado de novo
+            pedidos.clear()
+            assert preencher_historico(hist, ["2025-04"] + MESES, coletor=coletor) == {"2025-04": 0}
+            assert pedidos == [("2025-04", 6)]
+
+        serie = hist.serie(CAIXA, 903101)
+        assert serie["mes"].tolist() == MESES
+        assert [round(a - b, 6) for a, b in zip(serie["taxa_anual"][1:], serie["taxa_anual"])] == [0.01, 0.01]
+        assert hist.serie("BANCO INEXISTENTE", 903101).empty
+
+        longa = hist.ler(desde="2025-06", modalidades=[903201], instituicoes=[CAIXA])
+        assert longa["mes"].tolist() == ["2025-06", "2025-07"]
+        assert set(longa["codigo_modalidade"]) == {903201} and set(longa["instituicao"]) == {CAIXA}
+        assert len(hist.ler()) == 69 and hist.ler(desde="2026-01").empty
+
+        # reaberto do disco: mesmos ids e mesmos dados
+        de_novo = HistoricoTaxas(tmp)
+        assert de_novo.instituicoes == hist.instituicoes
+        assert de_novo.id_instituicao(CAIXA) == hist.id_instituicao(CAIXA)
+        assert de_novo.serie(CAIXA, 903101).equals(serie)
+    DialetosOData.esquecer()
+
+
+def testar_refazer_troca_particao():
+    print("\n🔧 testar_refazer_troca_particao")
+    with tempfile.TemporaryDirectory() as tmp:
+        hist = HistoricoTaxas(tmp)
+        df = pd.DataFrame({"instituicao": ["A", "B"], "codigo_modalidade": [903101, 903101], "taxa_anual": [0.1, 0.2]})
+        assert hist.gravar_mes("2025-07", df) == 2
+        assert hist.gravar_mes("2025-07", df.iloc[:1].assign(taxa_anual=0.3)) == 1
+        assert hist.meses() == ["2025-07"] and hist.ler()["taxa_anual"].tolist() == [0.3]
+        assert sorted(os.listdir(tmp)) == ["_indice.json", "_instituicoes.json", "mes=2025-07"]
+        assert HistoricoTaxas(tmp).ler()["instituicao"].tolist() == ["A"]
+
+
+if __name__ == "__main__":
+    testar_meses_ate()
+    testar_backfill_paralelo_e_consultas()
+    testar_refazer_troca_particao()
+    print("\n🎯 Testes do histórico de taxas passaram.")
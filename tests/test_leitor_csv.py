@@ -8,7 +8,7 @@ if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
 
-from infrastructure.data.leitor_csv import ler_csv
+from infrastructure.data.leitor_csv import ler_csv, detectar_dialeto, _dialeto_cache
 
 print("🔧 Iniciando testes do leitor_csv.py")
 
@@ -34,4 +34,23 @@ assert pd.api.types.is_float_dtype(df["ipca"]), "❌ Coluna 'ipca' não está co
 # Teste 4 – Verifica se não há a linha da fonte
 assert not df["data"].str.contains("Fonte", case=False).any(), "❌ Linha da fonte não foi removida"
 
-print("✅ Todos os testes passaram com sucesso!")
\ No newline at end of file
+# Teste 5 – Dialeto detectado (latin-1 e ';') e reaproveitado do cache
+assert detectar_dialeto(csv_path) == ("ISO-8859-1", ";")
+hits_antes = _dialeto_cache.cache_info().hits
+ler_csv(csv_path)
+assert _dialeto_cache.cache_info().hits > hits_antes, "❌ Dialeto não foi reaproveitado do cache"
+
+print("✅ Todos os testes passaram com sucesso!")
+
+
+def testar_ler_csv_utf8_virgula():
+    """CSV já tratado (utf-8, ',') também é lido pelo engine C sem sniffing manual."""
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        p = os.path.join(tmp, "ipca_tratado.csv")
+        with open(p, "w", encoding="utf-8") as f:
+            f.write("data,ipca\n2024-01,0.42\n2024-02,-0.02\n")
+        assert detectar_dialeto(p) == ("utf-8", ",")
+        df = ler_csv(p)
+    assert list(df["data"]) == ["2024-01", "2024-02"]
+    assert abs(df.loc[1, "ipca"] - (-0.02)) < 1e-12
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+tests/test_leitura_json.py
+
+Leitura incremental de JSON (leitura_json):
+- mesmo resultado que json.loads para qualquer fragmentação dos blocos (inclusive UTF-8 partido)
+- chaves ausentes viram None; filtro descarta linhas antes de materializar
+- array ausente / truncado -> ValueError
+- pico de memória com filtro fica muito abaixo do de json.loads + DataFrame
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+
+import pandas as pd
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data.leitura_json import iterar_objetos, ler_colunas, ler_dataframe
+
+LINHAS = [
+    {"InstituicaoFinanceira": "BANCO ITAÚ", "Mes": "2024-03", "CodigoModalidade": 903101, "TaxaJurosAoAno": 11.5},
+    {"InstituicaoFinanceira": "CAIXA ECONÔMICA", "Mes": "2024-03", "CodigoModalidade": 905101, "TaxaJurosAoAno": 9.9},
+    {"InstituicaoFinanceira": "Banco \"X\" [teste]", "Mes": "2024-02", "CodigoModalidade": 903101},
+]
+DOC = json.dumps({"@odata.context": "http://x/$metadata#v", "value": LINHAS}, ensure_ascii=False).encode("utf-8")
+
+
+def _em_blocos(dados, n):
+    return (dados[i:i + n] for i in range(0, len(dados), n))
+
+
+def testar_qualquer_fragmentacao():
+    print("\n🔧 testar_qualquer_fragmentacao")
+    for n in (1, 2, 3, 7, 64, len(DOC)):
+        assert list(iterar_objetos(_em_blocos(DOC, n), chave="value")) == LINHAS, n
+    sgs = json.dumps([{"data": "01/01/2024", "valor": "0,42"}]).encode("utf-8")
+    assert list(iterar_objetos(_em_blocos(b"  " + sgs, 5))) == [{"data": "01/01/2024", "valor": "0,42"}]
+    assert list(iterar_objetos([b'{"value": []}'], chave="value")) == []
+
+
+def testar_colunas_e_filtro():
+    print("\n🔧 testar_colunas_e_filtro")
+    colunas, lidas = ler_colunas(_em_blocos(DOC, 10), chave="value")
+    assert lidas == 3 and colunas["TaxaJurosAoAno"] == [11.5, 9.9, None]
+    df = ler_dataframe(_em_blocos(DOC, 10), chave="value", filtro=lambda l: l["CodigoModalidade"] == 903101)
+    assert list(df["InstituicaoFinanceira"]) == ["BANCO ITAÚ", 'Banco "X" [teste]']
+    assert df.attrs["linhas_lidas"] == 3
+    vazio = ler_dataframe([DOC], chave="value", filtro=lambda l: False)
+    assert vazio.empty and vazio.attrs["linhas_lidas"] == 3
+
+
+def testar_erros():
+    print("\n🔧 testar_erros")
+    for corpo, chave in ((b"<html>erro</html>", "value"), (b'{"erro": 1}', None),
+                         (DOC[:-20], "value"), (b"", None)):
+        try:
+            list(iterar_objetos([corpo], chave=chave))
+            assert False, f"Esperava ValueError para {corpo[:20]!r}"
+        except ValueError:
+            pass
+
+
+def testar_memoria_constante_com_filtro():
+    print("\n🔧 testar_memoria_constante_com_filtro")
+    linha = {"InstituicaoFinanceira": "BANCO EXEMPLO S.A.", "Mes": "2024-03", "CodigoModalidade": 903101,
+             "CodigoSegmento": 1, "TaxaJurosAoAno": 10.25, "TaxaJurosAoMes": 0.81}
+    corpo = json.dumps({"value": [dict(linha, Posicao=i) for i in range(60_000)]}).encode("utf-8")
+
+    tracemalloc.start()
+    df = ler_dataframe(_em_blocos(corpo, 64 * 1024), chave="value", filtro=lambda l: l["Posicao"] % 1000 == 0)
+    _, pico_stream = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    ref = pd.DataFrame(json.loads(corpo)["value"])
+    ref = ref[ref["Posicao"] % 1000 == 0]
+    _, pico_json = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"pico streaming={pico_stream / 1e6:.1f} MB  json.loads={pico_json / 1e6:.1f} MB")
+    assert list(df["Posicao"]) == list(ref["Posicao"]) and len(df) == 60
+    assert pico_stream * 10 < pico_json
+
+
+if __name__ == "__main__":
+    testar_qualquer_fragmentacao()
+    testar_colunas_e_filtro()
+    testar_erros()
+    testar_memoria_constante_com_filtro()
+    print("\n🎯 Testes da leitura incremental de JSON passaram.")
@@ -0,0 +1,192 @@
+"""
+tests/test_lote_clientes.py
+
+Lote retomável de pedidos (application.lote_clientes + scripts/lote_clientes.py):
+- saída em blocos igual ao ranking do arquivo inteiro de uma vez
+- interrompido no meio (com um bloco escrito pela metade), retoma do último checkpoint sem duplicar
+- lote concluído não é refeito; checkpoint de outro lote é recusado
+- linha inválida não derruba o lote: vai com o motivo para <saida>.rejeitados.csv (sem repetir na retomada)
+- entrada modificada (tamanho ou mtime) desde o checkpoint: retomada recusada
+- CLI imprime a vazão e grava a saída
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+# entradas comuns dos testes do controlador (também põe src no path)
+from dados_controlador import BANCOS_CSV, FONTES, IPCA_CSV, ROOT, TR_CSV
+
+from application.controlador import ControladorApp
+from application.lote_clientes import caminho_checkpoint, caminho_rejeitados, ler_checkpoint, processar_arquivo
+from infrastructure.data.leitor_clientes import ler_em_blocos
+
+
+class Interrompido(Exception):
+    pass
+
+
+def _clientes(caminho, n=50):
+    pd.DataFrame({
+        "valor_total": [200_000.0 + 10_000 * i for i in range(n)],
+        "entrada": [40_000.0] * n,
+        "prazo_anos": [(10, 20, 30, 15.5)[i % 4] for i in range(n)],
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def testar_blocos_e_retomada():
+    print("\n🔧 testar_blocos_e_retomada")
+    lote = ControladorApp().preparar_lote(BANCOS_CSV, **FONTES)
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = _clientes(os.path.join(tmp, "clientes.csv"))
+        saida = os.path.join(tmp, "out", "lote.csv")
+        esperado = lote.ranquear(pd.read_csv(entrada), top=3)
+        assert [len(b) for b in ler_em_blocos(entrada, 7, pular=45)] == [5]
+        retomado = pd.concat(ler_em_blocos(entrada, 7, pular=12), ignore_index=True)
+        assert retomado.equals(pd.read_csv(entrada).iloc[12:].reset_index(drop=True))
+
+        # interrompe depois de 3 blocos e deixa um bloco escrito pela metade
+        def _interromper(p):
+            if p["blocos"] == 3:
+                raise Interrompido()
+        try:
+            processar_arquivo(lote, entrada, saida, linhas_por_bloco=7, top=3,
+                              ao_progresso=_interromper, intervalo_progresso=0)
+            assert False, "deveria ter sido interrompido"
+        except Interrompido:
+            pass
+        assert ler_checkpoint(saida)["linhas"] == 21 and not ler_checkpoint(saida)["concluido"]
+        with open(saida, "ab") as f:
+            f.write(b"lixo,de,um,bloco,incompleto")
+
+        blocos = []
+        original = lote.ranquear
+        lote.ranquear = lambda bloco, top=None, rej=None: blocos.append(len(bloco)) or original(bloco, top, rej)
+        progresso = []
+        estado = processar_arquivo(lote, entrada, saida, linhas_por_bloco=7, top=3, ao_progresso=progresso.append)
+        assert blocos == [7, 7, 7, 7, 1] and estado["concluido"] and estado["linhas"] == 50
+        assert progresso[-1]["linhas"] == 50 and progresso[-1]["linhas_por_s"] > 0
+        # mesmo conteúdo do lote inteiro (a menos da precisão do CSV)
+        pd.testing.assert_frame_equal(pd.read_csv(saida), esperado, check_dtype=False, rtol=1e-12)
+
+        # concluído: nada a refazer; checkpoint de outro lote é recusado
+        blocos.clear()
+        assert processar_arquivo(lote, entrada, saida, linhas_por_bloco=7, top=3)["concluido"] and not blocos
+        try:
+            processar_arquivo(lote, entrada, saida, top=5)
+            assert False, "checkpoint de outro top deveria ser recusado"
+        except ValueError as e:
+            assert "recomecar" in str(e)
+        processar_arquivo(lote, entrada, saida, top=5, recomecar=True)
+        assert len(pd.read_csv(saida)) == 5 * 50 and ler_checkpoint(saida)["top"] == 5
+
+
+def _interromper_no_bloco(n):
+    def _interromper(p):
+        if p["blocos"] == n:
+            raise Interrompido()
+    return _interromper
+
+
+def testar_linhas_invalidas():
+    print("\n🔧 testar_linhas_invalidas")
+    lote = ControladorApp().preparar_lote(BANCOS_CSV, **FONTES)
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = _clientes(os.path.join(tmp, "clientes.csv"), n=20)
+        df = pd.read_csv(entrada)
+        df["valor_total"] = df["valor_total"].astype(object)
+        invalidas = {2: ("prazo_anos", 10.01, "1/12"), 9: ("valor_total", "abc", "não numérico"),
+                     10: ("entrada", None, "sem valor"), 17: ("entrada", 900_000.0, "não positivo")}
+        for linha, (campo, valor, _) in invalidas.items():
+            df.loc[linha, campo] = valor
+        df.to_csv(entrada, index=False)
+        saida = os.path.join(tmp, "lote.csv")
+
+        try:
+            processar_arquivo(lote, entrada, saida, linhas_por_bloco=4, top=2,
+                              ao_progresso=_interromper_no_bloco(3), intervalo_progresso=0)
+            assert False, "deveria ter sido interrompido"
+        except Interrompido:
+            pass
+        assert ler_checkpoint(saida)["rejeitadas"] == 3  # linhas 2, 9 e 10 nos 3 primeiros blocos
+        with open(caminho_rejeitados(saida), "ab") as f:
+            f.write(b"99,lixo de um bloco incompleto")
+        estado = processar_arquivo(lote, entrada, saida, linhas_por_bloco=4, top=2)
+        assert estado["concluido"] and estado["linhas"] == 20 and estado["rejeitadas"] == 4
+
+        rejeitadas = pd.read_csv(caminho_rejeitados(saida))
+        print(rejeitadas[["linha", "motivo"]])
+        assert rejeitadas["linha"].tolist() == sorted(invalidas)
+        for linha, motivo in zip(rejeitadas["linha"], rejeitadas["motivo"]):
+            assert invalidas[linha][2] in motivo, motivo
+        validas = pd.read_csv(entrada).assign(cliente=range(20)).drop(index=list(invalidas))
+        esperado = lote.ranquear(validas.astype({"valor_total": float}), top=2)
+        pd.testing.assert_frame_equal(pd.read_csv(saida), esperado, check_dtype=False, rtol=1e-12)
+
+        # sem a lista de rejeitados (uso direto), a linha inválida continua sendo erro
+        try:
+            lote.ranquear(pd.read_csv(entrada).iloc[:4])
+            assert False, "linha inválida deveria falhar"
+        except ValueError as e:
+            assert "cliente 2" in str(e) and "1/12" in str(e)
+
+
+def testar_entrada_modificada():
+    print("\n🔧 testar_entrada_modificada")
+    lote = ControladorApp().preparar_lote(BANCOS_CSV, **FONTES)
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = _clientes(os.path.join(tmp, "clientes.csv"), n=12)
+        saida = os.path.join(tmp, "lote.csv")
+        try:
+            processar_arquivo(lote, entrada, saida, linhas_por_bloco=4,
+                              ao_progresso=_interromper_no_bloco(1), intervalo_progresso=0)
+            assert False, "deveria ter sido interrompido"
+        except Interrompido:
+            pass
+
+        # mesmo tamanho, outra data de modificação (ex.: linhas reescritas no lugar)
+        st = os.stat(entrada)
+        os.utime(entrada, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        try:
+            processar_arquivo(lote, entrada, saida, linhas_por_bloco=4)
+            assert False, "entrada modificada deveria ser recusada"
+        except ValueError as e:
+            assert "mudou" in str(e) and "recomecar" in str(e)
+        assert ler_checkpoint(saida)["linhas"] == 4  # checkpoint intacto
+
+        estado = processar_arquivo(lote, entrada, saida, linhas_por_bloco=4, recomecar=True)
+        assert estado["concluido"] and estado["linhas"] == 12
+        with open(entrada, "a", encoding="utf-8") as f:
+            f.write("500000.0,100000.0,20\n")
+        try:
+            processar_arquivo(lote, entrada, saida, linhas_por_bloco=4)
+            assert False, "entrada com linhas novas deveria ser recusada, mesmo com o lote concluído"
+        except ValueError as e:
+            assert "mudou" in str(e)
+
+
+def testar_cli():
+    print("\n🔧 testar_cli")
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = _clientes(os.path.join(tmp, "clientes.csv"), n=30)
+        saida = os.path.join(tmp, "lote.csv")
+        cmd = [sys.executable, os.path.join(ROOT, "scripts", "lote_clientes.py"), "--entrada", entrada,
+               "--saida", saida, "--bancos", BANCOS_CSV, "--ipca", IPCA_CSV, "--tr", TR_CSV,
+               "--top", "2", "--linhas-por-bloco", "10", "--progresso-a-cada", "0"]
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        print(proc.stdout)
+        assert proc.returncode == 0, proc.stderr
+        assert "linhas/s" in proc.stdout and "[LOTE] OK | 30 cliente(s)" in proc.stdout
+        assert len(pd.read_csv(saida)) == 60 and os.path.exists(caminho_checkpoint(saida))
+
+
+if __name__ == "__main__":
+    testar_blocos_e_retomada()
+    testar_linhas_invalidas()
+    testar_entrada_modificada()
+    testar_cli()
+    print("\n🎯 Testes do lote retomável passaram.")
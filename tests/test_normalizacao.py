@@ -0,0 +1,95 @@
+"""
+tests/test_normalizacao.py
+
+Valida a normalização vetorizada compartilhada pelos carregadores:
+- detecção do formato de data pela amostra e sobras heterogêneas
+- datas -> "YYYY-MM" / datetime, com inválidas virando NaN/NaT
+- números pt-BR (vírgula decimal, milhar, '%') e taxas -> fração
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data.normalizacao import (
+    detectar_formato_data,
+    para_ano_mes,
+    para_datetime,
+    para_numero,
+    taxa_para_fracao,
+)
+
+
+def testar_detectar_formato_data():
+    print("\n🔧 testar_detectar_formato_data")
+    assert detectar_formato_data(pd.Series(["01/2024", "02/2024"])) == "%m/%Y"
+    assert detectar_formato_data(pd.Series(["15/01/2024", "16/01/2024"])) == "%d/%m/%Y"
+    assert detectar_formato_data(pd.Series(["2024-01", "2024-02"])) == "%Y-%m"
+    assert detectar_formato_data(pd.Series(["2024-01-31"])) == "%Y-%m-%d"
+    assert detectar_formato_data(pd.Series(["jan/24"])) is None
+
+
+def testar_para_ano_mes_misto():
+    print("\n🔧 testar_para_ano_mes_misto")
+    s = pd.Series(["01/2024", "2024-03-15", "15/02/2024", "2024-4", "Fonte", None, " 2024/05 "])
+    out = para_ano_mes(s)
+    print(out.tolist())
+    assert out.tolist()[:4] == ["2024-01", "2024-03", "2024-02", "2024-04"]
+    assert pd.isna(out.iloc[4]) and pd.isna(out.iloc[5])
+    assert out.iloc[6] == "2024-05"
+
+
+def testar_para_datetime():
+    print("\n🔧 testar_para_datetime")
+    out = para_datetime(pd.Series(["15/02/2024", "2024-03", "x"]))
+    assert out.iloc[0] == pd.Timestamp("2024-02-15")
+    assert out.iloc[1] == pd.Timestamp("2024-03-01")
+    assert pd.isna(out.iloc[2])
+    # dayfirst=False: "01/02/2024" é 2 de janeiro
+    out = para_datetime(pd.Series(["01/02/2024"]), dayfirst=False)
+    assert out.iloc[0] == pd.Timestamp("2024-01-02")
+
+
+def testar_para_numero_ptbr():
+    print("\n🔧 testar_para_numero_ptbr")
+    s = pd.Series(["1.234,5", "", "Fonte", " 0,45 ", "-", "1e-3", None, "12,5%"])
+    out = para_numero(s, remover_milhar=True).to_numpy()
+    esperado = np.array([1234.5, np.nan, np.nan, 0.45, np.nan, 0.001, np.nan, 12.5])
+    assert np.allclose(out, esperado, equal_nan=True)
+    # sem remover milhar, o ponto é decimal
+    assert para_numero(pd.Series(["0.21"])).iloc[0] == 0.21
+    # coluna já numérica passa direto
+    assert para_numero(pd.Series([1, 2])).tolist() == [1.0, 2.0]
+    # valores longos não são truncados
+    assert para_numero(pd.Series(["1" * 40])).iloc[0] == float("1" * 40)
+
+
+def testar_taxa_para_fracao():
+    print("\n🔧 testar_taxa_para_fracao")
+    out = taxa_para_fracao(pd.Series(["12,5% a.a.", "0,11", "9.5 aa", "", "x", "ção"])).to_numpy()
+    assert np.allclose(out, [0.125, 0.11, 0.095, np.nan, np.nan, np.nan], equal_nan=True)
+
+
+def testar_serie_longa_igual_ao_parser_pandas():
+    print("\n🔧 testar_serie_longa_igual_ao_parser_pandas")
+    datas = pd.date_range("1990-01-01", periods=50_000, freq="D")
+    s = pd.Series(datas.strftime("%d/%m/%Y"))
+    assert para_ano_mes(s).tolist() == list(datas.strftime("%Y-%m"))
+    assert (para_datetime(s).to_numpy() == datas.to_numpy()).all()
+
+
+if __name__ == "__main__":
+    testar_detectar_formato_data()
+    testar_para_ano_mes_misto()
+    testar_para_datetime()
+    testar_para_numero_ptbr()
+    testar_taxa_para_fracao()
+    testar_serie_longa_igual_ao_parser_pandas()
+    print("\n🎯 Testes de normalização passaram.")
@@ -0,0 +1,159 @@
+"""
+tests/test_prazo.py
+
+Orçamento de tempo global da coleta online (prazo) contra o servidor local lento
+(tools/servidor_bacen_local.py):
+- backoff e orçamentos aninhados não passam do prazo
+- prazo zerado na hora do envio levanta PrazoEsgotado (não o ValueError do timeout 0)
+- sem dado guardado, o SGS lento levanta PrazoEsgotado logo após o prazo
+- com o cache em disco vencido, a resposta guardada é servida e marcada como desatualizada
+- buscar_incremental usa o histórico do repositório quando o prazo acaba
+- ColetorTxJuros não percorre os dialetos restantes depois do prazo
+"""
+
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+# garante src e tools no path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for _p in (os.path.join(ROOT, "src"), os.path.join(ROOT, "tools")):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+from infrastructure.data import sessao_http
+from infrastructure.data.cliente_sgs import ClienteSGS
+from infrastructure.data.coletor_txjuros import ColetorTxJuros, DialetosOData
+from infrastructure.data.prazo import PrazoEsgotado, orcamento, prazo_atual
+from infrastructure.data.repositorio_series import RepositorioSeries
+from servidor_bacen_local import ServidorBacenLocal
+
+PRAZO = 0.8
+LENTO = 3.0
+
+
+def _deve_esgotar(fn):
+    t0 = time.monotonic()
+    try:
+        fn()
+        assert False, "Esperava PrazoEsgotado"
+    except PrazoEsgotado:
+        pass
+    return time.monotonic() - t0
+
+
+def testar_backoff_e_aninhamento():
+    print("\n🔧 testar_backoff_e_aninhamento")
+    assert prazo_atual() is None
+    with orcamento(5) as externo:
+        with orcamento(0.3) as interno:
+            assert prazo_atual() is interno and interno.restante() <= 0.3
+            interno.marcar_desatualizado("x")
+            # backoff de vários segundos não cabe: falha na hora, sem dormir
+            assert _deve_esgotar(lambda: sessao_http.esperar_backoff(5)) < 0.1
+        with orcamento(60) as maior:
+            assert maior is externo  # o mais curto vale
+        assert prazo_atual() is externo and externo.desatualizados == ["x"]
+        assert externo.limitar((5, 45))[1] <= 5
+    assert prazo_atual() is None
+
+
+def testar_prazo_zerado_entre_verificacao_e_envio():
+    print("\n🔧 testar_prazo_zerado_entre_verificacao_e_envio")
+    with ServidorBacenLocal() as srv:
+        sessao = sessao_http.obter_sessao(retentar=False)
+        with orcamento(0.05) as prazo:
+            time.sleep(0.1)
+            assert _deve_esgotar(lambda: prazo.limitar((5, 10)))
+            # prazo acaba depois de `esgotado()` e antes do envio: PrazoEsgotado, não ValueError
+            prazo.esgotado = lambda: False
+            _deve_esgotar(lambda: sessao.get(f"{srv.url}/dados/serie/bcdata.sgs.433/dados", timeout=(5, 10)))
+
+
+def testar_sgs_lento_sem_cache():
+    print("\n🔧 testar_sgs_lento_sem_cache")
+    with ServidorBacenLocal(latencia=LENTO) as srv:
+        cliente = ClienteSGS(url_base=srv.url, atraso_hedge=0.05)
+
+        def _buscar():
+            with orcamento(PRAZO):
+                cliente.buscar_serie(433, "2024-01", "2024-12")
+
+        duracao = _deve_esgotar(_buscar)
+        print(f"esgotou em {duracao:.2f}s (prazo {PRAZO}s, servidor {LENTO}s)")
+        assert duracao < PRAZO + 1.0
+
+
+def testar_cache_vencido_no_prazo():
+    print("\n🔧 testar_cache_vencido_no_prazo")
+    with tempfile.TemporaryDirectory() as tmp, ServidorBacenLocal() as srv:
+        cache = sessao_http.ativar_cache(diretorio=tmp)
+        try:
+            cliente = ClienteSGS(url_base=srv.url, atraso_hedge=1.0)
+            ref = cliente.buscar_serie(433, "2024-01", "2024-12")
+            assert not ref.attrs["desatualizado"]
+            # envelhece todas as entradas além do TTL e deixa o servidor lento
+            for p in glob.glob(os.path.join(tmp, "*", "*.json")):
+                with open(p, encoding="utf-8") as f:
+                    meta = json.load(f)
+                with open(p, "w", encoding="utf-8") as f:
+                    json.dump({**meta, "armazenado_em": 0}, f)
+            srv.latencia = LENTO
+
+            t0 = time.monotonic()
+            with orcamento(PRAZO) as prazo:
+                df = cliente.buscar_serie(433, "2024-01", "2024-12")
+            duracao = time.monotonic() - t0
+            print(f"cache vencido servido em {duracao:.2f}s; {prazo.desatualizados}")
+            assert duracao < PRAZO + 1.0
+            assert df.attrs["desatualizado"] and df["valor"].tolist() == ref["valor"].tolist()
+            assert prazo.desatualizados and cache.estatisticas()["desatualizadas"] >= 1
+        finally:
+            sessao_http.desativar_cache()
+
+
+def testar_incremental_usa_repositorio():
+    print("\n🔧 testar_incremental_usa_repositorio")
+    with tempfile.TemporaryDirectory() as tmp, ServidorBacenLocal() as srv:
+        repo = RepositorioSeries(tmp)
+        cliente = ClienteSGS(url_base=srv.url, atraso_hedge=0.05)
+        cliente.buscar_incremental(433, "2024-01", "2024-06", repo, "ipca", hoje=date(2024, 7, 20))
+        srv.latencia = LENTO
+        t0 = time.monotonic()
+        with orcamento(PRAZO) as prazo:
+            df = cliente.buscar_incremental(433, "2024-01", "2024-12", repo, "ipca", hoje=date(2025, 1, 20))
+        duracao = time.monotonic() - t0
+        assert duracao < PRAZO + 1.0
+        assert df.attrs["desatualizado"] and df["data"].iloc[-1] == "2024-06" and len(df) == 6
+        assert prazo.desatualizados == ["SGS 433 (repositório até 2024-06)"]
+
+
+def testar_olinda_para_no_prazo():
+    print("\n🔧 testar_olinda_para_no_prazo")
+    DialetosOData.esquecer()
+    with ServidorBacenLocal(latencia=LENTO) as srv:
+        coletor = ColetorTxJuros(base_url=srv.url_olinda)
+
+        def _coletar():
+            with orcamento(PRAZO):
+                coletor.coletar_mensal_modalidades("2025-07")
+
+        duracao = _deve_esgotar(_coletar)
+        print(f"esgotou em {duracao:.2f}s (prazo {PRAZO}s, servidor {LENTO}s)")
+        # sem o prazo, cada dialeto e a paginação esperariam o servidor lento
+        assert duracao < PRAZO + 1.0
+    DialetosOData.esquecer()
+
+
+if __name__ == "__main__":
+    testar_backoff_e_aninhamento()
+    testar_prazo_zerado_entre_verificacao_e_envio()
+    testar_sgs_lento_sem_cache()
+    testar_cache_vencido_no_prazo()
+    testar_incremental_usa_repositorio()
+    testar_olinda_para_no_prazo()
+    print("\n🎯 Testes do prazo global de coleta passaram.")
@@ -0,0 +1,131 @@
+"""
+tests/test_projecao_indice.py
+
+Modelos de projeção de IPCA/TR:
+- constante, média móvel e AR(1) com reversão à média (caminho de 420 meses)
+- ajuste AR(1) no IPCA_BACEN.csv real
+- cache por (configuração, hash da série): sem reajuste; dados diferentes -> nova chave
+- cache em disco e integração com TabelaIPCA/TabelaTR
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data import projecao_indice
+from infrastructure.data.projecao_indice import ConfigProjecao, ajustar_ar1, limpar_cache, projetar
+from infrastructure.data.tabela_ipca import TabelaIPCA
+from infrastructure.data.tabela_tr import TabelaTR
+
+IPCA_BACEN = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "dados", "txjuros", "IPCA_BACEN.csv"))
+
+
+def testar_modelos_simples():
+    print("\n🔧 testar_modelos_simples")
+    limpar_cache()
+    x = np.array([0.2, 0.4, 0.6, 0.8])
+    p = projetar(x, "constante")
+    assert len(p.caminho) == 420 and np.all(p.caminho == 0.8)
+    p = projetar(x, {"modelo": "constante", "valor": 0.3, "horizonte": 10})
+    assert len(p.caminho) == 10 and np.all(p.caminho == 0.3)
+    p = projetar(x, {"modelo": "media_movel", "janela": 2})
+    assert np.allclose(p.caminho, 0.7)
+    try:
+        ConfigProjecao(modelo="arima")
+        assert False, "Esperava ValueError para modelo inválido"
+    except ValueError:
+        print("✅ modelo inválido rejeitado")
+
+
+def testar_ar1_reverte_a_media():
+    print("\n🔧 testar_ar1_reverte_a_media")
+    rng = np.random.default_rng(7)
+    mu, phi = 0.4, 0.7
+    x = np.empty(2000)
+    x[0] = mu
+    for t in range(1, len(x)):
+        x[t] = mu + phi * (x[t - 1] - mu) + rng.normal(0, 0.05)
+    par = ajustar_ar1(x)
+    print(par)
+    assert abs(par["phi"] - phi) < 0.05 and abs(par["mu"] - mu) < 0.02
+    x[-1] = 2.0  # choque no último mês
+    caminho = projetar(x, "ar1").caminho
+    assert caminho[0] < 2.0 and abs(caminho[-1] - par["mu"]) < 0.02
+    assert np.all(np.diff(caminho) <= 0)  # decai monotonicamente até mu
+
+
+def testar_ar1_ipca_bacen():
+    print("\n🔧 testar_ar1_ipca_bacen")
+    limpar_cache()
+    tab = TabelaIPCA(IPCA_BACEN)
+    est = tab.projetar(420, "ar1")
+    par = projecao_indice._CACHE[next(iter(projecao_indice._CACHE))].parametros
+    print(par)
+    assert 0.0 < par["phi"] < 1.0
+    assert 0.2 < par["mu"] < 1.0  # % a.m.
+    assert len(est) == 420
+    # meses reais preservados; futuros vêm do caminho
+    assert abs(est.get_ipca(1) - tab.tabela.loc[0, "ipca"] / 100) < 1e-12
+    assert np.isfinite(est.fatia_ipca(1, 420)).all()
+
+
+def testar_cache_sem_reajuste():
+    print("\n🔧 testar_cache_sem_reajuste")
+    limpar_cache()
+    x = np.linspace(0.1, 0.5, 60)
+    chamadas = []
+    original = projecao_indice._ajustar
+    projecao_indice._ajustar = lambda v, c: chamadas.append(1) or original(v, c)
+    try:
+        p1 = projetar(x, "ar1")
+        p2 = projetar(x.copy(), ConfigProjecao(modelo="ar1"))
+        assert p1 is p2 and len(chamadas) == 1
+        assert not p1.caminho.flags.writeable
+        p3 = projetar(x + 0.01, "ar1")  # dados diferentes -> nova chave
+        p4 = projetar(x, {"modelo": "ar1", "horizonte": 360})  # config diferente -> nova chave
+        assert len(chamadas) == 3 and len({p1.chave, p3.chave, p4.chave}) == 3
+    finally:
+        projecao_indice._ajustar = original
+
+
+def testar_cache_em_disco():
+    print("\n🔧 testar_cache_em_disco")
+    x = np.linspace(0.1, 0.5, 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        limpar_cache()
+        p1 = projetar(x, "ar1", diretorio_cache=tmp)
+        assert os.path.exists(os.path.join(tmp, f"projecao_{p1.chave}.npz"))
+        limpar_cache()
+        original = projecao_indice._ajustar
+        projecao_indice._ajustar = lambda v, c: (_ for _ in ()).throw(AssertionError("reajustou"))
+        try:
+            p2 = projetar(x, "ar1", diretorio_cache=tmp)
+        finally:
+            projecao_indice._ajustar = original
+        assert np.array_equal(p1.caminho, p2.caminho) and p1.parametros == p2.parametros
+
+
+def testar_tabela_tr_projetar():
+    print("\n🔧 testar_tabela_tr_projetar")
+    tab = TabelaTR.from_dataframe(pd.DataFrame({"data": ["2024-01", "2024-02", "2024-03"],
+                                                "tr": [0.001, 0.002, 0.003]}))
+    s = tab.projetar(6, {"modelo": "media_movel", "janela": 2})
+    assert np.allclose(list(s), [0.001, 0.002, 0.003, 0.0025, 0.0025, 0.0025])
+
+
+if __name__ == "__main__":
+    testar_modelos_simples()
+    testar_ar1_reverte_a_media()
+    testar_ar1_ipca_bacen()
+    testar_cache_sem_reajuste()
+    testar_cache_em_disco()
+    testar_tabela_tr_projetar()
+    print("\n🎯 Testes de projeção passaram.")
@@ -0,0 +1,214 @@
+"""
+tests/test_repositorio_series.py
+
+Repositório de séries somente-anexação:
+- anexa só meses novos e mantém índice do último mês
+- bytes anteriores do arquivo não são reescritos
+- leitura da cauda / desde um mês sem ler o histórico
+- recuperação de append interrompido (arquivo maior que o tamanho confirmado)
+- substituir reescreve a série inteira
+- anexar em paralelo (threads) em séries diferentes não perde entradas do índice
+- instâncias/processos diferentes no mesmo diretório: índice relido sob o lock de arquivo,
+  sem entradas perdidas nem meses duplicados; leitura ignora append não confirmado
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data.repositorio_series import RepositorioSeries
+from infrastructure.data import repositorio_series
+
+IPCA_BACEN = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "dados", "txjuros", "IPCA_BACEN.csv"))
+
+
+def testar_anexar_incremental():
+    print("\n🔧 testar_anexar_incremental")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSeries(tmp)
+        df = pd.DataFrame({"data": ["01/2024", "02/2024", "03/2024"], "ipca": ["0,42", "0,83", "0,16"]})
+        assert repo.anexar("ipca", df) == 3
+        assert repo.ultimo_mes("ipca") == "2024-03"
+        with open(repo.caminho("ipca"), "rb") as f:
+            antes = f.read()
+
+        # refresh: repete meses antigos + 1 novo -> só o novo é gravado
+        df2 = pd.DataFrame({"data": ["2024-02", "2024-03", "2024-04"], "valor": [9.9, 9.9, 0.38]})
+        assert repo.anexar("ipca", df2) == 1
+        assert repo.anexar("ipca", df2) == 0
+        with open(repo.caminho("ipca"), "rb") as f:
+            depois = f.read()
+        assert depois.startswith(antes)
+
+        # índice persistido e relido por outra instância
+        repo2 = RepositorioSeries(tmp)
+        assert repo2.ultimo_mes("ipca") == "2024-04" and repo2.tamanho("ipca") == 4
+        assert repo2.primeiro_mes("ipca") == "2024-01" and repo2.primeiro_mes("tr") is None
+        out = repo2.ler("ipca")
+        assert list(out["data"]) == ["2024-01", "2024-02", "2024-03", "2024-04"]
+        assert np.allclose(out["valor"], [0.42, 0.83, 0.16, 0.38])
+
+
+def testar_ler_cauda_sem_historico():
+    print("\n🔧 testar_ler_cauda_sem_historico")
+    meses = pd.period_range("1980-01", periods=600, freq="M").strftime("%Y-%m")
+    df = pd.DataFrame({"data": meses, "valor": np.arange(600) / 1000.0})
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSeries(tmp)
+        repo.anexar("tr", df)
+        lidos = []
+        original = repositorio_series._ultimas_linhas
+
+        def _espiao(caminho, n, inicio, fim):
+            texto = original(caminho, n, inicio, fim)
+            lidos.append(len(texto))
+            return texto
+
+        repositorio_series._ultimas_linhas = _espiao
+        try:
+            cauda = repo.ler_cauda("tr", 12)
+            desde = repo.ler("tr", desde="2029-06")
+        finally:
+            repositorio_series._ultimas_linhas = original
+        assert list(cauda["data"]) == list(meses[-12:])
+        assert np.allclose(cauda["valor"], np.arange(588, 600) / 1000.0)
+        assert list(desde["data"]) == list(meses[meses >= "2029-06"])
+        assert max(lidos) < os.path.getsize(repo.caminho("tr")) / 10
+        assert repo.ler("tr", desde="2031-01").empty
+
+
+def testar_recupera_append_interrompido():
+    print("\n🔧 testar_recupera_append_interrompido")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSeries(tmp)
+        repo.anexar("ipca", pd.DataFrame({"data": ["2024-01"], "valor": [0.42]}))
+        with open(repo.caminho("ipca"), "ab") as f:
+            f.write(b"2024-02;0.8")  # append cortado no meio, índice não atualizado
+        repo2 = RepositorioSeries(tmp)
+        assert list(repo2.ler("ipca")["data"]) == ["2024-01"]
+        assert repo2.anexar("ipca", pd.DataFrame({"data": ["2024-02"], "valor": [0.83]})) == 1
+        assert list(repo2.ler("ipca")["valor"]) == [0.42, 0.83]
+
+
+def testar_substituir():
+    print("\n🔧 testar_substituir")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSeries(tmp)
+        repo.anexar("tr", pd.DataFrame({"data": ["2024-03", "2024-04"], "valor": [0.1, 0.2]}))
+        assert repo.substituir("tr", pd.DataFrame({"data": ["2024-01", "2024-02", "2024-03", "2024-04"],
+                                                   "valor": [0.3, 0.4, 0.5, 0.6]})) == 4
+        repo2 = RepositorioSeries(tmp)
+        assert repo2.primeiro_mes("tr") == "2024-01" and repo2.tamanho("tr") == 4
+        assert list(repo2.ler("tr")["valor"]) == [0.3, 0.4, 0.5, 0.6]
+        assert repo2.anexar("tr", pd.DataFrame({"data": ["2024-05"], "valor": [0.7]})) == 1
+        assert list(repo2.ler_cauda("tr", 2)["valor"]) == [0.6, 0.7]
+
+
+def testar_anexar_em_paralelo():
+    print("\n🔧 testar_anexar_em_paralelo")
+    from concurrent.futures import ThreadPoolExecutor
+
+    meses = [f"{2000 + i // 12}-{i % 12 + 1:02d}" for i in range(24)]
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSeries(tmp)
+        nomes = [f"serie_{k}" for k in range(8)]
+
+        def _anexar(nome):
+            for m in meses:  # um mês por vez: muitas regravações do índice concorrentes
+                repo.anexar(nome, pd.DataFrame({"data": [m], "valor": [1.0]}))
+
+        original = repositorio_series.gravar_atomico
+
+        def _lento(*a, **kw):  # alarga a janela entre montar o índice e trocá-lo no disco
+            time.sleep(random.uniform(0, 0.003))
+            original(*a, **kw)
+
+        repositorio_series.gravar_atomico = _lento
+        try:
+            with ThreadPoolExecutor(max_workers=len(nomes)) as pool:
+                list(pool.map(_anexar, nomes))
+        finally:
+            repositorio_series.gravar_atomico = original
+        repo2 = RepositorioSeries(tmp)
+        assert repo2.series() == nomes
+        assert all(repo2.tamanho(n) == 24 and repo2.ultimo_mes(n) == "2001-12" for n in nomes)
+
+
+def testar_instancias_desatualizadas():
+    print("\n🔧 testar_instancias_desatualizadas")
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = RepositorioSeries(tmp), RepositorioSeries(tmp)  # como dois processos
+        a.anexar("ipca", pd.DataFrame({"data": ["2024-01", "2024-02"], "valor": [0.42, 0.83]}))
+        # b não viu o append de a: relê o índice antes de escrever
+        assert b.anexar("ipca", pd.DataFrame({"data": ["2024-02", "2024-03"], "valor": [9.9, 0.16]})) == 1
+        b.anexar("tr", pd.DataFrame({"data": ["2024-01"], "valor": [0.1]}))
+        a.substituir("tr", pd.DataFrame({"data": ["2023-12", "2024-01"], "valor": [0.05, 0.1]}))
+        c = RepositorioSeries(tmp)
+        assert c.series() == ["ipca", "tr"]
+        assert list(c.ler("ipca")["valor"]) == [0.42, 0.83, 0.16] and c.tamanho("tr") == 2
+
+        # append de outro processo ainda não confirmado no índice: leitores não o veem
+        with open(c.caminho("ipca"), "ab") as f:
+            f.write(b"2024-04;0.3")
+            f.flush()
+            assert list(c.ler("ipca")["data"]) == ["2024-01", "2024-02", "2024-03"]
+            assert list(c.ler_cauda("ipca", 1)["data"]) == ["2024-03"]
+
+
+def _anexar_em_processo(args):
+    diretorio, nomes, meses = args
+    repo = RepositorioSeries(diretorio)
+    for m in meses:
+        for nome in nomes:
+            repo.anexar(nome, pd.DataFrame({"data": [m], "valor": [float(os.getpid())]}))
+
+
+def testar_anexar_entre_processos():
+    print("\n🔧 testar_anexar_entre_processos")
+    meses = [f"{2000 + i // 12}-{i % 12 + 1:02d}" for i in range(12)]
+    with tempfile.TemporaryDirectory() as tmp:
+        # 4 processos: séries próprias + uma série comum com os mesmos meses
+        tarefas = [(tmp, [f"serie_{k}", "comum"], meses) for k in range(4)]
+        with multiprocessing.get_context("spawn").Pool(len(tarefas)) as pool:
+            pool.map(_anexar_em_processo, tarefas)
+        repo = RepositorioSeries(tmp)
+        assert repo.series() == ["comum"] + [f"serie_{k}" for k in range(4)]
+        for nome in repo.series():
+            assert repo.tamanho(nome) == 12 and list(repo.ler(nome)["data"]) == meses
+            assert os.path.getsize(repo.caminho(nome)) == repo._indice[nome]["bytes"]
+
+
+def testar_ipca_bacen_real():
+    print("\n🔧 testar_ipca_bacen_real")
+    from infrastructure.data.leitor_csv import ler_csv
+    df = ler_csv(IPCA_BACEN)
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSeries(tmp)
+        # carga inicial sem os 3 últimos meses, depois o refresh mensal
+        assert repo.anexar("ipca", df.iloc[:-3]) == len(df) - 3
+        assert repo.anexar("ipca", df) == 3
+        assert repo.ultimo_mes("ipca") == "2025-07"
+        assert np.allclose(repo.valores("ipca"), df["ipca"].to_numpy())
+
+
+if __name__ == "__main__":
+    testar_anexar_incremental()
+    testar_ler_cauda_sem_historico()
+    testar_recupera_append_interrompido()
+    testar_substituir()
+    testar_anexar_em_paralelo()
+    testar_instancias_desatualizadas()
+    testar_anexar_entre_processos()
+    testar_ipca_bacen_real()
+    print("\n🎯 Testes do repositório de séries passaram.")
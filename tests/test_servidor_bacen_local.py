@@ -0,0 +1,103 @@
+"""
+tests/test_servidor_bacen_local.py
+
+Coletores contra o servidor local do SGS/Olinda (tools/servidor_bacen_local.py), sem rede:
+- IPCA/TR servidos a partir de dados/txjuros batem com os CSVs gravados
+- intervalo recusado (406) -> ClienteSGS cai em /ultimos e no dump completo
+- Olinda: consulta combinada com `or`; sem $filter -> paginação com filtro no cliente
+- 503 transitório repetido pelo transporte; $filter com and/or/parênteses
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# garante src e tools no path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for _p in (os.path.join(ROOT, "src"), os.path.join(ROOT, "tools")):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+from infrastructure.data.cliente_sgs import ClienteSGS
+from infrastructure.data.coletor_bacen import obter_ipca_df
+from infrastructure.data.coletor_tr import ColetorTR
+from infrastructure.data.coletor_txjuros import ColetorTxJuros
+from servidor_bacen_local import ErroConsulta, ServidorBacenLocal, compilar_filtro
+
+ESPERADO_TXJUROS = {903101: 3, 905101: 0, 903201: 12, 905201: 0, 903203: 8, 905203: 0}
+
+
+def testar_sgs_serve_dados_gravados():
+    print("\n🔧 testar_sgs_serve_dados_gravados")
+    ref = pd.read_csv(os.path.join(ROOT, "dados", "txjuros", "IPCA_BACEN.csv"), sep=";", encoding="latin-1",
+                      skipfooter=1, engine="python")
+    ref = dict(zip(ref.iloc[:, 0], ref.iloc[:, 1]))
+    with ServidorBacenLocal() as srv:
+        # hedge longo: só a estratégia de intervalo deve ser disparada, mesmo com a máquina carregada
+        cliente = ClienteSGS(url_base=srv.url, atraso_hedge=5.0)
+        ipca = obter_ipca_df(data_inicial="01/01/2024", data_final="31/12/2024", cliente=cliente)
+        assert len(ipca) == 12
+        assert [f"{v:.2f}".replace(".", ",") for v in ipca["ipca"]] == [ref[f"{m:02d}/2024"] for m in range(1, 13)]
+        tr = ColetorTR(online=True, cliente=cliente).coletar("2024-01", "2024-12")
+        assert tr["data"].tolist() == [f"2024-{m:02d}" for m in range(1, 13)] and (tr["tr"] > 0).all()
+        assert set(srv.relatorio()) == {"sgs_intervalo"}
+
+
+def testar_fallbacks_sgs():
+    print("\n🔧 testar_fallbacks_sgs")
+    with ServidorBacenLocal(max_ultimos=20) as srv:
+        srv.injetar(406, 100, "sgs_intervalo")
+        df = ClienteSGS(url_base=srv.url, atraso_hedge=0.05).buscar_serie(433, "2023-01", "2024-12")
+        rel = srv.relatorio()
+        print(rel)
+        assert len(df) == 24
+        assert rel["sgs_intervalo"]["ok"] == 0 and rel["sgs_ultimos"]["ok"] == 0  # 24 > max_ultimos
+        assert rel["sgs_completo"]["ok"] >= 1
+
+
+def testar_olinda_combinada_e_paginacao():
+    print("\n🔧 testar_olinda_combinada_e_paginacao")
+    for aceita_filtro in (True, False):
+        with ServidorBacenLocal(aceita_filtro=aceita_filtro) as srv, tempfile.TemporaryDirectory() as tmp:
+            res = ColetorTxJuros(base_url=srv.url_olinda, diretorio_cache=tmp).coletar_mensal_modalidades("2025-07")
+            rel = srv.relatorio()
+            print(aceita_filtro, {c: len(r.df) for c, r in res.items()}, rel)
+            assert {c: len(r.df) for c, r in res.items()} == ESPERADO_TXJUROS
+            assert res[903101].df["taxa_anual"].round(4).tolist() == [0.1091, 0.162, 0.1799]
+            if aceita_filtro:
+                assert rel["olinda_filtro"] == {**rel["olinda_filtro"], "n": 1, "ok": 1}
+            else:
+                assert rel["olinda_pagina"]["ok"] >= 1
+
+
+def testar_falha_transitoria_olinda():
+    print("\n🔧 testar_falha_transitoria_olinda")
+    with ServidorBacenLocal() as srv, tempfile.TemporaryDirectory() as tmp:
+        srv.injetar(503, 1, "olinda_filtro")
+        res = ColetorTxJuros(base_url=srv.url_olinda, diretorio_cache=tmp).coletar_mensal("2025-07", 903201)
+        assert len(res.df) == 12
+        assert srv.relatorio()["olinda_filtro"]["falhas"] == 1
+
+
+def testar_compilar_filtro():
+    print("\n🔧 testar_compilar_filtro")
+    campos = ["Mes", "CodigoModalidade"]
+    p = compilar_filtro("Mes eq '2025-07' and (CodigoModalidade eq 1 or CodigoModalidade eq 2)", campos)
+    assert p({"Mes": "2025-07", "CodigoModalidade": 2}) and not p({"Mes": "2025-07", "CodigoModalidade": 3})
+    for ruim in ("MesReferencia eq '2025-07'", "Mes gt '2025'", "(Mes eq '2025-07'"):
+        try:
+            compilar_filtro(ruim, campos)
+            assert False, ruim
+        except ErroConsulta:
+            pass
+
+
+if __name__ == "__main__":
+    testar_sgs_serve_dados_gravados()
+    testar_fallbacks_sgs()
+    testar_olinda_combinada_e_paginacao()
+    testar_falha_transitoria_olinda()
+    testar_compilar_filtro()
+    print("\n🎯 Testes contra o servidor local do BACEN passaram.")
@@ -0,0 +1,112 @@
+"""
+tests/test_sessao_http.py
+
+Pool HTTP compartilhado (sessao_http) contra um servidor local HTTP/1.1 keep-alive:
+- ClienteSGS, ColetorTR e ColetorTxJuros usam o mesmo pool -> uma única conexão TCP
+- perfil padrão repete 503; perfil sem retry (ClienteSGS) não
+"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data import sessao_http
+from infrastructure.data.cliente_sgs import ClienteSGS
+from infrastructure.data.coletor_tr import ColetorTR
+from infrastructure.data.coletor_txjuros import ColetorTxJuros
+
+SGS = [{"data": f"01/{m:02d}/2024", "valor": "0,10"} for m in range(1, 4)]
+OLINDA = {"value": [{"InstituicaoFinanceira": "Banco A", "Mes": "2024-03", "CodigoModalidade": 903101,
+                     "CodigoSegmento": 1, "TaxaJurosAoAno": 11.5}]}
+
+
+class _Servidor:
+    """Responde SGS e Olinda; registra a porta do cliente (uma por conexão TCP) e falha N vezes."""
+
+    def __init__(self):
+        self.portas = []
+        self.falhas = 0
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def log_message(self, *a):
+                pass
+
+            def do_GET(self):
+                servidor.portas.append(self.client_address[1])
+                if servidor.falhas > 0:
+                    servidor.falhas -= 1
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                caminho = urlparse(self.path).path
+                corpo = json.dumps(SGS if "bcdata.sgs" in caminho else OLINDA).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def fechar(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def testar_coletores_reaproveitam_conexao():
+    print("\n🔧 testar_coletores_reaproveitam_conexao")
+    sessao_http.fechar_sessoes()
+    srv = _Servidor()
+    try:
+        cliente = ClienteSGS(url_base=srv.url, atraso_hedge=1.0)
+        assert cliente.session.adapters["http://"].poolmanager is \
+            sessao_http.obter_sessao().adapters["http://"].poolmanager
+        cliente.buscar_serie(433, "2024-01", "2024-03")
+        ColetorTR(online=True, cliente=cliente).coletar("2024-01", "2024-03")
+        tx = ColetorTxJuros(base_url=srv.url)
+        res = tx.coletar_mensal("2024-03", 903101)
+        res = tx.coletar_mensal("2024-03", 903101)
+        print("requisições:", len(srv.portas), "conexões:", len(set(srv.portas)))
+        assert len(res.df) == 1 and abs(res.df["taxa_anual"].iloc[0] - 0.115) < 1e-12
+        # SGS + TR + sondagem do $select + 2 consultas de taxas, tudo numa conexão só
+        assert len(srv.portas) == 5 and len(set(srv.portas)) == 1
+    finally:
+        srv.fechar()
+        sessao_http.fechar_sessoes()
+
+
+def testar_perfis_de_retry():
+    print("\n🔧 testar_perfis_de_retry")
+    srv = _Servidor()
+    try:
+        srv.falhas = 1
+        r = sessao_http.obter_sessao().get(f"{srv.url}/odata/X", timeout=5)
+        assert r.status_code == 200 and len(srv.portas) == 2  # 503 repetido pelo transporte
+
+        srv.falhas = 1
+        r = sessao_http.obter_sessao(retentar=False).get(f"{srv.url}/odata/X", timeout=5)
+        assert r.status_code == 503 and len(srv.portas) == 3
+        assert sessao_http.obter_sessao() is sessao_http.obter_sessao()
+    finally:
+        srv.fechar()
+        sessao_http.fechar_sessoes()
+
+
+if __name__ == "__main__":
+    testar_coletores_reaproveitam_conexao()
+    testar_perfis_de_retry()
+    print("\n🎯 Testes da sessão HTTP compartilhada passaram.")
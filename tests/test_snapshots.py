@@ -0,0 +1,111 @@
+"""
+tests/test_snapshots.py
+
+Snapshots endereçados por conteúdo:
+- mesmo conteúdo -> mesmo id (deduplicação), conteúdo novo -> id novo
+- arquivo inalterado não é relido/revalidado
+- controlador registra os ids usados, reaproveita resultado de (ids, parâmetros)
+- replay de uma execução mesmo depois de o arquivo de origem mudar
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# garante src no path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from application.controlador import ControladorApp
+from infrastructure.data.snapshots import RepositorioSnapshots
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+IPCA_CSV = os.path.join(ROOT, "dados", "ipca.csv")
+TR_CSV = os.path.join(ROOT, "tests", "fixtures", "tr_fixture.csv")
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def testar_deduplicacao_por_conteudo():
+    print("\n🔧 testar_deduplicacao_por_conteudo")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSnapshots(os.path.join(tmp, "snap"))
+        df = pd.DataFrame({"data": ["2024-01", "2024-02"], "ipca": [0.42, 0.83]})
+        id1 = repo.registrar("ipca", df)
+        id2 = repo.registrar("ipca", df.copy())
+        id3 = repo.registrar("ipca", df.assign(ipca=[0.42, 0.84]))
+        assert id1 == id2 and id1 != id3 and id1.startswith("ipca-")
+        assert RepositorioSnapshots(os.path.join(tmp, "snap")).carregar(id1).equals(df)
+
+
+def testar_arquivo_inalterado_nao_relido():
+    print("\n🔧 testar_arquivo_inalterado_nao_relido")
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = RepositorioSnapshots(os.path.join(tmp, "snap"))
+        p = _write(os.path.join(tmp, "b.csv"), "nome,sistema,taxa_anual\nA,SAC,0.1\n")
+        chamadas = []
+
+        def carregador(caminho):
+            chamadas.append(caminho)
+            return pd.read_csv(caminho)
+
+        id1 = repo.snapshot_arquivo("bancos", p, carregador)
+        id2 = RepositorioSnapshots(os.path.join(tmp, "snap")).snapshot_arquivo("bancos", p, carregador)
+        assert id1 == id2 and len(chamadas) == 1
+
+        # reescreve com o mesmo conteúdo: relido, mas mesmo id (dedup)
+        time.sleep(0.01)
+        _write(p, "nome,sistema,taxa_anual\nA,SAC,0.1\n")
+        os.utime(p, ns=(time.time_ns(), time.time_ns()))
+        assert repo.snapshot_arquivo("bancos", p, carregador) == id1 and len(chamadas) == 2
+
+        _write(p, "nome,sistema,taxa_anual\nA,SAC,0.2\n")
+        os.utime(p, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+        assert repo.snapshot_arquivo("bancos", p, carregador) != id1
+
+
+def testar_controlador_registra_e_reaproveita():
+    print("\n🔧 testar_controlador_registra_e_reaproveita")
+    with tempfile.TemporaryDirectory() as tmp:
+        bancos = _write(os.path.join(tmp, "bancos.csv"),
+                        "nome,sistema,taxa_anual\nA,SAC,0.10\nB,SAC_IPCA,0.06\nC,SAC_TR,0.09\n")
+        repo = RepositorioSnapshots(os.path.join(tmp, "snap"))
+        ctrl = ControladorApp(snapshots=repo)
+        dados = {"valor_total": 300000.0, "entrada": 60000.0, "prazo_anos": 10}
+        fontes = dict(fonte_ipca={"caminho_ipca": IPCA_CSV}, fonte_tr={"fixture_csv_path": TR_CSV})
+
+        res1, ranking1, _ = ctrl.simular_multiplos_bancos(bancos, dados, **fontes)
+        chave = ctrl.ultima_execucao
+        registro = repo.execucao(chave)
+        print(registro["snapshots"])
+        assert set(registro["snapshots"]) == {"bancos", "ipca", "tr"}
+
+        simulou = []
+        original = ctrl._simular_bancos
+        ctrl._simular_bancos = lambda *a: simulou.append(1) or original(*a)
+        _, ranking2, _ = ctrl.simular_multiplos_bancos(bancos, dados, **fontes)
+        assert ranking2 == ranking1 and not simulou and ctrl.ultima_execucao == chave
+
+        # parâmetros diferentes -> nova execução, simulada
+        ctrl.simular_multiplos_bancos(bancos, {**dados, "prazo_anos": 20}, **fontes)
+        assert simulou and ctrl.ultima_execucao != chave
+
+        # origem muda; o replay usa os snapshots gravados
+        _write(bancos, "nome,sistema,taxa_anual\nZ,SAC,0.30\n")
+        _, ranking3, _ = ControladorApp(snapshots=repo).reproduzir_execucao(chave)
+        assert ranking3 == ranking1
+
+
+if __name__ == "__main__":
+    testar_deduplicacao_por_conteudo()
+    testar_arquivo_inalterado_nao_relido()
+    testar_controlador_registra_e_reaproveita()
+    print("\n🎯 Testes de snapshots passaram.")
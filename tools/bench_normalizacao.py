@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da normalização de datas/números (infrastructure.data.normalizacao)
+contra os callbacks por linha usados antes nos carregadores.
+
+Para cada caso mede:
+  - tempo (melhor de N repetições);
+  - chamadas de função Python por linha (cProfile): os callbacks `.map` antigos
+    fazem várias chamadas por linha; o caminho vetorizado deve ficar perto de zero.
+
+Uso (a partir da raiz):
+    python tools/bench_normalizacao.py [--linhas 100000] [--repeticoes 3]
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from infrastructure.data.normalizacao import para_ano_mes, para_numero, taxa_para_fracao
+
+
+# ---------------- referência: callbacks por linha (implementação anterior) ---------------- #
+
+def _legado_to_yyyy_mm(s: str):
+    s = (s or "").strip()
+    if re.match(r"^\d{2}/\d{4}$", s):
+        mm, yyyy = s.split("/")
+        return f"{int(yyyy):04d}-{int(mm):02d}"
+    if re.match(r"^\d{1,2}/\d{1,2}/\d{4}$", s):
+        d, m, y = s.split("/")
+        return f"{int(y):04d}-{int(m):02d}"
+    if re.match(r"^\d{4}-\d{2}$", s):
+        return s[:7]
+    return None
+
+
+def _legado_to_float(v) -> float:
+    return float(str(v).replace(",", ".").strip())
+
+
+def _legado_parse_taxa(v):
+    if v is None:
+        return None
+    s = str(v).strip()
+    if not s:
+        return None
+    s = s.replace("%", "").replace("a.a.", "").replace("a.a", "").replace("aa", "").replace(",", ".")
+    s = "".join(s.split())
+    try:
+        x = float(s)
+        return x / 100.0 if x >= 1.5 else x
+    except Exception:
+        return None
+
+
+# ------------------------------------ medição ------------------------------------------- #
+
+def _medir(fn, repeticoes: int):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    prof = cProfile.Profile()
+    prof.enable()
+    fn()
+    prof.disable()
+    chamadas = pstats.Stats(prof).total_calls
+    return melhor, chamadas
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark: normalização vetorizada vs callbacks por linha.")
+    ap.add_argument("--linhas", type=int, default=100_000)
+    ap.add_argument("--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+    n = args.linhas
+
+    rng = np.random.default_rng(42)
+    # meses de 1900 a 2099, sorteados (séries longas repetem meses, como vários bancos/datas)
+    meses = pd.period_range("1900-01", "2099-12", freq="M").strftime("%m/%Y")
+    datas_mm_yyyy = pd.Series(np.asarray(meses)[rng.integers(0, len(meses), n)])
+    valores_txt = pd.Series([f"{v:.2f}".replace(".", ",") for v in rng.uniform(-1, 3, n)])
+    taxas_txt = pd.Series([f"{v:.2f}% a.a." for v in rng.uniform(5, 20, n)])
+
+    casos = [
+        ("data MM/YYYY -> YYYY-MM",
+         lambda: datas_mm_yyyy.map(_legado_to_yyyy_mm),
+         lambda: para_ano_mes(datas_mm_yyyy)),
+        ("número '0,45' -> float",
+         lambda: valores_txt.map(_legado_to_float),
+         lambda: para_numero(valores_txt)),
+        ("taxa '12,5% a.a.' -> fração",
+         lambda: taxas_txt.map(_legado_parse_taxa),
+         lambda: taxa_para_fracao(taxas_txt)),
+    ]
+
+    print(f"📊 Normalização — {n} linhas, melhor de {args.repeticoes}")
+    print(f"{'caso':<30} {'legado (s)':>11} {'vetor (s)':>10} {'ganho':>7} {'chamadas/linha legado':>22} {'vetor':>7}")
+    for nome, legado, vetor in casos:
+        esperado, obtido = legado(), vetor()
+        if isinstance(esperado.iloc[0], str):
+            assert list(esperado) == list(obtido), f"{nome}: resultados divergentes"
+        else:
+            assert np.allclose(esperado.astype(float), obtido, equal_nan=True), f"{nome}: resultados divergentes"
+        t_leg, c_leg = _medir(legado, args.repeticoes)
+        t_vet, c_vet = _medir(vetor, args.repeticoes)
+        print(f"{nome:<30} {t_leg:>11.4f} {t_vet:>10.4f} {t_leg / t_vet:>6.1f}x {c_leg / n:>22.2f} {c_vet / n:>7.3f}")
+
+
+if __name__ == '__main__':
+    main()
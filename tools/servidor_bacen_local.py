@@ -0,0 +1,492 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor local que imita o SGS e o Olinda (taxaJuros v2) do BACEN, para testes de regressão
+e benchmarks dos coletores sem rede.
+
+Rotas (dados lidos de dados/txjuros/*.csv):
+  - SGS  /dados/serie/bcdata.sgs.{N}/dados            (dataInicial/dataFinal, formato=json|csv)
+         /dados/serie/bcdata.sgs.{N}/dados/ultimos/{K}
+    séries 433 (IPCA_BACEN.csv) e 226 (TR_BACEN.csv)
+  - Olinda /olinda/servico/taxaJuros/versao/v2/odata/TaxasJurosMensalPorMes
+                                                    .../TaxasJurosDiariaPorInicioPeriodo
+    linhas de `<AAAA-MM>P_*_<codigo>.csv`, com $filter (eq/and/or/parênteses), $select,
+    $top/$skip, $count=true e $format=json|csv
+
+Injeção de falhas e latência:
+  - `latencia` (s, todas as requisições) e `atrasar(segundos, rota)` por rota;
+  - `injetar(status, vezes, rota)`: as próximas `vezes` requisições da rota respondem `status`
+    (429 vai com Retry-After);
+  - `taxa_falhas={503: 0.1}`: falhas aleatórias (semente fixa, reprodutível);
+  - `aceita_filtro=False` (Olinda recusa $filter -> coletor cai na paginação) e
+    `max_ultimos` (SGS recusa /ultimos/K acima do limite, como a API real).
+
+Cada requisição fica em `registros` (rota, status, duração); `relatorio()` agrega por rota.
+Rotas: sgs_intervalo, sgs_ultimos, sgs_completo, olinda_filtro, olinda_count, olinda_pagina e
+olinda_sonda (consulta sem $filter/$skip, ex.: a sondagem do $select).
+
+Uso (a partir da raiz):
+    python tools/servidor_bacen_local.py --porta 8765 --latencia 0.05 --falhas 503:0.1
+    python tools/servidor_bacen_local.py --bench [--replicar 200]
+"""
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+DIR_DADOS = os.path.join(ROOT, 'dados', 'txjuros')
+PREFIXO_OLINDA = "/olinda/servico/taxaJuros/versao/v2/odata"
+RECURSOS_OLINDA = ("TaxasJurosMensalPorMes", "TaxasJurosDiariaPorInicioPeriodo")
+
+_RE_SGS = re.compile(r"^/dados/serie/bcdata\.sgs\.(\d+)/dados(?:/ultimos/(\d+))?/?$")
+_RE_DATA = re.compile(r"^(\d{2})/(\d{2})/(\d{4})$")
+
+
+# ------------------------------ Dados gravados ------------------------------ #
+
+def _ler_sgs(dir_dados: str) -> Dict[int, List[Dict[str, str]]]:
+    """{série: [{"data": "DD/MM/AAAA", "valor": "0.26", ...}]} dos CSVs exportados do SGS."""
+    series: Dict[int, List[Dict[str, str]]] = {}
+    for serie, arquivo in ((433, "IPCA_BACEN.csv"), (226, "TR_BACEN.csv")):
+        caminho = os.path.join(dir_dados, arquivo)
+        if not os.path.exists(caminho):
+            continue
+        linhas = []
+        with open(caminho, encoding="latin-1") as f:
+            for campos in csv.reader(f, delimiter=";"):
+                if not campos or not re.match(r"^\d{2}/", campos[0]):
+                    continue  # cabeçalho e rodapé ("Fonte;...")
+                data = campos[0] if campos[0].count("/") == 2 else f"01/{campos[0]}"  # MM/AAAA -> 01/MM/AAAA
+                registro = {"data": data, "valor": campos[-1].replace(",", ".")}
+                if len(campos) == 3:
+                    registro = {"data": data, "datafim": campos[1], "valor": registro["valor"]}
+                linhas.append(registro)
+        series[serie] = linhas
+    return series
+
+
+def _ler_olinda(dir_dados: str, replicar: int = 1) -> Dict[str, List[dict]]:
+    """Linhas dos recursos mensal/diário a partir dos relatórios `<AAAA-MM>P_*_<codigo>.csv`."""
+    mensal, diario = [], []
+    for caminho in sorted(glob.glob(os.path.join(dir_dados, "*_*.csv"))):
+        m = re.match(r"^(\d{4}-\d{2})P?_.*_(\d{6})\.csv$", os.path.basename(caminho))
+        if not m:
+            continue
+        mes, codigo = m.group(1), int(m.group(2))
+        with open(caminho, encoding="utf-8-sig") as f:
+            for linha in csv.DictReader(f, delimiter=";"):
+                for k in range(max(1, replicar)):
+                    nome = linha["InstituicaoFinanceira"] + (f" #{k}" if k else "")
+                    comum = {
+                        "InstituicaoFinanceira": nome,
+                        "CodigoModalidade": codigo,
+                        "Modalidade": linha["Modalidade"],
+                        "CodigoSegmento": 1,
+                        "Segmento": linha["Segmento"],
+                        "Posicao": int(linha["Posicao"]),
+                        "TaxaJurosAoMes": float(linha["TaxaJurosAoMes"].replace(",", ".")),
+                        "TaxaJurosAoAno": float(linha["TaxaJurosAoAno"].replace(",", ".")),
+                    }
+                    # período primeiro: a autodetecção do coletor pega a 1ª coluna com "mes"
+                    mensal.append({"Mes": mes, **comum})
+                    diario.append({"InicioPeriodo": f"{mes}-01", "FimPeriodo": f"{mes}-07", **comum})
+    return {RECURSOS_OLINDA[0]: mensal, RECURSOS_OLINDA[1]: diario}
+
+
+# ------------------------------ $filter (OData) ----------------------------- #
+
+class ErroConsulta(ValueError):
+    """Consulta OData inválida para o recurso (responde 400, como o Olinda)."""
+
+
+_RE_TOKEN = re.compile(r"\s*(?:(\()|(\))|'([^']*)'|(-?\d+(?:\.\d+)?)|([A-Za-z_]\w*))")
+
+
+def compilar_filtro(expr: str, campos) -> Callable[[dict], bool]:
+    """
+    Predicado de um $filter com `campo eq valor`, `and`, `or` e parênteses. Campo fora de
+    `campos` ou sintaxe desconhecida -> ErroConsulta.
+    """
+    tokens, pos = [], 0
+    expr = expr.strip()
+    while pos < len(expr):
+        m = _RE_TOKEN.match(expr, pos)
+        if not m or m.end() == pos:
+            raise ErroConsulta(f"$filter inválido perto de {expr[pos:pos + 20]!r}")
+        abre, fecha, texto, numero, nome = m.groups()
+        tokens.append(("(" if abre else ")" if fecha else "str" if texto is not None
+                       else "num" if numero else "nome", texto if texto is not None else numero or nome))
+        pos = m.end()
+    i = 0
+
+    def _ver(tipo, valor=None):
+        return i < len(tokens) and tokens[i][0] == tipo and (valor is None or tokens[i][1] == valor)
+
+    def _ou():
+        nonlocal i
+        termos = [_e()]
+        while _ver("nome", "or"):
+            i += 1
+            termos.append(_e())
+        return termos[0] if len(termos) == 1 else (lambda r: any(t(r) for t in termos))
+
+    def _e():
+        nonlocal i
+        fatores = [_fator()]
+        while _ver("nome", "and"):
+            i += 1
+            fatores.append(_fator())
+        return fatores[0] if len(fatores) == 1 else (lambda r: all(f(r) for f in fatores))
+
+    def _fator():
+        nonlocal i
+        if _ver("("):
+            i += 1
+            p = _ou()
+            if not _ver(")"):
+                raise ErroConsulta("$filter: ')' esperado")
+            i += 1
+            return p
+        if not (_ver("nome") and i + 2 < len(tokens) and tokens[i + 1] == ("nome", "eq")):
+            raise ErroConsulta("$filter: esperado 'campo eq valor'")
+        campo, (tipo, valor) = tokens[i][1], tokens[i + 2]
+        if campo not in campos:
+            raise ErroConsulta(f"$filter: campo desconhecido {campo!r}")
+        i += 3
+        if tipo == "str":
+            return lambda r: str(r.get(campo)) == valor
+        if tipo == "num":
+            alvo = float(valor)
+            return lambda r: isinstance(r.get(campo), (int, float)) and float(r[campo]) == alvo
+        raise ErroConsulta("$filter: valor inválido")
+
+    pred = _ou()
+    if i != len(tokens):
+        raise ErroConsulta("$filter: sobra após a expressão")
+    return pred
+
+
+# --------------------------------- Servidor --------------------------------- #
+
+@dataclass
+class Registro:
+    caminho: str
+    rota: str
+    status: int
+    duracao_s: float
+
+
+class ServidorBacenLocal:
+    """
+    Servidor HTTP local (thread em segundo plano) com as rotas do SGS e do Olinda.
+
+    `url` é a raiz do SGS (para `ClienteSGS(url_base=...)`); `url_olinda` é a raiz OData
+    (para `ColetorTxJuros(base_url=...)`). Use como context manager ou `iniciar()`/`parar()`.
+    """
+
+    def __init__(self, dir_dados: str = DIR_DADOS, porta: int = 0, latencia: float = 0.0,
+                 taxa_falhas: Optional[Dict[int, float]] = None, aceita_filtro: bool = True,
+                 max_ultimos: Optional[int] = None, replicar: int = 1, semente: int = 0):
+        self.sgs = _ler_sgs(dir_dados)
+        self.olinda = _ler_olinda(dir_dados, replicar)
+        self.latencia = latencia
+        self.taxa_falhas = dict(taxa_falhas or {})
+        self.aceita_filtro = aceita_filtro
+        self.max_ultimos = max_ultimos
+        self.registros: List[Registro] = []
+        self._atrasos: Dict[str, float] = {}
+        self._falhas: Dict[Optional[str], deque] = defaultdict(deque)
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+        self._porta = porta
+        self.httpd: Optional[ThreadingHTTPServer] = None
+
+    # ------------------------------ ciclo de vida ------------------------------ #
+
+    def iniciar(self) -> "ServidorBacenLocal":
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *a):
+                pass
+
+            def do_GET(self):
+                try:
+                    servidor._atender(self)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # cliente desistiu (timeout/prazo) antes da resposta
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", self._porta), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def parar(self) -> None:
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self) -> "ServidorBacenLocal":
+        return self.iniciar()
+
+    def __exit__(self, *exc) -> None:
+        self.parar()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def url_olinda(self) -> str:
+        return self.url + PREFIXO_OLINDA
+
+    # ------------------------------- configuração ------------------------------ #
+
+    def injetar(self, status: int, vezes: int = 1, rota: Optional[str] = None) -> None:
+        """As próximas `vezes` requisições de `rota` (None = qualquer) respondem `status`."""
+        with self._lock:
+            self._falhas[rota].extend([int(status)] * vezes)
+
+    def atrasar(self, segundos: float, rota: str) -> None:
+        """Latência extra para a rota (somada a `latencia`)."""
+        with self._lock:
+            self._atrasos[rota] = segundos
+
+    def limpar(self) -> None:
+        """Zera registros, falhas programadas e atrasos por rota."""
+        with self._lock:
+            self.registros.clear()
+            self._falhas.clear()
+            self._atrasos.clear()
+
+    def relatorio(self) -> Dict[str, Dict[str, float]]:
+        """{rota: {"n", "ok", "falhas", "ms_medio"}} das requisições registradas."""
+        with self._lock:
+            registros = list(self.registros)
+        out: Dict[str, Dict[str, float]] = {}
+        for r in registros:
+            d = out.setdefault(r.rota, {"n": 0, "ok": 0, "falhas": 0, "ms_medio": 0.0})
+            d["n"] += 1
+            d["ok" if r.status == 200 else "falhas"] += 1
+            d["ms_medio"] += (r.duracao_s * 1000 - d["ms_medio"]) / d["n"]
+        return out
+
+    # -------------------------------- atendimento ------------------------------ #
+
+    def _falha_programada(self, rota: str) -> Optional[int]:
+        with self._lock:
+            for chave in (rota, None):
+                if self._falhas.get(chave):
+                    return self._falhas[chave].popleft()
+            for status, p in self.taxa_falhas.items():
+                if self._aleatorio.random() < p:
+                    return status
+        return None
+
+    def _atender(self, h: BaseHTTPRequestHandler) -> None:
+        t0 = time.perf_counter()
+        url = urlparse(h.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        m_sgs = _RE_SGS.match(url.path)
+        if m_sgs:
+            rota = ("sgs_ultimos" if m_sgs.group(2) else
+                    "sgs_intervalo" if "dataInicial" in q else "sgs_completo")
+        elif url.path.startswith(PREFIXO_OLINDA + "/"):
+            rota = ("olinda_filtro" if "$filter" in q else
+                    "olinda_count" if q.get("$count") == "true" else
+                    "olinda_pagina" if "$skip" in q else "olinda_sonda")
+        else:
+            rota = "desconhecida"
+
+        time.sleep(self.latencia + self._atrasos.get(rota, 0.0))
+        status = self._falha_programada(rota)
+        if status is not None:
+            corpo, tipo = b"", "text/plain"
+        else:
+            try:
+                if m_sgs:
+                    corpo, tipo = self._sgs(int(m_sgs.group(1)), m_sgs.group(2), q)
+                elif rota != "desconhecida":
+                    corpo, tipo = self._olinda(url.path[len(PREFIXO_OLINDA) + 1:], q)
+                else:
+                    raise LookupError(url.path)
+                status = 200
+            except LookupError:
+                status, corpo, tipo = 404, b"", "text/plain"
+            except ErroConsulta as e:
+                status, corpo, tipo = 400, str(e).encode("utf-8"), "text/plain"
+
+        h.send_response(status)
+        h.send_header("Content-Type", tipo)
+        h.send_header("Content-Length", str(len(corpo)))
+        if status == 429:
+            h.send_header("Retry-After", "0")
+        h.end_headers()
+        h.wfile.write(corpo)
+        with self._lock:
+            self.registros.append(Registro(h.path, rota, status, time.perf_counter() - t0))
+
+    def _sgs(self, serie: int, ultimos: Optional[str], q: Dict[str, str]) -> Tuple[bytes, str]:
+        if serie not in self.sgs:
+            raise LookupError(serie)
+        linhas = self.sgs[serie]
+        if ultimos is not None:
+            k = int(ultimos)
+            if self.max_ultimos is not None and k > self.max_ultimos:
+                raise ErroConsulta(f"/ultimos limitado a {self.max_ultimos}")
+            linhas = linhas[-k:] if k else []
+        elif "dataInicial" in q or "dataFinal" in q:
+            def _chave(data: str) -> Tuple[int, int, int]:
+                m = _RE_DATA.match(data or "")
+                if not m:
+                    raise ErroConsulta(f"data inválida: {data!r}")
+                return int(m.group(3)), int(m.group(2)), int(m.group(1))
+
+            ini = _chave(q.get("dataInicial", "01/01/1900"))
+            fim = _chave(q.get("dataFinal", "31/12/2999"))
+            linhas = [r for r in linhas if ini <= _chave(r["data"]) <= fim]
+        if q.get("formato") == "csv":
+            buf = io.StringIO()
+            campos = list(linhas[0]) if linhas else ["data", "valor"]
+            buf.write(";".join(f'"{c}"' for c in campos) + "\n")
+            for r in linhas:
+                buf.write(";".join(f'"{r[c].replace(".", ",") if c == "valor" else r[c]}"' for c in campos) + "\n")
+            return buf.getvalue().encode("utf-8"), "text/csv"
+        return json.dumps(linhas).encode("utf-8"), "application/json"
+
+    def _olinda(self, recurso: str, q: Dict[str, str]) -> Tuple[bytes, str]:
+        if recurso not in self.olinda:
+            raise LookupError(recurso)
+        linhas = self.olinda[recurso]
+        campos = list(linhas[0]) if linhas else []
+        if "$filter" in q:
+            if not self.aceita_filtro:
+                raise ErroConsulta("$filter não suportado")
+            pred = compilar_filtro(q["$filter"], campos)
+            linhas = [r for r in linhas if pred(r)]
+        total = len(linhas)
+        skip = int(q.get("$skip", 0))
+        top = int(q["$top"]) if "$top" in q else None
+        linhas = linhas[skip:] if top is None else linhas[skip:skip + top]
+        if "$select" in q:
+            sel = [c.strip() for c in q["$select"].split(",")]
+            desconhecidos = [c for c in sel if c not in campos]
+            if desconhecidos:
+                raise ErroConsulta(f"$select: campo desconhecido {desconhecidos}")
+            linhas = [{c: r[c] for c in sel} for r in linhas]
+            campos = sel
+        if q.get("$format") == "csv":
+            buf = io.StringIO()
+            w = csv.DictWriter(buf, fieldnames=campos, delimiter=";", lineterminator="\n")
+            w.writeheader()
+            w.writerows(linhas)
+            return buf.getvalue().encode("utf-8"), "text/csv"
+        corpo = {"@odata.context": f"{PREFIXO_OLINDA}/$metadata#{recurso}", "value": linhas}
+        if q.get("$count") == "true":
+            corpo["@odata.count"] = total
+        return json.dumps(corpo, ensure_ascii=False).encode("utf-8"), "application/json"
+
+
+# --------------------------------- Benchmark -------------------------------- #
+
+def _cenarios() -> Dict[str, Tuple[dict, Callable[[ServidorBacenLocal], None]]]:
+    """{nome: (kwargs do servidor, preparação)} — cada um força um caminho de fallback."""
+    return {
+        "nominal": ({}, lambda s: None),
+        "latencia_80ms": ({"latencia": 0.08}, lambda s: None),
+        "sgs_intervalo_406": ({}, lambda s: s.injetar(406, 100, "sgs_intervalo")),
+        "sgs_so_completo": ({"max_ultimos": 0}, lambda s: s.injetar(406, 100, "sgs_intervalo")),
+        "rajada_503": ({}, lambda s: (s.injetar(503, 2, "olinda_filtro"), s.injetar(503, 2, "sgs_intervalo"))),
+        "429": ({}, lambda s: s.injetar(429, 2)),
+        "olinda_sem_filtro": ({"aceita_filtro": False}, lambda s: None),
+    }
+
+
+def executar_bench(nomes: Optional[List[str]] = None, replicar: int = 1) -> List[dict]:
+    """Roda os coletores contra cada cenário e imprime tempo, linhas e requisições por rota."""
+    from infrastructure.data.cliente_sgs import ClienteSGS, coletar_ipca_tr
+    from infrastructure.data.coletor_bacen import obter_ipca_df
+    from infrastructure.data.coletor_tr import ColetorTR
+    from infrastructure.data.coletor_txjuros import ColetorTxJuros
+
+    resultados = []
+    for nome, (kwargs, preparar) in _cenarios().items():
+        if nomes and nome not in nomes:
+            continue
+        with ServidorBacenLocal(replicar=replicar, **kwargs) as srv, tempfile.TemporaryDirectory() as tmp:
+            cliente = ClienteSGS(url_base=srv.url)
+            coletas = {
+                "cliente_sgs": lambda: sum(len(d) for d in coletar_ipca_tr("2023-01", "2024-12", cliente).values()),
+                "coletor_bacen": lambda: len(obter_ipca_df(data_inicial="01/01/2023", data_final="31/12/2024",
+                                                           cliente=cliente)),
+                "coletor_tr": lambda: len(ColetorTR(online=True, cliente=cliente).coletar("2023-01", "2024-12")),
+                "coletor_txjuros": lambda: sum(len(r.df) for r in ColetorTxJuros(
+                    base_url=srv.url_olinda, diretorio_cache=tmp).coletar_mensal_modalidades("2025-07").values()),
+            }
+            for coletor, fn in coletas.items():
+                srv.limpar()
+                preparar(srv)
+                t0 = time.perf_counter()
+                try:
+                    linhas, erro = fn(), ""
+                except Exception as e:
+                    linhas, erro = 0, f"{type(e).__name__}: {e}"
+                dt = time.perf_counter() - t0
+                rotas = srv.relatorio()
+                resultados.append({"cenario": nome, "coletor": coletor, "tempo_s": dt, "linhas": linhas,
+                                   "rotas": rotas, "erro": erro})
+                caminho = ", ".join(f"{r}={d['ok']}/{d['n']}" for r, d in sorted(rotas.items()))
+                print(f"{nome:<20} {coletor:<16} {dt * 1000:8.1f} ms  linhas={linhas:<6} {caminho} {erro}")
+    return resultados
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--porta", type=int, default=8765)
+    ap.add_argument("--latencia", type=float, default=0.0)
+    ap.add_argument("--falhas", default="", help="status:prob separados por vírgula (ex.: 503:0.1,429:0.05)")
+    ap.add_argument("--sem-filtro", action="store_true", help="Olinda recusa $filter")
+    ap.add_argument("--replicar", type=int, default=1, help="multiplica as linhas do Olinda (payloads maiores)")
+    ap.add_argument("--bench", action="store_true", help="roda os coletores em todos os cenários e sai")
+    ap.add_argument("--cenario", action="append", help="restringe o --bench a este(s) cenário(s)")
+    args = ap.parse_args(argv)
+
+    if args.bench:
+        print(f"{'cenário':<20} {'coletor':<16} {'tempo':>11}  linhas  requisições ok/total por rota")
+        executar_bench(args.cenario, replicar=args.replicar)
+        return
+    falhas = {int(s): float(p) for s, p in (x.split(":") for x in args.falhas.split(",") if x)}
+    srv = ServidorBacenLocal(porta=args.porta, latencia=args.latencia, taxa_falhas=falhas,
+                             aceita_filtro=not args.sem_filtro, replicar=args.replicar).iniciar()
+    print(f"SGS:    {srv.url}/dados/serie/bcdata.sgs.433/dados?formato=json")
+    print(f"Olinda: {srv.url_olinda}/TaxasJurosMensalPorMes?$format=json")
+    print("Ctrl+C para sair.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.parar()
+
+
+if __name__ == '__main__':
+    main()